@@ -9,6 +9,12 @@ class Settings(BaseSettings):
     DATABASE_URL: PostgresDsn
     ASYNC_DATABASE_URL: PostgresDsn
 
+    # TimescaleDB (ignored on plain PostgreSQL)
+    # Convert market data tables to hypertables when the extension is available
+    TIMESCALE_ENABLED: bool = True
+    TIMESCALE_CHUNK_INTERVAL_DAYS: int = 7
+    TIMESCALE_COMPRESS_AFTER_DAYS: int = 30  # Chunks older than this are compressed
+
     # Redis
     REDIS_URL: RedisDsn
 
@@ -25,9 +31,18 @@ class Settings(BaseSettings):
     # Exchange
     EXCHANGE_ID: str = "bitget"
     EXCHANGE_SANDBOX: bool = False
+    # Parallel REST requests per client (paced by the shared rate limiter)
+    EXCHANGE_MAX_CONCURRENCY: int = 8
     EXCHANGE_API_KEY: str = ""
     EXCHANGE_SECRET: str = ""
 
+    # Market data / backfill
+    # Date-range segments fetched concurrently per backfill job (1 = serial)
+    BACKFILL_SEGMENTS: int = 4
+    # Derive 1h/4h/1d candles from stored 15m bars (the only source of them)
+    # instead of downloading them
+    RESAMPLING_ENABLED: bool = True
+
     # ML - OPTIMIZED FOR 70% ACCURACY AND >2% PROFIT
     MIN_CONFIDENCE_THRESHOLD: float = 0.65  # High confidence for quality (was 0.55)
     MIN_NET_PROFIT_PCT: float = 2.0  # Target >2% net profit after costs
@@ -37,14 +52,63 @@ class Settings(BaseSettings):
     DEFAULT_LOOKBACK_YEARS: int = 4
     MODEL_REGISTRY_DIR: str = "./model_registry"
     PERFORMANCE_TRACKING_DIR: str = "./performance_tracking"
+    STREAMING_FEATURES_ENABLED: bool = True  # Incremental live features persisted in Redis
+    STREAMING_FEATURES_TTL_SECONDS: int = 7 * 24 * 3600
+    MODEL_CACHE_ENABLED: bool = True  # Keep loaded models in memory across signal cycles
+    MODEL_CACHE_MAX_BYTES: int = 1024**3
+    SIGNAL_FEATURE_WORKERS: int = 4  # Threads computing live features for a batched signal cycle
+    # Compute a batched cycle's features per timeframe over a symbol panel
+    PANEL_FEATURES_ENABLED: bool = True
+    FEATURE_CACHE_ENABLED: bool = True  # Reuse computed features/labels across training runs
+    FEATURE_CACHE_DIR: str = "./feature_cache"
+    FEATURE_CACHE_MAX_BYTES: int = 5 * 1024**3
+    # Bars recomputed before the cached end when extending an entry
+    FEATURE_CACHE_WARMUP_BARS: int = 4000
+    # Read finalized months of market data from Parquet (requires pyarrow)
+    ARCHIVE_ENABLED: bool = True
+    ARCHIVE_DIR: str = "./market_archive"
+    # A month is archived this long after it ended, once gap repairs have settled
+    ARCHIVE_MIN_AGE_DAYS: int = 7
 
     # Auto-Training Configuration
     AUTO_TRAINING_ENABLED: bool = False  # Disabled by default, enable via API
     AUTO_TRAINING_INTERVAL_DAYS: int = 7  # Retrain every 7 days
+    # Weekly retrains continue the deployed model on the newest data only
+    AUTO_TRAINING_WARM_START: bool = False
     QUICK_TRAINING_TEST_DAYS: int = 14  # Quick mode: 14 day test windows
     QUICK_TRAINING_MIN_DAYS: int = 180  # Quick mode: 180 days min training (increased from 90)
     FULL_TRAINING_TEST_DAYS: int = 30  # Full mode: 30 day test windows
     FULL_TRAINING_MIN_DAYS: int = 365  # Full mode: 365 days min training (increased from 180)
+    TRAINING_FOLD_WORKERS: int = 1  # Walk-forward folds trained concurrently (1 = serial)
+    # LightGBM/XGBoost threads per fold worker (0 = cores / workers)
+    TRAINING_THREADS_PER_WORKER: int = 0
+    # Train from one float32 feature matrix shared by all folds
+    TRAINING_COMPACT_FEATURES: bool = False
+    # Builds the compact matrix in column groups within this budget (0 = unlimited)
+    TRAINING_MEMORY_BUDGET_MB: int = 0
+    # Bin features once and train every fold on row subsets of the bins
+    TRAINING_SHARED_BINS: bool = False
+    # Continue each expanding-window fold from the previous fold's boosters
+    TRAINING_WARM_START: bool = False
+    TRAINING_WARM_START_ROUNDS: int = 2000  # Boosting round cap for a warm-started fold / update
+    # Early-stopping rounds for a warm-started fold / update
+    TRAINING_WARM_START_PATIENCE: int = 200
+    TRAINING_CHECKPOINTS: bool = True  # Checkpoint every fold so an interrupted job can be resumed
+    TRAINING_CHECKPOINT_DIR: str = "./models/checkpoints"  # One subdirectory per training job
+    # A 'training' job silent this long is treated as interrupted
+    TRAINING_RESUME_STALE_MINUTES: int = 240
+    # Checkpoints no job resumed within this many days are deleted
+    TRAINING_CHECKPOINT_RETENTION_DAYS: int = 7
+    # Published fold data; must be mounted by every training worker
+    TRAINING_DISTRIBUTED_DIR: str = "./models/distributed"
+    # Default time budget of a training job, split across its folds (0 = unlimited)
+    TRAINING_TIME_BUDGET_HOURS: float = 0
+    # 'wall' = elapsed hours, 'cpu' = CPU-hours over the cores the folds train on
+    TRAINING_BUDGET_CLOCK: str = "wall"
+    # Highest learning rate a fold squeezed by the budget is given
+    TRAINING_BUDGET_MAX_LEARNING_RATE: float = 0.2
+    # Oldest folds are dropped when the budget cannot give each this long
+    TRAINING_BUDGET_MIN_FOLD_SECONDS: int = 60
 
     # LLM / Summaries
     LLM_PROVIDER: str = "openai"
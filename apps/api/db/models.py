@@ -379,6 +379,7 @@ class BackfillJob(Base):
     job_id = Column(String(50), unique=True, nullable=False, index=True)
     symbol = Column(String(20), nullable=False, index=True)
     timeframe = Column(Enum(TimeFrame), nullable=False)
+    job_type = Column(String(20), default="backfill", nullable=False)  # backfill, repair
 
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
@@ -388,6 +389,8 @@ class BackfillJob(Base):
     candles_fetched = Column(Integer, default=0)
     total_candles_estimate = Column(Integer)
     progress_pct = Column(Float, default=0.0)
+    # Partitioned jobs: [{index, start, end, cursor, candles_fetched, status}, ...]
+    segments = Column(JSON)
 
     # Performance
     candles_per_minute = Column(Float)
@@ -406,6 +409,19 @@ class BackfillJob(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class GapScanState(Base):
+    """High-water mark of the incremental OHLCV gap scan per (symbol, timeframe)."""
+
+    __tablename__ = "gap_scan_state"
+    __table_args__ = (UniqueConstraint("symbol", "timeframe", name="uq_gap_scan_state_symbol_tf"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String(20), nullable=False)
+    timeframe = Column(Enum(TimeFrame), nullable=False)
+    scanned_until = Column(DateTime, nullable=False)  # Newest candle already scanned
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class TrainingJob(Base):
     __tablename__ = "training_jobs"
 
@@ -425,6 +441,21 @@ class TrainingJob(Base):
     progress_pct = Column(Float, default=0.0)
     labeling_progress_pct = Column(Float, default=0.0)
 
+    # Fold checkpoints: resumed_folds were restored from resumed_from_job_id's checkpoint
+    checkpoint_path = Column(String(255))
+    resumed_from_job_id = Column(String(50))
+    resumed_folds = Column(Integer, default=0)
+
+    # Celery group of a distributed job's fold tasks (revoked on cancel)
+    fold_group_id = Column(String(50))
+
+    # Time budget (seconds of budget_clock) and the per-fold training time it achieved
+    time_budget_seconds = Column(Float)
+    budget_clock = Column(String(10))
+    avg_fold_seconds = Column(Float)
+    budget_exhausted = Column(Boolean, default=False)
+    budget_skipped_folds = Column(Integer, default=0)
+
     # Metrics
     accuracy = Column(Float)
     hit_rate_tp1 = Column(Float)
@@ -575,6 +606,9 @@ class AutoTrainingConfig(Base):
     symbols = Column(JSON, nullable=False)  # List of symbols to auto-train
     timeframe = Column(Enum(TimeFrame), nullable=False)
     quick_mode = Column(Boolean, default=False)  # Start with quick training
+    # Per-job training budget (None = settings.TRAINING_TIME_BUDGET_HOURS)
+    time_budget_hours = Column(Float)
+    budget_clock = Column(String(10))  # 'wall' or 'cpu' (None = settings.TRAINING_BUDGET_CLOCK)
 
     # Evolution tracking
     current_generation = Column(Integer, default=1)
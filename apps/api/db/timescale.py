@@ -0,0 +1,200 @@
+"""
+TimescaleDB layout for the market data tables.
+
+``ohlcv`` and ``market_metrics`` are converted into hypertables chunked by
+``timestamp``, so range scans only touch the chunks overlapping the requested
+window. Chunks older than ``TIMESCALE_COMPRESS_AFTER_DAYS`` are compressed
+(segmented by symbol) by a background policy. ``historical_signal_snapshots``
+stays a plain table: its inserts dedup on ``signal_id`` alone, which a
+hypertable key would have to widen. Migration ``e4f5a6b7c8d9`` applies the
+same layout with its own copy of the DDL. Higher timeframes are not
+aggregated here: the resampler (``apps.ml.resampling``) derives 1h/4h/1d bars
+into ``ohlcv`` on every database, so all readers keep a single source.
+
+Every entry point is idempotent and degrades to a no-op when the database is
+not PostgreSQL or the ``timescaledb`` extension is unavailable, leaving the
+plain tables with their B-tree indexes in place.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from apps.api.config import settings
+
+logger = logging.getLogger(__name__)
+
+HYPERTABLES: Dict[str, Dict[str, str]] = {
+    "ohlcv": {"time_column": "timestamp", "segment_by": "symbol, timeframe"},
+    "market_metrics": {"time_column": "timestamp", "segment_by": "symbol"},
+}
+
+
+def timescale_available(connection: Connection) -> bool:
+    """True if ``connection`` is PostgreSQL with the timescaledb extension installed (or installable)."""
+    if connection.dialect.name != "postgresql":
+        return False
+
+    installed = connection.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+    ).scalar()
+    if installed:
+        return True
+
+    available = connection.execute(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'")
+    ).scalar()
+    if not available:
+        return False
+
+    try:
+        with connection.begin_nested():
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS timescaledb"))
+        return True
+    except DBAPIError as exc:
+        logger.warning("timescaledb extension is available but could not be created: %s", exc)
+        return False
+
+
+def _table_exists(connection: Connection, table: str) -> bool:
+    return (
+        connection.execute(text("SELECT to_regclass(:table)"), {"table": table}).scalar()
+        is not None
+    )
+
+
+def is_hypertable(connection: Connection, table: str) -> bool:
+    return bool(
+        connection.execute(
+            text(
+                "SELECT 1 FROM timescaledb_information.hypertables "
+                "WHERE hypertable_name = :table AND hypertable_schema = current_schema()"
+            ),
+            {"table": table},
+        ).scalar()
+    )
+
+
+def _include_time_in_primary_key(connection: Connection, table: str, time_column: str) -> None:
+    """Hypertables require every unique constraint, the primary key included, to cover the time column."""
+    row = connection.execute(
+        text(
+            """
+            SELECT c.conname, array_agg(a.attname::text ORDER BY array_position(c.conkey, a.attnum))
+            FROM pg_constraint c
+            JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey)
+            WHERE c.conrelid = CAST(:table AS regclass) AND c.contype = 'p'
+            GROUP BY c.conname
+            """
+        ),
+        {"table": table},
+    ).first()
+    if row is None or time_column in row[1]:
+        return
+
+    preparer = connection.dialect.identifier_preparer
+    columns = ", ".join(preparer.quote(column) for column in [*row[1], time_column])
+    connection.execute(
+        text(
+            f"ALTER TABLE {preparer.quote(table)} "
+            f"DROP CONSTRAINT {preparer.quote(row[0])}, ADD PRIMARY KEY ({columns})"
+        )
+    )
+    logger.info("Extended primary key of %s to (%s)", table, columns)
+
+
+def setup_hypertable(
+    connection: Connection,
+    table: str,
+    chunk_interval_days: Optional[int] = None,
+    compress_after_days: Optional[int] = None,
+) -> bool:
+    """
+    Convert ``table`` into a compressed hypertable (existing rows are migrated).
+
+    Args:
+        connection: Connection inside the caller's transaction
+        table: One of HYPERTABLES
+        chunk_interval_days: Chunk width (default: settings.TIMESCALE_CHUNK_INTERVAL_DAYS)
+        compress_after_days: Compression policy age (default: settings.TIMESCALE_COMPRESS_AFTER_DAYS)
+
+    Returns:
+        True if the table is a hypertable afterwards
+    """
+    if (
+        not settings.TIMESCALE_ENABLED
+        or not timescale_available(connection)
+        or not _table_exists(connection, table)
+    ):
+        return False
+
+    spec = HYPERTABLES[table]
+    time_column = spec["time_column"]
+    chunk_days = chunk_interval_days or settings.TIMESCALE_CHUNK_INTERVAL_DAYS
+    compress_days = compress_after_days or settings.TIMESCALE_COMPRESS_AFTER_DAYS
+
+    if not is_hypertable(connection, table):
+        _include_time_in_primary_key(connection, table, time_column)
+        connection.execute(
+            text(
+                "SELECT create_hypertable(CAST(:table AS regclass), :time_column, "
+                "chunk_time_interval => CAST(:chunk AS interval), migrate_data => TRUE, if_not_exists => TRUE)"
+            ),
+            {"table": table, "time_column": time_column, "chunk": f"{chunk_days} days"},
+        )
+        logger.info("Converted %s into a hypertable (%d-day chunks)", table, chunk_days)
+
+    compressed = connection.execute(
+        text(
+            "SELECT compression_enabled FROM timescaledb_information.hypertables "
+            "WHERE hypertable_name = :table AND hypertable_schema = current_schema()"
+        ),
+        {"table": table},
+    ).scalar()
+    if not compressed:
+        preparer = connection.dialect.identifier_preparer
+        connection.execute(
+            text(
+                f"ALTER TABLE {preparer.quote(table)} SET ("
+                f"timescaledb.compress, "
+                f"timescaledb.compress_segmentby = '{spec['segment_by']}', "
+                f"timescaledb.compress_orderby = '{preparer.quote(time_column)} DESC')"
+            )
+        )
+
+    connection.execute(
+        text(
+            "SELECT add_compression_policy(CAST(:table AS regclass), CAST(:after AS interval), if_not_exists => TRUE)"
+        ),
+        {"table": table, "after": f"{compress_days} days"},
+    )
+    return True
+
+
+def setup_timescale(connection: Connection) -> Dict[str, Any]:
+    """
+    Apply the full Timescale layout; a no-op on plain PostgreSQL and other databases.
+
+    Returns:
+        Report with 'timescale' (bool) and 'hypertables'
+    """
+    report: Dict[str, Any] = {"timescale": False, "hypertables": []}
+    if not settings.TIMESCALE_ENABLED or not timescale_available(connection):
+        logger.info("TimescaleDB not available; keeping plain PostgreSQL tables")
+        return report
+
+    report["timescale"] = True
+    report["hypertables"] = [table for table in HYPERTABLES if setup_hypertable(connection, table)]
+    logger.info("TimescaleDB layout ready: hypertables=%s", report["hypertables"])
+    return report
+
+
+if __name__ == "__main__":
+    from apps.api.db.session import engine
+
+    logging.basicConfig(level=logging.INFO)
+    with engine.begin() as conn:
+        print(setup_timescale(conn))
@@ -29,6 +29,9 @@ class AutoTrainStartRequest(BaseModel):
     symbols: Optional[List[str]] = None
     timeframe: str = "15m"
     quick_start: bool = True
+    # Per-job training budget (None = server default, 0 = unlimited)
+    time_budget_hours: Optional[float] = None
+    budget_clock: Optional[str] = None  # 'wall' or 'cpu'
 
 
 class AutoTrainConfigResponse(BaseModel):
@@ -37,6 +40,8 @@ class AutoTrainConfigResponse(BaseModel):
     symbols: List[str]
     timeframe: str
     quick_mode: bool
+    time_budget_hours: Optional[float] = None
+    budget_clock: Optional[str] = None
     current_generation: Optional[int] = None
     best_score: Optional[float] = None
 
@@ -50,6 +55,17 @@ class AutoTrainStatusResponse(BaseModel):
     last_updated: Optional[str] = None
 
 
+def _validate_budget(request: AutoTrainStartRequest) -> None:
+    from apps.ml.training_budget import BUDGET_CLOCKS
+
+    if request.budget_clock is not None and request.budget_clock not in BUDGET_CLOCKS:
+        raise HTTPException(
+            status_code=400, detail=f"budget_clock must be one of {', '.join(BUDGET_CLOCKS)}"
+        )
+    if request.time_budget_hours is not None and request.time_budget_hours < 0:
+        raise HTTPException(status_code=400, detail="time_budget_hours must not be negative")
+
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -67,12 +83,15 @@ def start_auto_training(
     2. Continue with full training cycles every 12 hours
     3. Evolve parameters to optimize for 1% min return and 60% accuracy
     """
+    _validate_budget(request)
     trainer = AutoTrainer(db)
 
     result = trainer.start_auto_training(
         symbols=request.symbols,
         timeframe=request.timeframe,
-        quick_start=request.quick_start
+        quick_start=request.quick_start,
+        time_budget_hours=request.time_budget_hours,
+        budget_clock=request.budget_clock,
     )
 
     # Trigger immediate training cycle
@@ -144,6 +163,8 @@ def get_auto_training_config(db: Session = Depends(get_db)):
         symbols=config.symbols or [],
         timeframe=timeframe_value,
         quick_mode=config.quick_mode,
+        time_budget_hours=config.time_budget_hours,
+        budget_clock=config.budget_clock,
         current_generation=config.current_generation,
         best_score=config.best_score
     )
@@ -182,6 +203,7 @@ def update_auto_training_config(
     """
     Update auto-training configuration without stopping/starting.
     """
+    _validate_budget(request)
     config = db.query(AutoTrainingConfig).first()
 
     if not config:
@@ -197,6 +219,12 @@ def update_auto_training_config(
     if request.quick_start is not None:
         config.quick_mode = request.quick_start
 
+    if request.time_budget_hours is not None:
+        config.time_budget_hours = request.time_budget_hours
+
+    if request.budget_clock is not None:
+        config.budget_clock = request.budget_clock
+
     from datetime import datetime
     config.last_updated = datetime.utcnow()
 
@@ -210,6 +238,8 @@ def update_auto_training_config(
         symbols=config.symbols or [],
         timeframe=timeframe_value,
         quick_mode=config.quick_mode,
+        time_budget_hours=config.time_budget_hours,
+        budget_clock=config.budget_clock,
         current_generation=config.current_generation,
         best_score=config.best_score
     )
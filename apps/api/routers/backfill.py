@@ -18,12 +18,14 @@ class BackfillRequest(BaseModel):
     timeframe: TimeFrame
     start_date: str
     end_date: str
+    segments: Optional[int] = None
 
 
 class BackfillStatus(BaseModel):
     job_id: str
     symbol: str
     timeframe: str
+    job_type: str = "backfill"
     status: str
     progress_pct: float
     candles_fetched: int
@@ -31,6 +33,7 @@ class BackfillStatus(BaseModel):
     candles_per_minute: Optional[float]
     eta_minutes: Optional[float]
     detected_gaps: Optional[list[dict[str, str]]] = None
+    segments: Optional[list[dict]] = None
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     created_at: Optional[str] = None
@@ -62,7 +65,8 @@ async def start_backfill(
         symbol=request.symbol,
         timeframe=request.timeframe,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        segments=request.segments,
     )
 
     # Trigger Celery task to execute backfill
@@ -20,6 +20,7 @@ from apps.api.db.models import (
     TradeResult,
 )
 from apps.api.config import settings
+from apps.ml.feature_store import FeatureCache
 
 
 ANALYTICS_CACHE_TTL_SECONDS = 300
@@ -27,6 +28,17 @@ ANALYTICS_CACHE_TTL_SECONDS = 300
 router = APIRouter()
 
 
+class FeatureCacheStatus(BaseModel):
+    hits: int = 0
+    partial_hits: int = 0
+    misses: int = 0
+    hit_rate: Optional[float] = None
+    bytes_served: int = 0
+    bytes_on_disk: int = 0
+    entries: int = 0
+    evictions: int = 0
+
+
 class SystemStatusResponse(BaseModel):
     hit_rate_tp1: Optional[float] = None
     avg_net_profit_pct: Optional[float] = None
@@ -38,6 +50,7 @@ class SystemStatusResponse(BaseModel):
     avg_trade_duration_minutes: Optional[float] = None
     metrics_source: str = "trade_results"
     metrics_sample_size: int = 0
+    feature_cache: Optional[FeatureCacheStatus] = None
 
 
 class CandleInfo(BaseModel):
@@ -149,6 +162,16 @@ async def get_system_status(db: Session = Depends(get_db)):
             win_rate = wins / sample_size if sample_size else None
             hit_rate_tp1 = tp_hits / sample_size if sample_size else None
 
+    feature_cache_status = None
+    if settings.FEATURE_CACHE_ENABLED:
+        try:
+            stats = FeatureCache().stats()
+            feature_cache_status = FeatureCacheStatus(
+                **{key: stats[key] for key in FeatureCacheStatus.model_fields}
+            )
+        except OSError:
+            feature_cache_status = None
+
     return SystemStatusResponse(
         hit_rate_tp1=hit_rate_tp1,
         avg_net_profit_pct=avg_net_profit_pct,
@@ -160,6 +183,7 @@ async def get_system_status(db: Session = Depends(get_db)):
         avg_trade_duration_minutes=avg_duration,
         metrics_source=metrics_source,
         metrics_sample_size=sample_size,
+        feature_cache=feature_cache_status,
     )
 
 
@@ -4,7 +4,7 @@ from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from apps.api.db import get_db
-from celery.result import AsyncResult
+from celery.result import AsyncResult, GroupResult
 from apps.ml.worker import celery_app
 from apps.ml.model_registry import ModelRegistry
 from apps.ml.performance_tracker import PerformanceTracker
@@ -20,6 +20,10 @@ class TrainRequest(BaseModel):
     min_train_days: int = 180
     use_expanding_window: bool = True
     force_retrain: bool = False
+    distributed: bool = False  # Train each fold as its own task across the training workers
+    # Split across the folds (None = settings.TRAINING_TIME_BUDGET_HOURS)
+    time_budget_hours: Optional[float] = None
+    budget_clock: Optional[str] = None  # 'wall' or 'cpu' (None = settings.TRAINING_BUDGET_CLOCK)
 
 
 class TrainResponse(BaseModel):
@@ -39,6 +43,13 @@ class TrainingStatus(BaseModel):
     labeling_progress_pct: Optional[float] = None
     current_fold: Optional[int] = None
     total_folds: Optional[int] = None
+    resumed_folds: Optional[int] = None  # Folds restored from an interrupted job's checkpoint
+    resumed_from_job_id: Optional[str] = None
+    time_budget_seconds: Optional[float] = None
+    budget_clock: Optional[str] = None
+    avg_fold_seconds: Optional[float] = None  # Achieved training time per fold
+    budget_exhausted: Optional[bool] = None
+    budget_skipped_folds: Optional[int] = None  # Folds dropped to fit the budget
     accuracy: Optional[float] = None
     hit_rate_tp1: Optional[float] = None
     elapsed_seconds: Optional[float] = None
@@ -68,11 +79,21 @@ async def start_training(request: TrainRequest, db: Session = Depends(get_db)):
     Start model training with walk-forward validation using expanding windows.
 
     Trains on ALL available historical data by default (expanding window mode).
+    With ``distributed``, folds are spread over all workers on the training queue.
+    With ``time_budget_hours``, the job fits its folds into that many (wall or
+    CPU) hours and stops with the best model so far when they run out.
     """
-    from apps.ml.worker import train_model_task
+    from apps.ml.training_budget import BUDGET_CLOCKS
+    from apps.ml.worker import train_model_distributed_task, train_model_task
 
-    # Trigger Celery task
-    task = train_model_task.delay(
+    if request.budget_clock is not None and request.budget_clock not in BUDGET_CLOCKS:
+        raise HTTPException(
+            status_code=400, detail=f"budget_clock must be one of {', '.join(BUDGET_CLOCKS)}"
+        )
+    if request.time_budget_hours is not None and request.time_budget_hours < 0:
+        raise HTTPException(status_code=400, detail="time_budget_hours must not be negative")
+
+    task_kwargs = dict(
         symbol=request.symbol,
         timeframe=request.timeframe,
         test_period_days=request.test_period_days,
@@ -80,6 +101,20 @@ async def start_training(request: TrainRequest, db: Session = Depends(get_db)):
         use_expanding_window=request.use_expanding_window
     )
 
+    # Trigger Celery task
+    if request.distributed:
+        if request.time_budget_hours:
+            raise HTTPException(
+                status_code=400, detail="Time budgets are not supported for distributed training"
+            )
+        task = train_model_distributed_task.delay(**task_kwargs)
+    else:
+        task = train_model_task.delay(
+            **task_kwargs,
+            time_budget_hours=request.time_budget_hours,
+            budget_clock=request.budget_clock,
+        )
+
     return TrainResponse(
         job_id=task.id,
         status="queued",
@@ -108,6 +143,13 @@ async def get_training_status(job_id: str, db: Session = Depends(get_db)):
             labeling_progress_pct=training_job.labeling_progress_pct,
             current_fold=training_job.current_fold,
             total_folds=training_job.total_folds,
+            resumed_folds=training_job.resumed_folds,
+            resumed_from_job_id=training_job.resumed_from_job_id,
+            time_budget_seconds=training_job.time_budget_seconds,
+            budget_clock=training_job.budget_clock,
+            avg_fold_seconds=training_job.avg_fold_seconds,
+            budget_exhausted=training_job.budget_exhausted,
+            budget_skipped_folds=training_job.budget_skipped_folds,
             accuracy=training_job.accuracy,
             hit_rate_tp1=training_job.hit_rate_tp1,
             elapsed_seconds=training_job.elapsed_seconds,
@@ -178,6 +220,15 @@ async def cancel_training(job_id: str, db: Session = Depends(get_db)):
     except Exception as e:
         print(f"Could not revoke Celery task {job_id}: {e}")
 
+    # A distributed job's parent task returned after dispatching; its folds run on
+    if job.fold_group_id:
+        try:
+            fold_group = GroupResult.restore(job.fold_group_id, app=celery_app)
+            if fold_group is not None:
+                fold_group.revoke(terminate=True, signal='SIGKILL')
+        except Exception as e:
+            print(f"Could not revoke fold tasks of {job_id}: {e}")
+
     return {"job_id": job_id, "status": "cancelled"}
 
 
@@ -230,6 +281,13 @@ async def list_training_jobs(db: Session = Depends(get_db)):
             labeling_progress_pct=job.labeling_progress_pct,
             current_fold=job.current_fold,
             total_folds=job.total_folds,
+            resumed_folds=job.resumed_folds,
+            resumed_from_job_id=job.resumed_from_job_id,
+            time_budget_seconds=job.time_budget_seconds,
+            budget_clock=job.budget_clock,
+            avg_fold_seconds=job.avg_fold_seconds,
+            budget_exhausted=job.budget_exhausted,
+            budget_skipped_folds=job.budget_skipped_folds,
             accuracy=job.accuracy,
             hit_rate_tp1=job.hit_rate_tp1,
             elapsed_seconds=job.elapsed_seconds,
@@ -0,0 +1,673 @@
+"""
+Columnar Parquet archive for closed market data history.
+
+Candles and market metrics of a finalized month never change, yet every
+training run, historical signal replay and backtest used to re-read them from
+Postgres. The archive exports each finalized month once into its own
+zstd-compressed Parquet file::
+
+    <ARCHIVE_DIR>/ohlcv/<symbol>/<timeframe>/<YYYY-MM>.parquet
+    <ARCHIVE_DIR>/market_metrics/<symbol>/<YYYY-MM>.parquet
+
+Every series directory keeps a ``manifest.json`` with the row count, time
+range and checksum of each archived month. Readers memory-map the archived
+months and stitch in whatever the manifest does not cover (the live tail,
+months not exported yet) from the database, so the result is identical to a
+database-only read. With ARCHIVE_ENABLED off every read goes straight to the
+database; with it on, pyarrow (a project dependency) must be importable.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, func, literal_column, select
+from sqlalchemy.orm import Session
+
+from apps.api.config import settings
+from apps.api.db.models import OHLCV, MarketMetrics, TimeFrame
+from apps.ml.market_data import OHLCV_COLUMNS, _resolve_timeframe, load_ohlcv
+from apps.ml.resampling import DERIVED_TIMEFRAMES, SOURCE_TIMEFRAME
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts
+    fcntl = None
+
+MANIFEST_VERSION = 1
+PARQUET_COMPRESSION = "zstd"
+
+OHLCV_TABLE = "ohlcv"
+METRICS_TABLE = "market_metrics"
+METRIC_COLUMNS = [
+    "funding_rate",
+    "open_interest",
+    "spread_bps",
+    "depth_imbalance",
+    "realized_volatility",
+]
+
+# Inclusive upper bounds for month ranges on the database side
+_RESOLUTION = timedelta(microseconds=1)
+
+
+def _month_start(ts: datetime) -> datetime:
+    return datetime(ts.year, ts.month, 1)
+
+
+def _next_month(month: datetime) -> datetime:
+    return datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _month_key(month: datetime) -> str:
+    return month.strftime("%Y-%m")
+
+
+def _parse_month(key: str) -> datetime:
+    return datetime.strptime(key, "%Y-%m")
+
+
+def _month_expr(column, dialect_name: str):
+    """'YYYY-MM' of a timestamp column, rendered inline so it groups identically."""
+    if dialect_name == "sqlite":
+        return func.strftime(literal_column("'%Y-%m'"), column)
+    return func.to_char(column, literal_column("'YYYY-MM'"))
+
+
+def _checksum(frame: pd.DataFrame) -> str:
+    """Hash of the timestamps and numeric values of an archived month."""
+    digest = hashlib.sha1()
+    digest.update(frame["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64).tobytes())
+    values = frame.drop(columns="timestamp").to_numpy(dtype=np.float64)
+    # Nulls come back from the database and from Parquet as NaNs with possibly different payloads
+    values = np.where(np.isnan(values), np.nan, values)
+    digest.update(",".join(frame.columns).encode())
+    digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def empty_metrics_frame() -> pd.DataFrame:
+    """Typed, empty market metrics frame."""
+    frame = pd.DataFrame({col: pd.Series(dtype=np.float64) for col in METRIC_COLUMNS})
+    frame.insert(0, "timestamp", pd.Series(dtype="datetime64[ns]"))
+    return frame
+
+
+def load_market_metrics(
+    db: Session, symbol: str, start: Optional[datetime] = None, end: Optional[datetime] = None
+) -> pd.DataFrame:
+    """
+    Load market metrics from the database as a typed, timestamp-ascending DataFrame.
+
+    Args:
+        db: SQLAlchemy session
+        symbol: Trading pair, e.g. 'BTC/USDT'
+        start: Inclusive lower timestamp bound
+        end: Inclusive upper timestamp bound
+
+    Returns:
+        DataFrame with datetime64 ``timestamp`` and float64 METRIC_COLUMNS
+    """
+    conditions = [MarketMetrics.symbol == symbol]
+    if start is not None:
+        conditions.append(MarketMetrics.timestamp >= start)
+    if end is not None:
+        conditions.append(MarketMetrics.timestamp <= end)
+
+    query = (
+        select(MarketMetrics.timestamp, *[getattr(MarketMetrics, col) for col in METRIC_COLUMNS])
+        .where(and_(*conditions))
+        .order_by(MarketMetrics.timestamp)
+    )
+    rows = db.execute(query).all()
+    if not rows:
+        return empty_metrics_frame()
+
+    columns = list(zip(*rows))
+    frame = pd.DataFrame(
+        {
+            col: np.array(values, dtype=np.float64)
+            for col, values in zip(METRIC_COLUMNS, columns[1:])
+        }
+    )
+    frame.insert(0, "timestamp", pd.to_datetime(np.array(columns[0], dtype="datetime64[ns]")))
+    return frame
+
+
+class MarketDataArchive:
+    """
+    Month-partitioned Parquet copies of finalized ``ohlcv`` and ``market_metrics`` rows.
+
+    The database stays the source of truth: a month is only read from disk
+    while its manifest entry exists, and ``build`` re-exports months whose
+    row count changed (e.g. after a gap repair) since they were archived.
+    """
+
+    def __init__(self, root: Optional[str] = None, min_age_days: Optional[int] = None):
+        """
+        Args:
+            root: Archive directory (default: settings.ARCHIVE_DIR)
+            min_age_days: A month is finalized this many days after it ended
+                          (default: settings.ARCHIVE_MIN_AGE_DAYS)
+        """
+        self.root = Path(root or settings.ARCHIVE_DIR)
+        self.min_age_days = int(
+            min_age_days if min_age_days is not None else settings.ARCHIVE_MIN_AGE_DAYS
+        )
+        self._manifests: Dict[Path, Tuple[int, Dict]] = {}
+
+    # --------------------------------------------------------------- manifest
+
+    def _series_dir(self, table: str, symbol: str, timeframe: Optional[TimeFrame] = None) -> Path:
+        directory = self.root / table / symbol.replace("/", "_")
+        return directory / timeframe.value if timeframe is not None else directory
+
+    @contextmanager
+    def _locked(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / ".lock", "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read_manifest(self, directory: Path) -> Dict:
+        path = directory / "manifest.json"
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+
+        cached = self._manifests.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as exc:
+            logger.warning("Unreadable archive manifest %s: %s", path, exc)
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+
+        self._manifests[path] = (mtime, manifest)
+        return manifest
+
+    def _update_manifest(
+        self,
+        directory: Path,
+        table: str,
+        symbol: str,
+        timeframe: Optional[TimeFrame],
+        mutate: Callable[[Dict[str, Dict]], None],
+    ) -> None:
+        with self._locked(directory):
+            manifest = self._read_manifest(directory) or {
+                "version": MANIFEST_VERSION,
+                "table": table,
+                "symbol": symbol,
+                "timeframe": timeframe.value if timeframe is not None else None,
+                "months": {},
+            }
+            manifest = {**manifest, "months": dict(manifest["months"])}
+            mutate(manifest["months"])
+
+            path = directory / "manifest.json"
+            tmp_path = path.with_suffix(".json.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, path)
+
+    def archived_months(
+        self, table: str, symbol: str, timeframe: Optional[TimeFrame] = None
+    ) -> Dict[str, Dict]:
+        """Manifest entries of one series keyed by 'YYYY-MM'."""
+        return self._read_manifest(self._series_dir(table, symbol, timeframe)).get("months", {})
+
+    def _manifests_on_disk(self) -> Iterable[Dict]:
+        for path in sorted(self.root.glob("*/*/manifest.json")) + sorted(
+            self.root.glob("*/*/*/manifest.json")
+        ):
+            manifest = self._read_manifest(path.parent)
+            if manifest:
+                yield manifest
+
+    # --------------------------------------------------------------- database
+
+    @staticmethod
+    def _load_from_db(
+        db: Session,
+        table: str,
+        symbol: str,
+        timeframe: Optional[TimeFrame],
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> pd.DataFrame:
+        if table == OHLCV_TABLE:
+            return load_ohlcv(db, symbol, timeframe, start=start, end=end)
+        return load_market_metrics(db, symbol, start=start, end=end)
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Start of the oldest month that is not finalized yet."""
+        now = now or datetime.utcnow()
+        return _month_start(now - timedelta(days=self.min_age_days))
+
+    @staticmethod
+    def _month_counts(
+        db: Session,
+        cutoff: datetime,
+        symbols: Optional[List[str]],
+        timeframes: Optional[List[TimeFrame]],
+    ) -> Dict[Tuple[str, str, Optional[TimeFrame], str], int]:
+        """Rows per (table, symbol, timeframe, month) before ``cutoff``, one grouped query per table."""
+        dialect = db.get_bind().dialect.name
+        counts = {}
+
+        month = _month_expr(OHLCV.timestamp, dialect)
+        query = db.query(OHLCV.symbol, OHLCV.timeframe, month, func.count()).filter(
+            OHLCV.timestamp < cutoff
+        )
+        if symbols:
+            query = query.filter(OHLCV.symbol.in_(symbols))
+        if timeframes:
+            query = query.filter(OHLCV.timeframe.in_(timeframes))
+        for symbol, timeframe, key, rows in query.group_by(OHLCV.symbol, OHLCV.timeframe, month):
+            counts[(OHLCV_TABLE, symbol, timeframe, key)] = rows
+
+        month = _month_expr(MarketMetrics.timestamp, dialect)
+        query = db.query(MarketMetrics.symbol, month, func.count()).filter(
+            MarketMetrics.timestamp < cutoff
+        )
+        if symbols:
+            query = query.filter(MarketMetrics.symbol.in_(symbols))
+        for symbol, key, rows in query.group_by(MarketMetrics.symbol, month):
+            counts[(METRICS_TABLE, symbol, None, key)] = rows
+
+        return counts
+
+    # ------------------------------------------------------------------ write
+
+    def export_month(
+        self, db: Session, table: str, symbol: str, timeframe: Optional[TimeFrame], month: datetime
+    ) -> int:
+        """
+        Write one month of a series to Parquet and record it in the manifest.
+
+        Returns:
+            Rows archived (0 if the month is empty in the database)
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required to build the market data archive")
+
+        month = _month_start(month)
+        frame = self._load_from_db(
+            db, table, symbol, timeframe, month, _next_month(month) - _RESOLUTION
+        )
+        if frame.empty:
+            return 0
+
+        directory = self._series_dir(table, symbol, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+        key = _month_key(month)
+        path = directory / f"{key}.parquet"
+        tmp_path = path.with_name(path.name + ".tmp")
+        pq.write_table(
+            pa.Table.from_pandas(frame, preserve_index=False),
+            tmp_path,
+            compression=PARQUET_COMPRESSION,
+        )
+        os.replace(tmp_path, path)
+
+        entry = {
+            "rows": len(frame),
+            "first": frame["timestamp"].iloc[0].isoformat(),
+            "last": frame["timestamp"].iloc[-1].isoformat(),
+            "checksum": _checksum(frame),
+            "bytes": path.stat().st_size,
+            "exported_at": datetime.utcnow().isoformat(),
+        }
+        self._update_manifest(
+            directory, table, symbol, timeframe, lambda months: months.__setitem__(key, entry)
+        )
+        return len(frame)
+
+    def build(
+        self,
+        db: Session,
+        symbols: Optional[Iterable[str]] = None,
+        timeframes: Optional[Iterable[Union[str, TimeFrame]]] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """
+        Archive every finalized month that is missing or whose row count changed.
+
+        Args:
+            db: SQLAlchemy session
+            symbols: Restrict to these symbols (default: all)
+            timeframes: Restrict candles to these timeframes (default: all)
+            now: Reference time for the finalization cutoff
+
+        Returns:
+            Counts of exported files, exported rows and months already up to date
+        """
+        symbols = list(symbols) if symbols is not None else None
+        timeframes = (
+            [_resolve_timeframe(tf) for tf in timeframes] if timeframes is not None else None
+        )
+        cutoff = self.cutoff(now)
+
+        report = {"exported": 0, "rows": 0, "up_to_date": 0}
+        counts = self._month_counts(db, cutoff, symbols, timeframes)
+        for (table, symbol, timeframe, key), rows in sorted(
+            counts.items(), key=lambda item: str(item[0])
+        ):
+            entry = self.archived_months(table, symbol, timeframe).get(key)
+            if entry is not None and entry["rows"] == rows:
+                report["up_to_date"] += 1
+                continue
+
+            report["rows"] += self.export_month(db, table, symbol, timeframe, _parse_month(key))
+            report["exported"] += 1
+
+        logger.info("Market data archive built up to %s: %s", cutoff.date(), report)
+        return report
+
+    def invalidate(
+        self,
+        table: str,
+        symbol: str,
+        timeframe: Optional[TimeFrame],
+        start: datetime,
+        end: datetime,
+    ) -> List[str]:
+        """
+        Drop the archived months overlapping [start, end] so reads go back to the database.
+
+        Called after history was rewritten (backfills, gap repairs); the next
+        ``build`` exports the months again.
+        """
+        directory = self._series_dir(table, symbol, timeframe)
+        stale = [
+            key
+            for key in self.archived_months(table, symbol, timeframe)
+            if _parse_month(key) <= end and _next_month(_parse_month(key)) > start
+        ]
+        if not stale:
+            return []
+
+        def _drop(months: Dict[str, Dict]) -> None:
+            for key in stale:
+                months.pop(key, None)
+
+        self._update_manifest(directory, table, symbol, timeframe, _drop)
+        for key in stale:
+            (directory / f"{key}.parquet").unlink(missing_ok=True)
+        logger.info("Invalidated %d archived months of %s %s", len(stale), table, symbol)
+        return stale
+
+    def verify(self, db: Session, repair: bool = False) -> Dict:
+        """
+        Check every archived month against its file and the database.
+
+        Args:
+            db: SQLAlchemy session
+            repair: Re-export months whose file or database rows no longer match
+
+        Returns:
+            Number of months checked and the 'table/symbol/timeframe/month' keys that mismatched
+        """
+        report = {"checked": 0, "mismatched": [], "repaired": 0}
+        for manifest in self._manifests_on_disk():
+            table = manifest["table"]
+            symbol = manifest["symbol"]
+            timeframe = TimeFrame(manifest["timeframe"]) if manifest["timeframe"] else None
+            directory = self._series_dir(table, symbol, timeframe)
+
+            for key, entry in sorted(manifest["months"].items()):
+                report["checked"] += 1
+                month = _parse_month(key)
+                try:
+                    archived = pq.read_table(
+                        directory / f"{key}.parquet", memory_map=True
+                    ).to_pandas()
+                    file_ok = (
+                        len(archived) == entry["rows"] and _checksum(archived) == entry["checksum"]
+                    )
+                except (OSError, pa.ArrowException):
+                    file_ok = False
+
+                stored = self._load_from_db(
+                    db, table, symbol, timeframe, month, _next_month(month) - _RESOLUTION
+                )
+                db_ok = len(stored) == entry["rows"] and _checksum(stored) == entry["checksum"]
+                if file_ok and db_ok:
+                    continue
+
+                name = "/".join(filter(None, [table, symbol, manifest["timeframe"], key]))
+                logger.warning(
+                    "Archived month %s does not match (file ok: %s, database ok: %s)",
+                    name,
+                    file_ok,
+                    db_ok,
+                )
+                report["mismatched"].append(name)
+                if repair:
+                    self.invalidate(table, symbol, timeframe, month, month)
+                    self.export_month(db, table, symbol, timeframe, month)
+                    report["repaired"] += 1
+
+        logger.info(
+            "Verified %d archived months, %d mismatched",
+            report["checked"],
+            len(report["mismatched"]),
+        )
+        return report
+
+    # ------------------------------------------------------------------- read
+
+    def _read_month(
+        self, path: Path, start: Optional[datetime], end: Optional[datetime]
+    ) -> pd.DataFrame:
+        filters = []
+        if start is not None:
+            filters.append(("timestamp", ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append(("timestamp", "<=", pd.Timestamp(end)))
+        return pq.read_table(path, memory_map=True, filters=filters or None).to_pandas()
+
+    def _stitch(
+        self,
+        db: Session,
+        table: str,
+        symbol: str,
+        timeframe: Optional[TimeFrame],
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> pd.DataFrame:
+        """Archived months from disk, everything between and after them from the database."""
+        directory = self._series_dir(table, symbol, timeframe)
+        parts = []
+        cursor = start
+        archived = 0
+
+        for key in sorted(self.archived_months(table, symbol, timeframe)):
+            month = _parse_month(key)
+            month_end = _next_month(month)
+            if start is not None and month_end <= start:
+                continue
+            if end is not None and month > end:
+                break
+
+            if cursor is None or cursor < month:
+                parts.append(
+                    self._load_from_db(db, table, symbol, timeframe, cursor, month - _RESOLUTION)
+                )
+
+            lower = start if start is not None and start > month else None
+            upper = end if end is not None and end < month_end else None
+            try:
+                frame = self._read_month(directory / f"{key}.parquet", lower, upper)
+                archived += len(frame)
+            except (OSError, pa.ArrowException) as exc:
+                logger.warning(
+                    "Falling back to the database for archived month %s of %s: %s", key, symbol, exc
+                )
+                frame = self._load_from_db(
+                    db, table, symbol, timeframe, lower or month, upper or month_end - _RESOLUTION
+                )
+            parts.append(frame)
+            cursor = month_end
+
+        if cursor is None or end is None or cursor <= end:
+            parts.append(self._load_from_db(db, table, symbol, timeframe, cursor, end))
+
+        rows = [part for part in parts if not part.empty]
+        if not rows:
+            return parts[-1]
+
+        logger.debug("Read %d archived rows of %s %s", archived, table, symbol)
+        return rows[0] if len(rows) == 1 else pd.concat(rows, ignore_index=True)
+
+    def load_ohlcv(
+        self,
+        db: Session,
+        symbol: str,
+        timeframe: Union[str, TimeFrame],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """Same result as ``market_data.load_ohlcv`` with archived months read from Parquet."""
+        return self._stitch(db, OHLCV_TABLE, symbol, _resolve_timeframe(timeframe), start, end)[
+            OHLCV_COLUMNS
+        ]
+
+    def load_market_metrics(
+        self,
+        db: Session,
+        symbol: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """Same result as ``load_market_metrics`` with archived months read from Parquet."""
+        return self._stitch(db, METRICS_TABLE, symbol, None, start, end)
+
+
+_archives: Dict[str, MarketDataArchive] = {}
+
+
+def get_archive() -> Optional[MarketDataArchive]:
+    """
+    Shared archive of this process, or None if it is disabled.
+
+    Raises:
+        RuntimeError: ARCHIVE_ENABLED is set but pyarrow is not installed
+    """
+    if not settings.ARCHIVE_ENABLED:
+        return None
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError(
+            "ARCHIVE_ENABLED is set but pyarrow is not installed; install it or disable the archive"
+        )
+    root = settings.ARCHIVE_DIR
+    if root not in _archives:
+        _archives[root] = MarketDataArchive(root)
+    return _archives[root]
+
+
+def load_ohlcv_history(
+    db: Session,
+    symbol: str,
+    timeframe: Union[str, TimeFrame],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> pd.DataFrame:
+    """Load a candle range through the archive when it is available, from the database otherwise."""
+    archive = get_archive()
+    if archive is None:
+        return load_ohlcv(db, symbol, timeframe, start=start, end=end)
+    return archive.load_ohlcv(db, symbol, timeframe, start=start, end=end)
+
+
+def load_market_metrics_history(
+    db: Session, symbol: str, start: Optional[datetime] = None, end: Optional[datetime] = None
+) -> pd.DataFrame:
+    """Load a market metrics range through the archive when it is available, from the database otherwise."""
+    archive = get_archive()
+    if archive is None:
+        return load_market_metrics(db, symbol, start=start, end=end)
+    return archive.load_market_metrics(db, symbol, start=start, end=end)
+
+
+def invalidate_archive(symbol: str, timeframe: TimeFrame, start: datetime, end: datetime) -> None:
+    """Drop archived candle months (and, for 15m history, the derived timeframes) that a write touched."""
+    archive = get_archive()
+    if archive is None:
+        return
+    for tf in [timeframe] + (list(DERIVED_TIMEFRAMES) if timeframe == SOURCE_TIMEFRAME else []):
+        archive.invalidate(OHLCV_TABLE, symbol, tf, start, end)
+
+
+def invalidate_metrics_archive(symbol: str, start: datetime, end: datetime) -> None:
+    """Drop archived market metrics months that a write touched."""
+    archive = get_archive()
+    if archive is None:
+        return
+    archive.invalidate(METRICS_TABLE, symbol, None, start, end)
+
+
+if __name__ == "__main__":
+    from apps.api.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Build or verify the Parquet market data archive")
+    parser.add_argument("command", choices=["build", "verify"])
+    parser.add_argument(
+        "--symbol", action="append", dest="symbols", help="Restrict to a symbol (repeatable)"
+    )
+    parser.add_argument(
+        "--timeframe",
+        action="append",
+        dest="timeframes",
+        help="Restrict to a timeframe (repeatable)",
+    )
+    parser.add_argument(
+        "--repair", action="store_true", help="Re-export months that fail verification"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if not PYARROW_AVAILABLE:
+        parser.error("pyarrow is not installed")
+
+    session = SessionLocal()
+    try:
+        archive = MarketDataArchive()
+        if args.command == "build":
+            print(archive.build(session, symbols=args.symbols, timeframes=args.timeframes))
+        else:
+            print(archive.verify(session, repair=args.repair))
+    finally:
+        session.close()
@@ -21,7 +21,7 @@ from pathlib import Path
 from apps.api.db.models import (
     TrainingJob, AutoTrainingConfig, OHLCV, TimeFrame
 )
-from apps.ml.training import train_model_pipeline
+from apps.ml.training import train_model_pipeline, update_model_pipeline
 from apps.ml.model_registry import ModelRegistry
 from apps.api.config import settings
 
@@ -199,7 +199,9 @@ class AutoTrainer:
         self,
         symbols: List[str] = None,
         timeframe: str = "15m",
-        quick_start: bool = True
+        quick_start: bool = True,
+        time_budget_hours: Optional[float] = None,
+        budget_clock: Optional[str] = None,
     ) -> Dict:
         """
         Start auto-training system.
@@ -208,6 +210,9 @@ class AutoTrainer:
             symbols: List of symbols to train (default: all tracked pairs)
             timeframe: Timeframe to use
             quick_start: If True, do quick initial training first
+            time_budget_hours: Training budget of each symbol's job
+                               (None = settings.TRAINING_TIME_BUDGET_HOURS; 0 = unlimited)
+            budget_clock: 'wall' or 'cpu' (None = settings.TRAINING_BUDGET_CLOCK)
 
         Returns:
             Status dictionary
@@ -226,6 +231,8 @@ class AutoTrainer:
                 symbols=symbols,
                 timeframe=TimeFrame(timeframe),
                 quick_mode=quick_start,
+                time_budget_hours=time_budget_hours,
+                budget_clock=budget_clock,
                 created_at=datetime.utcnow()
             )
             self.db.add(config)
@@ -234,6 +241,8 @@ class AutoTrainer:
             config.symbols = symbols
             config.timeframe = TimeFrame(timeframe)
             config.quick_mode = quick_start
+            config.time_budget_hours = time_budget_hours
+            config.budget_clock = budget_clock
             config.last_updated=datetime.utcnow()
 
         self.db.commit()
@@ -247,7 +256,9 @@ class AutoTrainer:
             'status': 'started',
             'symbols': symbols,
             'timeframe': timeframe,
-            'quick_mode': quick_start
+            'quick_mode': quick_start,
+            'time_budget_hours': time_budget_hours,
+            'budget_clock': budget_clock
         }
 
     def stop_auto_training(self) -> Dict:
@@ -266,7 +277,10 @@ class AutoTrainer:
         self,
         symbol: str,
         timeframe: str,
-        quick_mode: bool = False
+        quick_mode: bool = False,
+        warm_start: bool = False,
+        time_budget_hours: Optional[float] = None,
+        budget_clock: Optional[str] = None,
     ) -> Dict:
         """
         Run a single training cycle for a symbol.
@@ -275,6 +289,12 @@ class AutoTrainer:
             symbol: Trading pair
             timeframe: Timeframe
             quick_mode: Use quick training settings
+            warm_start: Continue the deployed model on the data that arrived since it
+                        was trained, falling back to a full retrain when there is no
+                        deployed model or it cannot be continued
+            time_budget_hours: Budget of the full training run
+                               (None = settings.TRAINING_TIME_BUDGET_HOURS; 0 = unlimited)
+            budget_clock: 'wall' or 'cpu' (None = settings.TRAINING_BUDGET_CLOCK)
 
         Returns:
             Training results
@@ -298,14 +318,23 @@ class AutoTrainer:
         # TODO: Refactor to pass parameters directly to training pipeline
 
         try:
-            results = train_model_pipeline(
-                db=self.db,
-                symbol=symbol,
-                timeframe=timeframe,
-                test_period_days=params.test_period_days,
-                min_train_days=params.min_train_days,
-                use_expanding_window=True
-            )
+            results = None
+            if warm_start and not quick_mode:
+                results = self._warm_start_update(symbol, timeframe)
+
+            if results is None:
+                results = train_model_pipeline(
+                    db=self.db,
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    test_period_days=params.test_period_days,
+                    min_train_days=params.min_train_days,
+                    use_expanding_window=True,
+                    time_budget_seconds=time_budget_hours * 3600
+                    if time_budget_hours is not None
+                    else None,
+                    budget_clock=budget_clock,
+                )
 
             # Evolve parameters for next cycle
             next_params = self.evolution.evolve_params(params, results)
@@ -322,7 +351,10 @@ class AutoTrainer:
                 'timeframe': timeframe,
                 'generation': params.generation,
                 'model_id': results['model_id'],
+                'warm_start': bool(results.get('warm_start_from')),
                 'avg_metrics': results.get('avg_metrics', {}),
+                'avg_fold_seconds': results.get('avg_fold_seconds'),
+                'time_budget': results.get('time_budget'),
                 'next_params': {
                     'tp_atr_multiplier': next_params.tp_atr_multiplier,
                     'sl_atr_multiplier': next_params.sl_atr_multiplier,
@@ -339,6 +371,25 @@ class AutoTrainer:
                 'error': str(e)
             }
 
+    def _warm_start_update(self, symbol: str, timeframe: str) -> Optional[Dict]:
+        """Warm-start the deployed model on new data; None if a full retrain is needed."""
+        deployment = self.registry.get_deployed_model(symbol, timeframe, "production")
+        if not deployment:
+            logger.info(
+                f"No deployed model for {symbol} {timeframe} to warm-start, running full training"
+            )
+            return None
+
+        try:
+            return update_model_pipeline(
+                db=self.db, symbol=symbol, timeframe=timeframe, deployment=deployment
+            )
+        except ValueError as e:
+            logger.info(
+                f"Warm-start update not possible for {symbol} {timeframe} ({e}), running full training"
+            )
+            return None
+
     def should_retrain(self, symbol: str, timeframe: str) -> bool:
         """
         Determine if model should be retrained.
@@ -1,15 +1,32 @@
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+import pandas as pd
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from apps.api.config import settings
 from apps.api.db.models import OHLCV, BackfillJob, TimeFrame, MarketMetrics
-from apps.ml.ccxt_client import CCXTClient
+from apps.ml.archive import invalidate_archive, invalidate_metrics_archive
+from apps.ml.ccxt_client import CCXTClient, run_concurrently
+from apps.ml.gap_scanner import Gap, find_gaps, group_gaps
+from apps.ml.resampling import DERIVED_TIMEFRAMES, SOURCE_TIMEFRAME, source_covers, update_derived_bars
+from apps.ml.market_data import OHLCV_COLUMNS, PRICE_COLUMNS, bulk_upsert
 import time
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Exchange-sourced MarketMetrics fields written by the candle updater
+MARKET_METRIC_COLUMNS = ["open_interest", "spread_bps", "funding_rate"]
+# Smallest date range (in bars) worth its own concurrent backfill segment
+MIN_SEGMENT_BARS = 2000
+# Fetched chunks buffered per segment before fetchers wait for the writer
+SEGMENT_QUEUE_CHUNKS = 2
+# Candles per exchange request; nearby gaps within one request are repaired together
+FETCH_CHUNK_BARS = 1000
+
 
 class BackfillService:
     """
@@ -25,9 +42,27 @@ class BackfillService:
         symbol: str,
         timeframe: TimeFrame,
         start_date: datetime,
-        end_date: datetime
+        end_date: datetime,
+        segments: Optional[int] = None,
+        commit: bool = True,
     ) -> BackfillJob:
-        """Create a new backfill job"""
+        """
+        Create a new backfill job.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            start_date: First candle to fetch
+            end_date: Last candle to fetch
+            segments: Disjoint date-range segments fetched concurrently
+                      (default: settings.BACKFILL_SEGMENTS; 1 = serial)
+            commit: Commit the job; with False it is only flushed into the
+                    caller's transaction
+
+        Derived timeframes (1h/4h/1d) whose range is covered by stored 15m
+        candles become 'resample' jobs that aggregate locally instead of
+        downloading.
+        """
         job_id = f"backfill_{symbol.replace('/', '_')}_{timeframe.value}_{uuid.uuid4().hex[:8]}"
 
         # Estimate total candles
@@ -35,23 +70,135 @@ class BackfillService:
         tf_delta = self.client._timeframe_to_timedelta(timeframe.value)
         total_candles = int(delta / tf_delta)
 
+        job_type = "backfill"
+        segment_plan = []
+        if (
+            settings.RESAMPLING_ENABLED
+            and timeframe in DERIVED_TIMEFRAMES
+            and source_covers(self.db, symbol, start_date, end_date, tolerance=tf_delta)
+        ):
+            job_type = "resample"
+        else:
+            segment_plan = self._plan_segments(
+                start_date,
+                end_date,
+                tf_delta,
+                settings.BACKFILL_SEGMENTS if segments is None else segments,
+            )
+
         job = BackfillJob(
             job_id=job_id,
             symbol=symbol,
             timeframe=timeframe,
+            job_type=job_type,
             start_date=start_date,
             end_date=end_date,
             total_candles_estimate=total_candles,
+            segments=segment_plan if len(segment_plan) > 1 else None,
             status="pending"
         )
 
         self.db.add(job)
-        self.db.commit()
-        self.db.refresh(job)
+        self._save_new_job(job, commit)
 
-        logger.info(f"Created backfill job {job_id} for {symbol} {timeframe.value} ({total_candles} candles)")
+        logger.info(
+            f"Created {job_type} job {job_id} for {symbol} {timeframe.value} ({total_candles} candles)"
+        )
         return job
 
+    def create_repair_job(
+        self, symbol: str, timeframe: TimeFrame, gaps: List[Gap], commit: bool = True
+    ) -> BackfillJob:
+        """
+        Create a job that refetches only the bars missing inside ``gaps``.
+
+        Gaps close enough to fit in one exchange request are merged into a
+        single segment, so a burst of small holes costs one call; bars that
+        are already stored inside a merged segment are simply overwritten.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            gaps: Gaps of this pair, as returned by the gap scanner
+            commit: Commit the job; with False it is only flushed into the
+                    caller's transaction
+        """
+        tf_delta = self.client._timeframe_to_timedelta(timeframe.value)
+        if settings.RESAMPLING_ENABLED and timeframe in DERIVED_TIMEFRAMES:
+            first = min(gap.start for gap in gaps)
+            last = max(gap.end for gap in gaps)
+            if source_covers(self.db, symbol, first, last, tolerance=tf_delta):
+                # Holes in a derived series are rebuilt from the 15m candles
+                return self.create_backfill_job(symbol, timeframe, first, last, commit=commit)
+
+        job_id = f"repair_{symbol.replace('/', '_')}_{timeframe.value}_{uuid.uuid4().hex[:8]}"
+        segment_plan = self._plan_repair_segments(gaps, tf_delta)
+        total_candles = sum(
+            int(
+                (datetime.fromisoformat(segment["end"]) - datetime.fromisoformat(segment["start"]))
+                / tf_delta
+            )
+            for segment in segment_plan
+        )
+
+        job = BackfillJob(
+            job_id=job_id,
+            symbol=symbol,
+            timeframe=timeframe,
+            job_type="repair",
+            start_date=datetime.fromisoformat(segment_plan[0]["start"]),
+            end_date=datetime.fromisoformat(segment_plan[-1]["end"]),
+            total_candles_estimate=total_candles,
+            segments=segment_plan,
+            status="pending",
+        )
+
+        self.db.add(job)
+        self._save_new_job(job, commit)
+
+        logger.info(
+            f"Created repair job {job_id} for {symbol} {timeframe.value}: "
+            f"{len(gaps)} gaps in {len(segment_plan)} requests ({total_candles} candles)"
+        )
+        return job
+
+    def create_repair_jobs(self, gaps: List[Gap], commit: bool = True) -> List[BackfillJob]:
+        """Create one repair job per (symbol, timeframe) with gaps."""
+        return [
+            self.create_repair_job(symbol, timeframe, pair_gaps, commit=commit)
+            for (symbol, timeframe), pair_gaps in group_gaps(gaps).items()
+        ]
+
+    def _save_new_job(self, job: BackfillJob, commit: bool) -> None:
+        if commit:
+            self.db.commit()
+            self.db.refresh(job)
+        else:
+            self.db.flush()
+
+    @staticmethod
+    def _plan_repair_segments(gaps: List[Gap], tf_delta: timedelta) -> List[Dict[str, Any]]:
+        """Turn ordered gaps into [first missing bar, next stored bar) segments."""
+        ranges: List[List[datetime]] = []
+        for gap in sorted(gaps, key=lambda item: item.start):
+            start = gap.start + tf_delta
+            if ranges and (gap.end - ranges[-1][0]) / tf_delta <= FETCH_CHUNK_BARS:
+                ranges[-1][1] = gap.end
+            else:
+                ranges.append([start, gap.end])
+
+        return [
+            {
+                "index": index,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "cursor": None,
+                "candles_fetched": 0,
+                "status": "pending",
+            }
+            for index, (start, end) in enumerate(ranges)
+        ]
+
     def resume_backfill_job(self, job_id: str) -> Optional[BackfillJob]:
         """Resume a backfill job from checkpoint"""
         job = self.db.query(BackfillJob).filter(BackfillJob.job_id == job_id).first()
@@ -71,6 +218,11 @@ class BackfillService:
         """
         Execute backfill with checkpointing and progress tracking.
         """
+        if job.job_type == "resample":
+            return self._execute_resample(job)
+        if job.segments:
+            return self._execute_partitioned(job)
+
         job.status = "running"
         job.started_at = datetime.utcnow()
         self.db.commit()
@@ -81,7 +233,7 @@ class BackfillService:
         else:
             current_start = job.start_date
 
-        chunk_size = 1000  # Candles per request
+        chunk_size = FETCH_CHUNK_BARS
         start_time = time.time()
 
         try:
@@ -134,73 +286,334 @@ class BackfillService:
 
                 current_start = chunk_end
 
-            # Detect and log gaps
-            gaps = self._detect_gaps(job)
-            if gaps:
-                job.detected_gaps = [
-                    {"start": gap[0].isoformat(), "end": gap[1].isoformat()}
-                    for gap in gaps
-                ]
-                logger.warning(f"Detected {len(gaps)} gaps in {job.job_id}")
-
-            job.status = "completed"
-            job.completed_at = datetime.utcnow()
-            job.progress_pct = 100.0
+            return self._complete_job(job)
+
+        except Exception as e:
+            job.status = "failed"
+            job.error_message = str(e)
             self.db.commit()
+            logger.error(f"Backfill job {job.job_id} failed: {e}")
+            raise
 
-            logger.info(f"Backfill job {job.job_id} completed successfully")
-            return job
+    def _execute_resample(self, job: BackfillJob) -> BackfillJob:
+        """Build a derived timeframe's range from stored 15m candles."""
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        self.db.commit()
 
+        try:
+            written = update_derived_bars(
+                self.db,
+                symbols=[job.symbol],
+                timeframes=[job.timeframe],
+                since=job.start_date,
+                until=job.end_date,
+                include_partial=False,
+            )
+            job.candles_fetched = written[job.timeframe.value]
+            job.last_completed_ts = job.end_date
+            return self._complete_job(job)
         except Exception as e:
+            self.db.rollback()
             job.status = "failed"
             job.error_message = str(e)
             self.db.commit()
-            logger.error(f"Backfill job {job.job_id} failed: {e}")
+            logger.error(f"Resample job {job.job_id} failed: {e}")
             raise
 
-    def _upsert_ohlcv(self, symbol: str, timeframe: TimeFrame, df):
-        """Upsert OHLCV data (insert or update on conflict) using bulk operations"""
-        from sqlalchemy.dialects.postgresql import insert
-
-        # Prepare data for bulk insert
-        records = []
-        for _, row in df.iterrows():
-            records.append({
-                'symbol': symbol,
-                'timeframe': timeframe,
-                'timestamp': row['timestamp'],
-                'open': float(row['open']),
-                'high': float(row['high']),
-                'low': float(row['low']),
-                'close': float(row['close']),
-                'volume': float(row['volume']),
-                'created_at': datetime.utcnow()
-            })
-
-        if not records:
+    def _complete_job(self, job: BackfillJob) -> BackfillJob:
+        """Record detected gaps and mark the job completed."""
+        # Detect and log gaps
+        gaps = self._detect_gaps(job)
+        if gaps:
+            job.detected_gaps = [
+                {"start": gap[0].isoformat(), "end": gap[1].isoformat()} for gap in gaps
+            ]
+            logger.warning(f"Detected {len(gaps)} gaps in {job.job_id}")
+
+        job.status = "completed"
+        job.completed_at = datetime.utcnow()
+        job.progress_pct = 100.0
+        self.db.commit()
+
+        if settings.RESAMPLING_ENABLED and job.timeframe == SOURCE_TIMEFRAME:
+            try:
+                update_derived_bars(
+                    self.db,
+                    symbols=[job.symbol],
+                    since=job.start_date,
+                    until=job.end_date,
+                    include_partial=False,
+                )
+            except Exception as exc:
+                self.db.rollback()
+                logger.warning(f"Could not rebuild derived timeframes after {job.job_id}: {exc}")
+
+        try:
+            # Rewritten months are read from the database until the next archive build
+            invalidate_archive(job.symbol, job.timeframe, job.start_date, job.end_date)
+        except OSError as exc:
+            logger.warning(f"Could not invalidate archived months after {job.job_id}: {exc}")
+
+        logger.info(f"Backfill job {job.job_id} completed successfully")
+        return job
+
+    @staticmethod
+    def _plan_segments(
+        start_date: datetime, end_date: datetime, tf_delta: timedelta, segments: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Split [start_date, end_date) into disjoint, bar-aligned segments.
+
+        Segments shorter than MIN_SEGMENT_BARS are not worth a separate
+        fetcher, so short ranges get fewer segments.
+        """
+        total_bars = max(1, int((end_date - start_date) / tf_delta))
+        count = max(1, min(int(segments or 1), total_bars // MIN_SEGMENT_BARS))
+        bars_per_segment = -(-total_bars // count)
+
+        plan = []
+        for index in range(count):
+            segment_start = start_date + tf_delta * (bars_per_segment * index)
+            if segment_start >= end_date:
+                break
+            segment_end = min(start_date + tf_delta * (bars_per_segment * (index + 1)), end_date)
+            plan.append(
+                {
+                    "index": index,
+                    "start": segment_start.isoformat(),
+                    "end": segment_end.isoformat(),
+                    "cursor": None,
+                    "candles_fetched": 0,
+                    "status": "pending",
+                }
+            )
+        # The last segment owns the job's inclusive end bound
+        if plan:
+            plan[-1]["end"] = end_date.isoformat()
+        return plan
+
+    def _execute_partitioned(self, job: BackfillJob) -> BackfillJob:
+        """
+        Fetch a job's segments concurrently, writing from this thread only.
+
+        One fetcher thread per unfinished segment pages through its range
+        (all of them share the client's rate limiter) and hands chunks to a
+        bounded queue; this thread upserts each chunk and checkpoints the
+        segment's cursor, so a crash loses at most the chunks in flight and a
+        resume restarts only the segments that had not completed.
+        """
+        segments = [dict(segment) for segment in job.segments]
+        pending = [segment for segment in segments if segment["status"] != "completed"]
+
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        job.error_message = None
+        for segment in pending:
+            segment["status"] = "running"
+            segment.pop("error", None)
+        self._checkpoint_segments(job, segments, 0, time.time())
+
+        logger.info(
+            f"Job {job.job_id}: fetching {len(pending)}/{len(segments)} segments concurrently"
+        )
+
+        chunk_queue: "queue.Queue" = queue.Queue(
+            maxsize=SEGMENT_QUEUE_CHUNKS * max(1, len(pending))
+        )
+        stop = threading.Event()
+        # Repair segments end at a stored bar, so none of them may include its end
+        last_index = segments[-1]["index"] if job.job_type != "repair" else None
+        start_time = time.time()
+        fetched_this_run = 0
+        active = len(pending)
+        failure: Optional[BaseException] = None
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, len(pending)), thread_name_prefix="backfill-segment"
+        ) as executor:
+            for segment in pending:
+                executor.submit(
+                    self._fetch_segment,
+                    job.symbol,
+                    job.timeframe.value,
+                    segment,
+                    segment["index"] == last_index,
+                    chunk_queue,
+                    stop,
+                )
+
+            while active:
+                index, payload, chunk_end = chunk_queue.get()
+                segment = next(item for item in segments if item["index"] == index)
+
+                if payload is None or isinstance(payload, Exception):
+                    active -= 1
+                    if payload is None:
+                        segment["status"] = "completed" if not stop.is_set() else "running"
+                    else:
+                        segment["status"] = "failed"
+                        segment["error"] = str(payload)
+                        logger.error(f"Job {job.job_id}: segment {index} failed: {payload}")
+                elif failure is None:
+                    try:
+                        if not payload.empty:
+                            self._upsert_ohlcv(job.symbol, job.timeframe, payload)
+                            segment["candles_fetched"] += len(payload)
+                            fetched_this_run += len(payload)
+                        segment["cursor"] = chunk_end.isoformat()
+                    except Exception as exc:
+                        # Stop the fetchers and keep draining so none blocks on a full queue
+                        failure = exc
+                        stop.set()
+                        continue
+                else:
+                    continue
+
+                try:
+                    self._checkpoint_segments(job, segments, fetched_this_run, start_time)
+                except Exception as exc:
+                    failure = failure or exc
+                    stop.set()
+
+        failed = [segment for segment in segments if segment["status"] == "failed"]
+        if failure is None and not failed:
+            logger.info(
+                f"Job {job.job_id}: all {len(segments)} segments completed, "
+                f"{job.candles_fetched} candles, rate={job.candles_per_minute or 0:.0f} candles/min"
+            )
+            return self._complete_job(job)
+
+        self.db.rollback()
+        job.status = "failed"
+        job.error_message = (
+            str(failure)
+            if failure is not None
+            else ("Segments failed: " + ", ".join(str(segment["index"]) for segment in failed))
+        )
+        self._checkpoint_segments(job, segments, fetched_this_run, start_time)
+        logger.error(f"Backfill job {job.job_id} failed: {job.error_message}")
+        raise failure if failure is not None else RuntimeError(job.error_message)
+
+    def _fetch_segment(
+        self,
+        symbol: str,
+        timeframe: str,
+        segment: Dict[str, Any],
+        is_last: bool,
+        chunk_queue: "queue.Queue",
+        stop: threading.Event,
+    ) -> None:
+        """Fetcher thread: page through one segment and queue (index, df, chunk_end)."""
+        index = segment["index"]
+        segment_end = datetime.fromisoformat(segment["end"])
+        current_start = datetime.fromisoformat(segment["cursor"] or segment["start"])
+        chunk_size = FETCH_CHUNK_BARS
+        bar_delta = timedelta(hours=self._tf_to_hours(timeframe))
+
+        try:
+            while current_start < segment_end and not stop.is_set():
+                chunk_end = min(current_start + bar_delta * chunk_size, segment_end)
+                # Short chunks (small gaps) ask only for the bars they need
+                chunk_bars = -(-(chunk_end - current_start) // bar_delta) + (1 if is_last else 0)
+                df = self.client.fetch_ohlcv_range(
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    start_date=current_start,
+                    end_date=chunk_end,
+                    limit=min(chunk_size, chunk_bars),
+                )
+                if not is_last and not df.empty:
+                    # A full page can run past the segment; the next segment owns those bars
+                    df = df[df["timestamp"] < segment_end]
+                chunk_queue.put((index, df, chunk_end))
+                current_start = chunk_end
+        except Exception as exc:
+            chunk_queue.put((index, exc, None))
             return
 
-        # Use PostgreSQL's INSERT ... ON CONFLICT DO UPDATE
-        stmt = insert(OHLCV).values(records)
-        stmt = stmt.on_conflict_do_update(
-            constraint='uq_ohlcv_symbol_tf_ts',
-            set_={
-                'open': stmt.excluded.open,
-                'high': stmt.excluded.high,
-                'low': stmt.excluded.low,
-                'close': stmt.excluded.close,
-                'volume': stmt.excluded.volume
-            }
+        chunk_queue.put((index, None, None))
+
+    def _checkpoint_segments(
+        self,
+        job: BackfillJob,
+        segments: List[Dict[str, Any]],
+        fetched_this_run: int,
+        start_time: float,
+    ) -> None:
+        """Persist segment cursors and aggregate job-level progress, rate and ETA."""
+        job.segments = [dict(segment) for segment in segments]
+        job.candles_fetched = sum(segment["candles_fetched"] for segment in segments)
+        job.progress_pct = min(
+            100.0,
+            (job.candles_fetched / job.total_candles_estimate * 100)
+            if job.total_candles_estimate
+            else 0.0,
         )
 
+        # Everything up to the first unfinished segment's cursor is on disk
+        watermark = None
+        for segment in segments:
+            if segment["status"] == "completed":
+                watermark = segment["end"]
+                continue
+            watermark = segment["cursor"] or watermark
+            break
+        job.last_completed_ts = datetime.fromisoformat(watermark) if watermark else None
+
+        elapsed = time.time() - start_time
+        if elapsed > 0 and fetched_this_run:
+            job.candles_per_minute = (fetched_this_run / elapsed) * 60
+            remaining_candles = max(0, (job.total_candles_estimate or 0) - job.candles_fetched)
+            job.eta_minutes = remaining_candles / job.candles_per_minute
+
+        self.db.commit()
+
+    def _upsert_ohlcv(self, symbol: str, timeframe: TimeFrame, df):
+        """Upsert OHLCV data (insert or update on conflict) using bulk operations"""
+        self.upsert_ohlcv_many(timeframe, {symbol: df})
+
+    def upsert_ohlcv_many(self, timeframe: TimeFrame, frames: Dict[str, Any]) -> int:
+        """
+        Upsert candles of several symbols with one bulk write.
+
+        Args:
+            timeframe: Timeframe of every frame
+            frames: OHLCV DataFrame per symbol
+
+        Returns:
+            Number of rows written
+        """
+        parts = [
+            df[OHLCV_COLUMNS].assign(symbol=symbol)
+            for symbol, df in frames.items()
+            if df is not None and not df.empty
+        ]
+        if not parts:
+            return 0
+
+        batch = pd.concat(parts, ignore_index=True)
+        batch["timestamp"] = pd.to_datetime(batch["timestamp"])
+        batch[PRICE_COLUMNS] = batch[PRICE_COLUMNS].astype(float)
+        batch["timeframe"] = timeframe
+        batch["created_at"] = datetime.utcnow()
+
         try:
-            self.db.execute(stmt)
+            written = bulk_upsert(
+                self.db,
+                OHLCV.__table__,
+                batch[["symbol", "timeframe"] + OHLCV_COLUMNS + ["created_at"]],
+                conflict_columns=["symbol", "timeframe", "timestamp"],
+                update_columns=PRICE_COLUMNS,
+            )
             self.db.commit()
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error upserting OHLCV data: {e}")
             raise
 
+        return written
+
     def fetch_open_interest(self, symbol: str) -> Optional[float]:
         """Fetch open interest from the exchange client."""
         return self.client.fetch_open_interest(symbol)
@@ -258,53 +671,112 @@ class BackfillService:
 
     def upsert_market_metrics(self, symbol: str, timestamp: datetime, metrics: Dict[str, Any]):
         """Upsert market metrics for a given symbol and timestamp."""
-        if hasattr(timestamp, 'to_pydatetime'):
-            timestamp = timestamp.to_pydatetime()
-
-        record = (
-            self.db.query(MarketMetrics)
-            .filter(
-                MarketMetrics.symbol == symbol,
-                MarketMetrics.timestamp == timestamp
-            )
-            .one_or_none()
-        )
+        self.upsert_market_metrics_many([(symbol, timestamp, metrics)])
+
+    def upsert_market_metrics_many(
+        self, entries: List[Tuple[str, datetime, Dict[str, Any]]]
+    ) -> int:
+        """
+        Upsert market metrics of several symbols with one bulk write.
 
-        if record is None:
-            record = MarketMetrics(symbol=symbol, timestamp=timestamp)
-            self.db.add(record)
+        Args:
+            entries: (symbol, timestamp, metrics) tuples
 
-        record.open_interest = metrics.get('open_interest')
-        record.spread_bps = metrics.get('spread_bps')
-        record.funding_rate = metrics.get('funding_rate')
+        Returns:
+            Number of rows written
+        """
+        if not entries:
+            return 0
+
+        batch = pd.DataFrame(
+            {
+                "symbol": [symbol for symbol, _, _ in entries],
+                "timestamp": pd.to_datetime([timestamp for _, timestamp, _ in entries]),
+                **{
+                    column: pd.Series(
+                        [metrics.get(column) for _, _, metrics in entries], dtype=float
+                    )
+                    for column in MARKET_METRIC_COLUMNS
+                },
+                "created_at": datetime.utcnow(),
+            }
+        )
 
         try:
+            written = bulk_upsert(
+                self.db,
+                MarketMetrics.__table__,
+                batch,
+                conflict_columns=["symbol", "timestamp"],
+                update_columns=MARKET_METRIC_COLUMNS,
+            )
             self.db.commit()
         except Exception as exc:
             self.db.rollback()
-            logger.error("Error upserting market metrics for %s at %s: %s", symbol, timestamp, exc)
+            logger.error("Error upserting market metrics for %d symbols: %s", len(entries), exc)
             raise
 
-    def _detect_gaps(self, job: BackfillJob):
-        """Detect gaps in stored OHLCV data"""
-        ohlcv_data = self.db.query(OHLCV).filter(
-            and_(
-                OHLCV.symbol == job.symbol,
-                OHLCV.timeframe == job.timeframe,
-                OHLCV.timestamp >= job.start_date,
-                OHLCV.timestamp <= job.end_date
-            )
-        ).order_by(OHLCV.timestamp).all()
+        for symbol, timestamps in batch.groupby("symbol")["timestamp"]:
+            try:
+                # Archived months the write reached are read from the database until the next build
+                invalidate_metrics_archive(
+                    symbol, timestamps.min().to_pydatetime(), timestamps.max().to_pydatetime()
+                )
+            except OSError as exc:
+                logger.warning(f"Could not invalidate archived market metrics of {symbol}: {exc}")
+
+        return written
+
+    def fetch_latest_many(
+        self, start_dates: Dict[str, datetime], timeframe: str, end_date: datetime, limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Fetch new candles and market metrics for many symbols concurrently.
+
+        Each symbol's candle pagination and metric calls run as one job on a
+        thread pool; all requests share the client's rate limiter.
+
+        Args:
+            start_dates: First timestamp to fetch per symbol
+            timeframe: Timeframe string, e.g. '15m'
+            end_date: Upper bound for every symbol
+            limit: Candles per request
 
-        if not ohlcv_data:
-            return []
+        Returns:
+            Per symbol either {'candles': DataFrame, 'metrics': dict or None}
+            or the exception raised while fetching it
+        """
+
+        def _job(symbol: str, start_date: datetime):
+            def _run():
+                df = self.client.fetch_ohlcv_range(
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    start_date=start_date,
+                    end_date=end_date,
+                    limit=limit,
+                )
+                # Metrics are stamped with the newest candle, so skip them when nothing is new
+                metrics = self.collect_market_metrics(symbol) if not df.empty else None
+                return {"candles": df, "metrics": metrics}
 
-        import pandas as pd
-        df = pd.DataFrame([{
-            'timestamp': row.timestamp
-        } for row in ohlcv_data])
+            return _run
 
-        return self.client.detect_gaps(df, job.timeframe.value)
+        return run_concurrently(
+            {symbol: _job(symbol, start_date) for symbol, start_date in start_dates.items()}
+        )
+
+    def _detect_gaps(self, job: BackfillJob) -> List[Tuple[datetime, datetime]]:
+        """Detect gaps in the job's stored range without loading the candles"""
+        start = job.start_date
+        if job.job_type == "repair":
+            # Include the stored bar in front of the first repaired hole
+            start -= self.client._timeframe_to_timedelta(job.timeframe.value)
+
+        gaps = find_gaps(
+            self.db, symbol=job.symbol, timeframe=job.timeframe, start=start, end=job.end_date
+        )
+        return [(gap.start, gap.end) for gap in gaps]
 
     @staticmethod
     def _tf_to_hours(timeframe: str) -> float:
@@ -332,6 +804,7 @@ class BackfillService:
             "job_id": job.job_id,
             "symbol": job.symbol,
             "timeframe": job.timeframe.value,
+            "job_type": job.job_type,
             "status": job.status,
             "progress_pct": job.progress_pct,
             "candles_fetched": job.candles_fetched,
@@ -339,6 +812,7 @@ class BackfillService:
             "candles_per_minute": job.candles_per_minute,
             "eta_minutes": job.eta_minutes,
             "detected_gaps": job.detected_gaps,
+            "segments": job.segments,
             "started_at": job.started_at.isoformat() if job.started_at else None,
             "completed_at": job.completed_at.isoformat() if job.completed_at else None,
             "created_at": job.created_at.isoformat() if job.created_at else None,
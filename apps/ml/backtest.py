@@ -4,13 +4,20 @@ from typing import List, Dict, Optional, Iterable
 from datetime import datetime, timedelta
 import logging
 from collections import defaultdict
-from sqlalchemy import and_
 
-from apps.api.db.models import Side, RiskProfile, SignalStatus, OHLCV, TimeFrame
+from apps.api.db.models import Side, RiskProfile, SignalStatus
 from apps.api.config import settings
+from apps.ml.archive import load_ohlcv_history
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 class Backtester:
     """
@@ -488,6 +495,244 @@ class Backtester:
         }
 
 
+# Exit codes produced by the lifecycle kernel
+_EXIT_SL, _EXIT_TP1, _EXIT_TP2, _EXIT_TP3, _EXIT_TIME = 0, 1, 2, 3, 4
+_EXIT_NAMES = {
+    _EXIT_SL: "SL",
+    _EXIT_TP1: "TP1",
+    _EXIT_TP2: "TP2",
+    _EXIT_TP3: "TP3",
+    _EXIT_TIME: "TIME",
+}
+_MAX_POSITION_DURATION_NS = 48 * 3600 * 10**9
+
+
+def _lifecycle_kernel(
+    high,
+    low,
+    close,
+    ts,
+    start,
+    entry_ts,
+    side,
+    sl_price,
+    tp_prices,
+    tp_pcts,
+    quantity,
+    trailing_atr,
+    entry_price,
+    max_duration,
+):
+    """
+    Per-bar position lifecycle used by ``ArrayBacktester``.
+
+    Mirrors ``Backtester._simulate_position_lifecycle`` step for step (SL
+    check, TP1-3 partial exits, trailing stop after TP1, 48h time stop) on
+    plain arrays. ``side`` is 1 for long, -1 for short and 0 for anything
+    else; a NaN ``trailing_atr`` disables the trailing stop.
+
+    Returns:
+        (exit_count, exit_codes, exit_bars, exit_prices, remaining_quantity, closed)
+    """
+    exit_codes = np.full(4, -1, dtype=np.int64)
+    exit_bars = np.full(4, -1, dtype=np.int64)
+    exit_prices = np.zeros(4, dtype=np.float64)
+    exit_count = 0
+
+    remaining = quantity
+    current_sl = sl_price
+    trailing_activated = False
+    tp_done = [False, False, False]
+    closed = False
+
+    for i in range(start, len(close)):
+        if (side == 1 and low[i] <= current_sl) or (side == -1 and high[i] >= current_sl):
+            exit_codes[exit_count] = _EXIT_SL
+            exit_bars[exit_count] = i
+            exit_prices[exit_count] = current_sl
+            exit_count += 1
+            remaining -= quantity * (100.0 / 100)
+            closed = True
+            break
+
+        for k in range(3):
+            if remaining <= 0:
+                break
+            tp_hit = (side == 1 and high[i] >= tp_prices[k]) or (
+                side == -1 and low[i] <= tp_prices[k]
+            )
+            if tp_hit and not tp_done[k]:
+                exit_codes[exit_count] = _EXIT_TP1 + k
+                exit_bars[exit_count] = i
+                exit_prices[exit_count] = tp_prices[k]
+                exit_count += 1
+                remaining -= quantity * (tp_pcts[k] / 100)
+                tp_done[k] = True
+                if k == 0:
+                    trailing_activated = True
+
+        if trailing_activated and trailing_atr == trailing_atr:
+            trailing_distance = trailing_atr * 0.3
+            if side == 1:
+                new_sl = max(current_sl, entry_price + trailing_distance)
+                new_sl = max(new_sl, close[i] - trailing_atr * 1.0)
+                current_sl = max(current_sl, new_sl)
+            else:
+                new_sl = min(current_sl, entry_price - trailing_distance)
+                new_sl = min(new_sl, close[i] + trailing_atr * 1.0)
+                current_sl = min(current_sl, new_sl)
+
+        if ts[i] - entry_ts > max_duration:
+            exit_codes[exit_count] = _EXIT_TIME
+            exit_bars[exit_count] = i
+            exit_prices[exit_count] = close[i]
+            exit_count += 1
+            remaining -= quantity * (100.0 / 100)
+            closed = True
+            break
+
+    return exit_count, exit_codes, exit_bars, exit_prices, remaining, closed
+
+
+if NUMBA_AVAILABLE:
+    _lifecycle_kernel_jit = numba.njit(cache=True)(_lifecycle_kernel)
+
+
+class ArrayBacktester(Backtester):
+    """
+    Backtester variant that simulates on NumPy columns instead of DataFrame rows.
+
+    Market data is converted to arrays once per run, entry bars are located with
+    ``searchsorted`` and the per-bar loop runs in ``_lifecycle_kernel`` (compiled
+    with numba when installed). Exits are booked through the same
+    ``_execute_exit``/``_finalize_trade`` path, so results match ``Backtester``.
+    """
+
+    def run(self, signals: List[Dict], market_data: pd.DataFrame) -> Dict:
+        market_data = market_data.sort_values("timestamp").reset_index(drop=True)
+        self._prepare_arrays(market_data)
+        return super().run(signals, market_data)
+
+    def _prepare_arrays(self, market_data: pd.DataFrame):
+        self._timestamps = pd.DatetimeIndex(market_data["timestamp"])
+        self._ts_ns = self._timestamps.asi8
+        high = market_data["high"].to_numpy(dtype=np.float64)
+        low = market_data["low"].to_numpy(dtype=np.float64)
+        close = market_data["close"].to_numpy(dtype=np.float64)
+
+        if NUMBA_AVAILABLE:
+            self._kernel = _lifecycle_kernel_jit
+            self._columns = (high, low, close, self._ts_ns)
+        else:
+            # Element access on lists is much cheaper than on ndarrays in pure Python
+            self._kernel = _lifecycle_kernel
+            self._columns = (high.tolist(), low.tolist(), close.tolist(), self._ts_ns.tolist())
+
+    def _simulate_entry(self, signal: Dict, market_data: pd.DataFrame) -> Optional[Dict]:
+        """Simulate entry execution"""
+        signal_ts = pd.Timestamp(signal["timestamp"]).value
+        entry_idx = int(np.searchsorted(self._ts_ns, signal_ts, side="left"))
+
+        if entry_idx >= len(self._ts_ns):
+            return None
+
+        entry_price = signal["entry_price"]
+
+        # Apply slippage (assume taker order for safety)
+        slippage_factor = 1 + (self.slippage_bps / 10000) * (
+            1 if signal["side"] == Side.LONG else -1
+        )
+        filled_price = entry_price * slippage_factor
+
+        entry_fee = signal["position_size_usd"] * (self.maker_fee_bps / 10000)
+        margin_required = signal["position_size_usd"] / signal["leverage"]
+
+        if margin_required > self.capital:
+            logger.debug(f"Insufficient capital: {self.capital} < {margin_required}")
+            return None
+
+        self.capital -= margin_required
+
+        return {
+            "timestamp": self._timestamps[entry_idx],
+            "price": filled_price,
+            "fee": entry_fee,
+            "margin": margin_required,
+            "bar_index": entry_idx,
+        }
+
+    def _simulate_position_lifecycle(self, position: Dict, market_data: pd.DataFrame):
+        """Simulate position from entry to exit(s)"""
+        signal = position["signal"]
+        entry = position["entry"]
+        entry_ts = entry["timestamp"]
+        entry_idx = entry.pop("bar_index")
+        start = entry_idx + 1
+
+        if signal["side"] == Side.LONG:
+            side = 1
+        elif signal["side"] == Side.SHORT:
+            side = -1
+        else:
+            side = 0
+
+        trailing_atr = float(signal["atr"]) if "atr" in signal else np.nan
+        high, low, close, ts = self._columns
+
+        exit_count, exit_codes, exit_bars, exit_prices, _, closed = self._kernel(
+            high,
+            low,
+            close,
+            ts,
+            start,
+            int(self._ts_ns[entry_idx]),
+            side,
+            float(signal["sl_price"]),
+            np.array(
+                [signal["tp1_price"], signal["tp2_price"], signal["tp3_price"]], dtype=np.float64
+            ),
+            np.array([signal["tp1_pct"], signal["tp2_pct"], signal["tp3_pct"]], dtype=np.float64),
+            float(signal["quantity"]),
+            trailing_atr,
+            float(signal["entry_price"]),
+            _MAX_POSITION_DURATION_NS,
+        )
+
+        pct_by_code = {
+            _EXIT_TP1: signal["tp1_pct"],
+            _EXIT_TP2: signal["tp2_pct"],
+            _EXIT_TP3: signal["tp3_pct"],
+        }
+        for n in range(exit_count):
+            code = int(exit_codes[n])
+            timestamp = self._timestamps[int(exit_bars[n])]
+            price = float(exit_prices[n])
+            if code in pct_by_code:
+                self._execute_exit(
+                    position, price, timestamp, _EXIT_NAMES[code], pct=pct_by_code[code]
+                )
+            else:
+                self._execute_exit(position, price, timestamp, _EXIT_NAMES[code], remaining=True)
+
+        if closed:
+            position["status"] = (
+                "closed_sl" if int(exit_codes[exit_count - 1]) == _EXIT_SL else "closed_time"
+            )
+
+        # If still open, close at last price
+        if position["status"] == "open" and position["remaining_quantity"] > 0:
+            if start < len(self._ts_ns):
+                last_price = float(close[-1])
+                last_ts = self._timestamps[-1]
+            else:
+                last_price = signal["entry_price"]
+                last_ts = entry_ts
+            self._execute_exit(position, last_price, last_ts, "END", remaining=True)
+            position["status"] = "closed_end"
+
+        self._finalize_trade(position)
+
+
 def _coerce_timestamp(value) -> datetime:
     if isinstance(value, datetime):
         return value
@@ -510,44 +755,24 @@ def _load_market_data(
     """Fetch OHLCV data for the requested window."""
 
     buffer = timedelta(days=2)
-    query = (
-        db.query(OHLCV)
-        .filter(
-            and_(
-                OHLCV.symbol == symbol,
-                OHLCV.timeframe == TimeFrame(timeframe),
-                OHLCV.timestamp >= start - buffer,
-                OHLCV.timestamp <= end + buffer,
-            )
-        )
-        .order_by(OHLCV.timestamp.asc())
-    )
-
-    rows = query.all()
-    if not rows:
+    df = load_ohlcv_history(db, symbol, timeframe, start=start - buffer, end=end + buffer)
+    if df.empty:
         logger.warning("No OHLCV rows available for %s %s between %s and %s", symbol, timeframe, start, end)
         return pd.DataFrame()
 
-    return pd.DataFrame(
-        [
-            {
-                'timestamp': row.timestamp,
-                'open': row.open,
-                'high': row.high,
-                'low': row.low,
-                'close': row.close,
-                'volume': row.volume,
-            }
-            for row in rows
-        ]
-    )
+    return df
 
 
-def backtest_signals(db, signals: Iterable[Dict], default_timeframe: str = '15m') -> Dict:
+def backtest_signals(
+    db, signals: Iterable[Dict], default_timeframe: str = "15m", use_array_engine: bool = False
+) -> Dict:
     """
     Lightweight convenience wrapper used by the Celery worker to backtest freshly
     generated historical signals. Returns aggregated metrics so the API can report
     progress even if the comprehensive research backtester is not configured.
+
+    Set ``use_array_engine`` to simulate with ``ArrayBacktester``, which gives the
+    same metrics without per-signal DataFrame copies.
     """
 
     signals = list(signals or [])
@@ -594,7 +819,7 @@ def backtest_signals(db, signals: Iterable[Dict], default_timeframe: str = '15m'
         if market_df.empty:
             continue
 
-        tester = Backtester()
+        tester = ArrayBacktester() if use_array_engine else Backtester()
         metrics = tester.run(group_signals, market_df)
         metrics['symbol'] = symbol
         metrics['timeframe'] = timeframe
@@ -631,4 +856,4 @@ def backtest_signals(db, signals: Iterable[Dict], default_timeframe: str = '15m'
     }
 
 
-__all__ = ['Backtester', 'backtest_signals']
+__all__ = ["Backtester", "ArrayBacktester", "backtest_signals"]
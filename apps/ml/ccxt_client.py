@@ -1,28 +1,96 @@
 import ccxt
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
 import asyncio
 import logging
+import threading
+import time
 from apps.api.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class RateLimiter:
+    """
+    Thread-safe limiter spacing request starts at least ``interval`` seconds apart.
+
+    One instance is shared by every thread using a client, so concurrent
+    fetches overlap their network latency without exceeding the exchange's
+    request rate.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = max(0.0, float(interval))
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        """Block until the caller may issue its request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def run_concurrently(
+    tasks: Dict[Hashable, Callable[[], Any]], max_workers: Optional[int] = None
+) -> Dict[Hashable, Union[Any, Exception]]:
+    """
+    Run independent exchange jobs on a thread pool.
+
+    Jobs going through the same CCXTClient share its rate limiter, so the
+    pool only overlaps network latency and never raises the request rate.
+
+    Args:
+        tasks: Zero-argument callables keyed by an identifier (e.g. symbol)
+        max_workers: Thread cap (default: settings.EXCHANGE_MAX_CONCURRENCY)
+
+    Returns:
+        Result per key, or the exception the job raised
+    """
+    results: Dict[Hashable, Union[Any, Exception]] = {}
+    if not tasks:
+        return results
+
+    workers = max(1, min(len(tasks), max_workers or settings.EXCHANGE_MAX_CONCURRENCY))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="exchange-fetch") as executor:
+        futures = {key: executor.submit(task) for key, task in tasks.items()}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as exc:
+                results[key] = exc
+
+    return results
+
+
 class CCXTClient:
     """
     CCXT client for fetching OHLCV data with resumable backfill support.
     """
 
-    def __init__(self, exchange_id: str = None):
+    def __init__(self, exchange_id: str = None, exchange=None):
+        """
+        Args:
+            exchange_id: CCXT exchange id (default: settings.EXCHANGE_ID)
+            exchange: Pre-built exchange object; skips CCXT initialization
+        """
         self.exchange_id = exchange_id or settings.EXCHANGE_ID
-        self.exchange = self._initialize_exchange()
+        self.exchange = exchange if exchange is not None else self._initialize_exchange()
+        # Requests are paced here instead of by CCXT, whose throttle is not thread-safe
+        rate_limit_ms = getattr(self.exchange, "rateLimit", None) or 0
+        self.rate_limiter = RateLimiter(rate_limit_ms / 1000.0)
 
     def _initialize_exchange(self):
         """Initialize CCXT exchange instance"""
         exchange_class = getattr(ccxt, self.exchange_id)
 
-        config = {'enableRateLimit': True}
+        config = {'enableRateLimit': False}
 
         if self.exchange_id == 'bitget':
             config['options'] = {
@@ -45,6 +113,11 @@ class CCXTClient:
         logger.info(f"Initialized {self.exchange_id} exchange (sandbox={settings.EXCHANGE_SANDBOX})")
         return exchange
 
+    def _request(self, method: str, *args, **kwargs):
+        """Call an exchange endpoint under the shared rate limiter."""
+        self.rate_limiter.acquire()
+        return getattr(self.exchange, method)(*args, **kwargs)
+
     def _normalize_symbol(self, symbol: str) -> str:
         """Translate canonical symbol notation to exchange-specific format."""
         if self.exchange_id == 'bitget':
@@ -76,7 +149,7 @@ class CCXTClient:
         original_symbol = symbol
         symbol = self._normalize_symbol(symbol)
         try:
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+            ohlcv = self._request("fetch_ohlcv", symbol, timeframe, since=since, limit=limit)
             return ohlcv
         except ccxt.NetworkError as e:
             logger.error(f"Network error fetching {original_symbol} ({symbol}) {timeframe}: {e}")
@@ -126,7 +199,7 @@ class CCXTClient:
                 last_ts = candles[-1][0]
                 current_ts = last_ts + self._timeframe_to_ms(timeframe)
 
-                # Rate limiting handled by ccxt enableRateLimit
+                # Pacing comes from self.rate_limiter (CCXT's enableRateLimit is off)
                 logger.debug(f"Fetched {len(candles)} candles for {symbol} {timeframe}, last_ts={datetime.fromtimestamp(last_ts/1000)}")
 
             except Exception as e:
@@ -145,7 +218,7 @@ class CCXTClient:
     def fetch_funding_rate(self, symbol: str) -> Optional[float]:
         """Fetch current funding rate for a futures symbol"""
         try:
-            funding = self.exchange.fetch_funding_rate(self._normalize_symbol(symbol))
+            funding = self._request('fetch_funding_rate', self._normalize_symbol(symbol))
             return funding.get('fundingRate', 0.0)
         except Exception as e:
             logger.warning(f"Could not fetch funding rate for {symbol}: {e}")
@@ -154,7 +227,7 @@ class CCXTClient:
     def fetch_open_interest(self, symbol: str) -> Optional[float]:
         """Fetch current open interest for a futures symbol"""
         try:
-            oi = self.exchange.fetch_open_interest(self._normalize_symbol(symbol))
+            oi = self._request('fetch_open_interest', self._normalize_symbol(symbol))
             return oi.get('openInterest', 0.0)
         except Exception as e:
             logger.warning(f"Could not fetch open interest for {symbol}: {e}")
@@ -163,7 +236,9 @@ class CCXTClient:
     def fetch_order_book(self, symbol: str, limit: int = 20) -> Optional[dict]:
         """Fetch order book (depth)"""
         try:
-            orderbook = self.exchange.fetch_order_book(self._normalize_symbol(symbol), limit=limit)
+            orderbook = self._request(
+                "fetch_order_book", self._normalize_symbol(symbol), limit=limit
+            )
             return orderbook
         except Exception as e:
             logger.warning(f"Could not fetch order book for {symbol}: {e}")
@@ -184,18 +259,12 @@ class CCXTClient:
             return []
 
         expected_delta = self._timeframe_to_timedelta(timeframe)
-        gaps = []
-
-        for i in range(len(df) - 1):
-            current_ts = df.iloc[i]['timestamp']
-            next_ts = df.iloc[i + 1]['timestamp']
-
-            actual_delta = next_ts - current_ts
-
-            if actual_delta > expected_delta * 1.5:  # Allow 50% tolerance
-                gaps.append((current_ts, next_ts))
+        timestamps = pd.to_datetime(df["timestamp"]).reset_index(drop=True)
+        steps = timestamps.diff()
 
-        return gaps
+        # Allow 50% tolerance
+        gap_ends = np.flatnonzero((steps > expected_delta * 1.5).to_numpy())
+        return [(timestamps.iloc[i - 1], timestamps.iloc[i]) for i in gap_ends]
 
     @staticmethod
     def _timeframe_to_ms(timeframe: str) -> int:
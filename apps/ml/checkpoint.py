@@ -0,0 +1,315 @@
+"""
+Crash-safe checkpoints of a walk-forward training run.
+
+Each completed fold is written to disk as soon as it finishes: its split
+result, the best-so-far model (and, in warm-start mode, the latest fold's
+model, which the next fold continues) and a fingerprint of the prepared data
+and training configuration. A run that restarts with the same checkpoint
+directory and an identical fingerprint skips the folds already on disk; any
+other fingerprint discards the checkpoint and starts over.
+
+Every file is written under a temporary name and moved into place with
+``os.replace``; models go to a fresh directory that the manifest only points
+to once it is complete, so a crash at any point leaves the previous state
+readable.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from apps.ml.models import EnsembleModel
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+CHECKPOINT_VERSION = 1
+
+# Split result fields that hold fold boundaries (pd.Timestamp in memory)
+_TIMESTAMP_FIELDS = ("train_start", "train_end", "test_start", "test_end")
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _write_json(path: Path, payload: Dict) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, indent=2, default=_json_default)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def save_split_result(path, split_result: dict) -> None:
+    """Write a split result as JSON (atomically)."""
+    _write_json(Path(path), split_result)
+
+
+def load_split_result(path) -> Optional[dict]:
+    """Read a split result written by save_split_result (None if missing or unreadable)."""
+    try:
+        with open(path) as f:
+            split_result = json.load(f)
+    except (OSError, ValueError):
+        return None
+    for field in _TIMESTAMP_FIELDS:
+        if split_result.get(field):
+            split_result[field] = pd.Timestamp(split_result[field])
+    return split_result
+
+
+def read_manifest(directory) -> Optional[Dict]:
+    """Manifest of a checkpoint directory (None if there is none or it is unreadable)."""
+    path = Path(directory) / MANIFEST_FILE
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != CHECKPOINT_VERSION:
+        return None
+    return manifest
+
+
+def prepared_data_fingerprint(
+    timestamps, features, labels, feature_cols: List[str], params: Dict
+) -> str:
+    """
+    Fingerprint of prepared training data plus the configuration that trains on it.
+
+    Args:
+        timestamps: Row timestamps
+        features: Feature matrix (ndarray) or frame holding ``feature_cols``
+        labels: Label vector
+        feature_cols: Feature column names, in order
+        params: JSON-serializable training configuration
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(
+        json.dumps(
+            {"feature_cols": list(feature_cols), "params": params},
+            sort_keys=True,
+            default=_json_default,
+        ).encode()
+    )
+    digest.update(np.ascontiguousarray(pd.DatetimeIndex(timestamps).asi8).data)
+    digest.update(np.ascontiguousarray(np.asarray(labels)).data)
+    if isinstance(features, pd.DataFrame):
+        # Column by column: no full-width copy of the frame
+        for col in feature_cols:
+            digest.update(np.ascontiguousarray(features[col].to_numpy(dtype=np.float64)).data)
+    else:
+        digest.update(np.ascontiguousarray(features).data)
+    return digest.hexdigest()
+
+
+class FoldCheckpoint:
+    """
+    Fold results and models of one training run, kept in ``directory``.
+
+    Call ``open`` with the run's fingerprint before training; it returns the
+    split results that can be reused.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.fingerprint: Optional[str] = None
+        self.manifest: Dict = {}
+
+    def open(self, fingerprint: str, run_info: Optional[Dict] = None) -> Dict[int, dict]:
+        """
+        Resume a matching checkpoint or start a new one.
+
+        Args:
+            fingerprint: prepared_data_fingerprint of this run
+            run_info: Extra JSON fields stored in the manifest (e.g. the date range)
+
+        Returns:
+            Completed split results keyed by split index (empty when starting over)
+        """
+        self.fingerprint = fingerprint
+        manifest = read_manifest(self.directory)
+
+        if manifest and manifest.get("fingerprint") == fingerprint:
+            self.manifest = manifest
+            completed = {}
+            for split_index in manifest.get("completed_folds", []):
+                split_result = self._read_fold(split_index)
+                if split_result is None:
+                    break
+                completed[split_index] = split_result
+            if len(completed) < len(manifest.get("completed_folds", [])):
+                self._drop_models_of_lost_folds(completed)
+            if completed:
+                logger.info(
+                    "Resuming from checkpoint %s: %d folds already trained",
+                    self.directory,
+                    len(completed),
+                )
+            self.manifest["completed_folds"] = sorted(completed)
+            return completed
+
+        if manifest:
+            logger.info(
+                "Checkpoint %s was written for different data; starting over", self.directory
+            )
+        self.clear()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest = {
+            "version": CHECKPOINT_VERSION,
+            "fingerprint": fingerprint,
+            "created_at": datetime.utcnow().isoformat(),
+            "completed_folds": [],
+            "best_split_index": None,
+            "best_oos_auc": 0.0,
+            "best_model_dir": None,
+            "last_split_index": None,
+            "last_model_dir": None,
+            **(run_info or {}),
+        }
+        self._write_manifest()
+        return {}
+
+    @property
+    def best_split_index(self) -> Optional[int]:
+        return self.manifest.get("best_split_index")
+
+    @property
+    def best_oos_auc(self) -> float:
+        return float(self.manifest.get("best_oos_auc") or 0.0)
+
+    def load_best_model(self) -> Optional[EnsembleModel]:
+        return self._load_model(self.manifest.get("best_model_dir"))
+
+    def load_last_model(self) -> Optional[EnsembleModel]:
+        return self._load_model(self.manifest.get("last_model_dir"))
+
+    def record_fold(
+        self,
+        split_index: int,
+        split_result: dict,
+        best_model: Optional[EnsembleModel] = None,
+        best_oos_auc: Optional[float] = None,
+        last_model: Optional[EnsembleModel] = None,
+    ) -> None:
+        """
+        Persist a completed fold.
+
+        Args:
+            split_index: 1-based split index
+            split_result: Split result from train_fold_xy
+            best_model: The fold's model when it is the new best
+            best_oos_auc: OOS AUC of ``best_model``
+            last_model: The fold's model, kept for the next warm-started fold
+        """
+        save_split_result(self.directory / f"fold_{split_index:03d}.json", split_result)
+
+        stale = []
+        if best_model is not None:
+            stale.append(self.manifest.get("best_model_dir"))
+            self.manifest["best_model_dir"] = self._save_model(
+                best_model, f"best_{split_index:03d}"
+            )
+            self.manifest["best_split_index"] = split_index
+            self.manifest["best_oos_auc"] = best_oos_auc
+        if last_model is not None:
+            stale.append(self.manifest.get("last_model_dir"))
+            self.manifest["last_model_dir"] = self._save_model(
+                last_model, f"last_{split_index:03d}"
+            )
+            self.manifest["last_split_index"] = split_index
+
+        self.manifest["completed_folds"] = sorted(
+            set(self.manifest["completed_folds"]) | {split_index}
+        )
+        self.manifest["updated_at"] = datetime.utcnow().isoformat()
+        self._write_manifest()
+
+        # Only once the manifest no longer points at them
+        for name in stale:
+            if name and name not in (
+                self.manifest["best_model_dir"],
+                self.manifest["last_model_dir"],
+            ):
+                shutil.rmtree(self.directory / name, ignore_errors=True)
+
+    def clear(self) -> None:
+        """Remove the checkpoint (after the run completed, or before starting over)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.manifest = {}
+
+    def _drop_models_of_lost_folds(self, completed: Dict[int, dict]) -> None:
+        """
+        Forget saved models whose fold was dropped from ``completed``.
+
+        Only the best-so-far model is kept, so when its fold is lost the best
+        model among the remaining folds is gone too: the remaining fold with the
+        highest OOS AUC (earliest on ties) is dropped as well, and retraining it
+        recreates that model.
+        """
+        stale = []
+        if self.manifest.get("best_split_index") not in completed:
+            stale.append(self.manifest.get("best_model_dir"))
+            self.manifest["best_split_index"] = None
+            self.manifest["best_oos_auc"] = 0.0
+            self.manifest["best_model_dir"] = None
+            if completed:
+                best = max(
+                    completed,
+                    key=lambda i: (completed[i].get("oos_metrics", {}).get("roc_auc", 0), -i),
+                )
+                logger.warning("Best checkpointed model was lost; fold %d will be retrained", best)
+                del completed[best]
+        if self.manifest.get("last_split_index") not in completed:
+            # A warm-started fold must not continue from a later fold's model
+            stale.append(self.manifest.get("last_model_dir"))
+            self.manifest["last_split_index"] = None
+            self.manifest["last_model_dir"] = None
+
+        self.manifest["completed_folds"] = sorted(completed)
+        self._write_manifest()
+        for name in stale:
+            if name:
+                shutil.rmtree(self.directory / name, ignore_errors=True)
+
+    def _write_manifest(self) -> None:
+        _write_json(self.directory / MANIFEST_FILE, self.manifest)
+
+    def _read_fold(self, split_index: int) -> Optional[dict]:
+        split_result = load_split_result(self.directory / f"fold_{split_index:03d}.json")
+        if split_result is None:
+            logger.warning("Checkpointed fold %d is unreadable; it will be retrained", split_index)
+        return split_result
+
+    def _save_model(self, model: EnsembleModel, name: str) -> str:
+        tmp_dir = self.directory / f"{name}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        model.save(str(tmp_dir))
+        target = self.directory / name
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(tmp_dir, target)
+        return name
+
+    def _load_model(self, name: Optional[str]) -> Optional[EnsembleModel]:
+        if not name:
+            return None
+        model = EnsembleModel()
+        model.load(str(self.directory / name))
+        return model
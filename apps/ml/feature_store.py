@@ -0,0 +1,575 @@
+"""
+On-disk cache for computed features and triple-barrier labels.
+
+Entries are keyed by (symbol, timeframe, feature code version, labeling
+parameters, side) plus a fingerprint of the OHLCV/market-metrics range they
+were computed from. When the requested history extends a cached range, only
+the tail is recomputed: features over a warm-up window before the cached end,
+labels from the first row whose inputs changed. The recomputed overlap is
+checked against the cached rows before it is trusted; any mismatch falls back
+to a full recompute.
+
+Frames are stored as Parquet when pyarrow is installed, pickle otherwise.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from apps.api.config import settings
+from apps.ml.features import CUMULATIVE_FEATURE_COLUMNS, FEATURE_VERSION
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts
+    fcntl = None
+
+INDEX_VERSION = 1
+
+# Trailing cached rows that are always recomputed: centered windows (swing
+# points) look a few bars ahead, so the last cached rows saw an incomplete future.
+TAIL_OVERLAP_BARS = 64
+# Recomputed rows compared against the cache before the tail is accepted
+VERIFY_BARS = 256
+VERIFY_RTOL = 1e-7
+VERIFY_ATOL = 1e-9
+
+LABELING_PARAM_NAMES = (
+    "tp_pct",
+    "sl_pct",
+    "time_bars",
+    "use_atr",
+    "atr_column",
+    "tp_atr_multiplier",
+    "sl_atr_multiplier",
+)
+
+_EMPTY_STATS = {
+    "hits": 0,
+    "partial_hits": 0,
+    "misses": 0,
+    "bytes_served": 0,
+    "bytes_written": 0,
+    "evictions": 0,
+}
+
+
+def _labeling_params(labeler) -> Optional[Dict]:
+    if labeler is None:
+        return None
+    return {name: getattr(labeler, name, None) for name in LABELING_PARAM_NAMES}
+
+
+def _fingerprint(df: pd.DataFrame, market_metrics: Optional[pd.DataFrame], rows: int) -> str:
+    """Hash of the first ``rows`` candles and the market metrics visible to them."""
+    digest = hashlib.sha1()
+    head = df.iloc[:rows]
+    digest.update(head["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64).tobytes())
+    digest.update(
+        np.ascontiguousarray(
+            head[["open", "high", "low", "close", "volume"]].to_numpy(dtype=np.float64)
+        ).tobytes()
+    )
+
+    if market_metrics is not None and not market_metrics.empty and rows > 0:
+        last_ts = head["timestamp"].iloc[-1]
+        visible = market_metrics[market_metrics["timestamp"] <= last_ts].sort_values("timestamp")
+        digest.update(
+            visible["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64).tobytes()
+        )
+        numeric = visible.drop(columns=["timestamp"]).select_dtypes(include="number")
+        digest.update(",".join(numeric.columns).encode())
+        digest.update(np.ascontiguousarray(numeric.to_numpy(dtype=np.float64)).tobytes())
+
+    return digest.hexdigest()
+
+
+def _frames_match(cached: pd.DataFrame, fresh: pd.DataFrame) -> bool:
+    """True when two row-aligned feature frames agree within the verification tolerance."""
+    if list(cached.columns) != list(fresh.columns) or len(cached) != len(fresh):
+        return False
+
+    for col in cached.columns:
+        left = cached[col]
+        right = fresh[col]
+        if pd.api.types.is_numeric_dtype(left) and pd.api.types.is_numeric_dtype(right):
+            if not np.allclose(
+                left.to_numpy(dtype=np.float64),
+                right.to_numpy(dtype=np.float64),
+                rtol=VERIFY_RTOL,
+                atol=VERIFY_ATOL,
+                equal_nan=True,
+            ):
+                logger.debug("Feature cache overlap mismatch in column %s", col)
+                return False
+        elif not left.reset_index(drop=True).equals(right.reset_index(drop=True)):
+            logger.debug("Feature cache overlap mismatch in column %s", col)
+            return False
+
+    return True
+
+
+class FeatureCache:
+    """
+    Size-bounded, LRU-evicted store of feature/label frames on local disk.
+
+    Safe to share between processes on one host: the index is updated under
+    an exclusive file lock and replaced atomically.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        warmup_bars: Optional[int] = None,
+    ):
+        """
+        Args:
+            cache_dir: Directory holding the cache (default: settings.FEATURE_CACHE_DIR)
+            max_bytes: Disk budget; least recently used entries are evicted beyond it
+            warmup_bars: History recomputed before the cached end when extending an entry
+        """
+        self.cache_dir = Path(cache_dir or settings.FEATURE_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(
+            max_bytes if max_bytes is not None else settings.FEATURE_CACHE_MAX_BYTES
+        )
+        self.warmup_bars = int(
+            warmup_bars if warmup_bars is not None else settings.FEATURE_CACHE_WARMUP_BARS
+        )
+        self.index_file = self.cache_dir / "index.json"
+        self.lock_file = self.cache_dir / ".lock"
+        self.format = "parquet" if PYARROW_AVAILABLE else "pickle"
+
+    # ------------------------------------------------------------------ index
+
+    @contextmanager
+    def _locked(self):
+        with open(self.lock_file, "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read_index(self) -> Dict:
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, "r") as f:
+                    index = json.load(f)
+                if index.get("version") == INDEX_VERSION:
+                    index.setdefault("entries", {})
+                    index["stats"] = {**_EMPTY_STATS, **index.get("stats", {})}
+                    return index
+            except (OSError, ValueError) as exc:
+                logger.warning("Unreadable feature cache index %s: %s", self.index_file, exc)
+        return {"version": INDEX_VERSION, "entries": {}, "stats": dict(_EMPTY_STATS)}
+
+    def _write_index(self, index: Dict) -> None:
+        tmp_path = self.index_file.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2, default=str)
+        os.replace(tmp_path, self.index_file)
+
+    def _update_index(self, mutate: Callable[[Dict], None]) -> Dict:
+        with self._locked():
+            index = self._read_index()
+            mutate(index)
+            self._write_index(index)
+        return index
+
+    # ---------------------------------------------------------------- storage
+
+    def _entry_paths(self, entry_id: str, fmt: str) -> Tuple[Path, Path]:
+        suffix = "parquet" if fmt == "parquet" else "pkl"
+        return (
+            self.cache_dir / f"{entry_id}.features.{suffix}",
+            self.cache_dir / f"{entry_id}.labels.{suffix}",
+        )
+
+    @staticmethod
+    def _write_frame(frame: pd.DataFrame, path: Path, fmt: str) -> int:
+        tmp_path = path.with_name(path.name + ".tmp")
+        if fmt == "parquet":
+            frame.to_parquet(tmp_path, engine="pyarrow", index=False)
+        else:
+            frame.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        return path.stat().st_size
+
+    @staticmethod
+    def _read_frame(path: Path, fmt: str) -> pd.DataFrame:
+        if fmt == "parquet":
+            return pd.read_parquet(path, engine="pyarrow")
+        return pd.read_pickle(path)
+
+    def _load_entry(
+        self, entry_id: str, meta: Dict
+    ) -> Optional[Tuple[pd.DataFrame, Optional[pd.DataFrame]]]:
+        fmt = meta.get("format", "pickle")
+        if fmt == "parquet" and not PYARROW_AVAILABLE:
+            return None
+
+        features_path, labels_path = self._entry_paths(entry_id, fmt)
+        try:
+            features = self._read_frame(features_path, fmt)
+            labels = self._read_frame(labels_path, fmt) if meta.get("has_labels") else None
+        except (OSError, ValueError, EOFError) as exc:
+            logger.warning("Dropping unreadable feature cache entry %s: %s", entry_id, exc)
+            self._update_index(lambda index: self._remove_entry(index, entry_id))
+            return None
+
+        return features, labels
+
+    def _remove_entry(self, index: Dict, entry_id: str) -> None:
+        meta = index["entries"].pop(entry_id, None)
+        if meta is None:
+            return
+        for path in self._entry_paths(entry_id, meta.get("format", "pickle")):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _evict(self, index: Dict, keep: Optional[str] = None) -> None:
+        """Drop least recently used entries until the cache fits its budget."""
+        total = sum(meta.get("bytes", 0) for meta in index["entries"].values())
+        by_age = sorted(index["entries"].items(), key=lambda item: item[1].get("last_access", 0))
+        for entry_id, meta in by_age:
+            if total <= self.max_bytes:
+                break
+            if entry_id == keep:
+                continue
+            total -= meta.get("bytes", 0)
+            self._remove_entry(index, entry_id)
+            index["stats"]["evictions"] += 1
+
+        if total > self.max_bytes and keep in index["entries"]:
+            # A single entry larger than the whole budget is not worth keeping
+            self._remove_entry(index, keep)
+            index["stats"]["evictions"] += 1
+
+    # ------------------------------------------------------------------ public
+
+    def stats(self) -> Dict:
+        """Lifetime hit/miss counters plus current disk usage."""
+        index = self._read_index()
+        stats = dict(index["stats"])
+        lookups = stats["hits"] + stats["partial_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["partial_hits"]) / lookups if lookups else None
+        stats["entries"] = len(index["entries"])
+        stats["bytes_on_disk"] = sum(meta.get("bytes", 0) for meta in index["entries"].values())
+        stats["max_bytes"] = self.max_bytes
+        stats["format"] = self.format
+        return stats
+
+    def clear(self) -> None:
+        """Remove every entry (counters are kept)."""
+
+        def _clear(index: Dict) -> None:
+            for entry_id in list(index["entries"]):
+                self._remove_entry(index, entry_id)
+
+        self._update_index(_clear)
+
+    def get_or_compute(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        feature_eng,
+        market_metrics: Optional[pd.DataFrame] = None,
+        labeler=None,
+        side: str = "long",
+        labeling_progress_callback=None,
+    ) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """
+        Return features (and labels, when a labeler is given) for ``df``, reusing cached work.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe value, e.g. '15m'
+            df: Timestamp-ascending OHLCV frame
+            feature_eng: FeatureEngineering instance
+            market_metrics: Optional market metrics passed to compute_all_features
+            labeler: Optional TripleBarrierLabeling; None caches features only
+            side: Label side
+            labeling_progress_callback: Progress callback forwarded to label_data
+
+        Returns:
+            (features_df, labels_df) with a RangeIndex; labels_df is None without a labeler
+        """
+        df = df.reset_index(drop=True)
+        rows = len(df)
+        if rows == 0:
+            return self._compute_full(
+                df, feature_eng, market_metrics, labeler, side, labeling_progress_callback
+            )
+
+        timeframe = timeframe.value if hasattr(timeframe, "value") else str(timeframe)
+        namespace = hashlib.sha1(
+            json.dumps(
+                {
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "feature_version": FEATURE_VERSION,
+                    "labeling": _labeling_params(labeler),
+                    "side": side if labeler is not None else None,
+                },
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()[:16]
+        start_iso = pd.Timestamp(df["timestamp"].iloc[0]).isoformat()
+
+        base_id, base_meta = self._find_prefix(namespace, start_iso, df, market_metrics)
+        cached = self._load_entry(base_id, base_meta) if base_id else None
+
+        if cached is not None and base_meta["rows"] == rows:
+            features, labels = cached
+            bytes_served = base_meta.get("bytes", 0)
+
+            def _touch(index: Dict) -> None:
+                if base_id in index["entries"]:
+                    index["entries"][base_id]["last_access"] = time.time()
+                index["stats"]["hits"] += 1
+                index["stats"]["bytes_served"] += bytes_served
+
+            self._update_index(_touch)
+            logger.info(
+                "Feature cache hit for %s %s (%d rows, %.1f MB served)",
+                symbol,
+                timeframe,
+                rows,
+                bytes_served / 1e6,
+            )
+            if labeling_progress_callback and labels is not None:
+                labeling_progress_callback(100.0)
+            return features, labels
+
+        outcome = "misses"
+        bytes_served = 0
+        result = None
+        if cached is not None:
+            result = self._extend(
+                cached,
+                base_meta,
+                df,
+                feature_eng,
+                market_metrics,
+                labeler,
+                side,
+                labeling_progress_callback,
+            )
+            if result is not None:
+                outcome = "partial_hits"
+                bytes_served = base_meta.get("bytes", 0)
+                logger.info(
+                    "Feature cache partial hit for %s %s: reused %d rows, computed %d new rows",
+                    symbol,
+                    timeframe,
+                    base_meta["rows"],
+                    rows - base_meta["rows"],
+                )
+            else:
+                logger.info(
+                    "Feature cache overlap check failed for %s %s; recomputing", symbol, timeframe
+                )
+
+        if result is None:
+            if cached is None:
+                logger.info("Feature cache miss for %s %s (%d rows)", symbol, timeframe, rows)
+            result = self._compute_full(
+                df, feature_eng, market_metrics, labeler, side, labeling_progress_callback
+            )
+
+        features, labels = result
+        self._store(
+            namespace,
+            symbol,
+            timeframe,
+            start_iso,
+            df,
+            market_metrics,
+            features,
+            labels,
+            outcome=outcome,
+            bytes_served=bytes_served,
+            superseded=base_id,
+        )
+        return features, labels
+
+    # ---------------------------------------------------------------- helpers
+
+    def _find_prefix(
+        self,
+        namespace: str,
+        start_iso: str,
+        df: pd.DataFrame,
+        market_metrics: Optional[pd.DataFrame],
+    ) -> Tuple[Optional[str], Optional[Dict]]:
+        """Longest cached entry whose source range is a prefix of ``df``."""
+        entries = self._read_index()["entries"]
+        candidates = sorted(
+            (
+                (entry_id, meta)
+                for entry_id, meta in entries.items()
+                if meta.get("namespace") == namespace
+                and meta.get("start") == start_iso
+                and 0 < meta.get("rows", 0) <= len(df)
+            ),
+            key=lambda item: item[1]["rows"],
+            reverse=True,
+        )
+        for entry_id, meta in candidates:
+            if _fingerprint(df, market_metrics, meta["rows"]) == meta.get("fingerprint"):
+                return entry_id, meta
+        return None, None
+
+    @staticmethod
+    def _compute_full(df, feature_eng, market_metrics, labeler, side, labeling_progress_callback):
+        features = feature_eng.compute_all_features(df, market_metrics=market_metrics).reset_index(
+            drop=True
+        )
+        labels = None
+        if labeler is not None:
+            labels = labeler.label_data(
+                features, side=side, progress_callback=labeling_progress_callback
+            )
+        return features, labels
+
+    def _extend(
+        self,
+        cached: Tuple[pd.DataFrame, Optional[pd.DataFrame]],
+        meta: Dict,
+        df: pd.DataFrame,
+        feature_eng,
+        market_metrics: Optional[pd.DataFrame],
+        labeler,
+        side: str,
+        labeling_progress_callback,
+    ) -> Optional[Tuple[pd.DataFrame, Optional[pd.DataFrame]]]:
+        """Recompute only the tail beyond a cached prefix; None if the overlap disagrees."""
+        cached_features, cached_labels = cached
+        cached_rows = meta["rows"]
+        if len(cached_features) != cached_rows:
+            return None
+
+        context_start = max(0, cached_rows - self.warmup_bars)
+        reuse_rows = max(0, cached_rows - TAIL_OVERLAP_BARS)
+        verify_start = max(context_start, reuse_rows - VERIFY_BARS)
+
+        fresh = feature_eng.compute_all_features(
+            df.iloc[context_start:].reset_index(drop=True), market_metrics=market_metrics
+        )
+        if context_start > 0:
+            # Cumulative features depend on every earlier bar; refresh them over the full history
+            cumulative = feature_eng.compute_cumulative_features(df)
+            for col in CUMULATIVE_FEATURE_COLUMNS:
+                if col in fresh.columns:
+                    fresh[col] = cumulative[col].to_numpy()[context_start:]
+
+        if not _frames_match(
+            cached_features.iloc[verify_start:reuse_rows],
+            fresh.iloc[verify_start - context_start : reuse_rows - context_start],
+        ):
+            return None
+
+        features = pd.concat(
+            [cached_features.iloc[:reuse_rows], fresh.iloc[reuse_rows - context_start :]],
+            ignore_index=True,
+        )
+
+        labels = None
+        if labeler is not None:
+            # A cached label is final once its full horizon and its entry row's features were cached
+            label_reuse = min(len(cached_labels) if cached_labels is not None else 0, reuse_rows)
+            tail_labels = labeler.label_data(
+                features.iloc[label_reuse:], side=side, progress_callback=labeling_progress_callback
+            )
+            if cached_labels is not None and label_reuse > 0:
+                labels = pd.concat(
+                    [cached_labels.iloc[:label_reuse], tail_labels], ignore_index=True
+                )
+            else:
+                labels = tail_labels.reset_index(drop=True)
+
+        return features, labels
+
+    def _store(
+        self,
+        namespace: str,
+        symbol: str,
+        timeframe: str,
+        start_iso: str,
+        df: pd.DataFrame,
+        market_metrics: Optional[pd.DataFrame],
+        features: pd.DataFrame,
+        labels: Optional[pd.DataFrame],
+        outcome: str,
+        bytes_served: int,
+        superseded: Optional[str],
+    ) -> None:
+        fingerprint = _fingerprint(df, market_metrics, len(df))
+        entry_id = f"{namespace}_{fingerprint[:16]}"
+        features_path, labels_path = self._entry_paths(entry_id, self.format)
+
+        try:
+            written = self._write_frame(features, features_path, self.format)
+            if labels is not None:
+                written += self._write_frame(labels, labels_path, self.format)
+        except (OSError, ValueError, TypeError, ImportError) as exc:
+            logger.warning(
+                "Could not write feature cache entry for %s %s: %s", symbol, timeframe, exc
+            )
+            written = None
+
+        def _record(index: Dict) -> None:
+            index["stats"][outcome] += 1
+            index["stats"]["bytes_served"] += bytes_served
+            if written is None:
+                return
+
+            now = time.time()
+            index["entries"][entry_id] = {
+                "namespace": namespace,
+                "symbol": symbol,
+                "timeframe": timeframe,
+                "start": start_iso,
+                "end": pd.Timestamp(df["timestamp"].iloc[-1]).isoformat(),
+                "rows": len(df),
+                "fingerprint": fingerprint,
+                "has_labels": labels is not None,
+                "format": self.format,
+                "bytes": written,
+                "created_at": datetime.utcnow().isoformat(),
+                "last_access": now,
+            }
+            index["stats"]["bytes_written"] += written
+
+            # The extended entry covers everything its prefix did
+            if superseded and superseded != entry_id:
+                self._remove_entry(index, superseded)
+            self._evict(index, keep=entry_id)
+
+        self._update_index(_record)
@@ -1,8 +1,12 @@
 import pandas as pd
 import numpy as np
-from typing import Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import logging
 
+from apps.ml.indicators import supertrend, true_range
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -19,6 +23,466 @@ except ImportError:
     PANDAS_TA_AVAILABLE = False
     logger.warning("pandas_ta not available, some indicators will be unavailable")
 
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Bounds the (rows x window) scratch arrays of the NumPy rolling kernels
+ROLLING_CHUNK_ROWS = 8192
+
+# Bump whenever compute_all_features output changes; invalidates the on-disk feature cache
+FEATURE_VERSION = 1
+
+# Accumulated over the whole history, so they never converge when recomputed from a later start
+CUMULATIVE_FEATURE_COLUMNS = ["vwap", "obv", "obv_ema", "obv_divergence"]
+
+
+def _sorted_window_kernel(values: np.ndarray, window: int, q: float, mode: int) -> np.ndarray:
+    """
+    Rolling kernel over order statistics of the window, O(n log w).
+
+    Outputs are produced in blocks of ``window`` bars. Every window ending in a
+    block lies inside the block's 2w-bar span, so the span's distinct values are
+    sorted once and the window is tracked as a Fenwick tree of counts over their
+    ranks: inserting, expiring, ranking and selecting a value are all O(log w).
+    mode 0 returns the average-method percentile rank of the newest value,
+    mode 1 returns the linearly interpolated ``q`` quantile. Windows holding
+    NaN yield NaN, like pandas with ``min_periods=window``.
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+
+    tree = np.zeros(2 * window + 1, dtype=np.int64)
+    picked = np.empty(2)
+    idx = q * (window - 1)
+    lower = int(idx)
+
+    for block_start in range(window - 1, n, window):
+        block_end = min(block_start + window, n)
+        span_start = block_start - window + 1
+        span = values[span_start:block_end]
+        distinct = np.unique(span[~np.isnan(span)])
+        size = distinct.shape[0]
+        # 1-based Fenwick positions; NaN gets size + 1 and is never inserted
+        ranks = np.searchsorted(distinct, span) + 1
+        top = 1
+        while top * 2 <= size:
+            top *= 2
+        tree[: size + 1] = 0
+        nan_count = 0
+
+        for i in range(span_start, block_end):
+            # Add the newest value, then expire the one that left the window
+            for j, delta in ((i, 1), (i - window, -1)):
+                if j < span_start:
+                    continue
+                if values[j] != values[j]:
+                    nan_count += delta
+                    continue
+                pos = ranks[j - span_start]
+                while pos <= size:
+                    tree[pos] += delta
+                    pos += pos & -pos
+
+            if i < block_start or nan_count > 0:
+                continue
+
+            if mode == 0:
+                rank = ranks[i - span_start]
+                less = 0
+                pos = rank - 1
+                while pos > 0:
+                    less += tree[pos]
+                    pos -= pos & -pos
+                at_most = 0
+                pos = rank
+                while pos > 0:
+                    at_most += tree[pos]
+                    pos -= pos & -pos
+                out[i] = (less + (at_most - less + 1) / 2.0) / window
+            else:
+                # Descend the tree for the lower and, if needed, the next order statistic
+                for slot in range(2 if idx != lower else 1):
+                    remaining = lower + slot
+                    pos = 0
+                    step = top
+                    while step > 0:
+                        if pos + step <= size and tree[pos + step] <= remaining:
+                            pos += step
+                            remaining -= tree[pos]
+                        step //= 2
+                    picked[slot] = distinct[pos]
+                if idx == lower:
+                    out[i] = picked[0]
+                else:
+                    out[i] = picked[0] + (picked[1] - picked[0]) * (idx - lower)
+
+    return out
+
+
+if NUMBA_AVAILABLE:
+    _sorted_window_kernel_jit = numba.njit(cache=True)(_sorted_window_kernel)
+
+
+def _window_has_nan(values: np.ndarray, window: int) -> np.ndarray:
+    """Boolean mask of rows whose trailing window contains NaN (or is incomplete)."""
+    nan_counts = np.concatenate(([0], np.cumsum(np.isnan(values))))
+    has_nan = np.ones(len(values), dtype=bool)
+    if len(values) >= window:
+        has_nan[window - 1 :] = (nan_counts[window:] - nan_counts[:-window]) > 0
+    return has_nan
+
+
+def _numpy_window_kernel(values: np.ndarray, window: int, q: float, mode: int) -> np.ndarray:
+    """Chunked vectorized fallback for ``_sorted_window_kernel`` when numba is missing."""
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+
+    windows = sliding_window_view(values, window)
+    idx = q * (window - 1)
+    lower = int(idx)
+
+    for start in range(0, len(windows), ROLLING_CHUNK_ROWS):
+        chunk = windows[start : start + ROLLING_CHUNK_ROWS]
+        if mode == 0:
+            current = chunk[:, -1:]
+            less = np.count_nonzero(chunk < current, axis=1)
+            equal = np.count_nonzero(chunk == current, axis=1)
+            result = (less + (equal + 1) / 2.0) / window
+        else:
+            ordered = np.sort(chunk, axis=1)
+            if idx == lower:
+                result = ordered[:, lower]
+            else:
+                result = ordered[:, lower] + (ordered[:, lower + 1] - ordered[:, lower]) * (
+                    idx - lower
+                )
+        out[window - 1 + start : window - 1 + start + len(chunk)] = result
+
+    out[_window_has_nan(values, window)] = np.nan
+    return out
+
+
+def _rolling_window_op(series: pd.Series, window: int, q: float, mode: int) -> pd.Series:
+    values = np.ascontiguousarray(series.to_numpy(dtype=np.float64))
+    if NUMBA_AVAILABLE:
+        result = _sorted_window_kernel_jit(values, window, q, mode)
+    else:
+        result = _numpy_window_kernel(values, window, q, mode)
+    return pd.Series(result, index=series.index)
+
+
+def rolling_percentile_rank(series: pd.Series, window: int) -> pd.Series:
+    """
+    Percentile rank of each value within its trailing window.
+
+    Equivalent to ``series.rolling(window).apply(lambda x: pd.Series(x).rank(pct=True).iloc[-1])``
+    without building a Series per bar.
+    """
+    return _rolling_window_op(series, window, 0.0, 0)
+
+
+def rolling_quantile(series: pd.Series, window: int, q: float) -> pd.Series:
+    """Linearly interpolated rolling quantile, equivalent to ``series.rolling(window).quantile(q)``."""
+    return _rolling_window_op(series, window, q, 1)
+
+
+# Price/volume columns every feature may read without declaring them
+BASE_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# Recursive smoothers (EMA) are considered settled after this many spans:
+# the seed value then weighs less than 0.04% (exp(-8))
+EMA_SETTLE_SPANS = 4
+
+# Wilder's smoothing (RMA, alpha = 1/period) decays half as fast as an EMA of
+# the same period, so it reaches the same exp(-8) seed weight after 8 periods
+WILDER_SETTLE_PERIODS = 2 * EMA_SETTLE_SPANS
+
+INDICATOR_BACKENDS = ("talib", "pandas_ta", "pandas")
+
+
+def indicator_backend() -> str:
+    """Library computing the TA indicators: 'talib', 'pandas_ta' or the 'pandas' fallback."""
+    if TALIB_AVAILABLE:
+        return "talib"
+    if PANDAS_TA_AVAILABLE:
+        return "pandas_ta"
+    return "pandas"
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """
+    One node of the feature dependency graph.
+
+    Attributes:
+        name: Node name
+        method: FeatureEngineering method computing the node
+        outputs: Columns the method adds
+        inputs: Feature columns it reads besides BASE_COLUMNS
+        warmup: Bars of history its own window (or smoother) consumes
+        params: Keyword arguments passed to the method
+        uses_market_metrics: The method also takes the market metrics frame
+        backend_warmup: Warm-up per indicator backend whose smoother differs
+                        from the pandas fallback (e.g. TA-Lib's Wilder RSI)
+    """
+
+    name: str
+    method: str
+    outputs: Tuple[str, ...]
+    inputs: Tuple[str, ...] = ()
+    warmup: int = 0
+    params: Dict[str, Any] = field(default_factory=dict)
+    uses_market_metrics: bool = False
+    backend_warmup: Dict[str, int] = field(default_factory=dict)
+
+    def warmup_for(self, backend: Optional[str] = None) -> int:
+        """Warm-up under ``backend`` (default: the one in use)."""
+        return self.backend_warmup.get(backend or indicator_backend(), self.warmup)
+
+
+# In compute_all_features order; a node may only read outputs of nodes above it
+FEATURE_REGISTRY: Tuple[FeatureSpec, ...] = (
+    *(
+        FeatureSpec(
+            f"ema_{period}",
+            "_add_emas",
+            (f"ema_{period}",),
+            warmup=EMA_SETTLE_SPANS * period,
+            params={"periods": (period,)},
+        )
+        for period in (9, 21, 50, 200)
+    ),
+    # TA-Lib and pandas_ta smooth RSI and ATR with Wilder's RMA; the fallback uses rolling means
+    FeatureSpec(
+        "rsi",
+        "_add_rsi",
+        ("rsi_14",),
+        warmup=15,
+        backend_warmup=dict.fromkeys(("talib", "pandas_ta"), 1 + WILDER_SETTLE_PERIODS * 14),
+    ),
+    FeatureSpec("stochastic", "_add_stochastic", ("stoch_k", "stoch_d"), warmup=16),
+    FeatureSpec(
+        "macd",
+        "_add_macd",
+        ("macd", "macd_signal", "macd_hist"),
+        warmup=EMA_SETTLE_SPANS * (26 + 9),
+    ),
+    FeatureSpec(
+        "atr",
+        "_add_atr",
+        ("atr_14", "atr_rising", "atr_falling", "atr_slope"),
+        warmup=18,
+        backend_warmup=dict.fromkeys(("talib", "pandas_ta"), 4 + WILDER_SETTLE_PERIODS * 14),
+    ),
+    FeatureSpec(
+        "bollinger",
+        "_add_bollinger_bands",
+        ("bb_upper", "bb_middle", "bb_lower", "bb_width"),
+        warmup=20,
+    ),
+    FeatureSpec("vwap", "_add_vwap", ("vwap", "vwap_rolling", "vwap_distance"), warmup=96),
+    FeatureSpec(
+        "stochrsi",
+        "_add_stochrsi",
+        ("stochrsi", "stochrsi_k", "stochrsi_d"),
+        inputs=("rsi_14",),
+        warmup=18,
+    ),
+    FeatureSpec(
+        "keltner",
+        "_add_keltner_channels",
+        ("ema_20", "keltner_upper", "keltner_lower", "keltner_width"),
+        inputs=("atr_14",),
+        warmup=EMA_SETTLE_SPANS * 20,
+    ),
+    FeatureSpec(
+        "supertrend",
+        "_add_supertrend",
+        ("supertrend", "supertrend_direction"),
+        inputs=("atr_14",),
+        warmup=1,
+    ),
+    # TA-Lib's ADX Wilder-smooths the directional movement, then DX again
+    FeatureSpec(
+        "adx",
+        "_add_adx",
+        ("adx",),
+        inputs=("atr_14",),
+        warmup=28,
+        backend_warmup={"talib": 1 + 2 * WILDER_SETTLE_PERIODS * 14},
+    ),
+    FeatureSpec(
+        "swing_points",
+        "_add_swing_points",
+        ("swing_high", "swing_low", "dist_to_swing_high", "dist_to_swing_low"),
+        warmup=11,
+    ),
+    FeatureSpec(
+        "fibonacci",
+        "_add_fibonacci_dynamic",
+        (
+            "fib_0",
+            "fib_236",
+            "fib_382",
+            "fib_50",
+            "fib_618",
+            "fib_786",
+            "fib_100",
+            "fib_1618",
+            "fib_2618",
+        ),
+        warmup=50,
+    ),
+    FeatureSpec(
+        "pivot_points", "_add_pivot_points", ("pivot_point", "resistance_1", "support_1"), warmup=1
+    ),
+    FeatureSpec(
+        "obv", "_add_obv", ("obv", "obv_ema", "obv_divergence"), warmup=EMA_SETTLE_SPANS * 20
+    ),
+    FeatureSpec(
+        "volume_profile",
+        "_add_volume_profile",
+        ("volume_surge", "high_volume_node", "volume_percentile", "volume_quantile_90", "vwap_std"),
+        inputs=("vwap_rolling",),
+        warmup=100,
+    ),
+    FeatureSpec("obi", "_add_obi", ("obi", "obi_ema"), warmup=21 + EMA_SETTLE_SPANS * 10),
+    FeatureSpec(
+        "spread",
+        "_add_bid_ask_spread_dynamic",
+        ("estimated_spread_bps", "spread_percentile"),
+        warmup=121,
+    ),
+    FeatureSpec(
+        "ema_slopes",
+        "_add_ema_slopes",
+        ("ema_20_slope", "ema_20_accel", "ema_50_slope", "ema_50_accel"),
+        inputs=("ema_20", "ema_50"),
+        warmup=6,
+    ),
+    FeatureSpec(
+        "consolidation",
+        "_add_consolidation_zones",
+        ("is_consolidation", "consolidation_duration"),
+        inputs=("bb_width",),
+        warmup=100,
+    ),
+    FeatureSpec(
+        "rsi_divergence",
+        "_add_rsi_divergence",
+        ("bearish_divergence", "bullish_divergence"),
+        inputs=("rsi_14",),
+        warmup=14,
+    ),
+    FeatureSpec(
+        "regime_trend", "_add_regime_trend", ("regime_trend",), inputs=("ema_21", "ema_50")
+    ),
+    FeatureSpec(
+        "regime_volatility",
+        "_add_regime_volatility",
+        ("regime_volatility",),
+        inputs=("atr_14",),
+        warmup=100,
+    ),
+    FeatureSpec(
+        "market_metrics",
+        "_add_market_metrics",
+        ("spread_bps", "depth_imbalance", "realized_vol", "funding_rate", "open_interest"),
+        warmup=21,
+        uses_market_metrics=True,
+    ),
+    FeatureSpec("sentiment", "_add_sentiment", ("sentiment_score",)),
+    FeatureSpec(
+        "rolling_stats",
+        "_add_rolling_stats",
+        (
+            "close_rolling_mean_20",
+            "close_rolling_std_20",
+            "close_zscore",
+            "volume_rolling_mean_20",
+            "volume_rolling_std_20",
+            "volume_zscore",
+            "price_momentum_5",
+            "price_momentum_10",
+            "price_momentum_20",
+            "volume_momentum_5",
+            "volume_momentum_10",
+            "price_volume_corr",
+            "hl_range",
+            "hl_range_ma",
+            "hl_range_std",
+        ),
+        warmup=21,
+    ),
+)
+
+_PRODUCERS: Dict[str, FeatureSpec] = {
+    column: spec for spec in FEATURE_REGISTRY for column in spec.outputs
+}
+
+
+def resolve_features(columns: Optional[Iterable[str]] = None) -> List[FeatureSpec]:
+    """
+    Nodes needed to produce ``columns``, in computation order.
+
+    Args:
+        columns: Feature columns to produce (default: every registered feature).
+                 Columns nothing produces (base columns, retired features) are ignored.
+
+    Returns:
+        The required subgraph as a list of FeatureSpec
+    """
+    if columns is None:
+        return list(FEATURE_REGISTRY)
+
+    required = set()
+    pending = [_PRODUCERS[column] for column in columns if column in _PRODUCERS]
+    while pending:
+        spec = pending.pop()
+        if spec.name in required:
+            continue
+        required.add(spec.name)
+        pending.extend(_PRODUCERS[column] for column in spec.inputs)
+
+    return [spec for spec in FEATURE_REGISTRY if spec.name in required]
+
+
+def feature_lookback(
+    columns: Optional[Iterable[str]] = None, backend: Optional[str] = None
+) -> Optional[int]:
+    """
+    Minimum number of bars needed for the newest row of ``columns`` to be fully warmed up.
+
+    The lookback of a node is its own warm-up plus the longest lookback among
+    the nodes it reads from.
+
+    Args:
+        columns: Feature columns needed (default: all)
+        backend: Indicator backend to size the warm-ups for (default: the one in use)
+
+    Returns:
+        Bars including the newest one, or None if a requested column
+        accumulates over the whole history (CUMULATIVE_FEATURE_COLUMNS)
+    """
+    columns = list(columns) if columns is not None else list(_PRODUCERS)
+    if any(column in CUMULATIVE_FEATURE_COLUMNS for column in columns):
+        return None
+
+    lookbacks: Dict[str, int] = {}
+    for spec in resolve_features(columns):
+        lookbacks[spec.name] = spec.warmup_for(backend) + max(
+            (lookbacks[_PRODUCERS[column].name] for column in spec.inputs), default=0
+        )
+    return max(lookbacks.values(), default=0) + 1
+
 
 class FeatureEngineering:
     """
@@ -32,72 +496,88 @@ class FeatureEngineering:
     def compute_all_features(
         self,
         df: pd.DataFrame,
-        market_metrics: Optional[pd.DataFrame] = None
+        market_metrics: Optional[pd.DataFrame] = None,
+        columns: Optional[Iterable[str]] = None,
     ) -> pd.DataFrame:
         """
-        Compute all features for a given OHLCV DataFrame.
+        Compute features for a given OHLCV DataFrame.
+
+        The features form a dependency graph (FEATURE_REGISTRY); with
+        ``columns`` only the nodes producing them and their inputs run, and
+        every produced column is identical to a full computation.
+
+        Note: Ichimoku is not registered due to look-ahead bias (chikou_span
+        shifts future data).
 
         Args:
             df: DataFrame with columns [timestamp, open, high, low, close, volume]
+            market_metrics: Optional microstructure metrics joined by timestamp
+            columns: Feature columns needed, e.g. ``model.feature_names`` (default: all)
 
         Returns:
-            DataFrame with all computed features
+            DataFrame with the input columns and the computed features
         """
         df = df.copy()
 
-        # Technical indicators - Basic
-        df = self._add_emas(df)
-        df = self._add_rsi(df)
-        df = self._add_stochastic(df)
-        df = self._add_macd(df)
-        df = self._add_atr(df)
-        df = self._add_bollinger_bands(df)
-
-        # Note: Ichimoku removed due to look-ahead bias (chikou_span shifts future data)
+        for spec in resolve_features(columns):
+            method = getattr(self, spec.method)
+            if spec.uses_market_metrics:
+                df = method(df, market_metrics, **spec.params)
+            else:
+                df = method(df, **spec.params)
 
-        # Advanced indicators
-        df = self._add_vwap(df)
-        df = self._add_stochrsi(df)
-        df = self._add_keltner_channels(df)
-        df = self._add_supertrend(df)
-        df = self._add_adx(df)
+        return df
 
-        # Price action
-        df = self._add_swing_points(df)
-        df = self._add_fibonacci_dynamic(df)
-        df = self._add_pivot_points(df)
+    def compute_panel_features(
+        self,
+        panel,
+        market_metrics: Optional[Dict[str, pd.DataFrame]] = None,
+        columns: Optional[Iterable[str]] = None,
+    ):
+        """
+        Compute features for many symbols at once over an aligned (time x symbol) panel.
 
-        # Volume analysis
-        df = self._add_obv(df)
-        df = self._add_volume_profile(df)
+        Args:
+            panel: ``FeaturePanel`` (see ``apps.ml.panel_features``)
+            market_metrics: Optional microstructure metrics frame per symbol
+            columns: Feature columns needed (default: all)
 
-        # Market structure
-        df = self._add_obi(df)
-        df = self._add_bid_ask_spread_dynamic(df)
+        Returns:
+            ``PanelFeatures`` with wide frames, a long-format view and
+            per-symbol views identical to ``compute_all_features``
+        """
+        from apps.ml.panel_features import compute_panel_features
 
-        # Derivative features
-        df = self._add_ema_slopes(df)
-        df = self._add_consolidation_zones(df)
-        df = self._add_rsi_divergence(df)
+        return compute_panel_features(self, panel, market_metrics=market_metrics, columns=columns)
 
-        # Market regime
-        df = self._add_regime_detection(df)
+    def required_lookback(self, columns: Optional[Iterable[str]] = None) -> Optional[int]:
+        """Bars of history ``compute_all_features(columns=...)`` needs; see ``feature_lookback``."""
+        return feature_lookback(columns)
 
-        # Microstructure & market metrics
-        df = self._add_market_metrics(df, market_metrics)
+    def compute_cumulative_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute only the whole-history features (cumulative VWAP and OBV).
 
-        # Sentiment (plugin interface - placeholder)
-        if 'sentiment_score' not in df.columns:
-            df['sentiment_score'] = 0.0
+        These are cheap vectorized passes, so callers that recompute the rest
+        of the features over a recent window can refresh them over the full
+        history instead.
 
-        # Rolling statistics for better trend detection
-        df = self._add_rolling_stats(df)
+        Args:
+            df: DataFrame with at least [close, volume]
 
-        return df
+        Returns:
+            DataFrame with CUMULATIVE_FEATURE_COLUMNS, aligned to ``df``
+        """
+        out = df[["close", "volume"]].copy()
+        out = self._add_vwap(out)
+        out = self._add_obv(out)
+        return out[CUMULATIVE_FEATURE_COLUMNS]
 
-    def _add_emas(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_emas(
+        self, df: pd.DataFrame, periods: Tuple[int, ...] = (9, 21, 50, 200)
+    ) -> pd.DataFrame:
         """Add Exponential Moving Averages"""
-        for period in [9, 21, 50, 200]:
+        for period in periods:
             if TALIB_AVAILABLE:
                 df[f'ema_{period}'] = talib.EMA(df['close'], timeperiod=period)
             elif PANDAS_TA_AVAILABLE:
@@ -177,12 +657,7 @@ class FeatureEngineering:
             df['atr_14'] = ta.atr(df['high'], df['low'], df['close'], length=14)
         else:
             # Manual ATR calculation
-            high_low = df['high'] - df['low']
-            high_close = np.abs(df['high'] - df['close'].shift())
-            low_close = np.abs(df['low'] - df['close'].shift())
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = np.max(ranges, axis=1)
-            df['atr_14'] = pd.Series(true_range).rolling(window=14).mean()
+            df["atr_14"] = true_range(df["high"], df["low"], df["close"]).rolling(window=14).mean()
 
         # ATR rising/falling detection
         df['atr_rising'] = (df['atr_14'] > df['atr_14'].shift(3)).astype(int)
@@ -268,6 +743,12 @@ class FeatureEngineering:
 
         return df
 
+    def _add_sentiment(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Sentiment (plugin interface - placeholder)"""
+        if "sentiment_score" not in df.columns:
+            df["sentiment_score"] = 0.0
+        return df
+
     def _add_ichimoku(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add Ichimoku Cloud indicators"""
         if PANDAS_TA_AVAILABLE:
@@ -331,13 +812,11 @@ class FeatureEngineering:
 
         return df
 
-    def _add_regime_detection(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_regime_trend(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Detect market regime: trend (uptrend/downtrend/sideways) and volatility (low/med/high).
-        Returns numeric encodings instead of strings.
+        Detect the trend regime from EMA crossovers.
+        Numeric encoding: 1 = uptrend, -1 = downtrend, 0 = sideways.
         """
-        # Trend detection using EMA crossovers
-        # 1 = uptrend, -1 = downtrend, 0 = sideways
         if 'ema_21' in df.columns and 'ema_50' in df.columns:
             ema_diff = df['ema_21'] - df['ema_50']
             df['regime_trend'] = np.where(
@@ -346,12 +825,16 @@ class FeatureEngineering:
             )
         else:
             df['regime_trend'] = 0
+        return df
 
-        # Volatility regime using ATR percentile
-        # 2 = high, 1 = medium, 0 = low
+    def _add_regime_volatility(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Detect the volatility regime from the ATR percentile.
+        Numeric encoding: 2 = high, 1 = medium, 0 = low.
+        """
         if 'atr_14' in df.columns and df['close'].notna().any():
             atr_pct = df['atr_14'] / df['close']
-            atr_percentile = atr_pct.rolling(100).apply(lambda x: pd.Series(x).rank(pct=True).iloc[-1] if len(x) > 0 else 0.5)
+            atr_percentile = rolling_percentile_rank(atr_pct, 100)
 
             df['regime_volatility'] = np.where(
                 atr_percentile > 0.66, 2,
@@ -425,11 +908,7 @@ class FeatureEngineering:
             atr = df['atr_14']
         else:
             # Calculate ATR if not present
-            high_low = df['high'] - df['low']
-            high_close = np.abs(df['high'] - df['close'].shift())
-            low_close = np.abs(df['low'] - df['close'].shift())
-            true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-            atr = true_range.rolling(14).mean()
+            atr = true_range(df['high'], df['low'], df['close']).rolling(14).mean()
         
         multiplier = 2.0
         df['keltner_upper'] = df['ema_20'] + multiplier * atr
@@ -440,39 +919,13 @@ class FeatureEngineering:
     def _add_supertrend(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add Supertrend indicator - Trend following indicator"""
         if 'atr_14' not in df.columns:
-            high_low = df['high'] - df['low']
-            high_close = np.abs(df['high'] - df['close'].shift())
-            low_close = np.abs(df['low'] - df['close'].shift())
-            true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-            atr = true_range.rolling(14).mean()
+            atr = true_range(df['high'], df['low'], df['close']).rolling(14).mean()
         else:
             atr = df['atr_14']
-        
-        hl_avg = (df['high'] + df['low']) / 2
-        multiplier = 3.0
-        
-        upper_band = hl_avg + multiplier * atr
-        lower_band = hl_avg - multiplier * atr
-        
-        # Supertrend logic
-        supertrend = pd.Series(index=df.index, dtype=float)
-        direction = pd.Series(index=df.index, dtype=int)
-        
-        for i in range(1, len(df)):
-            if df['close'].iloc[i] > upper_band.iloc[i-1]:
-                direction.iloc[i] = 1
-            elif df['close'].iloc[i] < lower_band.iloc[i-1]:
-                direction.iloc[i] = -1
-            else:
-                direction.iloc[i] = direction.iloc[i-1] if i > 0 else 0
-            
-            if direction.iloc[i] == 1:
-                supertrend.iloc[i] = lower_band.iloc[i]
-            else:
-                supertrend.iloc[i] = upper_band.iloc[i]
-        
-        df['supertrend'] = supertrend
-        df['supertrend_direction'] = direction
+
+        df['supertrend'], df['supertrend_direction'] = supertrend(
+            df['high'], df['low'], df['close'], atr, multiplier=3.0
+        )
         return df
 
     def _add_adx(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -490,10 +943,7 @@ class FeatureEngineering:
             if 'atr_14' in df.columns:
                 tr = df['atr_14'] * 14  # Approximate
             else:
-                high_low = df['high'] - df['low']
-                high_close = np.abs(df['high'] - df['close'].shift())
-                low_close = np.abs(df['low'] - df['close'].shift())
-                tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+                tr = true_range(df['high'], df['low'], df['close'])
             
             plus_di = 100 * (plus_dm.rolling(14).mean() / tr.rolling(14).mean())
             minus_di = 100 * (minus_dm.rolling(14).mean() / tr.rolling(14).mean())
@@ -558,12 +1008,12 @@ class FeatureEngineering:
         df['volume_surge'] = df['volume'] / df['volume'].rolling(20).mean()
 
         # High volume nodes (simplified)
-        df['high_volume_node'] = (df['volume'] > df['volume'].rolling(window).quantile(0.8)).astype(int)
+        df["high_volume_node"] = (
+            df["volume"] > rolling_quantile(df["volume"], window, 0.8)
+        ).astype(int)
 
         # Volume percentiles for TP adjustment
-        df['volume_percentile'] = df['volume'].rolling(100).apply(
-            lambda x: pd.Series(x).rank(pct=True).iloc[-1] if len(x) > 0 else 0.5
-        )
+        df['volume_percentile'] = rolling_percentile_rank(df['volume'], 100)
         df['volume_quantile_90'] = (df['volume_percentile'] >= 0.90).astype(int)
 
         # Volume-weighted price levels
@@ -596,9 +1046,7 @@ class FeatureEngineering:
         rolling_vol = returns.rolling(20).std()
         
         df['estimated_spread_bps'] = rolling_vol * 10000  # Convert to basis points
-        df['spread_percentile'] = df['estimated_spread_bps'].rolling(100).apply(
-            lambda x: pd.Series(x).rank(pct=True).iloc[-1] if len(x) > 0 else 0.5
-        )
+        df['spread_percentile'] = rolling_percentile_rank(df['estimated_spread_bps'], 100)
         
         return df
 
@@ -626,7 +1074,7 @@ class FeatureEngineering:
             bb_width = pd.Series([0.05] * len(df), index=df.index)
         
         # Consolidation when BB width is in lower 30th percentile
-        consolidation_threshold = bb_width.rolling(100).quantile(0.30)
+        consolidation_threshold = rolling_quantile(bb_width, 100, 0.30)
         df['is_consolidation'] = (bb_width < consolidation_threshold).astype(int)
         
         # Time in consolidation
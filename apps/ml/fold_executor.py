@@ -0,0 +1,496 @@
+"""
+Walk-forward fold training, serial or fanned out over a process pool.
+
+The parallel path dumps the prepared feature matrix, labels and timestamps
+once to ``.npy`` files; every worker memory-maps them read-only, so a fold
+task only carries its row ranges and split bounds instead of a pickled
+DataFrame; a compact TrainingMatrix is dumped as is (float32). Each worker
+caps LightGBM/XGBoost to a fixed number of native threads so
+``workers * threads`` never exceeds the host's cores.
+
+The same arrays can be published to a shared volume and trained one fold per
+Celery task (``train_published_fold``), spreading folds across hosts.
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from apps.ml.checkpoint import save_split_result
+from apps.ml.models import ConformalPredictor, EnsembleModel, SharedBins
+from apps.ml.training_data import TrainingMatrix
+
+logger = logging.getLogger(__name__)
+
+# Populated in each pool worker by _init_worker
+_WORKER_STATE: Dict = {}
+
+
+def resolve_threads_per_worker(workers: int, threads_per_worker: Optional[int]) -> int:
+    """
+    Native threads each fold worker may use.
+
+    Args:
+        workers: Number of concurrent fold workers
+        threads_per_worker: Explicit cap; 0/None splits the host's cores evenly
+
+    Returns:
+        Thread count (>= 1)
+    """
+    if threads_per_worker:
+        return max(1, int(threads_per_worker))
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def build_shared_bins(
+    X: pd.DataFrame,
+    y: pd.Series,
+    n_threads: Optional[int] = None,
+    model_params: Optional[Dict] = None,
+) -> SharedBins:
+    """
+    Bin features once for all folds, with the boosters' own parameters.
+
+    Args:
+        X: Features of every row a fold trains on (fold rows index into these)
+        y: Labels of those rows
+        n_threads: Native thread cap for LightGBM/XGBoost
+        model_params: Extra EnsembleModel keyword arguments (lgbm_params/xgb_params)
+    """
+    model = EnsembleModel(n_threads=n_threads, **(model_params or {}))
+    logger.info("Binning %d rows x %d features once for all folds", len(X), X.shape[1])
+    return SharedBins(X, y, model.lgbm_params, model.xgb_params)
+
+
+def train_fold_xy(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    target_confidence: float,
+    split_index: int,
+    total_splits: int,
+    train_bounds,
+    test_bounds,
+    n_threads: Optional[int] = None,
+    model_params: Optional[Dict] = None,
+    shared_bins: Optional[SharedBins] = None,
+    train_rows: Optional[Tuple[int, int]] = None,
+    init_model: Optional[EnsembleModel] = None,
+    num_boost_round: Optional[int] = None,
+    early_stopping_rounds: Optional[int] = None,
+    learning_rate: Optional[float] = None,
+    deadline: Optional[float] = None,
+) -> Optional[Tuple[dict, EnsembleModel]]:
+    """
+    Train and evaluate the ensemble on one walk-forward split.
+
+    Features and labels are passed separately, so callers holding a feature
+    matrix (e.g. row-range views of a TrainingMatrix) never copy it into a
+    frame.
+
+    Args:
+        X_train: Training features
+        y_train: Training labels
+        X_test: Out-of-sample features
+        y_test: Out-of-sample labels
+        target_confidence: Conformal confidence target
+        split_index: 1-based split number
+        total_splits: Number of splits in the run (for logging)
+        train_bounds: (start, end) of the training window
+        test_bounds: (start, end) of the test window
+        n_threads: Native thread cap for LightGBM/XGBoost
+        model_params: Extra EnsembleModel keyword arguments (lgbm_params/xgb_params)
+        shared_bins: Features binned once for all folds
+        train_rows: (start, end) of X_train within the rows of ``shared_bins``
+        init_model: Model whose boosting continues (warm start)
+        num_boost_round: Cap on new boosting rounds
+        early_stopping_rounds: Early-stopping patience
+        learning_rate: Learning rate set by a TrainingBudget
+        deadline: time.time() value at which boosting stops (TrainingBudget)
+
+    Returns:
+        (split_result, model), or None if the split was skipped
+    """
+    if len(X_train) < 50 or len(X_test) < 10:
+        logger.warning(
+            "Insufficient data in split %s (train=%s, test=%s). Skipping...",
+            split_index,
+            len(X_train),
+            len(X_test),
+        )
+        return None
+
+    # Further split train into train/val for early stopping
+    train_size = max(int(len(X_train) * 0.8), 1)
+    X_train_fit = X_train.iloc[:train_size]
+    y_train_fit = y_train.iloc[:train_size]
+    X_val = X_train.iloc[train_size:]
+    y_val = y_train.iloc[train_size:]
+
+    if len(X_val) == 0:
+        X_val = X_train_fit
+        y_val = y_train_fit
+
+    model = EnsembleModel(n_threads=n_threads, **(model_params or {}))
+    boosting = {
+        "init_model": init_model,
+        "num_boost_round": num_boost_round,
+        "early_stopping_rounds": early_stopping_rounds,
+        "learning_rate": learning_rate,
+        "deadline": deadline,
+    }
+
+    started = time.perf_counter()
+    try:
+        logger.info(
+            "Training ensemble model for split %s/%s (train=%s, test=%s)",
+            split_index,
+            total_splits,
+            len(X_train),
+            len(X_test),
+        )
+        if shared_bins is not None:
+            fit_rows = (train_rows[0], train_rows[0] + train_size)
+            model.train(
+                X_train_fit,
+                y_train_fit,
+                X_val,
+                y_val,
+                shared_bins=shared_bins,
+                train_rows=fit_rows,
+                **boosting,
+            )
+        else:
+            model.train(X_train_fit, y_train_fit, X_val, y_val, **boosting)
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.error("Training failed for split %s: %s", split_index, exc)
+        return None
+    train_seconds = time.perf_counter() - started
+
+    test_metrics = model.evaluate(X_test, y_test)
+    logger.info("OOS Test Metrics: %s", test_metrics)
+
+    conformal = ConformalPredictor(model, target_confidence=target_confidence)
+    conformal.calibrate(X_val, y_val)
+
+    preds, conf, mask = conformal.filter_by_confidence(X_test)
+    filtered_metrics = model.evaluate(X_test[mask], y_test[mask]) if mask.sum() > 0 else {}
+
+    hit_rate_tp1 = float(y_test.mean()) if len(y_test) > 0 else 0.0
+
+    split_result = {
+        "split_id": split_index - 1,
+        "train_start": train_bounds[0],
+        "train_end": train_bounds[1],
+        "test_start": test_bounds[0],
+        "test_end": test_bounds[1],
+        "train_samples": len(X_train),
+        "test_samples": len(X_test),
+        "oos_metrics": test_metrics,
+        "hit_rate_tp1": hit_rate_tp1,
+        "filtered_coverage": mask.sum() / len(mask) if len(mask) > 0 else 0,
+        "filtered_metrics": filtered_metrics,
+        "train_seconds": train_seconds,
+        "warm_started": init_model is not None,
+        "boost_rounds": _boosted_rounds(model, init_model),
+        "learning_rate": learning_rate or model.lgbm_params.get("learning_rate"),
+        "deadline_reached": model.deadline_reached,
+    }
+
+    return split_result, model
+
+
+def _boosted_rounds(model: EnsembleModel, init_model: Optional[EnsembleModel] = None) -> int:
+    """Boosting rounds a fold added (the slower of the two boosters)."""
+    lgbm_rounds = model.lgbm_model.current_iteration()
+    xgb_rounds = model.xgb_model.num_boosted_rounds()
+    if init_model is not None:
+        lgbm_rounds -= init_model.lgbm_model.current_iteration()
+        xgb_rounds -= init_model.xgb_model.num_boosted_rounds()
+    return int(max(lgbm_rounds, xgb_rounds))
+
+
+class SharedFoldData:
+    """
+    Feature matrix, labels and timestamps written once as ``.npy`` files.
+
+    Use as a context manager; the backing directory is removed on exit.
+    """
+
+    def __init__(self, df: pd.DataFrame, feature_cols: List[str], directory: Optional[str] = None):
+        self._dump(
+            feature_cols,
+            df[list(feature_cols)].to_numpy(dtype=np.float64),
+            df["label"].to_numpy(),
+            df["timestamp"].to_numpy(dtype="datetime64[ns]"),
+            directory,
+        )
+
+    @classmethod
+    def from_matrix(
+        cls, matrix: TrainingMatrix, directory: Optional[str] = None
+    ) -> "SharedFoldData":
+        """Dump a compact TrainingMatrix as is (float32 features, int8 labels)."""
+        shared = cls.__new__(cls)
+        shared._dump(
+            matrix.feature_cols,
+            matrix.features,
+            matrix.labels,
+            matrix.timestamps.to_numpy(dtype="datetime64[ns]"),
+            directory,
+        )
+        return shared
+
+    def _dump(self, feature_cols, features, labels, timestamps, directory):
+        self.feature_cols = list(feature_cols)
+        self._dir = Path(tempfile.mkdtemp(prefix="wf_folds_", dir=directory))
+        self.paths = {
+            "features": str(self._dir / "features.npy"),
+            "labels": str(self._dir / "labels.npy"),
+            "timestamps": str(self._dir / "timestamps.npy"),
+        }
+
+        np.save(self.paths["features"], features)
+        np.save(self.paths["labels"], labels)
+        np.save(self.paths["timestamps"], timestamps)
+
+    def close(self):
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _init_worker(
+    paths: Dict[str, str],
+    feature_cols: List[str],
+    target_confidence: float,
+    n_threads: int,
+    model_params: Optional[Dict],
+    bin_rows: Optional[int] = None,
+):
+    """Pool initializer: map the shared arrays once per worker process."""
+    _WORKER_STATE.clear()
+    _WORKER_STATE.update(
+        {
+            "paths": paths,
+            "features": np.load(paths["features"], mmap_mode="r"),
+            "labels": np.load(paths["labels"], mmap_mode="r"),
+            "timestamps": np.load(paths["timestamps"], mmap_mode="r"),
+            "feature_cols": feature_cols,
+            "target_confidence": target_confidence,
+            "n_threads": n_threads,
+            "model_params": model_params,
+            "bin_rows": bin_rows,
+            "shared_bins": None,
+        }
+    )
+
+
+def _worker_bins() -> Optional[SharedBins]:
+    """This worker's shared bins, built on its first fold."""
+    if not _WORKER_STATE["bin_rows"]:
+        return None
+    if _WORKER_STATE["shared_bins"] is None:
+        X, y = _xy_from_rows((0, _WORKER_STATE["bin_rows"]))
+        _WORKER_STATE["shared_bins"] = build_shared_bins(
+            X, y, _WORKER_STATE["n_threads"], _WORKER_STATE["model_params"]
+        )
+    return _WORKER_STATE["shared_bins"]
+
+
+def _xy_from_rows(rows: Tuple[int, int]) -> Tuple[pd.DataFrame, pd.Series]:
+    start, stop = rows
+    # One writable copy of the fold's rows; the mapped arrays stay read-only
+    features = pd.DataFrame(
+        np.array(_WORKER_STATE["features"][start:stop]),
+        columns=_WORKER_STATE["feature_cols"],
+        copy=False,
+    )
+    labels = pd.Series(np.array(_WORKER_STATE["labels"][start:stop]), name="label")
+    return features, labels
+
+
+def _run_fold(fold: Dict) -> Tuple[int, Optional[Tuple[dict, EnsembleModel]]]:
+    """Worker entry point: rebuild the fold's features/labels from the mapped arrays and train."""
+    deadline = fold.get("deadline")
+    if deadline is not None and time.time() >= deadline:
+        logger.info("Time budget spent; skipping split %s", fold["split_index"])
+        return fold["split_index"], None
+
+    X_train, y_train = _xy_from_rows(fold["train_rows"])
+    X_test, y_test = _xy_from_rows(fold["test_rows"])
+    shared_bins = _worker_bins()
+    outcome = train_fold_xy(
+        X_train,
+        y_train,
+        X_test,
+        y_test,
+        _WORKER_STATE["target_confidence"],
+        split_index=fold["split_index"],
+        total_splits=fold["total_splits"],
+        train_bounds=fold["train_bounds"],
+        test_bounds=fold["test_bounds"],
+        n_threads=_WORKER_STATE["n_threads"],
+        model_params=_WORKER_STATE["model_params"],
+        shared_bins=shared_bins,
+        train_rows=fold["train_rows"] if shared_bins is not None else None,
+        deadline=deadline,
+    )
+    return fold["split_index"], outcome
+
+
+def train_published_fold(plan: Dict, fold: Dict) -> Optional[int]:
+    """
+    Train one fold of a published run (WalkForwardPipeline.publish_folds).
+
+    The fold's model and split result are written to the run's ``folds``
+    directory, where finalize_published_folds reads them.
+
+    Args:
+        plan: Published plan (shared array paths, settings, run directory)
+        fold: One of the plan's fold specs
+
+    Returns:
+        The split index, or None if the fold produced no model
+    """
+    if _WORKER_STATE.get("paths") != plan["paths"]:
+        _init_worker(
+            plan["paths"],
+            plan["feature_cols"],
+            plan["target_confidence"],
+            plan["n_threads"],
+            plan["model_params"],
+            plan["bin_rows"],
+        )
+
+    split_index, outcome = _run_fold(
+        {
+            **fold,
+            "train_rows": tuple(fold["train_rows"]),
+            "test_rows": tuple(fold["test_rows"]),
+            "train_bounds": tuple(pd.Timestamp(bound) for bound in fold["train_bounds"]),
+            "test_bounds": tuple(pd.Timestamp(bound) for bound in fold["test_bounds"]),
+        }
+    )
+    if outcome is None:
+        return None
+
+    split_result, model = outcome
+    fold_dir = Path(plan["run_dir"]) / "folds"
+    model.save(str(fold_dir / f"model_{split_index:03d}"))
+    # Written last: the result marks the fold as complete
+    save_split_result(fold_dir / f"fold_{split_index:03d}.json", split_result)
+    return split_index
+
+
+def run_folds_parallel(
+    shared: SharedFoldData,
+    folds: List[Dict],
+    target_confidence: float,
+    workers: int,
+    threads_per_worker: int,
+    model_params: Optional[Dict] = None,
+    on_fold_done: Optional[Callable[[int, Optional[Tuple[dict, EnsembleModel]]], None]] = None,
+    bin_rows: Optional[int] = None,
+) -> None:
+    """
+    Train folds concurrently on a process pool.
+
+    Args:
+        shared: Arrays dumped by SharedFoldData
+        folds: Fold specs with 'split_index', 'total_splits', 'train_rows',
+               'test_rows' (half-open row ranges), 'train_bounds', 'test_bounds'
+               and optionally 'deadline' (time.time() at which training stops)
+        target_confidence: Conformal confidence target
+        workers: Number of worker processes
+        threads_per_worker: Native thread cap inside each worker
+        model_params: Extra EnsembleModel keyword arguments
+        on_fold_done: Called in completion order with (split_index, outcome)
+        bin_rows: Bin rows [0, bin_rows) once per worker and train every fold on
+                  those bins (None = each fold bins its own rows)
+    """
+    max_workers = max(1, min(workers, len(folds)))
+    initargs = (
+        shared.paths,
+        shared.feature_cols,
+        target_confidence,
+        threads_per_worker,
+        model_params,
+        bin_rows,
+    )
+
+    if multiprocessing.current_process().daemon:
+        # Celery prefork children are daemonic and multiprocessing refuses to
+        # start processes from them; billiard, Celery's fork of it, does not
+        results = _run_folds_billiard(folds, max_workers, initargs)
+    else:
+        results = _run_folds_executor(folds, max_workers, initargs)
+
+    for split_index, outcome in results:
+        if on_fold_done:
+            on_fold_done(split_index, outcome)
+
+
+def _run_folds_executor(
+    folds: List[Dict], max_workers: int, initargs: tuple
+) -> Iterator[Tuple[int, Optional[Tuple[dict, EnsembleModel]]]]:
+    """Yield fold outcomes in completion order from a ProcessPoolExecutor."""
+    # spawn, not fork: forking a parent that already initialised OpenMP can deadlock the boosters
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=initargs,
+    ) as executor:
+        futures = [executor.submit(_run_fold, fold) for fold in folds]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _run_folds_billiard(
+    folds: List[Dict], max_workers: int, initargs: tuple
+) -> Iterator[Tuple[int, Optional[Tuple[dict, EnsembleModel]]]]:
+    """Yield fold outcomes in completion order from a billiard pool."""
+    import billiard
+
+    done: queue.Queue = queue.Queue()
+    pool = billiard.get_context("spawn").Pool(
+        processes=max_workers, initializer=_init_worker, initargs=initargs
+    )
+    try:
+        for fold in folds:
+            pool.apply_async(
+                _run_fold,
+                (fold,),
+                callback=lambda result: done.put((result, None)),
+                error_callback=lambda exc: done.put((None, exc)),
+            )
+        for _ in folds:
+            result, exc = done.get()
+            if exc is not None:
+                raise exc
+            yield result
+    except BaseException:
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
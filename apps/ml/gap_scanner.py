@@ -0,0 +1,253 @@
+"""
+Set-based detection of missing candles in the ``ohlcv`` table.
+
+Each stored bar is compared with its predecessor through
+``LAG(timestamp) OVER (PARTITION BY symbol, timeframe ORDER BY timestamp)``,
+so the database walks the ``(symbol, timeframe, timestamp)`` unique index
+once and only the gaps themselves are returned to Python. The periodic scan
+is incremental: ``gap_scan_state`` keeps, per pair, the newest bar already
+scanned and the next pass starts from it.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import Integer, and_, case, cast, func, literal, not_, or_, select
+from sqlalchemy.orm import Session
+
+from apps.api.db.models import OHLCV, GapScanState, TimeFrame
+from apps.ml.market_data import bulk_upsert
+
+logger = logging.getLogger(__name__)
+
+# A step longer than this many bar intervals is a gap
+GAP_TOLERANCE = 1.5
+
+TIMEFRAME_SECONDS: Dict[TimeFrame, int] = {
+    TimeFrame.M1: 60,
+    TimeFrame.M5: 300,
+    TimeFrame.M15: 900,
+    TimeFrame.H1: 3600,
+    TimeFrame.H4: 14400,
+    TimeFrame.D1: 86400,
+}
+
+
+@dataclass(frozen=True)
+class Gap:
+    """Missing bars between two stored candles of one (symbol, timeframe)."""
+
+    symbol: str
+    timeframe: TimeFrame
+    start: datetime  # Last stored bar before the hole
+    end: datetime  # First stored bar after the hole
+
+    @property
+    def interval(self) -> timedelta:
+        return timedelta(seconds=TIMEFRAME_SECONDS[self.timeframe])
+
+    @property
+    def missing_bars(self) -> int:
+        return max(0, int((self.end - self.start) / self.interval) - 1)
+
+
+def _epoch_seconds(column, dialect_name: str):
+    """Dialect-specific seconds-since-epoch of a timestamp column."""
+    if dialect_name == "sqlite":
+        return cast(func.strftime("%s", column), Integer)
+    return func.extract("epoch", column)
+
+
+def _pair_filters(exclude: Optional[Iterable[Tuple[str, TimeFrame]]]) -> list:
+    return [
+        not_(and_(OHLCV.symbol == symbol, OHLCV.timeframe == timeframe))
+        for symbol, timeframe in (exclude or ())
+    ]
+
+
+def find_gaps(
+    db: Session,
+    symbol: Optional[str] = None,
+    timeframe: Optional[TimeFrame] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    incremental: bool = False,
+    exclude: Optional[Iterable[Tuple[str, TimeFrame]]] = None,
+) -> List[Gap]:
+    """
+    Find holes in the stored candles with one window-function query.
+
+    Args:
+        db: SQLAlchemy session
+        symbol: Restrict to one symbol (default: all)
+        timeframe: Restrict to one timeframe (default: all)
+        start: Ignore bars before this timestamp
+        end: Ignore bars after this timestamp
+        incremental: Only look at bars at or after each pair's stored high-water mark
+        exclude: (symbol, timeframe) pairs to skip
+
+    Returns:
+        Gaps ordered by symbol, timeframe and start
+    """
+    gaps, _ = _find_gaps_and_marks(
+        db,
+        symbol=symbol,
+        timeframe=timeframe,
+        start=start,
+        end=end,
+        incremental=incremental,
+        exclude=exclude,
+    )
+    return gaps
+
+
+def _find_gaps_and_marks(
+    db: Session,
+    symbol: Optional[str] = None,
+    timeframe: Optional[TimeFrame] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    incremental: bool = False,
+    exclude: Optional[Iterable[Tuple[str, TimeFrame]]] = None,
+    with_marks: bool = False,
+) -> Tuple[List[Gap], List[Tuple[str, TimeFrame, datetime]]]:
+    """
+    Gaps and, with ``with_marks``, the newest bar of every pair that gained bars.
+
+    Both come out of the same statement, so they describe one snapshot: a
+    candle written while the scan runs is neither checked nor marked scanned.
+    """
+    filters = _pair_filters(exclude)
+    if symbol is not None:
+        filters.append(OHLCV.symbol == symbol)
+    if timeframe is not None:
+        filters.append(OHLCV.timeframe == timeframe)
+    if start is not None:
+        filters.append(OHLCV.timestamp >= start)
+    if end is not None:
+        filters.append(OHLCV.timestamp <= end)
+
+    pair = (OHLCV.symbol, OHLCV.timeframe)
+    columns = [
+        OHLCV.symbol,
+        OHLCV.timeframe,
+        OHLCV.timestamp,
+        func.lag(OHLCV.timestamp, type_=OHLCV.timestamp.type)
+        .over(partition_by=pair, order_by=OHLCV.timestamp)
+        .label("prev_ts"),
+    ]
+    if with_marks:
+        columns.append(func.max(OHLCV.timestamp).over(partition_by=pair).label("newest"))
+    lagged = select(*columns)
+    if incremental:
+        # The bar at the mark itself is kept so a hole right after it is still seen
+        lagged = lagged.add_columns(GapScanState.scanned_until).outerjoin(
+            GapScanState,
+            and_(GapScanState.symbol == OHLCV.symbol, GapScanState.timeframe == OHLCV.timeframe),
+        )
+        filters.append(
+            or_(GapScanState.scanned_until.is_(None), OHLCV.timestamp >= GapScanState.scanned_until)
+        )
+    lagged = lagged.where(*filters).subquery()
+
+    dialect_name = db.get_bind().dialect.name
+    expected = case(
+        *[(lagged.c.timeframe == tf, seconds) for tf, seconds in TIMEFRAME_SECONDS.items()]
+    )
+    step = _epoch_seconds(lagged.c.timestamp, dialect_name) - _epoch_seconds(
+        lagged.c.prev_ts, dialect_name
+    )
+    is_gap = and_(lagged.c.prev_ts.isnot(None), step > expected * GAP_TOLERANCE)
+
+    if not with_marks:
+        query = (
+            select(lagged.c.symbol, lagged.c.timeframe, lagged.c.prev_ts, lagged.c.timestamp)
+            .where(is_gap)
+            .order_by(lagged.c.symbol, lagged.c.timeframe, lagged.c.prev_ts)
+        )
+        gaps = [
+            Gap(symbol=row[0], timeframe=row[1], start=row[2], end=row[3])
+            for row in db.execute(query)
+        ]
+        return gaps, []
+
+    scanned_until = lagged.c.scanned_until if incremental else literal(None)
+    # Gap rows plus each pair's newest row, which carries the new mark
+    query = (
+        select(
+            lagged.c.symbol,
+            lagged.c.timeframe,
+            lagged.c.prev_ts,
+            lagged.c.timestamp,
+            is_gap.label("is_gap"),
+            lagged.c.newest,
+            scanned_until,
+        )
+        .where(or_(is_gap, lagged.c.timestamp == lagged.c.newest))
+        .order_by(lagged.c.symbol, lagged.c.timeframe, lagged.c.prev_ts)
+    )
+
+    gaps, marks = [], []
+    for row in db.execute(query):
+        if row[4]:
+            gaps.append(Gap(symbol=row[0], timeframe=row[1], start=row[2], end=row[3]))
+        if row[3] == row[5] and (row[6] is None or row[5] > row[6]):
+            marks.append((row[0], row[1], row[5]))
+    return gaps, marks
+
+
+def scan_gaps(
+    db: Session, exclude: Optional[Iterable[Tuple[str, TimeFrame]]] = None, commit: bool = True
+) -> List[Gap]:
+    """
+    Incrementally scan the whole ``ohlcv`` table and advance the high-water marks.
+
+    Only bars at or after each pair's ``scanned_until`` are read, so the
+    periodic pass costs roughly the candles written since the previous one.
+    The new marks come from the same query as the gaps, so bars inserted
+    during the scan stay above the mark for the next pass. The marks are
+    written into the session's transaction.
+
+    Args:
+        db: SQLAlchemy session
+        exclude: (symbol, timeframe) pairs to leave for a later scan, e.g.
+                 pairs a backfill is still writing
+        commit: Commit the marks. Pass False to commit them together with the
+                repair jobs for the returned gaps: if the jobs are never
+                created, the marks do not move and the next scan finds the
+                gaps again
+
+    Returns:
+        Gaps found since the previous scan
+    """
+    gaps, newest = _find_gaps_and_marks(db, incremental=True, exclude=exclude, with_marks=True)
+
+    now = datetime.utcnow()
+    marks = pd.DataFrame(
+        [(symbol, timeframe, scanned_until, now) for symbol, timeframe, scanned_until in newest],
+        columns=["symbol", "timeframe", "scanned_until", "updated_at"],
+    )
+    bulk_upsert(
+        db,
+        GapScanState.__table__,
+        marks,
+        conflict_columns=["symbol", "timeframe"],
+        update_columns=["scanned_until", "updated_at"],
+        method="statement",
+    )
+    if commit:
+        db.commit()
+
+    logger.info("Gap scan advanced %d pairs and found %d gaps", len(marks), len(gaps))
+    return gaps
+
+
+def group_gaps(gaps: List[Gap]) -> Dict[Tuple[str, TimeFrame], List[Gap]]:
+    """Gaps keyed by (symbol, timeframe), each list ordered by start."""
+    grouped: Dict[Tuple[str, TimeFrame], List[Gap]] = {}
+    for gap in sorted(gaps, key=lambda item: (item.symbol, item.timeframe.value, item.start)):
+        grouped.setdefault((gap.symbol, gap.timeframe), []).append(gap)
+    return grouped
@@ -0,0 +1,156 @@
+"""
+Array kernels for recursive indicators.
+
+Indicators whose value depends on the previous bar (Supertrend's trend
+state) cannot be expressed as a single rolling window. Each one has a
+scalar recurrence kernel, compiled with numba when it is installed, and an
+equivalent vectorized NumPy formulation used otherwise. Both operate on
+contiguous float64 arrays and return arrays; the pandas wrappers only attach
+the index.
+
+The wrappers also accept wide DataFrames (time x symbol, see
+``apps.ml.panel_features``) and then compute every column at once.
+"""
+
+import logging
+from typing import Tuple, TypeVar
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# A Series, or a wide DataFrame with one column per symbol
+PandasObj = TypeVar("PandasObj", pd.Series, pd.DataFrame)
+
+
+def _as_array(values: PandasObj) -> np.ndarray:
+    return np.ascontiguousarray(values.to_numpy(dtype=np.float64))
+
+
+def _wrap(values: np.ndarray, like: PandasObj) -> PandasObj:
+    if isinstance(like, pd.DataFrame):
+        return pd.DataFrame(values, index=like.index, columns=like.columns)
+    return pd.Series(values, index=like.index)
+
+
+def true_range(high: PandasObj, low: PandasObj, close: PandasObj) -> PandasObj:
+    """
+    True range: the largest of high-low, |high - previous close| and |low - previous close|.
+
+    NaN terms are skipped (the first bar has no previous close), like
+    ``pd.concat([...], axis=1).max(axis=1)``.
+    """
+    high_values = _as_array(high)
+    low_values = _as_array(low)
+    close_values = _as_array(close)
+    prev_close = np.full_like(close_values, np.nan)
+    prev_close[1:] = close_values[:-1]
+    result = np.fmax(
+        np.fmax(high_values - low_values, np.abs(high_values - prev_close)),
+        np.abs(low_values - prev_close),
+    )
+    return _wrap(result, high)
+
+
+def _supertrend_kernel(
+    close: np.ndarray, upper: np.ndarray, lower: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scalar recurrence: the trend flips up when the close breaks the previous
+    upper band, down when it breaks the previous lower band, and is carried
+    over otherwise. It stays NaN until the first breakout.
+    """
+    n = close.shape[0]
+    direction = np.full(n, np.nan)
+    supertrend = np.full(n, np.nan)
+
+    for i in range(1, n):
+        if close[i] > upper[i - 1]:
+            direction[i] = 1.0
+        elif close[i] < lower[i - 1]:
+            direction[i] = -1.0
+        else:
+            direction[i] = direction[i - 1]
+        supertrend[i] = lower[i] if direction[i] == 1.0 else upper[i]
+
+    return supertrend, direction
+
+
+if NUMBA_AVAILABLE:
+    _supertrend_kernel_jit = numba.njit(cache=True)(_supertrend_kernel)
+
+
+def _supertrend_numpy(
+    close: np.ndarray, upper: np.ndarray, lower: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized ``_supertrend_kernel``.
+
+    The recurrence only ever copies the previous state, so the trend is the
+    last breakout signal forward-filled: mark the bars that break a band and
+    carry each mark forward with a running maximum over their positions.
+    2-D inputs (time x symbol) are processed column-wise in the same pass.
+    """
+    n = close.shape[0]
+    supertrend = np.full(close.shape, np.nan)
+    if n < 2:
+        return supertrend, np.full(close.shape, np.nan)
+
+    signal = np.full(close.shape, np.nan)
+    signal[1:] = np.where(
+        close[1:] > upper[:-1], 1.0, np.where(close[1:] < lower[:-1], -1.0, np.nan)
+    )
+    positions = np.arange(n).reshape((n,) + (1,) * (close.ndim - 1))
+    last_mark = np.maximum.accumulate(np.where(np.isnan(signal), -1, positions), axis=0)
+    direction = np.take_along_axis(signal, np.maximum(last_mark, 0), axis=0)
+    direction[last_mark < 0] = np.nan
+
+    supertrend[1:] = np.where(direction[1:] == 1.0, lower[1:], upper[1:])
+    return supertrend, direction
+
+
+def supertrend(
+    high: PandasObj, low: PandasObj, close: PandasObj, atr: PandasObj, multiplier: float = 3.0
+) -> Tuple[PandasObj, PandasObj]:
+    """
+    Supertrend line and trend direction (1 up, -1 down, NaN before the first breakout).
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        atr: Average true range aligned with the prices
+        multiplier: Band width in ATRs around the high/low midpoint
+
+    Returns:
+        (supertrend, direction) shaped like ``close``
+    """
+    hl_avg = (_as_array(high) + _as_array(low)) / 2
+    atr_values = _as_array(atr)
+    upper = hl_avg + multiplier * atr_values
+    lower = hl_avg - multiplier * atr_values
+    close_values = _as_array(close)
+
+    if NUMBA_AVAILABLE and close_values.ndim == 1:
+        line, direction = _supertrend_kernel_jit(close_values, upper, lower)
+    elif NUMBA_AVAILABLE:
+        line = np.empty_like(close_values)
+        direction = np.empty_like(close_values)
+        for j in range(close_values.shape[1]):
+            line[:, j], direction[:, j] = _supertrend_kernel_jit(
+                np.ascontiguousarray(close_values[:, j]),
+                np.ascontiguousarray(upper[:, j]),
+                np.ascontiguousarray(lower[:, j]),
+            )
+    else:
+        line, direction = _supertrend_numpy(close_values, upper, lower)
+    return _wrap(line, close), _wrap(direction, close)
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from typing import Tuple
+from numpy.lib.stride_tricks import sliding_window_view
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,13 +21,15 @@ class TripleBarrierLabeling:
         use_atr: bool = False,
         atr_column: str = 'atr_14',
         tp_atr_multiplier: float = 1.0,
-        sl_atr_multiplier: float = 1.5
+        sl_atr_multiplier: float = 1.5,
+        max_chunk_bytes: int = 32 * 1024 * 1024,
     ):
         """
         Args:
             tp_pct: Take profit threshold (e.g., 0.02 = 2%)
             sl_pct: Stop loss threshold (e.g., 0.01 = 1%)
             time_bars: Maximum holding period in bars
+            max_chunk_bytes: Memory budget for the per-chunk first-touch masks
         """
         self.tp_pct = tp_pct
         self.sl_pct = sl_pct
@@ -35,14 +38,20 @@ class TripleBarrierLabeling:
         self.atr_column = atr_column
         self.tp_atr_multiplier = tp_atr_multiplier
         self.sl_atr_multiplier = sl_atr_multiplier
+        self.max_chunk_bytes = max_chunk_bytes
 
     def label_data(self, df: pd.DataFrame, side: str = 'long', progress_callback=None) -> pd.DataFrame:
         """
         Apply triple barrier labeling to OHLCV data.
 
+        First-touch indices for all rows are computed in chunks over a strided
+        view of the future highs/lows, so memory stays bounded by
+        ``max_chunk_bytes`` regardless of history length.
+
         Args:
             df: DataFrame with OHLCV data
             side: 'long' or 'short'
+            progress_callback: Optional callable receiving progress (0-100) per chunk
 
         Returns:
             DataFrame with labels: hit_barrier, bars_to_hit, return_pct
@@ -68,97 +77,113 @@ class TripleBarrierLabeling:
             ])
 
         timestamps = df['timestamp'].to_numpy()
-        close = df['close'].to_numpy()
-        high = df['high'].to_numpy()
-        low = df['low'].to_numpy()
-        atr = None
-
-        if self.use_atr and self.atr_column in df.columns:
-            atr = df[self.atr_column].to_numpy()
-
-        labels = []
+        close = df['close'].to_numpy(dtype=np.float64)
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
         time_bars = self.time_bars
-        log_interval = max(1, total_rows // 10)
-
-        for i in range(total_rows):
-            if i > 0 and i % log_interval == 0:
-                progress = (i / total_rows) * 100
-                logger.info(f"Labeling progress: {progress:.1f}% ({i}/{total_rows})")
-                if progress_callback:
-                    progress_callback(progress)
-
-            entry_price = close[i]
-
-            atr_value = None
-            if atr is not None:
-                atr_value = atr[i]
-                if pd.isna(atr_value) or atr_value <= 0:
-                    atr_value = None
-
-            if atr_value is not None:
-                if side == 'long':
-                    tp_price = entry_price + (atr_value * self.tp_atr_multiplier)
-                    sl_price = entry_price - (atr_value * self.sl_atr_multiplier)
-                else:
-                    tp_price = entry_price - (atr_value * self.tp_atr_multiplier)
-                    sl_price = entry_price + (atr_value * self.sl_atr_multiplier)
-            else:
-                if side == 'long':
-                    tp_price = entry_price * (1 + self.tp_pct)
-                    sl_price = entry_price * (1 - self.sl_pct)
-                else:
-                    tp_price = entry_price * (1 - self.tp_pct)
-                    sl_price = entry_price * (1 + self.sl_pct)
 
-            future_slice = slice(i + 1, i + 1 + time_bars)
-            future_high = high[future_slice]
-            future_low = low[future_slice]
+        entry_price = close[:total_rows]
+        tp_price, sl_price = self._compute_barriers(df, entry_price, total_rows, side)
 
-            hit_barrier = 'time'
-            bars_to_hit = time_bars
-            exit_price = close[i + time_bars]
+        # Row i sees bars i+1 .. i+time_bars; no data is copied here
+        future_high = sliding_window_view(high[1:], time_bars)[:total_rows]
+        future_low = sliding_window_view(low[1:], time_bars)[:total_rows]
 
-            if side == 'long':
-                tp_hits = np.where(future_high >= tp_price)[0]
-                sl_hits = np.where(future_low <= sl_price)[0]
-            else:
-                tp_hits = np.where(future_low <= tp_price)[0]
-                sl_hits = np.where(future_high >= sl_price)[0]
+        first_tp = np.zeros(total_rows, dtype=np.int64)
+        first_sl = np.zeros(total_rows, dtype=np.int64)
+        has_tp = np.zeros(total_rows, dtype=bool)
+        has_sl = np.zeros(total_rows, dtype=bool)
 
-            first_tp = tp_hits[0] + 1 if tp_hits.size else None
-            first_sl = sl_hits[0] + 1 if sl_hits.size else None
+        # Two boolean (rows x time_bars) masks are alive per chunk
+        chunk_rows = max(1, self.max_chunk_bytes // (2 * time_bars))
 
-            if first_tp is not None and (first_sl is None or first_tp <= first_sl):
-                hit_barrier = 'tp'
-                bars_to_hit = first_tp
-                exit_price = tp_price
-            elif first_sl is not None:
-                hit_barrier = 'sl'
-                bars_to_hit = first_sl
-                exit_price = sl_price
+        for start in range(0, total_rows, chunk_rows):
+            end = min(start + chunk_rows, total_rows)
 
             if side == 'long':
-                return_pct = (exit_price - entry_price) / entry_price
+                tp_mask = future_high[start:end] >= tp_price[start:end, None]
+                sl_mask = future_low[start:end] <= sl_price[start:end, None]
             else:
-                return_pct = (entry_price - exit_price) / entry_price
-
-            labels.append({
-                'timestamp': timestamps[i],
-                'side': side,
-                'tp_barrier': tp_price,
-                'sl_barrier': sl_price,
-                'time_barrier': time_bars,
-                'hit_barrier': hit_barrier,
-                'bars_to_hit': bars_to_hit,
-                'return_pct': return_pct
-            })
+                tp_mask = future_low[start:end] <= tp_price[start:end, None]
+                sl_mask = future_high[start:end] >= sl_price[start:end, None]
+
+            has_tp[start:end] = tp_mask.any(axis=1)
+            has_sl[start:end] = sl_mask.any(axis=1)
+            first_tp[start:end] = tp_mask.argmax(axis=1) + 1
+            first_sl[start:end] = sl_mask.argmax(axis=1) + 1
+
+            if progress_callback and end < total_rows:
+                progress = (end / total_rows) * 100
+                logger.info(f"Labeling progress: {progress:.1f}% ({end}/{total_rows})")
+                progress_callback(progress)
+
+        # TP wins ties, matching a bar that touches both barriers
+        tp_first = has_tp & (~has_sl | (first_tp <= first_sl))
+        sl_first = has_sl & ~tp_first
+
+        hit_barrier = np.full(total_rows, "time", dtype=object)
+        hit_barrier[tp_first] = "tp"
+        hit_barrier[sl_first] = "sl"
+
+        bars_to_hit = np.full(total_rows, time_bars, dtype=np.int64)
+        bars_to_hit[tp_first] = first_tp[tp_first]
+        bars_to_hit[sl_first] = first_sl[sl_first]
+
+        exit_price = close[time_bars : time_bars + total_rows].copy()
+        exit_price[tp_first] = tp_price[tp_first]
+        exit_price[sl_first] = sl_price[sl_first]
+
+        if side == "long":
+            return_pct = (exit_price - entry_price) / entry_price
+        else:
+            return_pct = (entry_price - exit_price) / entry_price
+
+        labels = pd.DataFrame(
+            {
+                "timestamp": timestamps[:total_rows],
+                "side": np.full(total_rows, side, dtype=object),
+                "tp_barrier": tp_price,
+                "sl_barrier": sl_price,
+                "time_barrier": np.full(total_rows, time_bars, dtype=np.int64),
+                "hit_barrier": hit_barrier,
+                "bars_to_hit": bars_to_hit,
+                "return_pct": return_pct,
+            }
+        )
 
         # Call progress callback with 100% when labeling is complete
         if progress_callback:
             progress_callback(100.0)
 
         logger.info(f"Labeling complete: {len(labels)} labels created")
-        return pd.DataFrame(labels)
+        return labels
+
+    def _compute_barriers(
+        self, df: pd.DataFrame, entry_price: np.ndarray, total_rows: int, side: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute per-row TP/SL prices, using ATR where it is valid and percentages otherwise."""
+        if side == "long":
+            tp_price = entry_price * (1 + self.tp_pct)
+            sl_price = entry_price * (1 - self.sl_pct)
+        else:
+            tp_price = entry_price * (1 - self.tp_pct)
+            sl_price = entry_price * (1 + self.sl_pct)
+
+        if self.use_atr and self.atr_column in df.columns:
+            atr = df[self.atr_column].to_numpy(dtype=np.float64)[:total_rows]
+            valid = ~np.isnan(atr) & (atr > 0)
+
+            if side == "long":
+                atr_tp = entry_price + (atr * self.tp_atr_multiplier)
+                atr_sl = entry_price - (atr * self.sl_atr_multiplier)
+            else:
+                atr_tp = entry_price - (atr * self.tp_atr_multiplier)
+                atr_sl = entry_price + (atr * self.sl_atr_multiplier)
+
+            tp_price = np.where(valid, atr_tp, tp_price)
+            sl_price = np.where(valid, atr_sl, sl_price)
+
+        return tp_price, sl_price
 
     def create_binary_labels(self, labels_df: pd.DataFrame) -> pd.Series:
         """
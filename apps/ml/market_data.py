@@ -0,0 +1,372 @@
+"""
+Columnar OHLCV access layer.
+
+Reads candles from the ``ohlcv`` table straight into typed NumPy columns
+instead of materializing one ORM object (and one dict) per bar. On Postgres
+with psycopg2 the rows are streamed with ``COPY ... TO STDOUT``; every other
+backend uses a server-side cursor read in fixed-size partitions.
+
+Writes go the other way through ``bulk_upsert``: on Postgres the frame is
+streamed with ``COPY ... FROM STDIN`` into a temporary staging table and
+merged with one set-based ``INSERT ... SELECT ... ON CONFLICT``; other
+backends fall back to batched multi-row ``INSERT ... ON CONFLICT``
+statements.
+"""
+
+import logging
+import tempfile
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Table, and_, func, select
+from sqlalchemy.orm import Session
+
+from apps.api.db.models import OHLCV, TimeFrame
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+PRICE_COLUMNS = OHLCV_COLUMNS[1:]
+
+# Rows fetched per round trip on the cursor path
+DEFAULT_CHUNK_SIZE = 50_000
+# COPY output larger than this spills from memory to a temporary file
+COPY_SPOOL_BYTES = 64 * 1024 * 1024
+# Rows per executemany call on the fallback write path
+UPSERT_BATCH_ROWS = 5000
+
+
+def empty_ohlcv_frame() -> pd.DataFrame:
+    """Typed, empty OHLCV frame."""
+    frame = pd.DataFrame({col: pd.Series(dtype=np.float64) for col in PRICE_COLUMNS})
+    frame.insert(0, "timestamp", pd.Series(dtype="datetime64[ns]"))
+    return frame
+
+
+def _resolve_timeframe(timeframe: Union[str, TimeFrame]) -> TimeFrame:
+    if isinstance(timeframe, TimeFrame):
+        return timeframe
+    if isinstance(timeframe, Enum):
+        timeframe = timeframe.value
+    return TimeFrame(str(timeframe))
+
+
+def _build_query(
+    symbol: str,
+    timeframe: TimeFrame,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    limit: Optional[int],
+    latest: bool,
+):
+    conditions = [OHLCV.symbol == symbol, OHLCV.timeframe == timeframe]
+    if start is not None:
+        conditions.append(OHLCV.timestamp >= start)
+    if end is not None:
+        conditions.append(OHLCV.timestamp <= end)
+
+    order = OHLCV.timestamp.desc() if latest else OHLCV.timestamp.asc()
+    query = (
+        select(
+            OHLCV.timestamp,
+            OHLCV.open,
+            OHLCV.high,
+            OHLCV.low,
+            OHLCV.close,
+            OHLCV.volume,
+        )
+        .where(and_(*conditions))
+        .order_by(order)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def _supports_copy(connection) -> bool:
+    dialect = connection.dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def _load_with_copy(connection, query) -> pd.DataFrame:
+    """Stream the query result through ``COPY ... TO STDOUT`` in CSV form."""
+    # Literal binds let SQLAlchemy render the Enum name and escape the symbol
+    select_sql = str(
+        query.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    )
+    dbapi_connection = connection.connection.dbapi_connection
+
+    with tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_BYTES, mode="w+b") as buffer:
+        with dbapi_connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY ({select_sql}) TO STDOUT WITH (FORMAT csv)", buffer)
+        buffer.seek(0)
+        frame = pd.read_csv(
+            buffer,
+            header=None,
+            names=OHLCV_COLUMNS,
+            dtype={col: np.float64 for col in PRICE_COLUMNS},
+            parse_dates=["timestamp"],
+            engine="c",
+        )
+
+    if frame.empty:
+        return empty_ohlcv_frame()
+    frame["timestamp"] = frame["timestamp"].astype("datetime64[ns]")
+    return frame
+
+
+def _load_with_cursor(
+    connection, query, chunk_size: int, capacity_hint: Optional[int]
+) -> pd.DataFrame:
+    """Read the query through a server-side cursor into preallocated columns."""
+    capacity = max(1, capacity_hint or chunk_size)
+    timestamps = np.empty(capacity, dtype="datetime64[us]")
+    values = np.empty((capacity, len(PRICE_COLUMNS)), dtype=np.float64)
+    size = 0
+
+    # Options go on the statement: Connection.execution_options() would change
+    # the session's shared connection for every later query in its transaction
+    result = connection.execute(query.execution_options(stream_results=True, yield_per=chunk_size))
+    for partition in result.partitions(chunk_size):
+        count = len(partition)
+        if size + count > capacity:
+            capacity = max(size + count, capacity * 2)
+            timestamps = np.resize(timestamps, capacity)
+            values = np.resize(values, (capacity, len(PRICE_COLUMNS)))
+
+        ts_chunk, price_chunk = zip(*((row[0], row[1:]) for row in partition))
+        timestamps[size : size + count] = np.array(ts_chunk, dtype="datetime64[us]")
+        values[size : size + count] = np.array(price_chunk, dtype=np.float64)
+        size += count
+
+    if size == 0:
+        return empty_ohlcv_frame()
+
+    frame = pd.DataFrame(values[:size], columns=PRICE_COLUMNS)
+    frame.insert(0, "timestamp", timestamps[:size].astype("datetime64[ns]"))
+    return frame
+
+
+def load_ohlcv(
+    db: Session,
+    symbol: str,
+    timeframe: Union[str, TimeFrame],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    latest: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Load OHLCV candles as a typed, timestamp-ascending DataFrame.
+
+    Args:
+        db: SQLAlchemy session (the read joins its current transaction)
+        symbol: Trading pair, e.g. 'BTC/USDT'
+        timeframe: TimeFrame or its string value, e.g. '15m'
+        start: Inclusive lower timestamp bound
+        end: Inclusive upper timestamp bound
+        limit: Maximum number of candles
+        latest: With ``limit``, take the most recent candles instead of the oldest
+        chunk_size: Rows fetched per round trip on the cursor path
+
+    Returns:
+        DataFrame with datetime64 ``timestamp`` and float64 open/high/low/close/volume
+    """
+    query = _build_query(symbol, _resolve_timeframe(timeframe), start, end, limit, latest)
+    connection = db.connection()
+
+    if _supports_copy(connection):
+        frame = _load_with_copy(connection, query)
+    else:
+        frame = _load_with_cursor(connection, query, chunk_size, limit)
+
+    if latest and not frame.empty:
+        frame = frame.iloc[::-1].reset_index(drop=True)
+
+    logger.debug("Loaded %d OHLCV bars for %s %s", len(frame), symbol, timeframe)
+    return frame
+
+
+def load_latest_ohlcv_many(
+    db: Session, symbols: Iterable[str], timeframe: Union[str, TimeFrame], limit: int
+) -> Dict[str, pd.DataFrame]:
+    """
+    Load the most recent ``limit`` candles of several symbols in one query.
+
+    Rows are ranked per symbol with ``ROW_NUMBER() OVER (PARTITION BY symbol
+    ORDER BY timestamp DESC)`` so the database returns every window in a
+    single round trip instead of one query per symbol.
+
+    Args:
+        db: SQLAlchemy session (the read joins its current transaction)
+        symbols: Trading pairs, e.g. ['BTC/USDT', 'ETH/USDT']
+        timeframe: TimeFrame or its string value, e.g. '15m'
+        limit: Candles per symbol
+
+    Returns:
+        Timestamp-ascending OHLCV frame per requested symbol (empty if it has no data)
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+
+    ranked = (
+        select(
+            OHLCV.symbol,
+            OHLCV.timestamp,
+            OHLCV.open,
+            OHLCV.high,
+            OHLCV.low,
+            OHLCV.close,
+            OHLCV.volume,
+            func.row_number()
+            .over(partition_by=OHLCV.symbol, order_by=OHLCV.timestamp.desc())
+            .label("bar_rank"),
+        )
+        .where(and_(OHLCV.symbol.in_(symbols), OHLCV.timeframe == _resolve_timeframe(timeframe)))
+        .subquery()
+    )
+    query = (
+        select(*(ranked.c[col] for col in ["symbol"] + OHLCV_COLUMNS))
+        .where(ranked.c.bar_rank <= limit)
+        .order_by(ranked.c.symbol, ranked.c.timestamp)
+    )
+
+    rows = db.connection().execute(query).all()
+    frames = {symbol: empty_ohlcv_frame() for symbol in symbols}
+    if not rows:
+        return frames
+
+    row_symbols = np.array([row[0] for row in rows], dtype=object)
+    timestamps = np.array([row[1] for row in rows], dtype="datetime64[us]").astype("datetime64[ns]")
+    values = np.array([row[2:] for row in rows], dtype=np.float64)
+
+    # Rows arrive grouped by symbol; slice each contiguous run
+    boundaries = np.flatnonzero(row_symbols[1:] != row_symbols[:-1]) + 1
+    for start, stop in zip(np.r_[0, boundaries], np.r_[boundaries, len(rows)]):
+        frame = pd.DataFrame(values[start:stop], columns=PRICE_COLUMNS)
+        frame.insert(0, "timestamp", timestamps[start:stop])
+        frames[row_symbols[start]] = frame
+
+    logger.debug(
+        "Loaded latest %d bars for %d symbols %s in one query", limit, len(symbols), timeframe
+    )
+    return frames
+
+
+def _insert_statement(dialect_name: str, table: Table):
+    """Dialect-specific INSERT supporting ``on_conflict_do_update``."""
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(table)
+
+
+def _upsert_with_statements(
+    connection,
+    table: Table,
+    frame: pd.DataFrame,
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> None:
+    """Fallback write path: one compiled ``INSERT ... ON CONFLICT DO UPDATE`` run as executemany."""
+    stmt = _insert_statement(connection.dialect.name, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={column: stmt.excluded[column] for column in update_columns},
+    )
+    records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    for offset in range(0, len(records), UPSERT_BATCH_ROWS):
+        connection.execute(stmt, records[offset : offset + UPSERT_BATCH_ROWS])
+
+
+def _upsert_with_copy(
+    connection,
+    table: Table,
+    frame: pd.DataFrame,
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> None:
+    """Stream the frame into a temporary staging table with COPY and merge it in one statement."""
+    preparer = connection.dialect.identifier_preparer
+    columns = ", ".join(preparer.quote(column) for column in frame.columns)
+    target = preparer.format_table(table)
+    staging = preparer.quote(f"staging_{table.name}")
+    conflict = ", ".join(preparer.quote(column) for column in conflict_columns)
+    assignments = ", ".join(
+        f"{preparer.quote(column)} = EXCLUDED.{preparer.quote(column)}" for column in update_columns
+    )
+
+    # Enum columns are stored by member name, which is what COPY has to receive
+    payload = frame.copy()
+    for column in payload.columns:
+        if payload[column].dtype == object:
+            payload[column] = payload[column].map(
+                lambda value: value.name if isinstance(value, Enum) else value
+            )
+
+    dbapi_connection = connection.connection.dbapi_connection
+    with tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_BYTES, mode="w+") as buffer:
+        payload.to_csv(buffer, index=False, header=False, date_format="%Y-%m-%d %H:%M:%S.%f")
+        buffer.seek(0)
+        with dbapi_connection.cursor() as cursor:
+            # Temp tables are not WAL-logged; ON COMMIT DROP ties the staging table to this transaction
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {staging} ON COMMIT DROP AS "
+                f"SELECT {columns} FROM {target} WITH NO DATA"
+            )
+            cursor.execute(f"TRUNCATE {staging}")
+            cursor.copy_expert(f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+            cursor.execute(
+                f"INSERT INTO {target} ({columns}) SELECT {columns} FROM {staging} "
+                f"ON CONFLICT ({conflict}) DO UPDATE SET {assignments}"
+            )
+
+
+def bulk_upsert(
+    db: Session,
+    table: Table,
+    frame: pd.DataFrame,
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+    method: str = "auto",
+) -> int:
+    """
+    Insert-or-update the rows of ``frame`` into ``table`` without ORM objects.
+
+    The write joins the session's current transaction; the caller commits.
+    Rows repeating a conflict key are collapsed to the last occurrence, since
+    one ``ON CONFLICT DO UPDATE`` cannot touch the same row twice.
+
+    Args:
+        db: SQLAlchemy session
+        table: Target table (e.g. ``OHLCV.__table__``)
+        frame: One column per target column to write
+        conflict_columns: Columns of the unique constraint to merge on
+        update_columns: Columns overwritten when the row already exists
+        method: 'copy' (Postgres + psycopg2 only), 'statement', or 'auto'
+
+    Returns:
+        Number of rows written
+    """
+    if frame.empty:
+        return 0
+
+    frame = frame.drop_duplicates(subset=list(conflict_columns), keep="last")
+    connection = db.connection()
+
+    use_copy = _supports_copy(connection) if method == "auto" else method == "copy"
+    if use_copy:
+        _upsert_with_copy(connection, table, frame, conflict_columns, update_columns)
+    else:
+        _upsert_with_statements(connection, table, frame, conflict_columns, update_columns)
+
+    logger.debug(
+        "Upserted %d rows into %s via %s", len(frame), table.name, "COPY" if use_copy else "INSERT"
+    )
+    return len(frame)
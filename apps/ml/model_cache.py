@@ -0,0 +1,253 @@
+"""
+Process-wide cache of deserialized models.
+
+Loading an EnsembleModel parses both boosters from disk, which dominates a
+signal cycle when it is repeated for every deployment on every tick. Loaded
+models are kept in an LRU keyed by (factory, model path, artifact
+fingerprint) and bounded by the on-disk size of their artifacts. A rewritten
+artifact changes the fingerprint, so stale models are never served; entries
+tagged with a (symbol, timeframe, version) are dropped when that deployment
+changes in the registry.
+
+The cache lives in the worker child process, so it only pays off while that
+process survives between ticks. ``signals.generate`` is therefore routed to
+its own ``signals`` queue, whose worker runs a single child that is recycled
+after a week of ticks or when it outgrows its memory limit, rather than after
+every task like the training and backfill workers.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from apps.api.config import settings
+
+logger = logging.getLogger(__name__)
+
+_model_cache: Optional["ModelCache"] = None
+_model_cache_lock = threading.Lock()
+
+
+def _artifact_fingerprint(path: Path) -> Optional[Tuple[Tuple[str, int, int], ...]]:
+    """(name, mtime_ns, size) of every file under ``path``; None if it does not exist."""
+    try:
+        if path.is_dir():
+            files = sorted(p for p in path.rglob("*") if p.is_file())
+        elif path.is_file():
+            files = [path]
+        else:
+            return None
+        return tuple(
+            (
+                str(p.relative_to(path)) if p != path else p.name,
+                p.stat().st_mtime_ns,
+                p.stat().st_size,
+            )
+            for p in files
+        )
+    except OSError:
+        return None
+
+
+class ModelCache:
+    """
+    Thread-safe LRU of loaded models with a memory budget.
+
+    The budget is measured as the artifact size on disk, which tracks the
+    in-memory size of the boosters closely enough to bound the cache.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_bytes: Budget for cached models (default: settings.MODEL_CACHE_MAX_BYTES)
+        """
+        self.max_bytes = int(max_bytes if max_bytes is not None else settings.MODEL_CACHE_MAX_BYTES)
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._registry_mtime: Optional[int] = None
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "uncached_loads": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "load_seconds": 0.0,
+        }
+
+    def get(
+        self,
+        model_path: str,
+        factory: Callable[[], Any],
+        tag: Optional[Tuple[str, str, str]] = None,
+    ) -> Any:
+        """
+        Return a loaded model for ``model_path``, loading it on a miss.
+
+        Args:
+            model_path: Directory (or file) passed to ``model.load``
+            factory: Zero-argument callable creating an unloaded model
+            tag: Optional (symbol, timeframe, version) used for invalidation
+
+        Returns:
+            Loaded model instance (shared; callers must not mutate it)
+        """
+        path = Path(model_path)
+        fingerprint = _artifact_fingerprint(path)
+
+        if fingerprint is None:
+            # Nothing on disk to fingerprint; let the model decide how to load
+            model, elapsed = self._load(model_path, factory)
+            with self._lock:
+                self._stats["uncached_loads"] += 1
+                self._stats["load_seconds"] += elapsed
+            return model
+
+        key = (factory, os.path.abspath(model_path), fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry["model"]
+
+        model, elapsed = self._load(model_path, factory)
+        size = sum(item[2] for item in fingerprint)
+
+        with self._lock:
+            self._stats["misses"] += 1
+            self._stats["load_seconds"] += elapsed
+            # Another artifact version of the same path can never be served again
+            for stale_key in [k for k in self._entries if k[0] is factory and k[1] == key[1]]:
+                del self._entries[stale_key]
+            self._entries[key] = {"model": model, "bytes": size, "tag": tag}
+            self._evict(keep=key)
+
+        logger.info("Loaded model %s in %.1f ms (cache miss)", model_path, elapsed * 1000)
+        return model
+
+    @staticmethod
+    def _load(model_path: str, factory: Callable[[], Any]) -> Tuple[Any, float]:
+        started = time.perf_counter()
+        model = factory()
+        model.load(model_path)
+        return model, time.perf_counter() - started
+
+    def _evict(self, keep: Tuple) -> None:
+        total = sum(entry["bytes"] for entry in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._entries.pop(key)["bytes"]
+            self._stats["evictions"] += 1
+
+    def invalidate(self, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> int:
+        """
+        Drop cached models, optionally only those tagged with ``symbol``/``timeframe``.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            doomed = [
+                key
+                for key, entry in self._entries.items()
+                if (symbol is None and timeframe is None)
+                or (
+                    entry["tag"] is not None
+                    and (symbol is None or entry["tag"][0] == symbol)
+                    and (timeframe is None or entry["tag"][1] == timeframe)
+                )
+            ]
+            for key in doomed:
+                del self._entries[key]
+            self._stats["invalidations"] += len(doomed)
+        return len(doomed)
+
+    def sync_registry(self, registry) -> None:
+        """
+        Drop models whose deployment changed since the registry index was last seen.
+
+        Deploys and rollbacks made by other processes only reach this one
+        through the registry's index file, so its mtime is checked each cycle.
+        """
+        index_file = getattr(registry, "index_file", None)
+        deployments = getattr(registry, "index", {}).get("deployments", {})
+        if index_file is None:
+            return
+
+        try:
+            mtime = Path(index_file).stat().st_mtime_ns
+        except (OSError, TypeError):
+            return
+
+        with self._lock:
+            if mtime == self._registry_mtime:
+                return
+            self._registry_mtime = mtime
+
+            deployed: Dict[Tuple[str, str], set] = {}
+            for deployment in deployments.values():
+                pair = (deployment.get("symbol"), deployment.get("timeframe"))
+                deployed.setdefault(pair, set()).add(deployment.get("version"))
+            doomed = [
+                key
+                for key, entry in self._entries.items()
+                if entry["tag"] is not None
+                and (entry["tag"][0], entry["tag"][1]) in deployed
+                and entry["tag"][2] not in deployed[(entry["tag"][0], entry["tag"][1])]
+            ]
+            for key in doomed:
+                del self._entries[key]
+            self._stats["invalidations"] += len(doomed)
+
+        if doomed:
+            logger.info("Dropped %d cached models after registry deployment change", len(doomed))
+
+    def stats(self) -> Dict[str, Any]:
+        """Cumulative counters plus current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = sum(entry["bytes"] for entry in self._entries.values())
+        return stats
+
+    def stats_since(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Hit rate and load latency accumulated since ``snapshot`` (a previous ``stats()``).
+
+        Returns:
+            Dict with hits, misses, hit_rate, load_ms_total and avg_load_ms
+        """
+        current = self.stats()
+        hits = current["hits"] - snapshot.get("hits", 0)
+        misses = current["misses"] - snapshot.get("misses", 0)
+        uncached = current["uncached_loads"] - snapshot.get("uncached_loads", 0)
+        load_ms = (current["load_seconds"] - snapshot.get("load_seconds", 0.0)) * 1000
+        loads = misses + uncached
+        lookups = hits + loads
+        return {
+            "hits": hits,
+            "misses": loads,
+            "hit_rate": hits / lookups if lookups else None,
+            "load_ms_total": round(load_ms, 3),
+            "avg_load_ms": round(load_ms / loads, 3) if loads else None,
+            "entries": current["entries"],
+            "bytes": current["bytes"],
+        }
+
+
+def get_model_cache() -> ModelCache:
+    """Process-wide model cache."""
+    global _model_cache
+    if _model_cache is None:
+        with _model_cache_lock:
+            if _model_cache is None:
+                _model_cache = ModelCache()
+    return _model_cache
@@ -6,6 +6,7 @@ from typing import Dict, List, Optional
 import logging
 
 from apps.api.config import settings
+from apps.ml.model_cache import get_model_cache
 
 logger = logging.getLogger(__name__)
 
@@ -206,6 +207,8 @@ class ModelRegistry:
                 break
 
         self._save_index()
+        # Loaded copies of the previously deployed version must not be served again
+        get_model_cache().invalidate(symbol, timeframe)
 
         logger.info(f"Model deployed: {deployment_key} -> {version}")
 
@@ -7,10 +7,125 @@ import pandas as pd
 from typing import Dict, Tuple, Optional
 import joblib
 import logging
+import time
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+BIN_CUTS_FILE = "bin_cuts.npz"
+
+
+class _LGBDeadline:
+    """LightGBM callback ending training at ``deadline`` (time.time()), keeping the best iteration so far."""
+
+    before_iteration = False
+
+    def __init__(self, deadline: float):
+        # After lgb.early_stopping (order 30); lgb.train only keeps an order set on the instance
+        self.order = 40
+        self.deadline = deadline
+        self.reached = False
+        self._best_iteration = 0
+        self._best_score = None
+        self._best_results = []
+
+    def __call__(self, env):
+        if env.evaluation_result_list:
+            _, _, score, higher_better = env.evaluation_result_list[0]
+            if self._best_score is None or (
+                score > self._best_score if higher_better else score < self._best_score
+            ):
+                self._best_iteration = env.iteration
+                self._best_score = score
+                self._best_results = env.evaluation_result_list
+        if time.time() >= self.deadline:
+            logger.info("Time budget reached after %d LightGBM rounds", env.iteration + 1)
+            self.reached = True
+            raise lgb.callback.EarlyStopException(self._best_iteration, self._best_results)
+
+
+class _XGBDeadline(xgb.callback.TrainingCallback):
+    """XGBoost callback ending training at ``deadline`` (time.time())."""
+
+    def __init__(self, deadline: float):
+        super().__init__()
+        self.deadline = deadline
+        self.reached = False
+
+    def after_iteration(self, model, epoch, evals_log):
+        if time.time() >= self.deadline:
+            logger.info("Time budget reached after %d XGBoost rounds", epoch + 1)
+            self.reached = True
+        return self.reached
+
+
+class SharedBins:
+    """
+    Features binned once for every walk-forward fold.
+
+    LightGBM folds train on ``Dataset.subset`` row subsets of one constructed
+    Dataset, so its bin mappers are shared. XGBoost folds build
+    ``QuantileDMatrix`` objects with ``ref=`` the shared matrix, which reuses its
+    quantile cuts instead of sketching every fold again. Binning only reads
+    feature values, never labels.
+    """
+
+    def __init__(self, X: pd.DataFrame, y: pd.Series, lgbm_params: Dict, xgb_params: Dict):
+        """
+        Args:
+            X: Features of every row a fold may train on (row order = fold row indices)
+            y: Labels of those rows
+            lgbm_params: LightGBM parameters of the models trained on the bins
+            xgb_params: XGBoost parameters of the models trained on the bins
+        """
+        if xgb_params.get("tree_method", "hist") not in ("hist", "approx"):
+            raise ValueError("Shared bins require XGBoost tree_method 'hist'")
+
+        self.rows = len(X)
+        self.feature_names = list(X.columns)
+        self.lgbm_params = dict(lgbm_params)
+        self.xgb_nthread = xgb_params.get("nthread")
+        self.xgb_max_bin = xgb_params.get("max_bin")
+
+        labels = np.asarray(y)
+        self.lgb_dataset = lgb.Dataset(X, label=labels, params=self.lgbm_params).construct()
+        self.xgb_reference = xgb.QuantileDMatrix(
+            X, label=labels, nthread=self.xgb_nthread, max_bin=self.xgb_max_bin
+        )
+
+    def lgb_train_set(self, rows: Tuple[int, int], weights: np.ndarray) -> lgb.Dataset:
+        """LightGBM training set over rows [start, stop) of the shared Dataset."""
+        start, stop = rows
+        if not 0 <= start < stop <= self.rows:
+            raise ValueError(f"Rows {rows} are outside the shared bins (0, {self.rows})")
+        subset = self.lgb_dataset.subset(range(start, stop), params=self.lgbm_params).construct()
+        subset.set_weight(weights)
+        return subset
+
+    def xgb_matrix(
+        self, X: pd.DataFrame, y: pd.Series, weights: Optional[np.ndarray] = None
+    ) -> xgb.QuantileDMatrix:
+        """XGBoost matrix quantized with the shared cuts."""
+        return xgb.QuantileDMatrix(
+            X,
+            label=y,
+            weight=weights,
+            ref=self.xgb_reference,
+            nthread=self.xgb_nthread,
+            max_bin=self.xgb_max_bin,
+        )
+
+    def cut_points(self) -> Dict[str, np.ndarray]:
+        """Bin boundaries the fold models were trained against."""
+        indptr, values = self.xgb_reference.get_quantile_cut()
+        return {
+            "xgb_indptr": np.asarray(indptr),
+            "xgb_values": np.asarray(values),
+            "lgbm_num_bins": np.array(
+                [self.lgb_dataset.feature_num_bin(i) for i in range(len(self.feature_names))]
+            ),
+        }
+
 
 class EnsembleModel:
     """
@@ -18,11 +133,21 @@ class EnsembleModel:
     Includes conformal prediction for confidence calibration.
     """
 
+    NUM_BOOST_ROUND = 20000  # Increased from 15000
+    EARLY_STOPPING_ROUNDS = 800  # More patience
+
     def __init__(
         self,
         lgbm_params: Optional[Dict] = None,
-        xgb_params: Optional[Dict] = None
+        xgb_params: Optional[Dict] = None,
+        n_threads: Optional[int] = None,
     ):
+        """
+        Args:
+            lgbm_params: LightGBM parameters (defaults tuned for this project)
+            xgb_params: XGBoost parameters (defaults tuned for this project)
+            n_threads: Cap on native threads used by both boosters (None = library default)
+        """
         self.lgbm_params = lgbm_params or {
             'objective': 'binary',
             'metric': 'auc',
@@ -57,9 +182,15 @@ class EnsembleModel:
             'verbosity': 0
         }
 
+        if n_threads:
+            self.lgbm_params = {**self.lgbm_params, "num_threads": int(n_threads)}
+            self.xgb_params = {**self.xgb_params, "nthread": int(n_threads)}
+
         self.lgbm_model = None
         self.xgb_model = None
         self.feature_names = None
+        self.bin_cuts = None
+        self.deadline_reached = False
 
     def train(
         self,
@@ -67,40 +198,107 @@ class EnsembleModel:
         y_train: pd.Series,
         X_val: pd.DataFrame,
         y_val: pd.Series,
-        sample_weights: Optional[np.ndarray] = None
+        sample_weights: Optional[np.ndarray] = None,
+        shared_bins: Optional[SharedBins] = None,
+        train_rows: Optional[Tuple[int, int]] = None,
+        init_model: Optional["EnsembleModel"] = None,
+        num_boost_round: Optional[int] = None,
+        early_stopping_rounds: Optional[int] = None,
+        learning_rate: Optional[float] = None,
+        deadline: Optional[float] = None,
     ):
-        """Train both models with optional sample weights for recency bias"""
+        """
+        Train both models with optional sample weights for recency bias.
+
+        With ``shared_bins``, X_train must be rows ``train_rows`` (start, stop) of
+        the binned features; both boosters then reuse the shared bin boundaries
+        instead of quantizing X_train again.
+
+        With ``init_model``, boosting continues from its LightGBM/XGBoost boosters
+        (which are left unchanged) and the result contains their trees plus up to
+        ``num_boost_round`` new ones.
+
+        ``learning_rate`` overrides both boosters' learning rate for this call.
+        With ``deadline`` (a time.time() value), LightGBM stops halfway to it and
+        XGBoost at it, each keeping the trees boosted so far; ``deadline_reached``
+        then tells whether either was cut short.
+        """
         self.feature_names = list(X_train.columns)
+        num_boost_round = num_boost_round or self.NUM_BOOST_ROUND
+        early_stopping_rounds = early_stopping_rounds or self.EARLY_STOPPING_ROUNDS
+        lgbm_params, xgb_params = self.lgbm_params, self.xgb_params
+        if learning_rate:
+            lgbm_params = {**lgbm_params, "learning_rate": learning_rate}
+            xgb_params = {**xgb_params, "learning_rate": learning_rate}
+
+        if init_model is not None and init_model.feature_names != self.feature_names:
+            raise ValueError("init_model was trained on different features")
 
         # Apply recency weights if not provided (recent data gets higher weight)
         if sample_weights is None:
             sample_weights = np.linspace(0.5, 1.0, len(X_train))
 
+        if shared_bins is not None:
+            if train_rows is None or train_rows[1] - train_rows[0] != len(X_train):
+                raise ValueError("train_rows must give X_train's rows in the shared bins")
+            if shared_bins.feature_names != self.feature_names:
+                raise ValueError("X_train columns do not match the shared bins")
+
         logger.info("Training LightGBM model...")
-        train_data = lgb.Dataset(X_train, label=y_train, weight=sample_weights)
+        if shared_bins is not None and init_model is None:
+            train_data = shared_bins.lgb_train_set(train_rows, sample_weights)
+        elif shared_bins is not None:
+            # Continued training needs raw rows for the init scores; bin them with the shared mappers
+            train_data = lgb.Dataset(
+                X_train, label=y_train, weight=sample_weights, reference=shared_bins.lgb_dataset
+            )
+        else:
+            train_data = lgb.Dataset(X_train, label=y_train, weight=sample_weights)
         val_data = lgb.Dataset(X_val, label=y_val, reference=train_data)
 
+        lgb_callbacks = [
+            lgb.early_stopping(stopping_rounds=early_stopping_rounds),
+            lgb.log_evaluation(period=2000),
+        ]
+        deadlines = []
+        if deadline is not None:
+            # LightGBM gets the first half of the remaining time, XGBoost the rest
+            deadlines = [
+                _LGBDeadline(time.time() + max(0.0, deadline - time.time()) / 2),
+                _XGBDeadline(deadline),
+            ]
+            lgb_callbacks.append(deadlines[0])
+
         self.lgbm_model = lgb.train(
-            self.lgbm_params,
+            lgbm_params,
             train_data,
-            num_boost_round=20000,  # Increased from 15000
+            num_boost_round=num_boost_round,
             valid_sets=[val_data],
-            callbacks=[lgb.early_stopping(stopping_rounds=800), lgb.log_evaluation(period=2000)]  # More patience
+            init_model=init_model.lgbm_model if init_model is not None else None,
+            callbacks=lgb_callbacks,
         )
 
         logger.info("Training XGBoost model...")
-        dtrain = xgb.DMatrix(X_train, label=y_train, weight=sample_weights)
-        dval = xgb.DMatrix(X_val, label=y_val)
+        if shared_bins is not None:
+            dtrain = shared_bins.xgb_matrix(X_train, y_train, sample_weights)
+            dval = shared_bins.xgb_matrix(X_val, y_val)
+            self.bin_cuts = shared_bins.cut_points()
+        else:
+            dtrain = xgb.DMatrix(X_train, label=y_train, weight=sample_weights)
+            dval = xgb.DMatrix(X_val, label=y_val)
 
         self.xgb_model = xgb.train(
-            self.xgb_params,
+            xgb_params,
             dtrain,
-            num_boost_round=20000,  # Increased from 15000
+            num_boost_round=num_boost_round,
             evals=[(dval, 'val')],
-            early_stopping_rounds=800,  # More patience
-            verbose_eval=2000
+            early_stopping_rounds=early_stopping_rounds,
+            verbose_eval=2000,
+            xgb_model=init_model.xgb_model if init_model is not None else None,
+            callbacks=deadlines[1:] or None,
         )
 
+        self.deadline_reached = any(callback.reached for callback in deadlines)
         logger.info("Ensemble training completed")
 
     def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
@@ -187,10 +385,14 @@ class EnsembleModel:
         metadata = {
             'feature_names': self.feature_names,
             'lgbm_params': self.lgbm_params,
-            'xgb_params': self.xgb_params
+            'xgb_params': self.xgb_params,
+            'shared_bins': self.bin_cuts is not None
         }
         joblib.dump(metadata, path / 'metadata.pkl')
 
+        if self.bin_cuts is not None:
+            np.savez(path / BIN_CUTS_FILE, **self.bin_cuts)
+
         logger.info(f"Model saved to {path}")
 
     def load(self, path: str):
@@ -206,6 +408,11 @@ class EnsembleModel:
         self.lgbm_params = metadata['lgbm_params']
         self.xgb_params = metadata['xgb_params']
 
+        self.bin_cuts = None
+        if metadata.get("shared_bins") and (path / BIN_CUTS_FILE).exists():
+            with np.load(path / BIN_CUTS_FILE) as cuts:
+                self.bin_cuts = {name: cuts[name] for name in cuts.files}
+
         logger.info(f"Model loaded from {path}")
 
 
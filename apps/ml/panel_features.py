@@ -0,0 +1,594 @@
+"""
+Panel (multi-symbol) feature computation.
+
+Mirrors the pandas implementations in ``FeatureEngineering.compute_all_features``
+on a panel: every field (open, high, ..., each feature) is one wide DataFrame
+indexed by timestamp with a column per symbol, so each indicator runs once
+for all symbols instead of once per symbol.
+
+Symbols are outer-aligned on the union of their timestamps. Bars a symbol
+does not have are NaN; leading and trailing padding (symbols listed later or
+with a shorter history) does not change any feature, but a hole inside a
+symbol's history behaves like a missing price in every window that spans it
+(see ``FeaturePanel.gapped_symbols``).
+
+Nodes whose per-symbol method uses TA-Lib or pandas_ta, and the merge of
+per-symbol market metrics, are computed symbol by symbol so results stay
+identical to ``compute_all_features``.
+"""
+
+import logging
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from apps.ml.features import (
+    BASE_COLUMNS,
+    PANDAS_TA_AVAILABLE,
+    TALIB_AVAILABLE,
+    FeatureSpec,
+    resolve_features,
+    rolling_percentile_rank,
+    rolling_quantile,
+)
+from apps.ml.indicators import supertrend, true_range
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# Methods that take a TA library path when one is installed
+TALIB_METHODS = {
+    "_add_emas",
+    "_add_rsi",
+    "_add_stochastic",
+    "_add_macd",
+    "_add_atr",
+    "_add_bollinger_bands",
+    "_add_adx",
+}
+PANDAS_TA_METHODS = {
+    "_add_emas",
+    "_add_rsi",
+    "_add_stochastic",
+    "_add_macd",
+    "_add_atr",
+    "_add_bollinger_bands",
+}
+
+Fields = Dict[str, pd.DataFrame]
+
+
+class FeaturePanel:
+    """
+    Aligned (time x symbol) price panel.
+
+    Attributes:
+        fields: Wide DataFrame per column (index: timestamp, columns: symbols)
+        present: Boolean wide DataFrame, True where the symbol has a bar
+    """
+
+    def __init__(self, fields: Fields, present: Optional[pd.DataFrame] = None):
+        missing = [column for column in PRICE_COLUMNS if column not in fields]
+        if missing:
+            raise ValueError(f"Panel is missing price fields: {missing}")
+
+        close = fields["close"]
+        self.fields: Fields = {
+            column: fields[column].reindex(index=close.index, columns=close.columns)
+            for column in PRICE_COLUMNS
+        }
+        self.present = present if present is not None else close.notna()
+
+    @property
+    def index(self) -> pd.Index:
+        return self.fields["close"].index
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.fields["close"].columns)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        timestamps: Iterable,
+        symbols: Iterable[str],
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+    ) -> "FeaturePanel":
+        """
+        Build a panel from aligned 2-D arrays of shape (len(timestamps), len(symbols)).
+
+        NaN close marks a bar the symbol does not have.
+        """
+        index = pd.DatetimeIndex(timestamps, name="timestamp")
+        columns = pd.Index(list(symbols), name="symbol")
+        arrays = {"open": open, "high": high, "low": low, "close": close, "volume": volume}
+        fields = {
+            column: pd.DataFrame(np.asarray(values, dtype=np.float64), index=index, columns=columns)
+            for column, values in arrays.items()
+        }
+        return cls(fields)
+
+    @classmethod
+    def from_frames(cls, frames: Mapping[str, pd.DataFrame]) -> "FeaturePanel":
+        """
+        Outer-align per-symbol OHLCV frames (as returned by ``load_ohlcv``) on their timestamps.
+
+        Args:
+            frames: OHLCV DataFrame per symbol with a ``timestamp`` column
+
+        Returns:
+            FeaturePanel over the union of the timestamps
+        """
+        if not frames:
+            raise ValueError("Panel needs at least one symbol")
+
+        long_df = pd.concat(
+            {symbol: frame[list(BASE_COLUMNS)] for symbol, frame in frames.items()},
+            names=["symbol", None],
+        ).reset_index(level=0)
+        wide = long_df.pivot(index="timestamp", columns="symbol")
+        symbols = pd.Index(list(frames), name="symbol")
+
+        present = pd.DataFrame(False, index=wide.index, columns=symbols)
+        for symbol, frame in frames.items():
+            present.loc[frame["timestamp"].to_numpy(), symbol] = True
+
+        fields = {
+            column: wide[column].reindex(columns=symbols).astype(np.float64)
+            for column in PRICE_COLUMNS
+        }
+        return cls(fields, present)
+
+    def gapped_symbols(self) -> List[str]:
+        """Symbols missing a bar between their first and last one, whose features differ from a per-symbol run."""
+        present = self.present.to_numpy()
+        seen_before = np.maximum.accumulate(present, axis=0)
+        seen_after = np.maximum.accumulate(present[::-1], axis=0)[::-1]
+        holes = (seen_before & seen_after & ~present).any(axis=0)
+        return [symbol for symbol, hole in zip(self.symbols, holes) if hole]
+
+
+class PanelFeatures:
+    """Features computed over a FeaturePanel, as wide frames with long and per-symbol views."""
+
+    def __init__(self, fields: Fields, present: pd.DataFrame, columns: List[str]):
+        self.fields = fields
+        self.present = present
+        self.columns = columns
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.present.columns)
+
+    def __getitem__(self, column: str) -> pd.DataFrame:
+        return self.fields[column]
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """
+        Features of one symbol over its own bars.
+
+        Same columns, order and dtypes as ``compute_all_features`` on that
+        symbol's OHLCV frame, with a fresh RangeIndex.
+        """
+        mask = self.present[symbol].to_numpy()
+        data = {"timestamp": self.present.index[mask]}
+        for column in self.columns:
+            data[column] = self.fields[column][symbol].to_numpy()[mask]
+        return pd.DataFrame(data)
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """``frame(symbol)`` for every symbol."""
+        return {symbol: self.frame(symbol) for symbol in self.symbols}
+
+    def long(self) -> pd.DataFrame:
+        """
+        Long format: one row per (symbol, timestamp) bar, grouped by symbol in panel order.
+
+        Returns:
+            DataFrame with ``symbol``, ``timestamp`` and every feature column
+        """
+        mask = self.present.to_numpy().ravel(order="F")
+        index = self.present.index
+        data = {
+            "symbol": np.repeat(np.asarray(self.symbols, dtype=object), len(index))[mask],
+            "timestamp": np.tile(index.to_numpy(), len(self.symbols))[mask],
+        }
+        for column in self.columns:
+            data[column] = self.fields[column].to_numpy().ravel(order="F")[mask]
+        return pd.DataFrame(data)
+
+
+def _pct_change(frame: pd.DataFrame, periods: int = 1) -> pd.DataFrame:
+    # pct_change without forward-filling the padding (identical on gap-free columns)
+    return frame / frame.shift(periods) - 1
+
+
+def _wide(values: np.ndarray, like: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame(values, index=like.index, columns=like.columns)
+
+
+def _per_column(frame: pd.DataFrame, func: Callable[..., pd.Series], *args) -> pd.DataFrame:
+    return pd.DataFrame(
+        {symbol: func(frame[symbol], *args) for symbol in frame.columns}, index=frame.index
+    ).reindex(columns=frame.columns)
+
+
+def _panel_emas(f: Fields, periods=(9, 21, 50, 200)) -> None:
+    for period in periods:
+        f[f"ema_{period}"] = f["close"].ewm(span=period, adjust=False).mean()
+
+
+def _panel_rsi(f: Fields) -> None:
+    delta = f["close"].diff()
+    # Padded bars stay NaN instead of counting as flat bars in the window
+    has_bar = f["close"].notna()
+    gain = (delta.where(delta > 0, 0)).where(has_bar).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).where(has_bar).rolling(window=14).mean()
+    rs = gain / loss
+    f["rsi_14"] = 100 - (100 / (1 + rs))
+
+
+def _panel_stochastic(f: Fields) -> None:
+    low_14 = f["low"].rolling(window=14).min()
+    high_14 = f["high"].rolling(window=14).max()
+    f["stoch_k"] = 100 * ((f["close"] - low_14) / (high_14 - low_14))
+    f["stoch_d"] = f["stoch_k"].rolling(window=3).mean()
+
+
+def _panel_macd(f: Fields) -> None:
+    ema_12 = f["close"].ewm(span=12, adjust=False).mean()
+    ema_26 = f["close"].ewm(span=26, adjust=False).mean()
+    f["macd"] = ema_12 - ema_26
+    f["macd_signal"] = f["macd"].ewm(span=9, adjust=False).mean()
+    f["macd_hist"] = f["macd"] - f["macd_signal"]
+
+
+def _panel_atr(f: Fields) -> None:
+    atr = true_range(f["high"], f["low"], f["close"]).rolling(window=14).mean()
+    f["atr_14"] = atr
+    f["atr_rising"] = (atr > atr.shift(3)).astype(int)
+    f["atr_falling"] = (atr < atr.shift(3)).astype(int)
+    f["atr_slope"] = atr.diff(3) / atr.shift(3)
+
+
+def _panel_bollinger(f: Fields) -> None:
+    f["bb_middle"] = f["close"].rolling(window=20).mean()
+    bb_std = f["close"].rolling(window=20).std()
+    f["bb_upper"] = f["bb_middle"] + (bb_std * 2)
+    f["bb_lower"] = f["bb_middle"] - (bb_std * 2)
+    f["bb_width"] = (f["bb_upper"] - f["bb_lower"]) / f["bb_middle"]
+
+
+def _panel_vwap(f: Fields) -> None:
+    close, volume = f["close"], f["volume"]
+    f["vwap"] = (close * volume).cumsum() / volume.cumsum()
+    window = 96
+    f["vwap_rolling"] = (close * volume).rolling(window).sum() / volume.rolling(window).sum()
+    f["vwap_distance"] = (close - f["vwap_rolling"]) / f["vwap_rolling"]
+
+
+def _panel_stochrsi(f: Fields) -> None:
+    rsi = f["rsi_14"]
+    rsi_min = rsi.rolling(14).min()
+    rsi_max = rsi.rolling(14).max()
+    f["stochrsi"] = 100 * (rsi - rsi_min) / (rsi_max - rsi_min)
+    f["stochrsi_k"] = f["stochrsi"].rolling(3).mean()
+    f["stochrsi_d"] = f["stochrsi_k"].rolling(3).mean()
+
+
+def _panel_keltner(f: Fields) -> None:
+    f["ema_20"] = f["close"].ewm(span=20, adjust=False).mean()
+    multiplier = 2.0
+    f["keltner_upper"] = f["ema_20"] + multiplier * f["atr_14"]
+    f["keltner_lower"] = f["ema_20"] - multiplier * f["atr_14"]
+    f["keltner_width"] = (f["keltner_upper"] - f["keltner_lower"]) / f["ema_20"]
+
+
+def _panel_supertrend(f: Fields) -> None:
+    f["supertrend"], f["supertrend_direction"] = supertrend(
+        f["high"], f["low"], f["close"], f["atr_14"], multiplier=3.0
+    )
+
+
+def _panel_adx(f: Fields) -> None:
+    high_diff = f["high"].diff()
+    low_diff = -f["low"].diff()
+
+    has_bar = f["close"].notna()
+    plus_dm = high_diff.where((high_diff > low_diff) & (high_diff > 0), 0).where(has_bar)
+    minus_dm = low_diff.where((low_diff > high_diff) & (low_diff > 0), 0).where(has_bar)
+    tr = f["atr_14"] * 14  # Approximate, as in FeatureEngineering._add_adx
+
+    plus_di = 100 * (plus_dm.rolling(14).mean() / tr.rolling(14).mean())
+    minus_di = 100 * (minus_dm.rolling(14).mean() / tr.rolling(14).mean())
+    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    f["adx"] = dx.rolling(14).mean()
+
+
+def _panel_swing_points(f: Fields, window: int = 5) -> None:
+    high, low = f["high"], f["low"]
+    f["swing_high"] = (high == high.rolling(window * 2 + 1, center=True).max()).astype(int)
+    f["swing_low"] = (low == low.rolling(window * 2 + 1, center=True).min()).astype(int)
+    f["dist_to_swing_high"] = f["close"] / high.where(f["swing_high"] == 1).ffill() - 1
+    f["dist_to_swing_low"] = f["close"] / low.where(f["swing_low"] == 1).ffill() - 1
+
+
+def _panel_fibonacci(f: Fields) -> None:
+    window = 50
+    rolling_high = f["high"].rolling(window).max()
+    rolling_low = f["low"].rolling(window).min()
+    diff = rolling_high - rolling_low
+
+    f["fib_0"] = rolling_high
+    f["fib_236"] = rolling_high - diff * 0.236
+    f["fib_382"] = rolling_high - diff * 0.382
+    f["fib_50"] = rolling_high - diff * 0.5
+    f["fib_618"] = rolling_high - diff * 0.618
+    f["fib_786"] = rolling_high - diff * 0.786
+    f["fib_100"] = rolling_low
+    f["fib_1618"] = rolling_low - diff * 0.618
+    f["fib_2618"] = rolling_low - diff * 1.618
+
+
+def _panel_pivot_points(f: Fields) -> None:
+    high, low = f["high"].shift(1), f["low"].shift(1)
+    f["pivot_point"] = (high + low + f["close"].shift(1)) / 3
+    f["resistance_1"] = 2 * f["pivot_point"] - low
+    f["support_1"] = 2 * f["pivot_point"] - high
+
+
+def _panel_obv(f: Fields) -> None:
+    close, volume = f["close"], f["volume"]
+    prev_close = close.shift()
+    # Padded bars contribute 0, so the running sum and its EMA are unaffected
+    obv = np.where(close > prev_close, volume, np.where(close < prev_close, -volume, 0))
+    f["obv"] = _wide(obv.cumsum(axis=0), close)
+    f["obv_ema"] = f["obv"].ewm(span=20, adjust=False).mean()
+    f["obv_divergence"] = f["obv"] - f["obv_ema"]
+
+
+def _panel_volume_profile(f: Fields, window: int = 50) -> None:
+    volume = f["volume"]
+    f["volume_surge"] = volume / volume.rolling(20).mean()
+    f["high_volume_node"] = (volume > _per_column(volume, rolling_quantile, window, 0.8)).astype(
+        int
+    )
+    f["volume_percentile"] = _per_column(volume, rolling_percentile_rank, 100)
+    f["volume_quantile_90"] = (f["volume_percentile"] >= 0.90).astype(int)
+    f["vwap_std"] = (
+        ((f["close"] - f["vwap_rolling"]) ** 2 * volume).rolling(window).sum()
+        / volume.rolling(window).sum()
+    ).pow(0.5)
+
+
+def _panel_obi(f: Fields) -> None:
+    price_momentum = _pct_change(f["close"])
+    volume_ratio = f["volume"] / f["volume"].rolling(20).mean()
+
+    buy_pressure = np.where(price_momentum > 0, price_momentum * volume_ratio, 0)
+    sell_pressure = np.where(price_momentum < 0, abs(price_momentum) * volume_ratio, 0)
+
+    f["obi"] = _wide(
+        (buy_pressure - sell_pressure) / (buy_pressure + sell_pressure + 1e-10), price_momentum
+    )
+    f["obi_ema"] = f["obi"].ewm(span=10, adjust=False).mean()
+
+
+def _panel_spread(f: Fields) -> None:
+    rolling_vol = _pct_change(f["close"]).rolling(20).std()
+    f["estimated_spread_bps"] = rolling_vol * 10000
+    f["spread_percentile"] = _per_column(f["estimated_spread_bps"], rolling_percentile_rank, 100)
+
+
+def _panel_ema_slopes(f: Fields) -> None:
+    for period in [20, 50]:
+        ema = f[f"ema_{period}"]
+        f[f"ema_{period}_slope"] = ema.diff(3) / ema.shift(3)
+        f[f"ema_{period}_accel"] = f[f"ema_{period}_slope"].diff(3)
+
+
+def _panel_consolidation(f: Fields) -> None:
+    bb_width = f["bb_width"]
+    threshold = _per_column(bb_width, rolling_quantile, 100, 0.30)
+    is_consolidation = (bb_width < threshold).astype(int)
+    f["is_consolidation"] = is_consolidation
+
+    # Length of the current run of consolidation bars (0 outside one)
+    running = is_consolidation.cumsum()
+    run_start = running.where(is_consolidation == 0).ffill().fillna(0)
+    f["consolidation_duration"] = (running - run_start).astype(np.int64)
+
+
+def _panel_rsi_divergence(f: Fields, window: int = 14) -> None:
+    rsi, price = f["rsi_14"], f["close"]
+
+    price_higher_high = (price > price.shift(window)) & (price > price.shift(1))
+    rsi_lower_high = (rsi < rsi.shift(window)) & (rsi < rsi.shift(1))
+    f["bearish_divergence"] = (price_higher_high & rsi_lower_high).astype(int)
+
+    price_lower_low = (price < price.shift(window)) & (price < price.shift(1))
+    rsi_higher_low = (rsi > rsi.shift(window)) & (rsi > rsi.shift(1))
+    f["bullish_divergence"] = (price_lower_low & rsi_higher_low).astype(int)
+
+
+def _panel_regime_trend(f: Fields) -> None:
+    ema_diff = f["ema_21"] - f["ema_50"]
+    f["regime_trend"] = _wide(np.where(ema_diff > 0, 1, np.where(ema_diff < 0, -1, 0)), ema_diff)
+
+
+def _panel_regime_volatility(f: Fields) -> None:
+    atr_percentile = _per_column(f["atr_14"] / f["close"], rolling_percentile_rank, 100)
+    regime = _wide(
+        np.where(atr_percentile > 0.66, 2, np.where(atr_percentile > 0.33, 1, 0)), atr_percentile
+    )
+    regime.loc[:, ~f["close"].notna().any()] = 1
+    f["regime_volatility"] = regime
+
+
+def _panel_market_metrics_defaults(f: Fields) -> None:
+    # Per-symbol metrics are merged afterwards by compute_panel_features
+    zeros = _wide(np.zeros(f["close"].shape), f["close"])
+    f["spread_bps"] = zeros
+    f["depth_imbalance"] = zeros.copy()
+    f["realized_vol"] = _pct_change(f["close"]).rolling(20).std() * np.sqrt(365 * 24)
+    f["funding_rate"] = zeros.copy()
+    f["open_interest"] = zeros.copy()
+
+
+def _panel_sentiment(f: Fields) -> None:
+    f["sentiment_score"] = _wide(np.zeros(f["close"].shape), f["close"])
+
+
+def _panel_rolling_stats(f: Fields) -> None:
+    close, volume = f["close"], f["volume"]
+    f["close_rolling_mean_20"] = close.rolling(20).mean()
+    f["close_rolling_std_20"] = close.rolling(20).std()
+    f["close_zscore"] = (close - f["close_rolling_mean_20"]) / (f["close_rolling_std_20"] + 1e-10)
+
+    f["volume_rolling_mean_20"] = volume.rolling(20).mean()
+    f["volume_rolling_std_20"] = volume.rolling(20).std()
+    f["volume_zscore"] = (volume - f["volume_rolling_mean_20"]) / (
+        f["volume_rolling_std_20"] + 1e-10
+    )
+
+    f["price_momentum_5"] = _pct_change(close, 5)
+    f["price_momentum_10"] = _pct_change(close, 10)
+    f["price_momentum_20"] = _pct_change(close, 20)
+
+    f["volume_momentum_5"] = _pct_change(volume, 5)
+    f["volume_momentum_10"] = _pct_change(volume, 10)
+
+    f["price_volume_corr"] = close.rolling(20).corr(volume)
+
+    f["hl_range"] = (f["high"] - f["low"]) / close
+    f["hl_range_ma"] = f["hl_range"].rolling(20).mean()
+    f["hl_range_std"] = f["hl_range"].rolling(20).std()
+
+
+# Panel counterpart of each FeatureEngineering method in FEATURE_REGISTRY
+PANEL_METHODS: Dict[str, Callable[..., None]] = {
+    "_add_emas": _panel_emas,
+    "_add_rsi": _panel_rsi,
+    "_add_stochastic": _panel_stochastic,
+    "_add_macd": _panel_macd,
+    "_add_atr": _panel_atr,
+    "_add_bollinger_bands": _panel_bollinger,
+    "_add_vwap": _panel_vwap,
+    "_add_stochrsi": _panel_stochrsi,
+    "_add_keltner_channels": _panel_keltner,
+    "_add_supertrend": _panel_supertrend,
+    "_add_adx": _panel_adx,
+    "_add_swing_points": _panel_swing_points,
+    "_add_fibonacci_dynamic": _panel_fibonacci,
+    "_add_pivot_points": _panel_pivot_points,
+    "_add_obv": _panel_obv,
+    "_add_volume_profile": _panel_volume_profile,
+    "_add_obi": _panel_obi,
+    "_add_bid_ask_spread_dynamic": _panel_spread,
+    "_add_ema_slopes": _panel_ema_slopes,
+    "_add_consolidation_zones": _panel_consolidation,
+    "_add_rsi_divergence": _panel_rsi_divergence,
+    "_add_regime_trend": _panel_regime_trend,
+    "_add_regime_volatility": _panel_regime_volatility,
+    "_add_market_metrics": _panel_market_metrics_defaults,
+    "_add_sentiment": _panel_sentiment,
+    "_add_rolling_stats": _panel_rolling_stats,
+}
+
+
+def _uses_ta_library(method: str) -> bool:
+    return (TALIB_AVAILABLE and method in TALIB_METHODS) or (
+        PANDAS_TA_AVAILABLE and method in PANDAS_TA_METHODS
+    )
+
+
+def _compute_per_symbol(
+    engineering,
+    spec: FeatureSpec,
+    fields: Fields,
+    present: pd.DataFrame,
+    symbols: List[str],
+    market_metrics: Optional[Mapping[str, pd.DataFrame]] = None,
+) -> None:
+    """Run the per-symbol method of ``spec`` on each symbol's own bars and write its outputs into ``fields``."""
+    method = getattr(engineering, spec.method)
+    outputs: Dict[str, Dict[str, pd.Series]] = {}
+
+    for symbol in symbols:
+        mask = present[symbol].to_numpy()
+        index = present.index[mask]
+        frame = pd.DataFrame({"timestamp": index})
+        for column in PRICE_COLUMNS + spec.inputs:
+            frame[column] = fields[column][symbol].to_numpy()[mask]
+
+        if spec.uses_market_metrics:
+            frame = method(frame, (market_metrics or {}).get(symbol), **spec.params)
+        else:
+            frame = method(frame, **spec.params)
+
+        # Keep the column order the method produced
+        for column in frame.columns:
+            if column in spec.outputs:
+                outputs.setdefault(column, {})[symbol] = pd.Series(
+                    frame[column].to_numpy(), index=index
+                )
+
+    for column, series in outputs.items():
+        computed = pd.DataFrame(series, index=present.index, columns=symbols)
+        if column in fields:
+            # Only the listed symbols were recomputed; padding keeps the panel values
+            computed = computed.where(present[symbols], fields[column][symbols])
+            fields[column] = fields[column].copy()
+            fields[column][symbols] = computed
+            continue
+        dtypes = {values.dtype for values in series.values()}
+        if len(dtypes) == 1 and next(iter(dtypes)).kind in "iub":
+            computed = computed.fillna(0).astype(next(iter(dtypes)))
+        fields[column] = computed.reindex(columns=present.columns)
+
+
+def compute_panel_features(
+    engineering,
+    panel: FeaturePanel,
+    market_metrics: Optional[Mapping[str, pd.DataFrame]] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> PanelFeatures:
+    """
+    Compute features for every symbol of ``panel`` in one pass per indicator.
+
+    Args:
+        engineering: FeatureEngineering whose methods serve the per-symbol fallbacks
+        panel: Aligned price panel
+        market_metrics: Optional microstructure metrics frame per symbol
+        columns: Feature columns needed (default: all), as in ``compute_all_features``
+
+    Returns:
+        PanelFeatures holding the base columns and the computed features
+    """
+    fields: Fields = {column: frame.copy() for column, frame in panel.fields.items()}
+
+    for spec in resolve_features(columns):
+        if _uses_ta_library(spec.method):
+            _compute_per_symbol(
+                engineering, spec, fields, panel.present, panel.symbols, market_metrics
+            )
+        else:
+            PANEL_METHODS[spec.method](fields, **spec.params)
+            if spec.uses_market_metrics and market_metrics:
+                with_metrics = [
+                    symbol
+                    for symbol in panel.symbols
+                    if market_metrics.get(symbol) is not None and not market_metrics[symbol].empty
+                ]
+                _compute_per_symbol(
+                    engineering, spec, fields, panel.present, with_metrics, market_metrics
+                )
+
+    # Fields are inserted in the order compute_all_features adds the columns
+    return PanelFeatures(fields, panel.present, list(fields))
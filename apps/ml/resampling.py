@@ -0,0 +1,247 @@
+"""
+Higher timeframes derived locally from stored 15m candles.
+
+1h/4h/1d bars are aggregated from the 15m series (first open, max high, min
+low, last close, summed volume) into UTC-aligned buckets and written to the
+``ohlcv`` table under their own timeframe, so training, backtests and the
+signal engine read them exactly as if they had been fetched from the
+exchange. The newest bucket is still forming until its last 15m bar has
+closed; like the exchange's own latest candle it is stored and overwritten on
+the next update. Any other bucket is only stored once every one of its 15m
+bars is present, so a hole in the 15m series never turns into a short bar
+that replaces one fetched from the exchange.
+
+This is the only producer of higher timeframes while ``RESAMPLING_ENABLED``
+is on: the database keeps no aggregate views of its own, and a 1h/4h/1d range
+is only downloaded when the 15m candles underneath it are missing.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from apps.api.db.models import OHLCV, TimeFrame
+from apps.ml.gap_scanner import find_gaps
+from apps.ml.market_data import OHLCV_COLUMNS, PRICE_COLUMNS, bulk_upsert, load_ohlcv
+
+logger = logging.getLogger(__name__)
+
+SOURCE_TIMEFRAME = TimeFrame.M15
+DERIVED_TIMEFRAMES = (TimeFrame.H1, TimeFrame.H4, TimeFrame.D1)
+
+TIMEFRAME_DELTAS: Dict[TimeFrame, timedelta] = {
+    TimeFrame.M1: timedelta(minutes=1),
+    TimeFrame.M5: timedelta(minutes=5),
+    TimeFrame.M15: timedelta(minutes=15),
+    TimeFrame.H1: timedelta(hours=1),
+    TimeFrame.H4: timedelta(hours=4),
+    TimeFrame.D1: timedelta(days=1),
+}
+
+
+def _floor(ts: datetime, delta: timedelta) -> datetime:
+    epoch = datetime(1970, 1, 1)
+    return epoch + ((ts - epoch) // delta) * delta
+
+
+def resample_ohlcv(
+    df: pd.DataFrame,
+    target: TimeFrame,
+    source: TimeFrame = SOURCE_TIMEFRAME,
+    as_of: Optional[datetime] = None,
+) -> pd.DataFrame:
+    """
+    Aggregate ``source`` candles into ``target`` buckets.
+
+    Args:
+        df: Candles with timestamp/open/high/low/close/volume (any order, duplicates allowed)
+        target: Coarser timeframe to build
+        source: Timeframe of ``df``
+        as_of: Wall-clock time; source bars still open at this time do not
+               complete their bucket (default: trust the data)
+
+    Returns:
+        DataFrame with OHLCV_COLUMNS plus a boolean ``complete`` column, True
+        for closed buckets that hold all of their source bars
+    """
+    source_delta = TIMEFRAME_DELTAS[source]
+    target_delta = TIMEFRAME_DELTAS[target]
+    if target_delta <= source_delta or target_delta % source_delta:
+        raise ValueError(f"Cannot resample {source.value} candles into {target.value}")
+
+    if df.empty:
+        frame = pd.DataFrame({col: pd.Series(dtype=np.float64) for col in OHLCV_COLUMNS})
+        frame["timestamp"] = pd.Series(dtype="datetime64[ns]")
+        frame["complete"] = pd.Series(dtype=bool)
+        return frame
+
+    df = df.drop_duplicates(subset="timestamp", keep="last").sort_values("timestamp")
+    stamps = pd.to_datetime(df["timestamp"]).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    width = int(target_delta / timedelta(microseconds=1)) * 1000
+    buckets = stamps - stamps % width
+
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+
+    opens = df["open"].to_numpy(dtype=np.float64)
+    highs = df["high"].to_numpy(dtype=np.float64)
+    lows = df["low"].to_numpy(dtype=np.float64)
+    closes = df["close"].to_numpy(dtype=np.float64)
+    volumes = df["volume"].to_numpy(dtype=np.float64)
+
+    # A bucket is complete once the source data (or the clock) has moved past its end
+    # and none of its source bars is missing
+    covered_until = stamps[-1] + int(source_delta / timedelta(microseconds=1)) * 1000
+    if as_of is not None:
+        covered_until = min(covered_until, pd.Timestamp(as_of).value)
+    counts = np.diff(np.r_[starts, len(buckets)])
+
+    return pd.DataFrame(
+        {
+            "timestamp": buckets[starts].astype("datetime64[ns]"),
+            "open": opens[starts],
+            "high": np.maximum.reduceat(highs, starts),
+            "low": np.minimum.reduceat(lows, starts),
+            "close": closes[ends],
+            "volume": np.add.reduceat(volumes, starts),
+            "complete": (buckets[starts] + width <= covered_until)
+            & (counts == target_delta // source_delta),
+        }
+    )
+
+
+def _latest_derived(db: Session, symbols: Sequence[str], timeframes: Sequence[TimeFrame]) -> Dict:
+    rows = (
+        db.query(OHLCV.symbol, OHLCV.timeframe, func.max(OHLCV.timestamp))
+        .filter(and_(OHLCV.symbol.in_(symbols), OHLCV.timeframe.in_(timeframes)))
+        .group_by(OHLCV.symbol, OHLCV.timeframe)
+        .all()
+    )
+    return {(symbol, timeframe): latest for symbol, timeframe, latest in rows}
+
+
+def update_derived_bars(
+    db: Session,
+    symbols: Optional[Iterable[str]] = None,
+    timeframes: Sequence[TimeFrame] = DERIVED_TIMEFRAMES,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    as_of: Optional[datetime] = None,
+    include_partial: bool = True,
+) -> Dict[str, int]:
+    """
+    Rebuild derived bars from the stored 15m candles and upsert them.
+
+    Without ``since`` the update is incremental: each (symbol, timeframe)
+    restarts at its newest stored bucket (which may have been partial), so a
+    5-minute cycle only reads the last day or so of 15m bars. With
+    ``since``/``until`` the buckets overlapping that range are rebuilt, e.g.
+    after a backfill or gap repair rewrote older history.
+
+    Args:
+        db: SQLAlchemy session (committed on success)
+        symbols: Symbols to update (default: every symbol with 15m candles)
+        timeframes: Derived timeframes to build
+        since: Rebuild buckets from this timestamp instead of the newest stored one
+        until: Ignore 15m candles after this timestamp
+        as_of: Wall-clock time used to tell forming buckets from closed ones
+        include_partial: Also store the newest bucket while it is still forming
+                         (or waiting for missing 15m bars); ignored with ``until``,
+                         which bounds a historical rebuild
+
+    Returns:
+        Bars written per timeframe value
+    """
+    if symbols is None:
+        symbols = [
+            symbol
+            for (symbol,) in db.query(OHLCV.symbol)
+            .filter(OHLCV.timeframe == SOURCE_TIMEFRAME)
+            .distinct()
+            .all()
+        ]
+    symbols = list(symbols)
+    written = {timeframe.value: 0 for timeframe in timeframes}
+    if not symbols or not timeframes:
+        return written
+
+    latest = _latest_derived(db, symbols, timeframes) if since is None else {}
+    frames: Dict[TimeFrame, List[pd.DataFrame]] = {timeframe: [] for timeframe in timeframes}
+
+    for symbol in symbols:
+        starts = {
+            timeframe: _floor(since, TIMEFRAME_DELTAS[timeframe])
+            if since is not None
+            else latest.get((symbol, timeframe))
+            for timeframe in timeframes
+        }
+        # One read covers every timeframe; None means the pair has never been derived
+        read_from = (
+            None if any(start is None for start in starts.values()) else min(starts.values())
+        )
+        read_until = None
+        if until is not None:
+            coarsest = max(TIMEFRAME_DELTAS[timeframe] for timeframe in timeframes)
+            read_until = _floor(until, coarsest) + coarsest - TIMEFRAME_DELTAS[SOURCE_TIMEFRAME]
+
+        source = load_ohlcv(db, symbol, SOURCE_TIMEFRAME, start=read_from, end=read_until)
+        if source.empty:
+            continue
+
+        for timeframe in timeframes:
+            start = starts[timeframe]
+            rows = source if start is None else source[source["timestamp"] >= start]
+            bars = resample_ohlcv(rows, timeframe, as_of=as_of)
+            keep = bars["complete"].to_numpy()
+            # Only the newest bucket (it holds the latest stored 15m bar) can still be forming
+            if include_partial and until is None and len(keep):
+                keep[-1] = True
+            bars = bars[keep]
+            if not bars.empty:
+                frames[timeframe].append(bars[OHLCV_COLUMNS].assign(symbol=symbol))
+
+    for timeframe, parts in frames.items():
+        if not parts:
+            continue
+        batch = pd.concat(parts, ignore_index=True)
+        batch["timeframe"] = timeframe
+        batch["created_at"] = datetime.utcnow()
+        written[timeframe.value] = bulk_upsert(
+            db,
+            OHLCV.__table__,
+            batch,
+            conflict_columns=["symbol", "timeframe", "timestamp"],
+            update_columns=PRICE_COLUMNS,
+        )
+    db.commit()
+
+    logger.info(
+        "Derived bars from %s candles for %d symbols: %s",
+        SOURCE_TIMEFRAME.value,
+        len(symbols),
+        written,
+    )
+    return written
+
+
+def source_covers(
+    db: Session,
+    symbol: str,
+    start: datetime,
+    end: datetime,
+    tolerance: timedelta = timedelta(hours=1),
+) -> bool:
+    """True if stored 15m candles span [start, end] (give or take ``tolerance``) without holes, so derived bars need no download."""
+    first, last = (
+        db.query(func.min(OHLCV.timestamp), func.max(OHLCV.timestamp))
+        .filter(and_(OHLCV.symbol == symbol, OHLCV.timeframe == SOURCE_TIMEFRAME))
+        .one()
+    )
+    if first is None or first > start + tolerance or last < end - tolerance:
+        return False
+    return not find_gaps(db, symbol=symbol, timeframe=SOURCE_TIMEFRAME, start=start, end=end)
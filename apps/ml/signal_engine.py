@@ -1,18 +1,18 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional, Tuple, Callable, Any, List
+from typing import Dict, Optional, Tuple, Callable, Any, Iterator, List, Union
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import func
 
 from apps.api.db.models import (
     RiskProfile,
     Side,
-    OHLCV,
     MarketMetrics,
     Signal,
     SignalStatus,
@@ -20,7 +20,13 @@ from apps.api.db.models import (
     ModelRegistry as ModelRecord,
 )
 from apps.api.config import settings
-from apps.ml.features import FeatureEngineering
+from apps.ml.features import FeatureEngineering, feature_lookback
+from apps.ml.feature_store import FeatureCache
+from apps.ml.archive import load_ohlcv_history
+from apps.ml.market_data import empty_ohlcv_frame, load_latest_ohlcv_many, load_ohlcv
+from apps.ml.panel_features import FeaturePanel
+from apps.ml.streaming_features import StreamingFeatureEngine, StreamingFeatureStore
+from apps.ml.model_cache import ModelCache, get_model_cache
 from apps.ml.model_registry import ModelRegistry
 from apps.ml.models import EnsembleModel
 from apps.ml.performance_tracker import PerformanceTracker
@@ -543,6 +549,16 @@ class SignalEngine:
     3. Runs inference and applies risk filters before producing a trading signal.
     """
 
+    # Snapshot features the risk filters read besides the model's own inputs
+    SNAPSHOT_FEATURES = (
+        "atr_14",
+        "atr_rising",
+        "atr_falling",
+        "volume_quantile_90",
+        "regime_volatility",
+        "spread_bps",
+    )
+
     def __init__(
         self,
         db: Session,
@@ -552,7 +568,10 @@ class SignalEngine:
         performance_tracker: Optional[PerformanceTracker] = None,
         lookback_bars: int = 250,
         max_spread_bps: float = 15.0,
-        min_volume: float = 1.0
+        min_volume: float = 1.0,
+        feature_store: Optional[StreamingFeatureStore] = None,
+        feature_cache: Optional[FeatureCache] = None,
+        model_cache: Optional[ModelCache] = None,
     ):
         self.db = db
         self.registry = registry or ModelRegistry(registry_dir=settings.MODEL_REGISTRY_DIR)
@@ -565,6 +584,19 @@ class SignalEngine:
         self.performance_tracker = performance_tracker or PerformanceTracker(
             tracking_dir=settings.PERFORMANCE_TRACKING_DIR
         )
+        if feature_store is None and settings.STREAMING_FEATURES_ENABLED:
+            feature_store = StreamingFeatureStore(
+                ttl_seconds=settings.STREAMING_FEATURES_TTL_SECONDS
+            )
+        self.feature_store = feature_store
+        if feature_cache is None and settings.FEATURE_CACHE_ENABLED:
+            feature_cache = FeatureCache()
+        self.feature_cache = feature_cache
+        if model_cache is None and settings.MODEL_CACHE_ENABLED:
+            model_cache = get_model_cache()
+        self.model_cache = model_cache
+        if self.model_cache is not None:
+            self.model_cache.sync_registry(self.registry)
 
     def generate_for_deployment(
         self,
@@ -587,40 +619,189 @@ class SignalEngine:
             )
             return None
 
-        timeframe_value = timeframe.value if isinstance(timeframe, Enum) else str(timeframe)
+        model = self._load_model(deployment)
 
         try:
-            timeframe_enum = TimeFrame(timeframe_value)
-        except ValueError:
-            logger.warning(
-                "Unable to resolve timeframe enum for %s; duplicate-signal guard will fallback to symbol-level check",
-                timeframe_value
+            latest_snapshot = self._prepare_latest_snapshot(
+                symbol, timeframe, *self._feature_plan([model])
             )
-            timeframe_enum = None
-
-        try:
-            latest_snapshot = self._prepare_latest_snapshot(symbol, timeframe)
         except ValueError as exc:
             logger.error("Signal generation aborted: %s", exc)
             return None
 
-        model = self._load_model(deployment)
+        inference_df = self._inference_frame(model, latest_snapshot["features"])
+        probability = self._to_probability(model.predict_proba(inference_df))
+
+        return self._evaluate_prediction(
+            symbol,
+            timeframe,
+            environment,
+            deployment,
+            latest_snapshot,
+            inference_df,
+            probability,
+            risk_profile,
+            capital_usd,
+        )
 
-        feature_columns = self._determine_feature_columns(model, latest_snapshot['features'])
-        if not feature_columns:
-            raise ValueError("No numeric features available for inference")
-        inference_values = []
-        for column in feature_columns:
-            value = latest_snapshot['features'].get(column)
+    def generate_for_deployments(
+        self,
+        requests: List[Tuple[str, str, str]],
+        risk_profile: RiskProfile = RiskProfile.MEDIUM,
+        capital_usd: float = 1000.0,
+    ) -> Iterator[Tuple[Tuple[str, str, str], Union[Optional[SignalInferenceResult], Exception]]]:
+        """
+        Generate signals for many deployments with batched data loading and inference.
+
+        The latest bars of every requested symbol are read with one query per
+        timeframe, features are computed concurrently, and deployments sharing
+        a model artifact are scored with a single ``predict_proba`` call on the
+        stacked rows. Risk filters are then evaluated per deployment, lazily
+        and in request order, so signals the caller persists between items are
+        seen by the duplicate and position-limit checks of later ones - exactly
+        as with repeated generate_for_deployment calls.
+
+        Args:
+            requests: (symbol, timeframe, environment) per deployment
+            risk_profile: Risk profile applied to every signal
+            capital_usd: Capital used for position sizing
+
+        Yields:
+            (request, outcome) in request order, where outcome is the
+            SignalInferenceResult, None if the deployment or its market data is
+            missing, or the exception raised while processing that deployment
+        """
+        requests = [tuple(request) for request in requests]
+        outcomes: Dict[int, Union[Optional[SignalInferenceResult], Exception]] = {}
+        deployments: Dict[int, Dict[str, Any]] = {}
+
+        for index, (symbol, timeframe, environment) in enumerate(requests):
+            deployment = self.registry.get_deployed_model(symbol, timeframe, environment)
+            if not deployment:
+                logger.warning(
+                    "No deployed model found for %s %s in %s environment",
+                    symbol,
+                    timeframe,
+                    environment,
+                )
+                outcomes[index] = None
+                continue
+            deployments[index] = deployment
+
+        # Load each artifact once; the features its models read decide what each snapshot computes
+        models: Dict[str, Any] = {}
+        load_errors: Dict[int, Exception] = {}
+        pair_models: Dict[Tuple[str, str], List[Any]] = {}
+        for index, deployment in deployments.items():
+            model_path = deployment.get("path")
             try:
-                inference_values.append(float(value))
-            except (TypeError, ValueError):
-                inference_values.append(0.0)
+                if model_path not in models:
+                    models[model_path] = self._load_model(deployment)
+            except Exception as exc:
+                load_errors[index] = exc
+                continue
+            pair = (requests[index][0], self._timeframe_value(requests[index][1]))
+            pair_models.setdefault(pair, []).append(models[model_path])
+
+        plans = {pair: self._feature_plan(loaded) for pair, loaded in pair_models.items()}
+        try:
+            snapshots = self._prepare_latest_snapshots(list(plans), plans)
+        except Exception as exc:
+            logger.error("Batched market data preparation failed: %s", exc)
+            snapshots = {pair: exc for pair in plans}
+
+        # Group the rows each artifact has to score
+        batches: Dict[Tuple[str, Tuple[str, ...]], List[Tuple[int, pd.DataFrame]]] = {}
+        for index, deployment in deployments.items():
+            if index in load_errors:
+                outcomes[index] = load_errors[index]
+                continue
+
+            symbol, timeframe, _ = requests[index]
+            snapshot = snapshots.get((symbol, self._timeframe_value(timeframe)))
+            if isinstance(snapshot, ValueError):
+                logger.error("Signal generation aborted: %s", snapshot)
+                outcomes[index] = None
+                continue
+            if isinstance(snapshot, Exception):
+                outcomes[index] = snapshot
+                continue
+
+            model_path = deployment.get("path")
+            try:
+                inference_df = self._inference_frame(models[model_path], snapshot["features"])
+            except Exception as exc:
+                outcomes[index] = exc
+                continue
+
+            batch_key = (model_path, tuple(inference_df.columns))
+            batches.setdefault(batch_key, []).append((index, inference_df))
 
-        inference_df = pd.DataFrame([inference_values], columns=feature_columns)
+        scored: Dict[int, Tuple[pd.DataFrame, float]] = {}
+        for (model_path, _), rows in batches.items():
+            try:
+                scores = self._predict_rows(models[model_path], [frame for _, frame in rows])
+            except Exception as exc:
+                for index, _ in rows:
+                    outcomes[index] = exc
+                continue
+            for (index, frame), score in zip(rows, scores):
+                scored[index] = (frame, score)
+
+        logger.info(
+            "Scored %d deployments with %d model calls (%d artifacts)",
+            len(scored),
+            len(batches),
+            len(models),
+        )
+
+        for index, request in enumerate(requests):
+            if index not in scored:
+                yield request, outcomes.get(index)
+                continue
 
-        probabilities = model.predict_proba(inference_df)
-        probability = float(probabilities[0]) if isinstance(probabilities, (list, np.ndarray, pd.Series)) else float(probabilities)
+            symbol, timeframe, environment = request
+            inference_df, probability = scored[index]
+            try:
+                outcome = self._evaluate_prediction(
+                    symbol,
+                    timeframe,
+                    environment,
+                    deployments[index],
+                    snapshots[(symbol, self._timeframe_value(timeframe))],
+                    inference_df,
+                    probability,
+                    risk_profile,
+                    capital_usd,
+                )
+            except Exception as exc:
+                outcome = exc
+            yield request, outcome
+
+    def _evaluate_prediction(
+        self,
+        symbol: str,
+        timeframe: str,
+        environment: str,
+        deployment: Dict[str, Any],
+        latest_snapshot: Dict[str, Any],
+        inference_df: pd.DataFrame,
+        probability: float,
+        risk_profile: RiskProfile,
+        capital_usd: float,
+    ) -> SignalInferenceResult:
+        """Apply risk filters to a model probability and build the trading signal."""
+
+        timeframe_value = self._timeframe_value(timeframe)
+
+        try:
+            timeframe_enum = TimeFrame(timeframe_value)
+        except ValueError:
+            logger.warning(
+                "Unable to resolve timeframe enum for %s; duplicate-signal guard will fallback to symbol-level check",
+                timeframe_value,
+            )
+            timeframe_enum = None
 
         side = Side.LONG if probability >= 0.5 else Side.SHORT
         confidence = probability if side == Side.LONG else 1.0 - probability
@@ -870,21 +1051,9 @@ class SignalEngine:
 
         timeframe_value = timeframe.value if isinstance(timeframe, Enum) else str(timeframe)
 
-        ohlcv_rows = (
-            self.db.query(OHLCV)
-            .filter(
-                and_(
-                    OHLCV.symbol == symbol,
-                    OHLCV.timeframe == timeframe_value,
-                    OHLCV.timestamp >= start_date,
-                    OHLCV.timestamp <= end_date,
-                )
-            )
-            .order_by(OHLCV.timestamp.asc())
-            .all()
-        )
+        df = load_ohlcv_history(self.db, symbol, timeframe_value, start=start_date, end=end_date)
 
-        if not ohlcv_rows:
+        if df.empty:
             logger.warning(
                 "No OHLCV rows available for %s %s between %s and %s",
                 symbol,
@@ -894,21 +1063,12 @@ class SignalEngine:
             )
             return []
 
-        df = pd.DataFrame(
-            [
-                {
-                    'timestamp': row.timestamp,
-                    'open': row.open,
-                    'high': row.high,
-                    'low': row.low,
-                    'close': row.close,
-                    'volume': row.volume,
-                }
-                for row in ohlcv_rows
-            ]
-        )
-
-        features_df = self.feature_engineering.compute_all_features(df)
+        if self.feature_cache is not None:
+            features_df, _ = self.feature_cache.get_or_compute(
+                symbol, timeframe_value, df, self.feature_engineering
+            )
+        else:
+            features_df = self.feature_engineering.compute_all_features(df)
 
         # Try to get deployed model first, fallback to best model
         registry_entry = self.registry.get_deployed_model(symbol, timeframe_value, 'production')
@@ -981,41 +1141,49 @@ class SignalEngine:
 
         return result_signals
 
-    def _prepare_latest_snapshot(self, symbol: str, timeframe: str) -> Dict[str, Any]:
-        """Fetch latest OHLCV data and compute features/ATR."""
+    @staticmethod
+    def _timeframe_value(timeframe) -> str:
+        return timeframe.value if isinstance(timeframe, Enum) else str(timeframe)
 
-        timeframe_value = timeframe.value if isinstance(timeframe, Enum) else str(timeframe)
+    def _feature_plan(self, models: List[Any]) -> Tuple[Optional[List[str]], int]:
+        """
+        Feature columns and number of bars a snapshot needs to score ``models``.
 
-        ohlcv_rows = (
-            self.db.query(OHLCV)
-            .filter(
-                and_(
-                    OHLCV.symbol == symbol,
-                    OHLCV.timeframe == timeframe_value,
-                    OHLCV.timestamp != None
-                )
-            )
-            .order_by(OHLCV.timestamp.desc())
-            .limit(self.lookback_bars)
-            .all()
+        Only the feature subgraph the models (and the risk filters) read is
+        computed, over the shortest window that warms it up, capped at
+        ``lookback_bars``. A model without feature metadata needs everything.
+        """
+        columns = list(self.SNAPSHOT_FEATURES)
+        for model in models:
+            names = getattr(model, "feature_names", None)
+            if not names:
+                return None, self.lookback_bars
+            columns.extend(names)
+
+        columns = list(dict.fromkeys(columns))
+        lookback = feature_lookback(columns)
+        return columns, self.lookback_bars if lookback is None else min(
+            self.lookback_bars, lookback
         )
 
-        if not ohlcv_rows:
-            raise ValueError(f"No OHLCV data available for {symbol} {timeframe}")
+    def _prepare_latest_snapshot(
+        self,
+        symbol: str,
+        timeframe: str,
+        columns: Optional[List[str]] = None,
+        bars: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Fetch latest OHLCV data and compute features/ATR.
 
-        ohlcv_rows = list(reversed(ohlcv_rows))
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe (enum or value)
+            columns: Feature columns to compute (default: all)
+            bars: Bars to compute them over (default: lookback_bars)
+        """
 
-        df = pd.DataFrame([
-            {
-                'timestamp': row.timestamp,
-                'open': row.open,
-                'high': row.high,
-                'low': row.low,
-                'close': row.close,
-                'volume': row.volume
-            }
-            for row in ohlcv_rows
-        ])
+        timeframe_value = self._timeframe_value(timeframe)
 
         market_metrics_row = (
             self.db.query(MarketMetrics)
@@ -1024,22 +1192,289 @@ class SignalEngine:
             .first()
         )
 
-        market_metrics_df = pd.DataFrame([
-            {
-                'timestamp': market_metrics_row.timestamp,
-                'funding_rate': market_metrics_row.funding_rate,
-                'open_interest': market_metrics_row.open_interest,
-                'spread_bps': market_metrics_row.spread_bps,
-                'depth_imbalance': market_metrics_row.depth_imbalance,
-                'realized_volatility': market_metrics_row.realized_volatility
-            }
-        ]) if market_metrics_row else pd.DataFrame()
+        use_streaming = self.feature_store is not None and self.feature_store.is_available()
+        if use_streaming:
+            snapshot = self._prepare_streaming_snapshot(symbol, timeframe_value, market_metrics_row)
+            if snapshot is not None:
+                return snapshot
+
+        # Seeding the streaming state needs every feature warmed up over the full window
+        limit = self.lookback_bars if use_streaming or bars is None else bars
+        df = load_ohlcv(self.db, symbol, timeframe_value, limit=limit, latest=True)
+        return self._snapshot_from_bars(
+            symbol, timeframe_value, df, market_metrics_row, use_streaming, columns
+        )
+
+    def _prepare_latest_snapshots(
+        self,
+        pairs: List[Tuple[str, str]],
+        plans: Optional[Dict[Tuple[str, str], Tuple[Optional[List[str]], int]]] = None,
+    ) -> Dict[Tuple[str, str], Union[Dict[str, Any], Exception]]:
+        """
+        Batched counterpart of _prepare_latest_snapshot for many (symbol, timeframe) pairs.
+
+        All database reads happen on the calling thread (the session is not
+        thread-safe); only feature computation is fanned out to a thread pool.
+
+        Args:
+            pairs: (symbol, timeframe value) pairs
+            plans: (columns, bars) per pair from ``_feature_plan`` (default: all features, lookback_bars)
+
+        Returns:
+            Snapshot per pair, or the exception raised while preparing it
+        """
+        pairs = list(dict.fromkeys(pairs))
+        if not pairs:
+            return {}
+
+        metrics_rows = self._latest_market_metrics(sorted({symbol for symbol, _ in pairs}))
+        use_streaming = self.feature_store is not None and self.feature_store.is_available()
+
+        snapshots: Dict[Tuple[str, str], Union[Dict[str, Any], Exception]] = {}
+        pending: List[Tuple[str, str]] = []
+        for pair in pairs:
+            if use_streaming:
+                try:
+                    snapshot = self._prepare_streaming_snapshot(
+                        pair[0], pair[1], metrics_rows.get(pair[0])
+                    )
+                except Exception as exc:
+                    snapshots[pair] = exc
+                    continue
+                if snapshot is not None:
+                    snapshots[pair] = snapshot
+                    continue
+            pending.append(pair)
+
+        plans = plans or {}
+        bars: Dict[Tuple[str, str], pd.DataFrame] = {}
+        by_window: Dict[Tuple[str, int], List[str]] = {}
+        for symbol, timeframe_value in pending:
+            limit = self.lookback_bars
+            if not use_streaming:
+                limit = plans.get((symbol, timeframe_value), (None, self.lookback_bars))[1]
+            by_window.setdefault((timeframe_value, limit), []).append(symbol)
+        for (timeframe_value, limit), symbols in by_window.items():
+            frames = load_latest_ohlcv_many(self.db, symbols, timeframe_value, limit)
+            for symbol, frame in frames.items():
+                bars[(symbol, timeframe_value)] = frame
+
+        panel_features: Dict[Tuple[str, str], pd.DataFrame] = {}
+        if settings.PANEL_FEATURES_ENABLED:
+            for (timeframe_value, _), symbols in by_window.items():
+                group = [(symbol, timeframe_value) for symbol in symbols]
+                try:
+                    panel_features.update(
+                        self._compute_panel_features(group, bars, metrics_rows, plans)
+                    )
+                except Exception as exc:
+                    logger.warning(
+                        "Panel features failed for %s, computing per symbol: %s",
+                        timeframe_value,
+                        exc,
+                    )
+
+        def _compute(pair: Tuple[str, str]) -> Dict[str, Any]:
+            return self._snapshot_from_bars(
+                pair[0],
+                pair[1],
+                bars.get(pair, empty_ohlcv_frame()),
+                metrics_rows.get(pair[0]),
+                use_streaming,
+                plans.get(pair, (None,))[0],
+                features_df=panel_features.get(pair),
+            )
+
+        workers = min(len(pending), max(1, settings.SIGNAL_FEATURE_WORKERS))
+        if workers <= 1:
+            for pair in pending:
+                try:
+                    snapshots[pair] = _compute(pair)
+                except Exception as exc:
+                    snapshots[pair] = exc
+        else:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="signal-features"
+            ) as executor:
+                futures = {pair: executor.submit(_compute, pair) for pair in pending}
+                for pair, future in futures.items():
+                    try:
+                        snapshots[pair] = future.result()
+                    except Exception as exc:
+                        snapshots[pair] = exc
+
+        return snapshots
+
+    def _compute_panel_features(
+        self,
+        pairs: List[Tuple[str, str]],
+        bars: Dict[Tuple[str, str], pd.DataFrame],
+        metrics_rows: Dict[str, MarketMetrics],
+        plans: Dict[Tuple[str, str], Tuple[Optional[List[str]], int]],
+    ) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """
+        Compute features for pairs sharing a timeframe in one pass over a symbol panel.
+
+        Symbols with a hole in their bars would not match a per-symbol
+        computation and are left out, as are groups of fewer than two symbols.
+
+        Returns:
+            Feature frame per pair, as ``compute_all_features`` returns it
+        """
+        frames = {
+            symbol: bars[(symbol, timeframe)]
+            for symbol, timeframe in pairs
+            if not bars.get((symbol, timeframe), empty_ohlcv_frame()).empty
+        }
+        if len(frames) < 2:
+            return {}
+
+        panel = FeaturePanel.from_frames(frames)
+        gapped = panel.gapped_symbols()
+        if gapped:
+            frames = {symbol: frame for symbol, frame in frames.items() if symbol not in gapped}
+            if len(frames) < 2:
+                return {}
+            panel = FeaturePanel.from_frames(frames)
+
+        # One subgraph serves the whole group; extra columns are ignored at inference
+        plan_columns = [plans.get(pair, (None,))[0] for pair in pairs if pair[0] in frames]
+        columns = None
+        if all(plan is not None for plan in plan_columns):
+            columns = sorted({column for plan in plan_columns for column in plan})
+
+        market_metrics = {
+            symbol: pd.DataFrame([self._market_metrics_from_row(metrics_rows[symbol])])
+            for symbol in frames
+            if metrics_rows.get(symbol)
+        }
+        result = self.feature_engineering.compute_panel_features(
+            panel, market_metrics=market_metrics, columns=columns
+        )
+        timeframe = pairs[0][1]
+        return {(symbol, timeframe): result.frame(symbol) for symbol in frames}
+
+    def _latest_market_metrics(self, symbols: List[str]) -> Dict[str, MarketMetrics]:
+        """Newest MarketMetrics row per symbol in a single query."""
+
+        latest = (
+            self.db.query(
+                MarketMetrics.symbol.label("symbol"),
+                func.max(MarketMetrics.timestamp).label("timestamp"),
+            )
+            .filter(MarketMetrics.symbol.in_(symbols))
+            .group_by(MarketMetrics.symbol)
+            .subquery()
+        )
+        rows = (
+            self.db.query(MarketMetrics)
+            .join(
+                latest,
+                (MarketMetrics.symbol == latest.c.symbol)
+                & (MarketMetrics.timestamp == latest.c.timestamp),
+            )
+            .all()
+        )
+        return {row.symbol: row for row in rows}
+
+    def _snapshot_from_bars(
+        self,
+        symbol: str,
+        timeframe_value: str,
+        df: pd.DataFrame,
+        market_metrics_row: Optional[MarketMetrics],
+        seed_streaming: bool,
+        columns: Optional[List[str]] = None,
+        features_df: Optional[pd.DataFrame] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compute features (all, or the subgraph producing ``columns``) on a window of bars and build the inference snapshot.
+
+        ``features_df`` skips the computation when the features of ``df`` are
+        already known (panel computation).
+        """
+
+        if df.empty:
+            raise ValueError(f"No OHLCV data available for {symbol} {timeframe_value}")
 
-        features_df = self.feature_engineering.compute_all_features(df, market_metrics=market_metrics_df)
+        if features_df is None:
+            market_metrics_df = (
+                pd.DataFrame([self._market_metrics_from_row(market_metrics_row)])
+                if market_metrics_row
+                else pd.DataFrame()
+            )
+
+            features_df = self.feature_engineering.compute_all_features(
+                df, market_metrics=market_metrics_df, columns=columns
+            )
         features_df = features_df.ffill().bfill()
 
-        latest_row = features_df.iloc[-1]
+        if seed_streaming:
+            # Seed incremental state from the same window; the newest bar may still be forming
+            engine = StreamingFeatureEngine(symbol, timeframe_value)
+            metrics = (
+                self._market_metrics_from_row(market_metrics_row) if market_metrics_row else None
+            )
+            engine.warm_up(df.iloc[:-1], metrics)
+            if engine.last_timestamp is not None:
+                self.feature_store.save(engine)
+
+        return self._build_snapshot(features_df.iloc[-1], df, market_metrics_row)
+
+    def _prepare_streaming_snapshot(
+        self, symbol: str, timeframe_value: str, market_metrics_row: Optional[MarketMetrics]
+    ) -> Optional[Dict[str, Any]]:
+        """Advance persisted streaming feature state to the newest candle, if available."""
+
+        engine = self.feature_store.load(symbol, timeframe_value)
+        if engine is None or engine.last_row is None:
+            return None
+
+        new_candles = load_ohlcv(
+            self.db,
+            symbol,
+            timeframe_value,
+            start=engine.last_timestamp.to_pydatetime(),
+            limit=self.lookback_bars + 1,
+        )
+        new_candles = new_candles[new_candles["timestamp"] > engine.last_timestamp]
+
+        if len(new_candles) >= self.lookback_bars:
+            # State is too stale to catch up cheaply; rebuild from the batch pipeline
+            return None
+
+        metrics = self._market_metrics_from_row(market_metrics_row) if market_metrics_row else None
+        candles = new_candles.to_dict("records")
+
+        # Every candle followed by a newer one is closed and can be committed
+        for candle in candles[:-1]:
+            engine.update(candle, metrics)
+        if len(candles) > 1:
+            self.feature_store.save(engine)
+
+        if candles:
+            latest = engine.fill_forward(engine.preview(candles[-1], metrics))
+        else:
+            latest = engine.fill_forward(engine.last_row)
+
+        df = pd.DataFrame([latest])
+        return self._build_snapshot(pd.Series(latest), df, market_metrics_row)
+
+    @staticmethod
+    def _market_metrics_from_row(row: MarketMetrics) -> Dict[str, Any]:
+        return {
+            "timestamp": row.timestamp,
+            "funding_rate": row.funding_rate,
+            "open_interest": row.open_interest,
+            "spread_bps": row.spread_bps,
+            "depth_imbalance": row.depth_imbalance,
+            "realized_volatility": row.realized_volatility,
+        }
 
+    @staticmethod
+    def _build_snapshot(
+        latest_row: pd.Series, df: pd.DataFrame, market_metrics_row: Optional[MarketMetrics]
+    ) -> Dict[str, Any]:
         atr = latest_row.get('atr_14')
         if pd.isna(atr):
             raise ValueError("ATR calculation returned NaN")
@@ -1065,6 +1500,10 @@ class SignalEngine:
         if not model_path:
             raise ValueError("Deployment missing model path")
 
+        if self.model_cache is not None:
+            tag = (deployment.get("symbol"), deployment.get("timeframe"), deployment.get("version"))
+            return self.model_cache.get(model_path, self.model_factory, tag=tag)
+
         model = self.model_factory()
         model.load(model_path)
         return model
@@ -1079,6 +1518,43 @@ class SignalEngine:
             'timeframe': deployment.get('timeframe')
         }
 
+    @classmethod
+    def _inference_frame(cls, model: Any, features: pd.Series) -> pd.DataFrame:
+        """Single-row inference input in the column order the model expects."""
+
+        feature_columns = cls._determine_feature_columns(model, features)
+        if not feature_columns:
+            raise ValueError("No numeric features available for inference")
+        inference_values = []
+        for column in feature_columns:
+            value = features.get(column)
+            try:
+                inference_values.append(float(value))
+            except (TypeError, ValueError):
+                inference_values.append(0.0)
+
+        return pd.DataFrame([inference_values], columns=feature_columns)
+
+    @staticmethod
+    def _to_probability(probabilities: Any) -> float:
+        if isinstance(probabilities, (list, np.ndarray, pd.Series)):
+            return float(probabilities[0])
+        return float(probabilities)
+
+    @classmethod
+    def _predict_rows(cls, model: Any, frames: List[pd.DataFrame]) -> List[float]:
+        """Score single-row frames with one predict_proba call on the stacked matrix."""
+
+        if len(frames) > 1:
+            probabilities = model.predict_proba(pd.concat(frames, ignore_index=True))
+            if isinstance(probabilities, (list, np.ndarray, pd.Series)):
+                values = np.asarray(probabilities, dtype=np.float64).reshape(-1)
+                if len(values) == len(frames):
+                    return [float(value) for value in values]
+            logger.debug("Model returned no per-row probabilities; scoring rows individually")
+
+        return [cls._to_probability(model.predict_proba(frame)) for frame in frames]
+
     @staticmethod
     def _determine_feature_columns(model: Any, latest_row: pd.Series) -> list:
         """Determine feature columns expected by the model."""
@@ -0,0 +1,997 @@
+"""
+Incremental feature engine for live signal generation.
+
+Mirrors ``FeatureEngineering.compute_all_features`` but keeps bounded rolling
+state per (symbol, timeframe), so each closed candle costs O(1) work instead of
+recomputing the full lookback window.
+
+The indicators the batch pipeline takes from TA-Lib (EMA, RSI, STOCH, MACD,
+ATR, BBANDS, ADX) are reproduced with TA-Lib's own recurrences, including its
+SMA seeding and output alignment; otherwise the pandas fallbacks are mirrored.
+pandas_ta is not mirrored, so streaming is unsupported when it is the backend.
+Because the recursive smoothers remember their seed, a streamed row matches the
+batch row computed over the history the state has seen since it was seeded.
+"""
+
+import logging
+import math
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from apps.api.cache import get_cached_json, get_redis_client, set_cached_json
+from apps.ml.features import indicator_backend
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 2
+
+# Indicator backends whose batch output the engine reproduces
+STREAMING_BACKENDS = ("talib", "pandas")
+
+# Longest history each rolling series needs to reproduce the batch features
+BUFFER_SIZES = {
+    "close": 26,
+    "high": 50,
+    "low": 50,
+    "volume": 100,
+    "gain": 14,
+    "loss": 14,
+    "tr": 14,
+    "atr": 4,
+    "fast_k": 3,
+    "stoch_k": 3,
+    "close_volume": 96,
+    "rsi": 15,
+    "stochrsi": 3,
+    "stochrsi_k": 3,
+    "plus_dm": 14,
+    "minus_dm": 14,
+    "adx_tr": 14,
+    "dx": 14,
+    "vwap_dev": 50,
+    "returns": 20,
+    "estimated_spread_bps": 100,
+    "ema_20": 4,
+    "ema_50": 4,
+    "ema_20_slope": 4,
+    "ema_50_slope": 4,
+    "bb_width": 100,
+    "atr_pct": 100,
+    "hl_range": 20,
+}
+
+EMA_SPANS = {
+    "ema_9": 9,
+    "ema_21": 21,
+    "ema_50": 50,
+    "ema_200": 200,
+    "ema_12": 12,
+    "ema_26": 26,
+    "macd_signal": 9,
+    "ema_20": 20,
+    "obv_ema": 20,
+    "obi_ema": 10,
+}
+
+# Periods of TA-Lib's SMA-seeded smoothers; RSI and ATR use Wilder's alpha = 1 / period
+TALIB_EMA_PERIODS = {
+    "ema_9": 9,
+    "ema_21": 21,
+    "ema_50": 50,
+    "ema_200": 200,
+    "macd_signal": 9,
+}
+TALIB_WILDER_PERIODS = {
+    "gain": 14,
+    "loss": 14,
+    "atr": 14,
+}
+
+SWING_WINDOW = 5
+NAN = float("nan")
+
+
+def _is_zero(value: float) -> bool:
+    """TA-Lib's TA_IS_ZERO."""
+    return -1e-8 < value < 1e-8
+
+
+class _Ewm:
+    """Exponentially weighted mean matching ``Series.ewm(span, adjust=False).mean()``."""
+
+    def __init__(self, span: int):
+        com = (span - 1) / 2.0
+        alpha = 1.0 / (1.0 + com)
+        self.old_wt_factor = 1.0 - alpha
+        self.new_wt = alpha
+        self.weighted = NAN
+        self.old_wt = 1.0
+        self.started = False
+
+    def update(self, value: float) -> float:
+        if not self.started:
+            self.started = True
+            self.weighted = value
+            self.old_wt = 1.0
+            return self.weighted
+
+        is_observation = value == value
+        if self.weighted == self.weighted:
+            self.old_wt *= self.old_wt_factor
+            if is_observation:
+                # Same update order as pandas to stay bit-compatible
+                if self.weighted != value:
+                    self.weighted = self.old_wt * self.weighted + self.new_wt * value
+                    self.weighted /= self.old_wt + self.new_wt
+                self.old_wt = 1.0
+        elif is_observation:
+            self.weighted = value
+
+        return self.weighted
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"weighted": self.weighted, "old_wt": self.old_wt, "started": self.started}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.weighted = state["weighted"]
+        self.old_wt = state["old_wt"]
+        self.started = state["started"]
+
+
+class _SeededSmoother:
+    """
+    TA-Lib's recursive average: NaN until ``period`` values were seen, seeded with
+    their simple mean, then ``value += alpha * (x - value)``.
+
+    ``alpha = 2 / (period + 1)`` is TA-Lib's EMA, ``1 / period`` Wilder's
+    smoothing (RSI, ATR).
+    """
+
+    def __init__(self, period: int, alpha: float):
+        self.period = period
+        self.alpha = alpha
+        self.count = 0
+        self.total = 0.0
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        if self.count < self.period:
+            self.count += 1
+            self.total += value
+            if self.count == self.period:
+                self.value = self.total / self.period
+            return self.value
+
+        self.value = (value - self.value) * self.alpha + self.value
+        return self.value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"count": self.count, "total": self.total, "value": self.value}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.count = state["count"]
+        self.total = state["total"]
+        self.value = state["value"]
+
+
+class _TalibAdx:
+    """
+    TA-Lib's ADX: directional movement and true range are summed over the first
+    ``period - 1`` bars, then Wilder-smoothed; the first ADX is the mean DX of
+    the next ``period`` bars and later ones are Wilder-smoothed DX.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.bars = 0
+        self.prev_high = NAN
+        self.prev_low = NAN
+        self.prev_close = NAN
+        self.plus_dm = 0.0
+        self.minus_dm = 0.0
+        self.tr = 0.0
+        self.sum_dx = 0.0
+        self.adx = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        period = self.period
+        self.bars += 1
+        if self.bars == 1:
+            self.prev_high, self.prev_low, self.prev_close = high, low, close
+            return NAN
+
+        diff_plus = high - self.prev_high
+        diff_minus = self.prev_low - low
+        true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        smoothing = self.bars > period
+        if smoothing:
+            self.minus_dm -= self.minus_dm / period
+            self.plus_dm -= self.plus_dm / period
+        if diff_minus > 0 and diff_plus < diff_minus:
+            self.minus_dm += diff_minus
+        elif diff_plus > 0 and diff_plus > diff_minus:
+            self.plus_dm += diff_plus
+        self.tr = self.tr - self.tr / period + true_range if smoothing else self.tr + true_range
+        if not smoothing:
+            return NAN
+
+        dx = NAN
+        if not _is_zero(self.tr):
+            minus_di = 100 * (self.minus_dm / self.tr)
+            plus_di = 100 * (self.plus_dm / self.tr)
+            total = minus_di + plus_di
+            if not _is_zero(total):
+                dx = 100 * (abs(minus_di - plus_di) / total)
+
+        if self.bars <= 2 * period:
+            if dx == dx:
+                self.sum_dx += dx
+            if self.bars == 2 * period:
+                self.adx = self.sum_dx / period
+                return self.adx
+            return NAN
+
+        if dx == dx:
+            self.adx = (self.adx * (period - 1) + dx) / period
+        return self.adx
+
+    def to_state(self) -> Dict[str, Any]:
+        return {key: value for key, value in vars(self).items() if key != "period"}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        for key, value in state.items():
+            setattr(self, key, value)
+
+
+def _window(buffer: Deque[float], size: int) -> Optional[np.ndarray]:
+    """Return the last ``size`` values, or None when incomplete or containing NaN."""
+    if len(buffer) < size:
+        return None
+    values = np.fromiter(
+        (buffer[i] for i in range(len(buffer) - size, len(buffer))), dtype=np.float64, count=size
+    )
+    if np.isnan(values).any():
+        return None
+    return values
+
+
+def _mean(buffer: Deque[float], size: int) -> float:
+    values = _window(buffer, size)
+    return NAN if values is None else float(values.mean())
+
+
+def _sum(buffer: Deque[float], size: int) -> float:
+    values = _window(buffer, size)
+    return NAN if values is None else float(values.sum())
+
+
+def _std(buffer: Deque[float], size: int) -> float:
+    values = _window(buffer, size)
+    return NAN if values is None else float(values.std(ddof=1))
+
+
+def _max(buffer: Deque[float], size: int) -> float:
+    values = _window(buffer, size)
+    return NAN if values is None else float(values.max())
+
+
+def _min(buffer: Deque[float], size: int) -> float:
+    values = _window(buffer, size)
+    return NAN if values is None else float(values.min())
+
+
+def _quantile(buffer: Deque[float], size: int, q: float) -> float:
+    values = _window(buffer, size)
+    return NAN if values is None else float(np.quantile(values, q))
+
+
+def _rank_pct(buffer: Deque[float], size: int) -> float:
+    """Average-method percentile rank of the newest value within the window."""
+    values = _window(buffer, size)
+    if values is None:
+        return NAN
+    current = values[-1]
+    less = np.count_nonzero(values < current)
+    equal = np.count_nonzero(values == current)
+    return (less + (equal + 1) / 2.0) / size
+
+
+def _lag(buffer: Deque[float], periods: int) -> float:
+    """Value ``periods`` bars before the newest one (``Series.shift(periods)``)."""
+    if len(buffer) <= periods:
+        return NAN
+    return buffer[-1 - periods]
+
+
+def _safe_div(numerator: float, denominator: float) -> float:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.float64(numerator) / np.float64(denominator))
+
+
+def _gt(a: float, b: float) -> bool:
+    return bool(a > b)
+
+
+class StreamingFeatureEngine:
+    """
+    Incremental counterpart of ``FeatureEngineering.compute_all_features``.
+
+    Each call to ``update`` consumes one closed candle and returns the feature
+    row the batch pipeline would produce for the last bar of the same history.
+    State is bounded by ``BUFFER_SIZES`` and can be serialized to JSON.
+    """
+
+    def __init__(self, symbol: str, timeframe: str, backend: Optional[str] = None):
+        """
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe value
+            backend: Indicator backend to reproduce (default: the one in use)
+        """
+        backend = backend or indicator_backend()
+        if backend not in STREAMING_BACKENDS:
+            raise ValueError(
+                f"Streaming features cannot reproduce the {backend!r} indicator backend"
+            )
+
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.backend = backend
+        self.buffers: Dict[str, Deque[float]] = {
+            name: deque(maxlen=size) for name, size in BUFFER_SIZES.items()
+        }
+        self.swing_highs: Deque[float] = deque(maxlen=SWING_WINDOW * 2 + 1)
+        self.swing_lows: Deque[float] = deque(maxlen=SWING_WINDOW * 2 + 1)
+        self.ewms: Dict[str, _Ewm] = {name: _Ewm(span) for name, span in EMA_SPANS.items()}
+        self.smoothers: Dict[str, _SeededSmoother] = {
+            **{
+                name: _SeededSmoother(period, 2.0 / (period + 1))
+                for name, period in TALIB_EMA_PERIODS.items()
+            },
+            **{
+                name: _SeededSmoother(period, 1.0 / period)
+                for name, period in TALIB_WILDER_PERIODS.items()
+            },
+        }
+        self.adx = _TalibAdx(14)
+        self.scalars: Dict[str, Any] = {
+            "bars_seen": 0,
+            "cum_close_volume": 0.0,
+            "cum_volume": 0.0,
+            "obv": 0.0,
+            "macd_fast": NAN,
+            "macd_slow": NAN,
+            "prev_upper_band": NAN,
+            "prev_lower_band": NAN,
+            "supertrend_direction": NAN,
+            "last_swing_high": NAN,
+            "last_swing_low": NAN,
+            "is_consolidation": None,
+            "consolidation_duration": 0,
+        }
+        self.metrics: Optional[Dict[str, Any]] = None
+        self.metrics_seen = False
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.last_row: Optional[Dict[str, Any]] = None
+        self.last_valid: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def update(
+        self, candle: Dict[str, Any], market_metrics: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Consume one closed candle and return its feature row.
+
+        Args:
+            candle: Mapping with timestamp, open, high, low, close, volume
+            market_metrics: Latest MarketMetrics values (optional, must include timestamp)
+
+        Returns:
+            Ordered dict of features in ``compute_all_features`` column order
+        """
+        timestamp = pd.Timestamp(candle["timestamp"])
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            raise ValueError(
+                f"Candle {timestamp} is not newer than streaming state {self.last_timestamp} "
+                f"for {self.symbol} {self.timeframe}"
+            )
+
+        row = self._step(candle, timestamp, market_metrics)
+        self.last_timestamp = timestamp
+        self.last_row = row
+
+        for key, value in row.items():
+            if not (isinstance(value, float) and math.isnan(value)):
+                self.last_valid[key] = value
+
+        return row
+
+    def preview(
+        self, candle: Dict[str, Any], market_metrics: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Compute the feature row for a still-forming candle without advancing state."""
+        return StreamingFeatureEngine.from_state(self.to_state()).update(candle, market_metrics)
+
+    def warm_up(
+        self, df: pd.DataFrame, market_metrics: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Replay historical candles (oldest first) and return the last feature row."""
+        row = None
+        for candle in df.sort_values("timestamp").to_dict("records"):
+            row = self.update(candle, market_metrics)
+        return row
+
+    def fill_forward(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace NaN values with the last valid value seen, like ``DataFrame.ffill``."""
+        filled = {}
+        for key, value in row.items():
+            if isinstance(value, float) and math.isnan(value) and key in self.last_valid:
+                filled[key] = self.last_valid[key]
+            else:
+                filled[key] = value
+        return filled
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "version": STATE_VERSION,
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "backend": self.backend,
+            "buffers": {name: list(buffer) for name, buffer in self.buffers.items()},
+            "swing_highs": list(self.swing_highs),
+            "swing_lows": list(self.swing_lows),
+            "ewms": {name: ewm.to_state() for name, ewm in self.ewms.items()},
+            "smoothers": {name: smoother.to_state() for name, smoother in self.smoothers.items()},
+            "adx": self.adx.to_state(),
+            "scalars": dict(self.scalars),
+            "metrics": _serialize_metrics(self.metrics),
+            "metrics_seen": self.metrics_seen,
+            "last_timestamp": self.last_timestamp.isoformat()
+            if self.last_timestamp is not None
+            else None,
+            "last_row": _serialize_row(self.last_row),
+            "last_valid": _serialize_row(self.last_valid),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StreamingFeatureEngine":
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported streaming feature state version: {state.get('version')}")
+
+        engine = cls(state["symbol"], state["timeframe"], state["backend"])
+        for name, values in state["buffers"].items():
+            engine.buffers[name].extend(values)
+        engine.swing_highs.extend(state["swing_highs"])
+        engine.swing_lows.extend(state["swing_lows"])
+        for name, ewm_state in state["ewms"].items():
+            engine.ewms[name].load_state(ewm_state)
+        for name, smoother_state in state["smoothers"].items():
+            engine.smoothers[name].load_state(smoother_state)
+        engine.adx.load_state(state["adx"])
+        engine.scalars.update(state["scalars"])
+        engine.metrics = _deserialize_metrics(state.get("metrics"))
+        engine.metrics_seen = state.get("metrics_seen", False)
+        if state.get("last_timestamp"):
+            engine.last_timestamp = pd.Timestamp(state["last_timestamp"])
+        engine.last_row = _deserialize_row(state.get("last_row"))
+        engine.last_valid = _deserialize_row(state.get("last_valid")) or {}
+        return engine
+
+    # ------------------------------------------------------------------
+    # Internal update
+    # ------------------------------------------------------------------
+
+    def _push(self, name: str, value: float) -> None:
+        self.buffers[name].append(float(value))
+
+    def _step(
+        self,
+        candle: Dict[str, Any],
+        timestamp: pd.Timestamp,
+        market_metrics: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        b = self.buffers
+        s = self.scalars
+        ewm = self.ewms
+        smooth = self.smoothers
+        talib = self.backend == "talib"
+
+        open_ = float(candle["open"])
+        high = float(candle["high"])
+        low = float(candle["low"])
+        close = float(candle["close"])
+        volume = float(candle["volume"])
+
+        prev_close = _lag(b["close"], 0)
+        prev_high = _lag(b["high"], 0)
+        prev_low = _lag(b["low"], 0)
+
+        self._push("close", close)
+        self._push("high", high)
+        self._push("low", low)
+        self._push("volume", volume)
+        self.swing_highs.append(high)
+        self.swing_lows.append(low)
+        s["bars_seen"] += 1
+
+        row: Dict[str, Any] = {
+            "timestamp": timestamp,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+        }
+
+        # EMAs
+        for period in (9, 21, 50, 200):
+            name = f"ema_{period}"
+            row[name] = smooth[name].update(close) if talib else ewm[name].update(close)
+
+        # RSI
+        delta = close - prev_close
+        if talib:
+            # Wilder-smoothed gains and losses from the second bar on
+            avg_gain = avg_loss = NAN
+            if delta == delta:
+                avg_gain = smooth["gain"].update(max(delta, 0.0))
+                avg_loss = smooth["loss"].update(max(-delta, 0.0))
+            total = avg_gain + avg_loss
+            rsi = (
+                total if total != total else (0.0 if _is_zero(total) else 100 * (avg_gain / total))
+            )
+        else:
+            self._push("gain", delta if delta > 0 else 0.0)
+            self._push("loss", -delta if delta < 0 else 0.0)
+            rs = _safe_div(_mean(b["gain"], 14), _mean(b["loss"], 14))
+            rsi = 100 - _safe_div(100, 1 + rs)
+        row["rsi_14"] = rsi
+
+        # Stochastic
+        low_14 = _min(b["low"], 14)
+        high_14 = _max(b["high"], 14)
+        if talib:
+            # Slow %K and %D (SMA 3 each), emitted together once %D exists
+            diff = (high_14 - low_14) / 100.0
+            self._push("fast_k", _safe_div(close - low_14, diff) if diff != 0 else 0.0)
+            stoch_k = _mean(b["fast_k"], 3)
+            self._push("stoch_k", stoch_k)
+            stoch_d = _mean(b["stoch_k"], 3)
+            row["stoch_k"] = NAN if stoch_d != stoch_d else stoch_k
+            row["stoch_d"] = stoch_d
+        else:
+            stoch_k = 100 * _safe_div(close - low_14, high_14 - low_14)
+            self._push("stoch_k", stoch_k)
+            row["stoch_k"] = stoch_k
+            row["stoch_d"] = _mean(b["stoch_k"], 3)
+
+        # MACD
+        if talib:
+            # Both EMAs are seeded on the 26th bar (the fast one from the last 12
+            # closes); all three outputs start once the signal EMA is seeded
+            if s["bars_seen"] == 26:
+                s["macd_fast"] = _mean(b["close"], 12)
+                s["macd_slow"] = _mean(b["close"], 26)
+            elif s["bars_seen"] > 26:
+                s["macd_fast"] = (close - s["macd_fast"]) * (2.0 / 13) + s["macd_fast"]
+                s["macd_slow"] = (close - s["macd_slow"]) * (2.0 / 27) + s["macd_slow"]
+            macd = s["macd_fast"] - s["macd_slow"]
+            macd_signal = smooth["macd_signal"].update(macd) if macd == macd else NAN
+            if macd_signal != macd_signal:
+                macd = NAN
+        else:
+            macd = ewm["ema_12"].update(close) - ewm["ema_26"].update(close)
+            macd_signal = ewm["macd_signal"].update(macd)
+        row["macd"] = macd
+        row["macd_signal"] = macd_signal
+        row["macd_hist"] = macd - macd_signal
+
+        # ATR (pandas max across the three ranges skips NaN; TA-Lib starts at the second bar)
+        true_range = np.nanmax([high - low, abs(high - prev_close), abs(low - prev_close)])
+        if talib:
+            atr = smooth["atr"].update(true_range) if prev_close == prev_close else NAN
+        else:
+            self._push("tr", true_range)
+            atr = _mean(b["tr"], 14)
+        self._push("atr", atr)
+        atr_lag = _lag(b["atr"], 3)
+        row["atr_14"] = atr
+        row["atr_rising"] = int(_gt(atr, atr_lag))
+        row["atr_falling"] = int(_gt(atr_lag, atr))
+        row["atr_slope"] = _safe_div(atr - atr_lag, atr_lag)
+
+        # Bollinger Bands
+        bb_middle = _mean(b["close"], 20)
+        if talib:
+            # Population deviation from the running sums, clamped like TA_IS_ZERO_OR_NEG
+            window = _window(b["close"], 20)
+            variance = (
+                NAN if window is None else float((window * window).mean()) - bb_middle * bb_middle
+            )
+            bb_std = (
+                variance
+                if variance != variance
+                else (math.sqrt(variance) if variance >= 1e-8 else 0.0)
+            )
+        else:
+            bb_std = _std(b["close"], 20)
+        bands = {
+            "bb_middle": bb_middle,
+            "bb_upper": bb_middle + (bb_std * 2),
+            "bb_lower": bb_middle - (bb_std * 2),
+        }
+        # Same column order as the batch pipeline of each backend
+        for name in ("bb_upper", "bb_middle", "bb_lower") if talib else bands:
+            row[name] = bands[name]
+        bb_width = _safe_div(row["bb_upper"] - row["bb_lower"], bb_middle)
+        row["bb_width"] = bb_width
+
+        # VWAP
+        s["cum_close_volume"] += close * volume
+        s["cum_volume"] += volume
+        self._push("close_volume", close * volume)
+        vwap_rolling = _safe_div(_sum(b["close_volume"], 96), _sum(b["volume"], 96))
+        row["vwap"] = _safe_div(s["cum_close_volume"], s["cum_volume"])
+        row["vwap_rolling"] = vwap_rolling
+        row["vwap_distance"] = _safe_div(close - vwap_rolling, vwap_rolling)
+
+        # Stochastic RSI
+        self._push("rsi", rsi)
+        rsi_min = _min(b["rsi"], 14)
+        rsi_max = _max(b["rsi"], 14)
+        stochrsi = 100 * _safe_div(rsi - rsi_min, rsi_max - rsi_min)
+        self._push("stochrsi", stochrsi)
+        stochrsi_k = _mean(b["stochrsi"], 3)
+        self._push("stochrsi_k", stochrsi_k)
+        row["stochrsi"] = stochrsi
+        row["stochrsi_k"] = stochrsi_k
+        row["stochrsi_d"] = _mean(b["stochrsi_k"], 3)
+
+        # Keltner Channels
+        ema_20 = ewm["ema_20"].update(close)
+        row["ema_20"] = ema_20
+        row["keltner_upper"] = ema_20 + 2.0 * atr
+        row["keltner_lower"] = ema_20 - 2.0 * atr
+        row["keltner_width"] = _safe_div(row["keltner_upper"] - row["keltner_lower"], ema_20)
+
+        # Supertrend
+        hl_avg = (high + low) / 2
+        upper_band = hl_avg + 3.0 * atr
+        lower_band = hl_avg - 3.0 * atr
+        if s["bars_seen"] == 1:
+            supertrend = NAN
+        else:
+            if close > s["prev_upper_band"]:
+                s["supertrend_direction"] = 1.0
+            elif close < s["prev_lower_band"]:
+                s["supertrend_direction"] = -1.0
+            supertrend = lower_band if s["supertrend_direction"] == 1 else upper_band
+        s["prev_upper_band"] = upper_band
+        s["prev_lower_band"] = lower_band
+        row["supertrend"] = supertrend
+        row["supertrend_direction"] = s["supertrend_direction"]
+
+        # ADX
+        if talib:
+            row["adx"] = self.adx.update(high, low, close)
+        else:
+            high_diff = high - prev_high
+            low_diff = -(low - prev_low)
+            self._push("plus_dm", high_diff if (high_diff > low_diff and high_diff > 0) else 0.0)
+            self._push("minus_dm", low_diff if (low_diff > high_diff and low_diff > 0) else 0.0)
+            self._push("adx_tr", atr * 14)
+            tr_mean = _mean(b["adx_tr"], 14)
+            plus_di = 100 * _safe_div(_mean(b["plus_dm"], 14), tr_mean)
+            minus_di = 100 * _safe_div(_mean(b["minus_dm"], 14), tr_mean)
+            self._push("dx", 100 * _safe_div(abs(plus_di - minus_di), plus_di + minus_di))
+            row["adx"] = _mean(b["dx"], 14)
+
+        # Swing points are only confirmed SWING_WINDOW bars later, so the newest
+        # bar is never a swing point yet (same as the centered batch window).
+        if len(self.swing_highs) == self.swing_highs.maxlen:
+            center_high = self.swing_highs[SWING_WINDOW]
+            center_low = self.swing_lows[SWING_WINDOW]
+            if center_high == max(self.swing_highs):
+                s["last_swing_high"] = center_high
+            if center_low == min(self.swing_lows):
+                s["last_swing_low"] = center_low
+        row["swing_high"] = 0
+        row["swing_low"] = 0
+        row["dist_to_swing_high"] = _safe_div(close, s["last_swing_high"]) - 1
+        row["dist_to_swing_low"] = _safe_div(close, s["last_swing_low"]) - 1
+
+        # Dynamic Fibonacci
+        rolling_high = _max(b["high"], 50)
+        rolling_low = _min(b["low"], 50)
+        diff = rolling_high - rolling_low
+        row["fib_0"] = rolling_high
+        row["fib_236"] = rolling_high - diff * 0.236
+        row["fib_382"] = rolling_high - diff * 0.382
+        row["fib_50"] = rolling_high - diff * 0.5
+        row["fib_618"] = rolling_high - diff * 0.618
+        row["fib_786"] = rolling_high - diff * 0.786
+        row["fib_100"] = rolling_low
+        row["fib_1618"] = rolling_low - diff * 0.618
+        row["fib_2618"] = rolling_low - diff * 1.618
+
+        # Pivot points
+        pivot = (prev_high + prev_low + prev_close) / 3
+        row["pivot_point"] = pivot
+        row["resistance_1"] = 2 * pivot - prev_low
+        row["support_1"] = 2 * pivot - prev_high
+
+        # OBV
+        if close > prev_close:
+            s["obv"] += volume
+        elif close < prev_close:
+            s["obv"] -= volume
+        obv_ema = ewm["obv_ema"].update(s["obv"])
+        row["obv"] = s["obv"]
+        row["obv_ema"] = obv_ema
+        row["obv_divergence"] = s["obv"] - obv_ema
+
+        # Volume profile
+        volume_mean_20 = _mean(b["volume"], 20)
+        volume_percentile = _rank_pct(b["volume"], 100)
+        self._push("vwap_dev", (close - vwap_rolling) ** 2 * volume)
+        row["volume_surge"] = _safe_div(volume, volume_mean_20)
+        row["high_volume_node"] = int(_gt(volume, _quantile(b["volume"], 50, 0.8)))
+        row["volume_percentile"] = volume_percentile
+        row["volume_quantile_90"] = int(volume_percentile >= 0.90)
+        row["vwap_std"] = _safe_div(_sum(b["vwap_dev"], 50), _sum(b["volume"], 50)) ** 0.5
+
+        # Order book imbalance proxy
+        price_momentum = _safe_div(close, prev_close) - 1
+        volume_ratio = _safe_div(volume, volume_mean_20)
+        buy_pressure = price_momentum * volume_ratio if price_momentum > 0 else 0.0
+        sell_pressure = abs(price_momentum) * volume_ratio if price_momentum < 0 else 0.0
+        obi = (buy_pressure - sell_pressure) / (buy_pressure + sell_pressure + 1e-10)
+        row["obi"] = obi
+        row["obi_ema"] = ewm["obi_ema"].update(obi)
+
+        # Dynamic spread estimate
+        self._push("returns", price_momentum)
+        returns_std = _std(b["returns"], 20)
+        estimated_spread = returns_std * 10000
+        self._push("estimated_spread_bps", estimated_spread)
+        row["estimated_spread_bps"] = estimated_spread
+        row["spread_percentile"] = _rank_pct(b["estimated_spread_bps"], 100)
+
+        # EMA slopes
+        for period, ema_value in ((20, ema_20), (50, row["ema_50"])):
+            name = f"ema_{period}"
+            self._push(name, ema_value)
+            ema_lag = _lag(b[name], 3)
+            slope = _safe_div(ema_value - ema_lag, ema_lag)
+            self._push(f"{name}_slope", slope)
+            row[f"{name}_slope"] = slope
+            row[f"{name}_accel"] = slope - _lag(b[f"{name}_slope"], 3)
+
+        # Consolidation zones
+        self._push("bb_width", bb_width)
+        is_consolidation = int(_gt(_quantile(b["bb_width"], 100, 0.30), bb_width))
+        if is_consolidation and s["is_consolidation"] == 1:
+            s["consolidation_duration"] += 1
+        else:
+            s["consolidation_duration"] = is_consolidation
+        s["is_consolidation"] = is_consolidation
+        row["is_consolidation"] = is_consolidation
+        row["consolidation_duration"] = s["consolidation_duration"]
+
+        # RSI divergence
+        close_lag = _lag(b["close"], 14)
+        rsi_lag = _lag(b["rsi"], 14)
+        rsi_prev = _lag(b["rsi"], 1)
+        row["bearish_divergence"] = int(
+            _gt(close, close_lag)
+            and _gt(close, prev_close)
+            and _gt(rsi_lag, rsi)
+            and _gt(rsi_prev, rsi)
+        )
+        row["bullish_divergence"] = int(
+            _gt(close_lag, close)
+            and _gt(prev_close, close)
+            and _gt(rsi, rsi_lag)
+            and _gt(rsi, rsi_prev)
+        )
+
+        # Market regime
+        ema_diff = row["ema_21"] - row["ema_50"]
+        row["regime_trend"] = 1 if ema_diff > 0 else (-1 if ema_diff < 0 else 0)
+        self._push("atr_pct", _safe_div(atr, close))
+        atr_percentile = _rank_pct(b["atr_pct"], 100)
+        row["regime_volatility"] = (
+            2 if atr_percentile > 0.66 else (1 if atr_percentile > 0.33 else 0)
+        )
+
+        # Market metrics
+        row.update(self._market_metrics_features(timestamp, market_metrics, returns_std))
+        row["sentiment_score"] = 0.0
+
+        # Rolling statistics
+        close_std_20 = _std(b["close"], 20)
+        volume_std_20 = _std(b["volume"], 20)
+        row["close_rolling_mean_20"] = bb_middle
+        row["close_rolling_std_20"] = close_std_20
+        row["close_zscore"] = (close - bb_middle) / (close_std_20 + 1e-10)
+        row["volume_rolling_mean_20"] = volume_mean_20
+        row["volume_rolling_std_20"] = volume_std_20
+        row["volume_zscore"] = (volume - volume_mean_20) / (volume_std_20 + 1e-10)
+        for periods in (5, 10, 20):
+            row[f"price_momentum_{periods}"] = _safe_div(close, _lag(b["close"], periods)) - 1
+        for periods in (5, 10):
+            row[f"volume_momentum_{periods}"] = _safe_div(volume, _lag(b["volume"], periods)) - 1
+        row["price_volume_corr"] = self._rolling_corr(20)
+        hl_range = (high - low) / close
+        self._push("hl_range", hl_range)
+        row["hl_range"] = hl_range
+        row["hl_range_ma"] = _mean(b["hl_range"], 20)
+        row["hl_range_std"] = _std(b["hl_range"], 20)
+
+        return row
+
+    def _market_metrics_features(
+        self, timestamp: pd.Timestamp, market_metrics: Optional[Dict[str, Any]], returns_std: float
+    ) -> Dict[str, Any]:
+        """Resolve microstructure columns the way ``_add_market_metrics`` merges them."""
+        if market_metrics is not None:
+            self.metrics_seen = True
+            metrics_ts = pd.Timestamp(market_metrics["timestamp"])
+            if metrics_ts <= timestamp and (
+                self.metrics is None or metrics_ts >= pd.Timestamp(self.metrics["timestamp"])
+            ):
+                self.metrics = dict(market_metrics, timestamp=metrics_ts)
+
+        if not self.metrics_seen:
+            return {
+                "spread_bps": 0.0,
+                "depth_imbalance": 0.0,
+                "realized_vol": returns_std * np.sqrt(365 * 24),
+                "funding_rate": 0.0,
+                "open_interest": 0.0,
+            }
+
+        metrics = self.metrics or {}
+
+        def _value(key: str, default: float) -> float:
+            value = metrics.get(key)
+            return default if value is None or pd.isna(value) else float(value)
+
+        return {
+            "spread_bps": _value("spread_bps", 0.0),
+            "depth_imbalance": _value("depth_imbalance", 0.0),
+            "realized_vol": _value("realized_volatility", NAN),
+            "funding_rate": _value("funding_rate", 0.0),
+            "open_interest": _value("open_interest", NAN),
+        }
+
+    def _rolling_corr(self, size: int) -> float:
+        """Rolling Pearson correlation computed with the same moments pandas uses."""
+        x = _window(self.buffers["close"], size)
+        y = _window(self.buffers["volume"], size)
+        if x is None or y is None:
+            return NAN
+        numerator = ((x * y).mean() - x.mean() * y.mean()) * (size / (size - 1))
+        denominator = (x.var(ddof=1) * y.var(ddof=1)) ** 0.5
+        return _safe_div(numerator, denominator)
+
+
+def _serialize_row(row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    return {
+        key: (value.isoformat() if isinstance(value, pd.Timestamp) else value)
+        for key, value in row.items()
+    }
+
+
+def _deserialize_row(row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    deserialized = dict(row)
+    if "timestamp" in deserialized:
+        deserialized["timestamp"] = pd.Timestamp(deserialized["timestamp"])
+    return deserialized
+
+
+def _serialize_metrics(metrics: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if metrics is None:
+        return None
+    serialized = dict(metrics)
+    serialized["timestamp"] = pd.Timestamp(metrics["timestamp"]).isoformat()
+    return serialized
+
+
+def _deserialize_metrics(metrics: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if metrics is None:
+        return None
+    deserialized = dict(metrics)
+    deserialized["timestamp"] = pd.Timestamp(metrics["timestamp"])
+    return deserialized
+
+
+class StreamingFeatureStore:
+    """Persist warm ``StreamingFeatureEngine`` state in Redis."""
+
+    KEY_PREFIX = "features:stream"
+
+    def __init__(self, ttl_seconds: int = 7 * 24 * 3600):
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Streaming parity holds for TA-Lib and the pandas fallbacks, not pandas_ta."""
+        return indicator_backend() in STREAMING_BACKENDS
+
+    def is_available(self) -> bool:
+        return self.is_supported() and get_redis_client() is not None
+
+    def _key(self, symbol: str, timeframe: str) -> str:
+        return f"{self.KEY_PREFIX}:{symbol}:{timeframe}"
+
+    def load(self, symbol: str, timeframe: str) -> Optional[StreamingFeatureEngine]:
+        state = get_cached_json(self._key(symbol, timeframe))
+        if not state:
+            return None
+        try:
+            engine = StreamingFeatureEngine.from_state(state)
+        except Exception as exc:
+            logger.warning(
+                "Discarding streaming feature state for %s %s: %s", symbol, timeframe, exc
+            )
+            return None
+        if engine.backend != indicator_backend():
+            # Seeded under another indicator library; the batch pipeline reseeds it
+            logger.info(
+                "Discarding %s streaming feature state for %s %s", engine.backend, symbol, timeframe
+            )
+            return None
+        return engine
+
+    def save(self, engine: StreamingFeatureEngine) -> None:
+        set_cached_json(
+            self._key(engine.symbol, engine.timeframe), engine.to_state(), self.ttl_seconds
+        )
+
+
+def advance_streaming_features(
+    store: StreamingFeatureStore,
+    symbol: str,
+    timeframe: str,
+    candles: pd.DataFrame,
+    market_metrics: Optional[Dict[str, Any]] = None,
+    closed_before: Optional[datetime] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Feed newly closed candles into the persisted engine for (symbol, timeframe).
+
+    Candles at or before the stored high-water mark are skipped, and candles
+    starting at or after ``closed_before`` are treated as still forming.
+    Returns the latest emitted feature row, or None when no state exists yet.
+    """
+    engine = store.load(symbol, timeframe)
+    if engine is None:
+        return None
+
+    rows: Iterable[Dict[str, Any]] = candles.sort_values("timestamp").to_dict("records")
+    latest_row = None
+    for candle in rows:
+        candle_ts = pd.Timestamp(candle["timestamp"])
+        if engine.last_timestamp is not None and candle_ts <= engine.last_timestamp:
+            continue
+        if closed_before is not None and candle_ts >= pd.Timestamp(closed_before):
+            break
+        latest_row = engine.update(candle, market_metrics)
+
+    if latest_row is not None:
+        store.save(engine)
+    return latest_row
@@ -1,17 +1,32 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from apps.ml.models import EnsembleModel, ConformalPredictor
 from apps.ml.features import FeatureEngineering
+from apps.ml.feature_store import FeatureCache
 from apps.ml.labeling import TripleBarrierLabeling
+from apps.ml.fold_executor import (
+    SharedFoldData,
+    build_shared_bins,
+    resolve_threads_per_worker,
+    run_folds_parallel,
+    train_fold_xy
+)
+from apps.ml.archive import load_market_metrics_history, load_ohlcv_history
+from apps.ml.checkpoint import FoldCheckpoint, load_split_result, prepared_data_fingerprint
+from apps.ml.training_budget import TrainingBudget
+from apps.ml.training_data import TrainingMatrix, build_training_matrix, log_memory
 from apps.ml.walkforward import WalkForwardValidator
 from apps.ml.model_registry import ModelRegistry
+from apps.ml.models import EnsembleModel
 from apps.ml.performance_tracker import PerformanceTracker
-from apps.api.db.models import OHLCV, TimeFrame, MarketMetrics
+from apps.api.db.models import OHLCV, TimeFrame
+from apps.api.config import settings
 import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Dict, Optional
 import json
 import logging
+import shutil
+import tempfile
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +51,20 @@ class WalkForwardPipeline:
         tp_atr_multiplier: float = 1.0,
         sl_atr_multiplier: float = 1.5,
         target_confidence: float = 0.55,
-        training_mode: str = 'full'  # 'quick' or 'full'
+        training_mode: str = "full",  # 'quick' or 'full'
+        fold_workers: Optional[int] = None,
+        threads_per_worker: Optional[int] = None,
+        model_params: Optional[Dict] = None,
+        feature_cache: Optional[FeatureCache] = None,
+        compact_features: Optional[bool] = None,
+        memory_budget_mb: Optional[int] = None,
+        shared_bins: Optional[bool] = None,
+        warm_start: Optional[bool] = None,
+        warm_start_rounds: Optional[int] = None,
+        warm_start_patience: Optional[int] = None,
+        checkpoint_dir: Optional[str] = None,
+        time_budget_seconds: Optional[float] = None,
+        budget_clock: Optional[str] = None,
     ):
         """
         Initialize walk-forward training pipeline.
@@ -44,6 +72,38 @@ class WalkForwardPipeline:
         Args:
             training_mode: 'quick' for fast validation (3-4h, ~5 folds),
                           'full' for complete training (35-45h, ~45 folds)
+            fold_workers: Folds trained concurrently in worker processes
+                          (default: settings.TRAINING_FOLD_WORKERS; 1 = serial)
+            threads_per_worker: LightGBM/XGBoost threads per fold worker
+                                (default: settings.TRAINING_THREADS_PER_WORKER; 0 = cores / workers)
+            model_params: Extra EnsembleModel keyword arguments (lgbm_params/xgb_params)
+            feature_cache: On-disk feature/label cache (default: a FeatureCache when
+                           settings.FEATURE_CACHE_ENABLED, otherwise no caching)
+            compact_features: Train from one float32 TrainingMatrix shared by all folds
+                              (default: settings.TRAINING_COMPACT_FEATURES)
+            memory_budget_mb: Memory budget; builds the matrix in column groups that fit
+                              it and warns when RSS exceeds it
+                              (default: settings.TRAINING_MEMORY_BUDGET_MB; 0 = unlimited)
+            shared_bins: Bin features once (LightGBM Dataset + XGBoost QuantileDMatrix)
+                         and train every fold on row subsets of those bins
+                         (default: settings.TRAINING_SHARED_BINS)
+            warm_start: Continue boosting each expanding-window fold from the previous
+                        fold's model instead of starting from zero; folds then train
+                        serially (default: settings.TRAINING_WARM_START)
+            warm_start_rounds: Boosting round cap for a warm-started fold
+                               (default: settings.TRAINING_WARM_START_ROUNDS)
+            warm_start_patience: Early-stopping rounds for a warm-started fold
+                                 (default: settings.TRAINING_WARM_START_PATIENCE)
+            checkpoint_dir: Write every completed fold (result, best-so-far model) here
+                            and skip the folds already there when a rerun prepares
+                            identical data (default: no checkpoints)
+            time_budget_seconds: Time budget of the run, split across its folds: folds
+                                 get higher learning rates and fewer rounds to fit, the
+                                 oldest folds are dropped when they cannot, and training
+                                 stops with the best model so far once it is spent
+                                 (default: settings.TRAINING_TIME_BUDGET_HOURS; 0 = unlimited)
+            budget_clock: 'wall' (elapsed time) or 'cpu' (CPU time over the cores the
+                          folds train on) (default: settings.TRAINING_BUDGET_CLOCK)
         """
         self.model_dir = Path(model_dir)
         self.model_dir.mkdir(parents=True, exist_ok=True)
@@ -80,6 +140,46 @@ class WalkForwardPipeline:
         )
         self.target_confidence = target_confidence
 
+        self.fold_workers = max(
+            1, fold_workers if fold_workers is not None else settings.TRAINING_FOLD_WORKERS
+        )
+        self.threads_per_worker = (
+            threads_per_worker
+            if threads_per_worker is not None
+            else settings.TRAINING_THREADS_PER_WORKER
+        )
+
+        self.model_params = model_params
+
+        if feature_cache is None and settings.FEATURE_CACHE_ENABLED:
+            feature_cache = FeatureCache()
+        self.feature_cache = feature_cache
+
+        self.compact_features = (
+            compact_features if compact_features is not None else settings.TRAINING_COMPACT_FEATURES
+        )
+        budget_mb = (
+            memory_budget_mb if memory_budget_mb is not None else settings.TRAINING_MEMORY_BUDGET_MB
+        )
+        self.memory_budget_bytes = int(budget_mb) * 1024**2 if budget_mb else None
+        self.shared_bins = shared_bins if shared_bins is not None else settings.TRAINING_SHARED_BINS
+
+        self.warm_start = warm_start if warm_start is not None else settings.TRAINING_WARM_START
+        if self.warm_start and not self.validator.use_expanding_window:
+            logger.info(
+                "Warm start needs expanding windows (each fold extends the previous one); disabled"
+            )
+            self.warm_start = False
+        self.warm_start_rounds = warm_start_rounds or settings.TRAINING_WARM_START_ROUNDS
+        self.warm_start_patience = warm_start_patience or settings.TRAINING_WARM_START_PATIENCE
+
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+
+        if time_budget_seconds is None:
+            time_budget_seconds = settings.TRAINING_TIME_BUDGET_HOURS * 3600
+        self.time_budget_seconds = time_budget_seconds or None
+        self.budget_clock = budget_clock or settings.TRAINING_BUDGET_CLOCK
+
         self.results = []
 
     def fetch_ohlcv_data(
@@ -90,32 +190,14 @@ class WalkForwardPipeline:
         start_date: datetime,
         end_date: datetime
     ) -> pd.DataFrame:
-        """Fetch OHLCV data from database"""
+        """Fetch OHLCV data from the Parquet archive and the database"""
         logger.info(f"Fetching OHLCV data for {symbol} {timeframe} from {start_date} to {end_date}")
 
-        query = db.query(OHLCV).filter(
-            and_(
-                OHLCV.symbol == symbol,
-                OHLCV.timeframe == timeframe,
-                OHLCV.timestamp >= start_date,
-                OHLCV.timestamp <= end_date
-            )
-        ).order_by(OHLCV.timestamp)
-
-        data = query.all()
+        df = load_ohlcv_history(db, symbol, timeframe, start=start_date, end=end_date)
 
-        if not data:
+        if df.empty:
             raise ValueError(f"No OHLCV data found for {symbol} {timeframe}")
 
-        df = pd.DataFrame([{
-            'timestamp': row.timestamp,
-            'open': row.open,
-            'high': row.high,
-            'low': row.low,
-            'close': row.close,
-            'volume': row.volume
-        } for row in data])
-
         logger.info(f"Fetched {len(df)} OHLCV bars")
         return df
 
@@ -131,32 +213,12 @@ class WalkForwardPipeline:
             f"Fetching market metrics for {symbol} from {start_date} to {end_date}"
         )
 
-        query = db.query(MarketMetrics).filter(
-            and_(
-                MarketMetrics.symbol == symbol,
-                MarketMetrics.timestamp >= start_date,
-                MarketMetrics.timestamp <= end_date
-            )
-        ).order_by(MarketMetrics.timestamp)
-
-        data = query.all()
+        df = load_market_metrics_history(db, symbol, start=start_date, end=end_date)
 
-        if not data:
+        if df.empty:
             logger.warning(f"No market metrics found for {symbol}")
             return pd.DataFrame()
 
-        df = pd.DataFrame([
-            {
-                'timestamp': row.timestamp,
-                'funding_rate': row.funding_rate,
-                'open_interest': row.open_interest,
-                'spread_bps': row.spread_bps,
-                'depth_imbalance': row.depth_imbalance,
-                'realized_volatility': row.realized_volatility
-            }
-            for row in data
-        ])
-
         logger.info(f"Fetched {len(df)} market metric rows")
         return df
 
@@ -165,28 +227,21 @@ class WalkForwardPipeline:
         df: pd.DataFrame,
         market_metrics: pd.DataFrame = None,
         side: str = 'long',
-        labeling_progress_callback=None
+        labeling_progress_callback=None,
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
     ) -> pd.DataFrame:
-        """Compute features and labels"""
-        logger.info("Computing features...")
-        df_features = self.feature_eng.compute_all_features(df, market_metrics=market_metrics)
+        """
+        Compute features and labels.
 
-        logger.info("Computing labels...")
-        labels_df = self.labeler.label_data(
-            df_features,
-            side=side,
-            progress_callback=labeling_progress_callback
+        With a feature cache and ``symbol``/``timeframe`` given, features and labels
+        for an already-seen history prefix are read from disk and only the tail is
+        recomputed.
+        """
+        df_features, labels_df = self._compute_features_and_labels(
+            df, market_metrics, side, labeling_progress_callback, symbol, timeframe
         )
 
-        logger.info(f"Labeling produced {len(labels_df)} labeled rows")
-
-        if labels_df.empty:
-            logger.error("Labeling returned empty DataFrame - insufficient data for time barrier")
-            raise ValueError("Labeling failed: insufficient data rows for time barrier")
-
-        labels_df['label'] = self.labeler.create_binary_labels(labels_df)
-        logger.info(f"Binary labels created, proceeding to merge...")
-
         # Merge on timestamp to avoid leaking unlabeled rows
         merged = pd.merge(
             df_features,
@@ -228,39 +283,148 @@ class WalkForwardPipeline:
 
         return merged
 
-    def run_walk_forward_validation(
+    def prepare_training_matrix(
+        self,
+        df: pd.DataFrame,
+        market_metrics: pd.DataFrame = None,
+        side: str = "long",
+        labeling_progress_callback=None,
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+    ) -> TrainingMatrix:
+        """
+        Compute features and labels into a compact float32 TrainingMatrix.
+
+        Same rows and (float32-rounded) values as prepare_features_and_labels,
+        without materializing the merged float64 frame.
+        """
+        df_features, labels_df = self._compute_features_and_labels(
+            df, market_metrics, side, labeling_progress_callback, symbol, timeframe
+        )
+
+        matrix = build_training_matrix(
+            df_features,
+            labels_df,
+            self.feature_eng.get_feature_columns(df_features),
+            budget_bytes=self.memory_budget_bytes,
+        )
+        del df_features, labels_df
+
+        if len(matrix) == 0:
+            logger.error("Merged feature/label frame is empty after join - timestamp mismatch?")
+            raise ValueError("Feature/label merge failed: no matching timestamps")
+
+        logger.info(
+            "Training matrix prepared: %d samples x %d features (%.0fMB float32)",
+            len(matrix),
+            len(matrix.feature_cols),
+            matrix.nbytes / 1024**2,
+        )
+        logger.info(f"Label distribution: {pd.Series(matrix.labels).value_counts().to_dict()}")
+        log_memory("training matrix", self.memory_budget_bytes)
+
+        return matrix
+
+    def _compute_features_and_labels(
+        self,
+        df: pd.DataFrame,
+        market_metrics: Optional[pd.DataFrame],
+        side: str,
+        labeling_progress_callback,
+        symbol: Optional[str],
+        timeframe: Optional[str],
+    ):
+        """Features plus labels (with the binary 'label' column), cached when possible."""
+        if self.feature_cache is not None and symbol and timeframe:
+            logger.info("Computing features and labels (cached)...")
+            df_features, labels_df = self.feature_cache.get_or_compute(
+                symbol,
+                timeframe,
+                df,
+                self.feature_eng,
+                market_metrics=market_metrics,
+                labeler=self.labeler,
+                side=side,
+                labeling_progress_callback=labeling_progress_callback,
+            )
+            labels_df = labels_df.copy()
+        else:
+            logger.info("Computing features...")
+            df_features = self.feature_eng.compute_all_features(df, market_metrics=market_metrics)
+
+            logger.info("Computing labels...")
+            labels_df = self.labeler.label_data(
+                df_features, side=side, progress_callback=labeling_progress_callback
+            )
+
+        logger.info(f"Labeling produced {len(labels_df)} labeled rows")
+
+        if labels_df.empty:
+            logger.error("Labeling returned empty DataFrame - insufficient data for time barrier")
+            raise ValueError("Labeling failed: insufficient data rows for time barrier")
+
+        labels_df["label"] = self.labeler.create_binary_labels(labels_df)
+        logger.info("Binary labels created, proceeding to merge...")
+        log_memory("labeling", self.memory_budget_bytes)
+
+        return df_features, labels_df
+
+    def _prepare_splits(
         self,
         db: Session,
         symbol: str,
         timeframe: str,
         start_date: datetime,
         end_date: datetime,
-        side: str = 'long',
-        progress_callback=None,
-        labeling_progress_callback=None
-    ) -> dict:
+        side: str,
+        labeling_progress_callback=None,
+    ):
         """
-        Run complete walk-forward validation pipeline.
+        Fetch data, prepare features and labels, and generate the walk-forward splits.
 
         Returns:
-            Dictionary with validation results and model metrics
+            (df_prepared, matrix, splits); matrix is the compact TrainingMatrix
+            (df_prepared then only holds timestamps) or None
         """
-        logger.info(f"Starting walk-forward validation for {symbol} {timeframe}")
-        logger.info(f"Period: {start_date.date()} to {end_date.date()}")
-
         # 1. Fetch data
         df = self.fetch_ohlcv_data(db, symbol, timeframe, start_date, end_date)
 
         # 1b. Fetch supplemental data
         market_metrics = self.fetch_market_metrics(db, symbol, start_date, end_date)
+        log_memory("data fetch", self.memory_budget_bytes)
 
         # 2. Prepare features and labels
-        df_prepared = self.prepare_features_and_labels(
-            df,
-            market_metrics=market_metrics,
-            side=side,
-            labeling_progress_callback=labeling_progress_callback
-        )
+        matrix = None
+        if self.compact_features:
+            matrix = self.prepare_training_matrix(
+                df,
+                market_metrics=market_metrics,
+                side=side,
+                labeling_progress_callback=labeling_progress_callback,
+                symbol=symbol,
+                timeframe=timeframe,
+            )
+            del df, market_metrics
+            # Folds are sliced from the matrix; the frame only carries timestamps
+            df_prepared = matrix.frame()
+        else:
+            df_prepared = self.prepare_features_and_labels(
+                df,
+                market_metrics=market_metrics,
+                side=side,
+                labeling_progress_callback=labeling_progress_callback,
+                symbol=symbol,
+                timeframe=timeframe,
+            )
+            log_memory("feature preparation", self.memory_budget_bytes)
+
+        # Row-range folds (compact matrix, shared bins) locate splits with searchsorted
+        if (matrix is not None or self.shared_bins) and not df_prepared[
+            "timestamp"
+        ].is_monotonic_increasing:
+            df_prepared = df_prepared.sort_values("timestamp", kind="mergesort").reset_index(
+                drop=True
+            )
 
         # 3. Generate walk-forward splits
         logger.info(f"Generating walk-forward splits from prepared data ({len(df_prepared)} samples)...")
@@ -272,131 +436,318 @@ class WalkForwardPipeline:
 
         logger.info(f"Generated {len(splits)} walk-forward splits - starting training...")
 
+        return df_prepared, matrix, splits
+
+    def run_walk_forward_validation(
+        self,
+        db: Session,
+        symbol: str,
+        timeframe: str,
+        start_date: datetime,
+        end_date: datetime,
+        side: str = "long",
+        progress_callback=None,
+        labeling_progress_callback=None,
+        resume_callback=None,
+    ) -> dict:
+        """
+        Run complete walk-forward validation pipeline.
+
+        Args:
+            resume_callback: Called with the number of folds restored from the
+                             checkpoint (checkpoint_dir only)
+
+        Returns:
+            Dictionary with validation results and model metrics
+        """
+        logger.info(f"Starting walk-forward validation for {symbol} {timeframe}")
+        logger.info(f"Period: {start_date.date()} to {end_date.date()}")
+
+        df_prepared, matrix, splits = self._prepare_splits(
+            db, symbol, timeframe, start_date, end_date, side, labeling_progress_callback
+        )
+        # Row-range folds (compact matrix, shared bins) locate splits with searchsorted
+        use_rows = matrix is not None or self.shared_bins
+
         # 4. Train and evaluate on each split
         split_results = []
         best_model = None
         best_oos_auc = 0.0
-
-        feature_cols = self.feature_eng.get_feature_columns(df_prepared)
+        best_split_index = 0
+        # Latest completed fold, continued by the next one in warm-start mode
+        warm_model = None
+        # Time budget (time_budget_seconds), created once the fold workers are known
+        budget = None
+
+        if matrix is not None:
+            feature_cols = matrix.feature_cols
+        else:
+            feature_cols = self.feature_eng.get_feature_columns(df_prepared)
         logger.info(f"Selected {len(feature_cols)} feature columns for training")
 
-        def _train_on_split(train_df, test_df, split_index: int, total_splits: int, train_bounds, test_bounds):
-            nonlocal best_model, best_oos_auc
-
-            if len(train_df) < 50 or len(test_df) < 10:
-                logger.warning(
-                    "Insufficient data in split %s (train=%s, test=%s). Skipping...",
-                    split_index,
-                    len(train_df),
-                    len(test_df)
-                )
-                return None
-
-            # Split into features and labels
-            X_train = train_df[feature_cols]
-            y_train = train_df['label']
-            X_test = test_df[feature_cols]
-            y_test = test_df['label']
-
-            # Further split train into train/val for early stopping
-            train_size = max(int(len(X_train) * 0.8), 1)
-            X_train_fit = X_train.iloc[:train_size]
-            y_train_fit = y_train.iloc[:train_size]
-            X_val = X_train.iloc[train_size:]
-            y_val = y_train.iloc[train_size:]
-
-            if len(X_val) == 0:
-                X_val = X_train_fit
-                y_val = y_train_fit
-
-            model = EnsembleModel()
-
-            try:
-                logger.info(
-                    "Training ensemble model for split %s/%s (train=%s, test=%s)",
-                    split_index,
-                    total_splits,
-                    len(train_df),
-                    len(test_df)
-                )
-                model.train(X_train_fit, y_train_fit, X_val, y_val)
-            except Exception as exc:  # pragma: no cover - defensive logging
-                logger.error("Training failed for split %s: %s", split_index, exc)
+        # Folds finished by an interrupted run over the same data
+        checkpoint = None
+        restored_folds = {}
+        if self.checkpoint_dir:
+            checkpoint = FoldCheckpoint(self.checkpoint_dir)
+            restored_folds = checkpoint.open(
+                self._checkpoint_fingerprint(
+                    df_prepared, matrix, feature_cols, symbol, timeframe, side, start_date, end_date
+                ),
+                run_info={
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat(),
+                    "training_mode": self.training_mode,
+                    "total_folds": len(splits),
+                },
+            )
+            if restored_folds:
+                best_model = checkpoint.load_best_model()
+                best_oos_auc = checkpoint.best_oos_auc
+                best_split_index = checkpoint.best_split_index or 0
+                if self.warm_start:
+                    warm_model = checkpoint.load_last_model()
+            if resume_callback:
+                resume_callback(len(restored_folds))
+
+        def _record_fold(split_index: int, outcome) -> Optional[dict]:
+            nonlocal best_model, best_oos_auc, best_split_index
+
+            if outcome is None:
                 return None
-
-            test_metrics = model.evaluate(X_test, y_test)
-            logger.info("OOS Test Metrics: %s", test_metrics)
-
-            conformal = ConformalPredictor(model, target_confidence=self.target_confidence)
-            conformal.calibrate(X_val, y_val)
-
-            preds, conf, mask = conformal.filter_by_confidence(X_test)
-            filtered_metrics = model.evaluate(X_test[mask], y_test[mask]) if mask.sum() > 0 else {}
-
-            hit_rate_tp1 = float(test_df['label'].mean()) if len(test_df) > 0 else 0.0
-
-            split_result = {
-                'split_id': split_index - 1,
-                'train_start': train_bounds[0],
-                'train_end': train_bounds[1],
-                'test_start': test_bounds[0],
-                'test_end': test_bounds[1],
-                'train_samples': len(train_df),
-                'test_samples': len(test_df),
-                'oos_metrics': test_metrics,
-                'hit_rate_tp1': hit_rate_tp1,
-                'filtered_coverage': mask.sum() / len(mask) if len(mask) > 0 else 0,
-                'filtered_metrics': filtered_metrics
-            }
-
-            if progress_callback:
-                progress_callback(
-                    progress_pct=min(100.0, (split_index / max(total_splits, 1)) * 100.0),
-                    current_fold=split_index,
-                    total_folds=total_splits
-                )
-
-            if test_metrics.get('roc_auc', 0) > best_oos_auc:
-                best_oos_auc = test_metrics['roc_auc']
+            split_result, model = outcome
+
+            # Same winner as a serial run: highest OOS AUC, earliest split on ties
+            new_best = False
+            auc = split_result["oos_metrics"].get("roc_auc", 0)
+            if auc > best_oos_auc or (
+                best_model is not None and auc == best_oos_auc and split_index < best_split_index
+            ):
+                best_oos_auc = auc
                 best_model = model
+                best_split_index = split_index
+                new_best = True
                 logger.info("New best model found! OOS AUC: %.4f", best_oos_auc)
             elif best_model is None:
                 best_model = model
+                best_split_index = split_index
+                new_best = True
+
+            if budget is not None:
+                budget.record_fold(split_index, split_result)
+
+            if checkpoint is not None:
+                try:
+                    checkpoint.record_fold(
+                        split_index,
+                        split_result,
+                        best_model=model if new_best else None,
+                        best_oos_auc=best_oos_auc,
+                        last_model=model if self.warm_start else None,
+                    )
+                except OSError as exc:
+                    logger.warning("Could not checkpoint fold %d: %s", split_index, exc)
 
             return split_result
 
-        for i, split in enumerate(splits):
-            logger.info(f"\n{'='*60}")
-            logger.info(f"Split {i+1}/{len(splits)}")
-            logger.info(f"Train: {split['train'][0].date()} to {split['train'][1].date()}")
-            logger.info(f"Test: {split['test'][0].date()} to {split['test'][1].date()}")
+        def _rows_xy(rows):
+            """Features and labels of a row range of the prepared data."""
+            if matrix is not None:
+                return matrix.features_frame(*rows), matrix.labels_series(*rows)
+            rows_df = df_prepared.iloc[rows[0] : rows[1]]
+            return rows_df[feature_cols], rows_df["label"]
+
+        def _fold_rows(train_rows, test_rows):
+            return _rows_xy(train_rows) + _rows_xy(test_rows)
+
+        def _train_on_split(
+            fold_data,
+            split_index: int,
+            total_splits: int,
+            train_bounds,
+            test_bounds,
+            bins=None,
+            train_rows=None,
+            init_model=None,
+            pending_rows=(),
+        ):
+            nonlocal warm_model
+
+            X_train, y_train, X_test, y_test = fold_data
+            warm = init_model is not None
+            boosting = {
+                "num_boost_round": self.warm_start_rounds if warm else None,
+                "early_stopping_rounds": self.warm_start_patience if warm else None,
+            }
+            if budget is not None:
+                boosting = budget.fold_settings(len(X_train), pending_rows, **boosting)
+
+            outcome = train_fold_xy(
+                X_train,
+                y_train,
+                X_test,
+                y_test,
+                self.target_confidence,
+                split_index=split_index,
+                total_splits=total_splits,
+                train_bounds=train_bounds,
+                test_bounds=test_bounds,
+                n_threads=self.threads_per_worker or None,
+                model_params=self.model_params,
+                shared_bins=bins,
+                train_rows=train_rows,
+                init_model=init_model,
+                **boosting,
+            )
+
+            if outcome:
+                warm_model = outcome[1]
 
-            # Update progress to show we're now training (not labeling)
-            if i == 0 and progress_callback:
+            if outcome and progress_callback:
                 progress_callback(
-                    progress_pct=5.0,
-                    current_fold=1,
-                    total_folds=len(splits)
+                    progress_pct=min(100.0, (split_index / max(total_splits, 1)) * 100.0),
+                    current_fold=split_index,
+                    total_folds=total_splits,
                 )
 
-            # Get train/test data
-            train_df, test_df = self.validator.get_train_test_data(df_prepared, split)
-            # Validate no leakage
-            if not self.validator.validate_no_leakage(train_df, test_df):
-                logger.error(f"Leakage detected in split {i+1}, skipping...")
-                continue
+            return _record_fold(split_index, outcome)
 
-            split_result = _train_on_split(
-                train_df,
-                test_df,
-                split_index=i + 1,
-                total_splits=len(splits),
-                train_bounds=split['train'],
-                test_bounds=split['test']
+        if progress_callback:
+            # Show we're now training (not labeling)
+            progress_callback(
+                progress_pct=5.0,
+                current_fold=1,
+                total_folds=len(splits)
             )
 
-            if split_result:
-                split_results.append(split_result)
+        workers = min(self.fold_workers, len(splits))
+        if workers > 1 and self.warm_start:
+            logger.info("Warm start chains folds; training folds serially")
+            workers = 1
+
+        if self.time_budget_seconds:
+            budget = TrainingBudget(
+                self.time_budget_seconds,
+                clock=self.budget_clock,
+                cores=workers * resolve_threads_per_worker(workers, self.threads_per_worker),
+                concurrency=workers,
+                base_learning_rate=EnsembleModel(**(self.model_params or {})).lgbm_params.get(
+                    "learning_rate", 0.02
+                ),
+                max_learning_rate=settings.TRAINING_BUDGET_MAX_LEARNING_RATE,
+                min_fold_seconds=settings.TRAINING_BUDGET_MIN_FOLD_SECONDS,
+            )
+            # Folds restored from a checkpoint were paid for by the interrupted run
+            budget.start(
+                spent_seconds=sum(
+                    split_result.get("train_seconds") or 0.0
+                    for split_result in restored_folds.values()
+                )
+                / workers
+            )
+            for split_index, split_result in sorted(restored_folds.items()):
+                budget.record_fold(split_index, split_result)
+
+        if workers > 1:
+            split_results = self._run_splits_parallel(
+                df_prepared,
+                feature_cols,
+                splits,
+                workers,
+                _record_fold,
+                progress_callback,
+                matrix=matrix,
+                completed=restored_folds,
+                budget=budget,
+            )
+        else:
+            timestamps = pd.DatetimeIndex(df_prepared["timestamp"])
+            split_rows = (
+                [
+                    tuple(
+                        int(x) for x in timestamps.searchsorted(list(split["train"]), side="left")
+                    )
+                    for split in splits
+                ]
+                if use_rows or budget is not None
+                else []
+            )
+
+            bins = None
+            bin_rows = max(rows[1] for rows in split_rows) if self.shared_bins else 0
+            if bin_rows > 0:
+                X_binned, y_binned = _rows_xy((0, bin_rows))
+                bins = build_shared_bins(
+                    X_binned, y_binned, self.threads_per_worker or None, self.model_params
+                )
+                del X_binned, y_binned
+                log_memory("feature binning", self.memory_budget_bytes)
+
+            for i, split in enumerate(splits):
+                logger.info(f"\n{'='*60}")
+                logger.info(f"Split {i+1}/{len(splits)}")
+                logger.info(f"Train: {split['train'][0].date()} to {split['train'][1].date()}")
+                logger.info(f"Test: {split['test'][0].date()} to {split['test'][1].date()}")
+
+                if i + 1 in restored_folds:
+                    logger.info("Split %d restored from checkpoint", i + 1)
+                    split_results.append(restored_folds[i + 1])
+                    continue
+
+                pending_rows = []
+                if budget is not None:
+                    # Training rows of this and every later fold still to train
+                    pending_rows = [
+                        split_rows[j][1] - split_rows[j][0]
+                        for j in range(i, len(splits))
+                        if j + 1 not in restored_folds
+                    ]
+                    if (budget.exhausted and split_results) or budget.folds_to_skip(
+                        pending_rows
+                    ) > 0:
+                        budget.skip_fold(i + 1)
+                        continue
+
+                # Get train/test data
+                train_rows = None
+                if use_rows:
+                    # Same half-open windows as WalkForwardValidator.get_train_test_data
+                    train_rows = split_rows[i]
+                    test_rows = tuple(
+                        int(x) for x in timestamps.searchsorted(list(split["test"]), side="left")
+                    )
+                    train_df = df_prepared[["timestamp"]].iloc[train_rows[0] : train_rows[1]]
+                    test_df = df_prepared[["timestamp"]].iloc[test_rows[0] : test_rows[1]]
+                    fold_data = _fold_rows(train_rows, test_rows)
+                else:
+                    train_df, test_df = self.validator.get_train_test_data(df_prepared, split)
+                    fold_data = (
+                        train_df[feature_cols],
+                        train_df["label"],
+                        test_df[feature_cols],
+                        test_df["label"],
+                    )
+                # Validate no leakage
+                if not self.validator.validate_no_leakage(train_df, test_df):
+                    logger.error(f"Leakage detected in split {i+1}, skipping...")
+                    continue
+
+                split_result = _train_on_split(
+                    fold_data,
+                    split_index=i + 1,
+                    total_splits=len(splits),
+                    train_bounds=split["train"],
+                    test_bounds=split["test"],
+                    bins=bins,
+                    train_rows=train_rows,
+                    init_model=warm_model if self.warm_start else None,
+                    pending_rows=pending_rows[1:],
+                )
+
+                if split_result:
+                    split_results.append(split_result)
 
         # 5. Aggregate results
         if not split_results:
@@ -416,8 +767,8 @@ class WalkForwardPipeline:
                     "Insufficient training window size after fallback (train=%d, test=%d)" % (train_size, test_size)
                 )
 
-            fallback_train = df_prepared.iloc[:train_size].copy()
-            fallback_test = df_prepared.iloc[train_size:].copy()
+            fallback_train = df_prepared.iloc[:train_size]
+            fallback_test = df_prepared.iloc[train_size:]
 
             fallback_train_bounds = (
                 fallback_train['timestamp'].min(),
@@ -429,8 +780,7 @@ class WalkForwardPipeline:
             )
 
             split_result = _train_on_split(
-                fallback_train,
-                fallback_test,
+                _fold_rows((0, train_size), (train_size, total_samples)),
                 split_index=1,
                 total_splits=1,
                 train_bounds=fallback_train_bounds,
@@ -442,6 +792,8 @@ class WalkForwardPipeline:
 
             split_results.append(split_result)
 
+        log_memory("fold training", self.memory_budget_bytes)
+
         if progress_callback:
             completed_folds = len(split_results)
             if completed_folds == len(splits) and len(splits) > 0:
@@ -455,6 +807,318 @@ class WalkForwardPipeline:
                 total_folds=reported_total
             )
 
+        results = self._save_and_register(
+            symbol,
+            timeframe,
+            side,
+            start_date,
+            end_date,
+            split_results,
+            best_model,
+            best_oos_auc,
+            extra_metadata={
+                "warm_start": self.warm_start,
+                "time_budget": budget.summary() if budget is not None else None,
+            },
+        )
+        results["resumed_folds"] = sorted(restored_folds)
+
+        if checkpoint is not None:
+            # The model is registered; nothing left to resume
+            checkpoint.clear()
+
+        return results
+
+    def _checkpoint_fingerprint(
+        self,
+        df_prepared: pd.DataFrame,
+        matrix: Optional[TrainingMatrix],
+        feature_cols: list,
+        symbol: str,
+        timeframe: str,
+        side: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> str:
+        """Fingerprint of the prepared data and every setting that changes the fold models."""
+        params = {
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "side": side,
+            "start_date": start_date,
+            "end_date": end_date,
+            "training_mode": self.training_mode,
+            "test_period": self.validator.test_period.total_seconds(),
+            "min_train_period": self.validator.min_train_period.total_seconds(),
+            "purge": self.validator.purge.total_seconds(),
+            "embargo": self.validator.embargo.total_seconds(),
+            "use_expanding_window": self.validator.use_expanding_window,
+            "target_confidence": self.target_confidence,
+            "model_params": self.model_params,
+            "compact_features": matrix is not None,
+            "shared_bins": bool(self.shared_bins),
+            "warm_start": self.warm_start,
+            "warm_start_rounds": self.warm_start_rounds if self.warm_start else None,
+            "warm_start_patience": self.warm_start_patience if self.warm_start else None,
+        }
+        if matrix is not None:
+            return prepared_data_fingerprint(
+                matrix.timestamps, matrix.features, matrix.labels, feature_cols, params
+            )
+        return prepared_data_fingerprint(
+            df_prepared["timestamp"],
+            df_prepared,
+            df_prepared["label"].to_numpy(),
+            feature_cols,
+            params,
+        )
+
+    def run_incremental_update(
+        self,
+        db: Session,
+        symbol: str,
+        timeframe: str,
+        base_model: EnsembleModel,
+        since: datetime,
+        start_date: datetime,
+        end_date: datetime,
+        side: str = "long",
+        base_model_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Continue boosting a deployed model on the bars after ``since`` only.
+
+        Features are computed over [start_date, end_date] (cached), so the new
+        rows are fully warmed up; training uses only rows after ``since``. The
+        newest 20% of those rows are held out as a single chronological test
+        split, as in the hold-out fallback of run_walk_forward_validation.
+
+        Returns:
+            Results in the run_walk_forward_validation format (one split)
+        """
+        logger.info(f"Warm-start update for {symbol} {timeframe} on data after {since}")
+
+        df = self.fetch_ohlcv_data(db, symbol, timeframe, start_date, end_date)
+        market_metrics = self.fetch_market_metrics(db, symbol, start_date, end_date)
+        df_prepared = self.prepare_features_and_labels(
+            df, market_metrics=market_metrics, side=side, symbol=symbol, timeframe=timeframe
+        )
+        del df, market_metrics
+
+        feature_cols = self.feature_eng.get_feature_columns(df_prepared)
+        if feature_cols != base_model.feature_names:
+            raise ValueError(
+                "Deployed model was trained on a different feature set; full retrain required"
+            )
+
+        new_rows = df_prepared[df_prepared["timestamp"] > since].sort_values(
+            "timestamp", kind="mergesort"
+        )
+        total_samples = len(new_rows)
+        test_size = max(int(total_samples * 0.2), 10)
+        train_size = total_samples - test_size
+        if train_size < 50:
+            raise ValueError(
+                "Insufficient new data for a warm-start update (train=%d, test=%d)"
+                % (max(train_size, 0), test_size)
+            )
+
+        train_df = new_rows.iloc[:train_size]
+        test_df = new_rows.iloc[train_size:]
+        outcome = train_fold_xy(
+            train_df[feature_cols],
+            train_df["label"],
+            test_df[feature_cols],
+            test_df["label"],
+            self.target_confidence,
+            split_index=1,
+            total_splits=1,
+            train_bounds=(train_df["timestamp"].min(), train_df["timestamp"].max()),
+            test_bounds=(test_df["timestamp"].min(), test_df["timestamp"].max()),
+            n_threads=self.threads_per_worker or None,
+            model_params=self.model_params,
+            init_model=base_model,
+            num_boost_round=self.warm_start_rounds,
+            early_stopping_rounds=self.warm_start_patience,
+        )
+        if outcome is None:
+            raise ValueError("Warm-start update could not be trained")
+        split_result, model = outcome
+
+        return self._save_and_register(
+            symbol,
+            timeframe,
+            side,
+            start_date,
+            end_date,
+            [split_result],
+            model,
+            split_result["oos_metrics"].get("roc_auc", 0.0),
+            extra_metadata={
+                "warm_start": True,
+                "warm_start_from": base_model_id,
+                "warm_start_since": since.isoformat(),
+            },
+        )
+
+    def publish_folds(
+        self,
+        db: Session,
+        symbol: str,
+        timeframe: str,
+        start_date: datetime,
+        end_date: datetime,
+        side: str = "long",
+        shared_dir: Optional[str] = None,
+        labeling_progress_callback=None,
+    ) -> dict:
+        """
+        Prepare features and labels once and publish them for distributed fold training.
+
+        The prepared data is dumped as .npy files (SharedFoldData) into a new run
+        directory under ``shared_dir``, which every training worker must mount.
+        Each fold of the returned plan is trained by
+        fold_executor.train_published_fold on any worker, and
+        finalize_published_folds aggregates them.
+
+        Args:
+            shared_dir: Parent of the run directory (default: settings.TRAINING_DISTRIBUTED_DIR)
+
+        Returns:
+            JSON-serializable plan: run settings, shared array paths and one
+            spec per fold (bounds as ISO strings)
+        """
+        if self.warm_start:
+            logger.info("Warm start chains folds; distributed folds train independently")
+
+        df_prepared, matrix, splits = self._prepare_splits(
+            db, symbol, timeframe, start_date, end_date, side, labeling_progress_callback
+        )
+        if not df_prepared["timestamp"].is_monotonic_increasing:
+            df_prepared = df_prepared.sort_values("timestamp", kind="mergesort").reset_index(
+                drop=True
+            )
+
+        folds = self._fold_specs(df_prepared, splits)
+        if not folds:
+            raise ValueError(
+                "No walk-forward split passed the leakage check - nothing to distribute"
+            )
+
+        run_root = Path(shared_dir or settings.TRAINING_DISTRIBUTED_DIR)
+        run_root.mkdir(parents=True, exist_ok=True)
+        run_dir = Path(
+            tempfile.mkdtemp(prefix=f"{symbol.replace('/', '_')}_{timeframe}_", dir=run_root)
+        )
+        (run_dir / "folds").mkdir()
+
+        # Left in place for the fold tasks; finalize_published_folds removes run_dir
+        if matrix is not None:
+            shared = SharedFoldData.from_matrix(matrix, directory=str(run_dir))
+        else:
+            shared = SharedFoldData(
+                df_prepared, self.feature_eng.get_feature_columns(df_prepared), str(run_dir)
+            )
+        log_memory("fold data publishing", self.memory_budget_bytes)
+
+        logger.info("Published %d folds of %s %s to %s", len(folds), symbol, timeframe, run_dir)
+
+        return {
+            "run_dir": str(run_dir),
+            "model_dir": str(self.model_dir),
+            "paths": shared.paths,
+            "feature_cols": shared.feature_cols,
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "side": side,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "target_confidence": self.target_confidence,
+            "model_params": self.model_params,
+            # Each Celery training worker runs one task at a time
+            "n_threads": resolve_threads_per_worker(1, self.threads_per_worker),
+            "bin_rows": max(fold["train_rows"][1] for fold in folds) if self.shared_bins else 0,
+            "total_splits": len(splits),
+            "folds": [
+                {
+                    **fold,
+                    "train_bounds": [bound.isoformat() for bound in fold["train_bounds"]],
+                    "test_bounds": [bound.isoformat() for bound in fold["test_bounds"]],
+                }
+                for fold in folds
+            ],
+        }
+
+    def finalize_published_folds(self, plan: dict, split_indices: list) -> dict:
+        """
+        Aggregate the folds of a published run, then save and register the best model.
+
+        Args:
+            plan: Plan returned by publish_folds
+            split_indices: Results of train_published_fold (None for folds without a model)
+
+        Returns:
+            Dictionary with validation results (run_walk_forward_validation format)
+        """
+        fold_dir = Path(plan["run_dir"]) / "folds"
+
+        split_results = []
+        best_split_index = None
+        best_oos_auc = 0.0
+        for split_index in sorted(index for index in split_indices if index is not None):
+            split_result = load_split_result(fold_dir / f"fold_{split_index:03d}.json")
+            if split_result is None:
+                raise ValueError(f"Result of fold {split_index} is missing from {fold_dir}")
+            split_results.append(split_result)
+
+            # Same winner as a serial run: highest OOS AUC, earliest split on ties
+            auc = split_result["oos_metrics"].get("roc_auc", 0)
+            if auc > best_oos_auc:
+                best_oos_auc = auc
+                best_split_index = split_index
+            elif best_split_index is None:
+                best_split_index = split_index
+
+        if not split_results:
+            raise ValueError("No distributed walk-forward fold produced a model")
+
+        best_model = EnsembleModel()
+        best_model.load(str(fold_dir / f"model_{best_split_index:03d}"))
+        logger.info(
+            "Best of %d distributed folds: split %d (OOS AUC %.4f)",
+            len(split_results),
+            best_split_index,
+            best_oos_auc,
+        )
+
+        results = self._save_and_register(
+            plan["symbol"],
+            plan["timeframe"],
+            plan["side"],
+            datetime.fromisoformat(plan["start_date"]),
+            datetime.fromisoformat(plan["end_date"]),
+            split_results,
+            best_model,
+            best_oos_auc,
+            extra_metadata={"warm_start": False, "distributed": True},
+        )
+
+        shutil.rmtree(plan["run_dir"], ignore_errors=True)
+        return results
+
+    def _save_and_register(
+        self,
+        symbol: str,
+        timeframe: str,
+        side: str,
+        start_date: datetime,
+        end_date: datetime,
+        split_results: list,
+        best_model,
+        best_oos_auc: float,
+        extra_metadata: Optional[Dict] = None,
+    ) -> dict:
+        """Save the best model and its validation results, then register it."""
         avg_metrics = self._aggregate_split_results(split_results)
 
         # 6. Save best model
@@ -479,7 +1143,15 @@ class WalkForwardPipeline:
             'avg_metrics': avg_metrics,
             'split_results': split_results,
             'best_oos_auc': best_oos_auc,
-            'feature_importance': best_model.get_feature_importance().to_dict() if best_model else {}
+            'total_train_seconds': sum(split.get('train_seconds', 0.0) for split in split_results),
+            'avg_fold_seconds': (
+                sum(split.get('train_seconds', 0.0) for split in split_results) / len(split_results)
+                if split_results else 0.0
+            ),
+            "feature_importance": best_model.get_feature_importance().to_dict()
+            if best_model
+            else {},
+            **(extra_metadata or {}),
         }
 
         results_path = model_path / 'validation_results.json'
@@ -499,7 +1171,8 @@ class WalkForwardPipeline:
             metadata={
                 'validation_period': results['validation_period'],
                 'num_splits': len(split_results),
-                'feature_importance_top10': best_model.get_feature_importance().head(10).to_dict() if best_model else {}
+                'feature_importance_top10': best_model.get_feature_importance().head(10).to_dict() if best_model else {},
+                **(extra_metadata or {})
             }
         )
 
@@ -516,6 +1189,159 @@ class WalkForwardPipeline:
 
         return results
 
+    def _run_splits_parallel(
+        self,
+        df_prepared: pd.DataFrame,
+        feature_cols: list,
+        splits: list,
+        workers: int,
+        record_fold,
+        progress_callback=None,
+        matrix: Optional[TrainingMatrix] = None,
+        completed: Optional[Dict[int, dict]] = None,
+        budget: Optional[TrainingBudget] = None,
+    ) -> list:
+        """
+        Train walk-forward splits concurrently.
+
+        The prepared frame is dumped once to memory-mapped .npy files; each
+        fold task only carries its row ranges.
+
+        Args:
+            df_prepared: Features + labels, one row per bar
+            feature_cols: Feature column names
+            splits: Splits from WalkForwardValidator.generate_splits
+            workers: Number of fold worker processes
+            record_fold: Callback(split_index, outcome) returning the split result
+                         (or None) and tracking the best model
+            progress_callback: Training progress callback
+            matrix: Compact training data; dumped instead of df_prepared's columns
+            completed: Split results restored from a checkpoint, keyed by split index;
+                       those splits are not retrained
+            budget: Started time budget; drops the oldest folds that do not fit it
+                    and stops every fold at its deadline
+
+        Returns:
+            Split results ordered by split
+        """
+        if not df_prepared["timestamp"].is_monotonic_increasing:
+            df_prepared = df_prepared.sort_values("timestamp", kind="mergesort").reset_index(
+                drop=True
+            )
+
+        total_splits = len(splits)
+        completed = completed or {}
+        folds = self._fold_specs(df_prepared, splits, skip=completed)
+
+        if budget is not None and folds:
+            skip = budget.folds_to_skip(
+                [fold["train_rows"][1] - fold["train_rows"][0] for fold in folds]
+            )
+            for fold in folds[:skip]:
+                budget.skip_fold(fold["split_index"])
+            folds = [{**fold, "deadline": budget.deadline} for fold in folds[skip:]]
+
+        if not folds:
+            return [completed[key] for key in sorted(completed)]
+
+        threads = resolve_threads_per_worker(workers, self.threads_per_worker)
+        logger.info(
+            "Training %d folds on %d worker processes (%d threads each)",
+            len(folds),
+            min(workers, len(folds)),
+            threads,
+        )
+
+        results_by_split = dict(completed)
+
+        def _on_fold_done(split_index: int, outcome):
+            split_result = record_fold(split_index, outcome)
+            if split_result is None:
+                return
+            results_by_split[split_index] = split_result
+            if progress_callback:
+                completed = len(results_by_split)
+                progress_callback(
+                    progress_pct=min(100.0, (completed / max(total_splits, 1)) * 100.0),
+                    current_fold=completed,
+                    total_folds=total_splits,
+                )
+
+        if matrix is not None:
+            shared = SharedFoldData.from_matrix(matrix)
+        else:
+            shared = SharedFoldData(df_prepared, feature_cols)
+
+        bin_rows = max(fold["train_rows"][1] for fold in folds) if self.shared_bins else 0
+
+        with shared:
+            run_folds_parallel(
+                shared,
+                folds,
+                self.target_confidence,
+                workers=workers,
+                threads_per_worker=threads,
+                model_params=self.model_params,
+                on_fold_done=_on_fold_done,
+                bin_rows=bin_rows,
+            )
+
+        if budget is not None and budget.exhausted:
+            # Folds still queued when the budget ran out
+            for fold in folds:
+                if fold["split_index"] not in results_by_split:
+                    budget.skip_fold(fold["split_index"])
+
+        return [results_by_split[key] for key in sorted(results_by_split)]
+
+    def _fold_specs(self, df_prepared: pd.DataFrame, splits: list, skip=()) -> list:
+        """
+        Row ranges of each split over time-sorted prepared data (leaking splits dropped).
+
+        Args:
+            df_prepared: Prepared data sorted by timestamp
+            splits: Splits from WalkForwardValidator.generate_splits
+            skip: Split indices not to train
+
+        Returns:
+            Fold specs for run_folds_parallel
+        """
+        timestamps = pd.DatetimeIndex(df_prepared["timestamp"])
+        timestamp_frame = df_prepared[["timestamp"]]
+
+        folds = []
+        for i, split in enumerate(splits):
+            if i + 1 in skip:
+                continue
+
+            # Same half-open windows as WalkForwardValidator.get_train_test_data
+            train_rows = tuple(
+                int(x) for x in timestamps.searchsorted(list(split["train"]), side="left")
+            )
+            test_rows = tuple(
+                int(x) for x in timestamps.searchsorted(list(split["test"]), side="left")
+            )
+
+            if not self.validator.validate_no_leakage(
+                timestamp_frame.iloc[train_rows[0] : train_rows[1]],
+                timestamp_frame.iloc[test_rows[0] : test_rows[1]],
+            ):
+                logger.error(f"Leakage detected in split {i+1}, skipping...")
+                continue
+
+            folds.append(
+                {
+                    "split_index": i + 1,
+                    "total_splits": len(splits),
+                    "train_rows": train_rows,
+                    "test_rows": test_rows,
+                    "train_bounds": split["train"],
+                    "test_bounds": split["test"],
+                }
+            )
+
+        return folds
+
     def _aggregate_split_results(self, split_results: list) -> dict:
         """Aggregate metrics across all splits"""
         metrics_keys = ['accuracy', 'precision', 'recall', 'f1_score', 'roc_auc']
@@ -537,6 +1363,31 @@ class WalkForwardPipeline:
         return avg_metrics
 
 
+def _resolve_date_range(db: Session, symbol: str, timeframe: str, start_date=None, end_date=None):
+    """Fill in missing dates with the first/last available bar."""
+    # If dates not provided, fetch all available data
+    if not start_date or not end_date:
+        from sqlalchemy import func
+
+        date_range = (
+            db.query(
+                func.min(OHLCV.timestamp).label("min_date"),
+                func.max(OHLCV.timestamp).label("max_date"),
+            )
+            .filter(OHLCV.symbol == symbol, OHLCV.timeframe == timeframe)
+            .first()
+        )
+
+        if not date_range or not date_range.min_date:
+            raise ValueError(f"No OHLCV data found for {symbol} {timeframe}")
+
+        start_date = start_date or date_range.min_date
+        end_date = end_date or date_range.max_date
+
+    logger.info(f"Using data from {start_date.date()} to {end_date.date()}")
+    return start_date, end_date
+
+
 def train_model_pipeline(
     db: Session,
     symbol: str,
@@ -547,7 +1398,10 @@ def train_model_pipeline(
     training_mode: str = 'full',
     start_date: datetime = None,
     end_date: datetime = None,
-    progress_callback=None
+    progress_callback=None,
+    checkpoint_dir: Optional[str] = None,
+    time_budget_seconds: Optional[float] = None,
+    budget_clock: Optional[str] = None,
 ) -> dict:
     """
     Complete training pipeline with walk-forward validation.
@@ -562,6 +1416,13 @@ def train_model_pipeline(
         use_expanding_window: Use expanding windows (trains on all history)
         start_date: Start date (default: earliest available data)
         end_date: End date (default: latest available data)
+        progress_callback: Training progress callback, or a dict of 'training',
+                           'labeling' and 'resume' callbacks
+        checkpoint_dir: Per-fold checkpoint directory; a rerun with identical data
+                        skips the folds already checkpointed there
+        time_budget_seconds: Time budget split across the folds
+                             (default: settings.TRAINING_TIME_BUDGET_HOURS; 0 = unlimited)
+        budget_clock: 'wall' or 'cpu' (default: settings.TRAINING_BUDGET_CLOCK)
 
     Returns:
         Dictionary with training results
@@ -569,34 +1430,23 @@ def train_model_pipeline(
     logger.info(f"Starting training pipeline for {symbol} {timeframe}")
     logger.info(f"Mode: {'Expanding' if use_expanding_window else 'Sliding'} window")
 
-    # If dates not provided, fetch all available data
-    if not start_date or not end_date:
-        from sqlalchemy import func
-        from apps.api.db.models import OHLCV
-
-        date_range = db.query(
-            func.min(OHLCV.timestamp).label('min_date'),
-            func.max(OHLCV.timestamp).label('max_date')
-        ).filter(
-            OHLCV.symbol == symbol,
-            OHLCV.timeframe == timeframe
-        ).first()
-
-        if not date_range or not date_range.min_date:
-            raise ValueError(f"No OHLCV data found for {symbol} {timeframe}")
-
-        start_date = start_date or date_range.min_date
-        end_date = end_date or date_range.max_date
-
-    logger.info(f"Using data from {start_date.date()} to {end_date.date()}")
+    start_date, end_date = _resolve_date_range(db, symbol, timeframe, start_date, end_date)
 
     pipeline = WalkForwardPipeline(
         test_period_days=test_period_days,
         min_train_days=min_train_days,
         use_expanding_window=use_expanding_window,
-        training_mode=training_mode
+        training_mode=training_mode,
+        checkpoint_dir=checkpoint_dir,
+        time_budget_seconds=time_budget_seconds,
+        budget_clock=budget_clock,
     )
 
+    callbacks = (
+        progress_callback
+        if isinstance(progress_callback, dict)
+        else {"training": progress_callback}
+    )
     results = pipeline.run_walk_forward_validation(
         db=db,
         symbol=symbol,
@@ -604,10 +1454,123 @@ def train_model_pipeline(
         start_date=start_date,
         end_date=end_date,
         side='long',
-        progress_callback=progress_callback.get('training') if isinstance(progress_callback, dict) else progress_callback,
-        labeling_progress_callback=progress_callback.get('labeling') if isinstance(progress_callback, dict) else None
+        progress_callback=callbacks.get('training'),
+        labeling_progress_callback=callbacks.get('labeling'),
+        resume_callback=callbacks.get('resume')
     )
 
     logger.info(f"Training completed: {results['model_id']}")
 
     return results
+
+
+def publish_training_folds(
+    db: Session,
+    symbol: str,
+    timeframe: str,
+    test_period_days: int = 30,
+    min_train_days: int = 180,
+    use_expanding_window: bool = True,
+    training_mode: str = "full",
+    start_date: datetime = None,
+    end_date: datetime = None,
+    labeling_progress_callback=None,
+) -> dict:
+    """
+    Prepare data once and publish its walk-forward folds for distributed training.
+
+    Takes the same arguments as train_model_pipeline; see
+    WalkForwardPipeline.publish_folds for the returned plan.
+    """
+    logger.info(f"Publishing distributed training folds for {symbol} {timeframe}")
+    start_date, end_date = _resolve_date_range(db, symbol, timeframe, start_date, end_date)
+
+    pipeline = WalkForwardPipeline(
+        test_period_days=test_period_days,
+        min_train_days=min_train_days,
+        use_expanding_window=use_expanding_window,
+        training_mode=training_mode,
+    )
+    return pipeline.publish_folds(
+        db=db,
+        symbol=symbol,
+        timeframe=timeframe,
+        start_date=start_date,
+        end_date=end_date,
+        side="long",
+        labeling_progress_callback=labeling_progress_callback,
+    )
+
+
+def finalize_training_folds(plan: dict, split_indices: list) -> dict:
+    """
+    Aggregate distributed folds, then save and register the best model.
+
+    Returns:
+        Dictionary with training results (train_model_pipeline format)
+    """
+    pipeline = WalkForwardPipeline(model_dir=plan["model_dir"])
+    results = pipeline.finalize_published_folds(plan, split_indices)
+
+    logger.info(f"Distributed training completed: {results['model_id']}")
+
+    return results
+
+
+def update_model_pipeline(
+    db: Session, symbol: str, timeframe: str, deployment: Dict, end_date: datetime = None
+) -> dict:
+    """
+    Warm-start a deployed model on the data that arrived after its training window.
+
+    Args:
+        db: Database session
+        symbol: Trading pair
+        timeframe: Timeframe
+        deployment: Registry entry of the deployed model (ModelRegistry.get_deployed_model)
+        end_date: End of the new data (default: latest available data)
+
+    Returns:
+        Dictionary with training results (train_model_pipeline format)
+    """
+    from sqlalchemy import func
+
+    period = (deployment.get("metadata") or {}).get("validation_period") or {}
+    if not period.get("end"):
+        raise ValueError(
+            f"Deployed model {deployment.get('model_id')} has no recorded training window"
+        )
+    since = datetime.fromisoformat(period["end"])
+
+    date_range = (
+        db.query(
+            func.min(OHLCV.timestamp).label("min_date"), func.max(OHLCV.timestamp).label("max_date")
+        )
+        .filter(OHLCV.symbol == symbol, OHLCV.timeframe == timeframe)
+        .first()
+    )
+
+    if not date_range or not date_range.min_date:
+        raise ValueError(f"No OHLCV data found for {symbol} {timeframe}")
+    end_date = end_date or date_range.max_date
+
+    base_model = EnsembleModel()
+    base_model.load(deployment["path"])
+
+    pipeline = WalkForwardPipeline(warm_start=True)
+    results = pipeline.run_incremental_update(
+        db=db,
+        symbol=symbol,
+        timeframe=timeframe,
+        base_model=base_model,
+        since=since,
+        start_date=date_range.min_date,
+        end_date=end_date,
+        base_model_id=deployment.get("model_id"),
+    )
+
+    logger.info(
+        f"Warm-start update completed: {results['model_id']} (from {deployment.get('model_id')})"
+    )
+
+    return results
@@ -0,0 +1,246 @@
+"""
+Time budget of a training job, shared out across its walk-forward folds.
+
+A job gets wall-clock seconds, or CPU seconds that are spread over the cores
+it trains on (fold workers x threads each). Before each fold the time left is
+divided between that fold and the folds still pending, weighted by training
+rows (expanding windows grow). The cost of the folds trained so far turns
+that share into boosting settings:
+
+- a fold that cannot afford the rounds the previous fold needed gets a
+  proportionally higher learning rate (up to ``max_learning_rate``), a round
+  cap it can afford and shorter early-stopping patience;
+- when even the cheapest settings cannot fit every pending fold, the oldest
+  ones are dropped, so the newest folds (closest to the deployed model) still
+  train;
+- each fold gets a deadline at which boosting stops with the trees built so
+  far, and no fold starts once the budget is spent.
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional, Sequence
+
+from apps.ml.models import EnsembleModel
+
+logger = logging.getLogger(__name__)
+
+BUDGET_CLOCKS = ("wall", "cpu")
+
+# A fold may run over its share by this factor (never past the job's deadline);
+# later folds are squeezed to make up for it
+_FOLD_OVERRUN = 1.5
+
+
+class TrainingBudget:
+    """
+    Time budget of one walk-forward run.
+
+    Call ``start`` when fold training begins, ``fold_settings`` before each fold
+    and ``record_fold`` after it.
+    """
+
+    def __init__(
+        self,
+        seconds: float,
+        clock: str = "wall",
+        cores: int = 1,
+        concurrency: int = 1,
+        base_learning_rate: float = 0.02,
+        max_learning_rate: float = 0.2,
+        min_fold_seconds: float = 60.0,
+        min_rounds: int = 100,
+        min_patience: int = 20,
+    ):
+        """
+        Args:
+            seconds: Budget, in seconds of ``clock``
+            clock: 'wall' (elapsed time) or 'cpu' (CPU time across ``cores``)
+            cores: Cores the run trains on (fold workers x threads each)
+            concurrency: Folds trained at the same time
+            base_learning_rate: Learning rate of the unconstrained model
+            max_learning_rate: Highest learning rate a squeezed fold is given
+            min_fold_seconds: Least time worth giving a fold; fewer folds are
+                              trained when the budget cannot give each this much
+            min_rounds: Lowest round cap a squeezed fold is given
+            min_patience: Lowest early-stopping patience a squeezed fold is given
+        """
+        if clock not in BUDGET_CLOCKS:
+            raise ValueError(f"Unknown budget clock {clock!r}; expected one of {BUDGET_CLOCKS}")
+        if seconds <= 0:
+            raise ValueError("Training budget must be positive")
+
+        self.seconds = float(seconds)
+        self.clock = clock
+        self.cores = max(1, int(cores))
+        self.concurrency = max(1, int(concurrency))
+        self.wall_seconds = self.seconds / self.cores if clock == "cpu" else self.seconds
+        self.base_learning_rate = base_learning_rate
+        self.max_learning_rate = max(max_learning_rate, base_learning_rate)
+        self.min_fold_seconds = min_fold_seconds
+        self.min_rounds = min_rounds
+        self.min_patience = min_patience
+
+        self.started_at: Optional[float] = None
+        self.deadline: Optional[float] = None
+        self.fold_seconds: Dict[int, float] = {}
+        self.skipped_folds: List[int] = []
+        # Measured on the latest fold: cost of one round per training row, and
+        # the rounds it needed, expressed at the base learning rate
+        self._seconds_per_row_round: Optional[float] = None
+        self._rounds_needed = EnsembleModel.NUM_BOOST_ROUND
+
+    def start(self, spent_seconds: float = 0.0) -> None:
+        """
+        Start the clock.
+
+        Args:
+            spent_seconds: Wall seconds already spent (folds restored from a checkpoint)
+        """
+        self.started_at = time.time() - spent_seconds
+        self.deadline = self.started_at + self.wall_seconds
+        logger.info(
+            "Training budget: %.0f %s seconds (%.0f s wall, %.0f s already spent)",
+            self.seconds,
+            self.clock,
+            self.wall_seconds,
+            spent_seconds,
+        )
+
+    def remaining(self) -> float:
+        """Wall seconds left."""
+        return max(0.0, self.deadline - time.time())
+
+    @property
+    def exhausted(self) -> bool:
+        return time.time() >= self.deadline
+
+    def used_seconds(self) -> float:
+        """Budget used so far, in seconds of the budget's clock."""
+        elapsed = time.time() - self.started_at
+        return elapsed * self.cores if self.clock == "cpu" else elapsed
+
+    def folds_to_skip(self, pending_rows: Sequence[int]) -> int:
+        """
+        Number of the oldest pending folds to drop so the rest fit the time left.
+
+        Args:
+            pending_rows: Training rows of the folds still to train, oldest first
+
+        Returns:
+            How many leading folds to skip (the newest fold is always kept)
+        """
+        capacity = self.remaining() * self.concurrency
+        kept = 0
+        cost = 0.0
+        for rows in reversed(pending_rows):
+            fold_cost = self._min_fold_cost(rows)
+            if kept and cost + fold_cost > capacity:
+                break
+            cost += fold_cost
+            kept += 1
+        return len(pending_rows) - kept
+
+    def fold_settings(
+        self,
+        train_rows: int,
+        pending_rows: Sequence[int] = (),
+        num_boost_round: Optional[int] = None,
+        early_stopping_rounds: Optional[int] = None,
+    ) -> Dict:
+        """
+        Boosting settings for the next fold.
+
+        Args:
+            train_rows: Training rows of the next fold
+            pending_rows: Training rows of the folds after it
+            num_boost_round: Round cap the fold would get without a budget
+            early_stopping_rounds: Patience the fold would get without a budget
+
+        Returns:
+            train_fold_xy keyword arguments: deadline, learning_rate,
+            num_boost_round and early_stopping_rounds
+        """
+        now = time.time()
+        remaining = self.remaining()
+        rows = max(1, train_rows)
+        share = remaining * min(1.0, rows * self.concurrency / max(1, rows + sum(pending_rows)))
+
+        deadline = min(self.deadline, now + share * _FOLD_OVERRUN)
+        if not self.fold_seconds:
+            # The first fold always gets a chance to produce a model
+            deadline = max(deadline, now + self.min_fold_seconds)
+
+        settings = {
+            "deadline": deadline,
+            "learning_rate": None,
+            "num_boost_round": num_boost_round,
+            "early_stopping_rounds": early_stopping_rounds,
+        }
+        if self._seconds_per_row_round is None:
+            return settings
+
+        round_cap = num_boost_round or EnsembleModel.NUM_BOOST_ROUND
+        rounds_needed = min(self._rounds_needed, round_cap)
+        affordable = int(share / (self._seconds_per_row_round * rows))
+        if affordable >= rounds_needed:
+            return settings
+
+        scale = min(
+            self.max_learning_rate / self.base_learning_rate, rounds_needed / max(affordable, 1)
+        )
+        patience = early_stopping_rounds or EnsembleModel.EARLY_STOPPING_ROUNDS
+        settings["learning_rate"] = self.base_learning_rate * scale
+        settings["num_boost_round"] = min(round_cap, max(self.min_rounds, affordable))
+        settings["early_stopping_rounds"] = min(
+            settings["num_boost_round"], max(self.min_patience, int(patience / scale))
+        )
+        logger.info(
+            "Budget squeezes fold: %.0f s for %d rows -> learning rate %.3f, %d rounds, patience %d",
+            share,
+            train_rows,
+            settings["learning_rate"],
+            settings["num_boost_round"],
+            settings["early_stopping_rounds"],
+        )
+        return settings
+
+    def record_fold(self, split_index: int, split_result: dict) -> None:
+        """Account for a trained (or restored) fold and update the cost estimates."""
+        seconds = split_result.get("train_seconds") or 0.0
+        self.fold_seconds[split_index] = seconds
+
+        rounds = split_result.get("boost_rounds")
+        rows = split_result.get("train_samples")
+        if not (seconds and rounds and rows):
+            return
+        self._seconds_per_row_round = seconds / (rounds * rows)
+        if not split_result.get("deadline_reached"):
+            # A higher learning rate needs proportionally fewer rounds
+            learning_rate = split_result.get("learning_rate") or self.base_learning_rate
+            self._rounds_needed = max(
+                self.min_rounds, int(rounds * learning_rate / self.base_learning_rate)
+            )
+
+    def skip_fold(self, split_index: int) -> None:
+        logger.info("Time budget: skipping split %d", split_index)
+        self.skipped_folds.append(split_index)
+
+    def summary(self) -> Dict:
+        """JSON summary for the validation results and registry metadata."""
+        return {
+            "seconds": self.seconds,
+            "clock": self.clock,
+            "used_seconds": round(self.used_seconds(), 1),
+            "exhausted": self.exhausted,
+            "skipped_folds": sorted(self.skipped_folds),
+        }
+
+    def _min_fold_cost(self, rows: int) -> float:
+        """Wall seconds of a fold at the highest learning rate."""
+        if self._seconds_per_row_round is None:
+            return self.min_fold_seconds
+        rounds = max(
+            self.min_rounds, self._rounds_needed * self.base_learning_rate / self.max_learning_rate
+        )
+        return max(self.min_fold_seconds, self._seconds_per_row_round * rows * rounds)
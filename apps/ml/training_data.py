@@ -0,0 +1,218 @@
+"""
+Compact training data: one contiguous float32 feature matrix plus a label vector.
+
+``build_training_matrix`` turns computed features and triple-barrier labels into
+the same rows and values as ``WalkForwardPipeline.prepare_features_and_labels``
+(inner join on timestamp, inf -> NaN, ffill/bfill, 0), but without the merged
+float64 frame and its copies: feature columns are read in groups, cleaned in
+place and written straight into a preallocated float32 matrix. Every fold takes
+row-range views of that matrix instead of slicing DataFrames.
+
+A memory budget bounds the per-group temporaries; ``log_memory`` reports
+current and peak RSS for each training stage.
+"""
+
+import logging
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX hosts
+    resource = None
+
+LABEL_COLUMNS = ["label", "hit_barrier", "return_pct", "bars_to_hit"]
+
+# Temporary bytes per cell while a column group is cleaned: the float64 read and
+# its row selection, the int64 fill index and the filled copy
+_BYTES_PER_CELL = 32
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process (None where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """High-water mark of this process's resident set size."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return int(peak) if os.uname().sysname == "Darwin" else int(peak) * 1024
+
+
+def log_memory(stage: str, budget_bytes: Optional[int] = None) -> Optional[int]:
+    """
+    Log current and peak RSS after a training stage.
+
+    Args:
+        stage: Stage name for the log line
+        budget_bytes: Warn when the current RSS exceeds this
+
+    Returns:
+        Current RSS in bytes (None if unknown)
+    """
+    rss = current_rss_bytes()
+    peak = peak_rss_bytes()
+    logger.info("Memory after %s: rss=%s peak=%s", stage, _format_bytes(rss), _format_bytes(peak))
+    if budget_bytes and rss is not None and rss > budget_bytes:
+        logger.warning(
+            "RSS after %s (%s) exceeds the training memory budget (%s)",
+            stage,
+            _format_bytes(rss),
+            _format_bytes(budget_bytes),
+        )
+    return rss
+
+
+def _format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "n/a"
+    return f"{value / 1024 ** 2:.0f}MB"
+
+
+def columns_per_chunk(rows: int, columns: int, budget_bytes: Optional[int]) -> int:
+    """
+    Feature columns cleaned at once so the temporaries stay within the budget.
+
+    Args:
+        rows: Rows in the matrix
+        columns: Feature columns
+        budget_bytes: Memory budget (0/None = all columns at once)
+
+    Returns:
+        Column group size (>= 1)
+    """
+    if not budget_bytes or rows == 0:
+        return max(columns, 1)
+    return int(min(max(columns, 1), max(1, budget_bytes // (rows * _BYTES_PER_CELL))))
+
+
+class TrainingMatrix:
+    """
+    Features, labels and timestamps of a prepared training set.
+
+    ``features`` is C-contiguous (rows x features); ``frame``/``features_frame``
+    and ``labels_series`` return views of a half-open row range.
+    """
+
+    def __init__(
+        self,
+        features: np.ndarray,
+        labels: np.ndarray,
+        timestamps: pd.DatetimeIndex,
+        feature_cols: List[str],
+    ):
+        if features.shape != (len(labels), len(feature_cols)) or len(timestamps) != len(labels):
+            raise ValueError("Feature matrix, labels and timestamps are not aligned")
+        self.features = features
+        self.labels = labels
+        self.timestamps = pd.DatetimeIndex(timestamps)
+        self.feature_cols = list(feature_cols)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.features.nbytes + self.labels.nbytes + self.timestamps.nbytes)
+
+    def rows(self, bounds) -> Tuple[int, int]:
+        """Half-open row range of [start, end) timestamps, as WalkForwardValidator.get_train_test_data."""
+        start, stop = self.timestamps.searchsorted(list(bounds), side="left")
+        return int(start), int(stop)
+
+    def features_frame(self, start: int, stop: int) -> pd.DataFrame:
+        return pd.DataFrame(self.features[start:stop], columns=self.feature_cols, copy=False)
+
+    def labels_series(self, start: int, stop: int) -> pd.Series:
+        return pd.Series(self.labels[start:stop], name="label", copy=False)
+
+    def frame(self, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+        """Timestamp-only frame of a row range (for splitting and leakage checks)."""
+        return pd.DataFrame({"timestamp": self.timestamps[start:stop]})
+
+
+def build_training_matrix(
+    df_features: pd.DataFrame,
+    labels_df: pd.DataFrame,
+    feature_cols: List[str],
+    budget_bytes: Optional[int] = None,
+) -> TrainingMatrix:
+    """
+    Join features to labels on timestamp and clean them into a float32 matrix.
+
+    Args:
+        df_features: Computed features with a 'timestamp' column
+        labels_df: Labels with 'timestamp' and LABEL_COLUMNS
+        feature_cols: Feature columns to keep, in order
+        budget_bytes: Memory budget for the per-group temporaries (0/None = no chunking)
+
+    Returns:
+        TrainingMatrix over the labeled rows, in time order
+    """
+    labels_df = labels_df.dropna(subset=LABEL_COLUMNS)
+    positions = pd.Index(df_features["timestamp"]).get_indexer(labels_df["timestamp"])
+    matched = positions >= 0
+    # Inner-join order: feature rows, not label rows
+    order = np.argsort(positions[matched], kind="stable")
+    positions = positions[matched][order]
+    labels = labels_df["label"].to_numpy()[matched][order].astype(np.int8)
+
+    timestamps = pd.DatetimeIndex(df_features["timestamp"].to_numpy()[positions])
+    if not timestamps.is_monotonic_increasing:
+        # Folds are located with searchsorted
+        by_time = np.argsort(timestamps.to_numpy(), kind="stable")
+        positions, labels, timestamps = positions[by_time], labels[by_time], timestamps[by_time]
+
+    rows = len(positions)
+    features = np.empty((rows, len(feature_cols)), dtype=np.float32)
+    step = columns_per_chunk(rows, len(feature_cols), budget_bytes)
+    if step < len(feature_cols):
+        logger.info(
+            "Building %dx%d float32 matrix in groups of %d columns (budget %s)",
+            rows,
+            len(feature_cols),
+            step,
+            _format_bytes(budget_bytes),
+        )
+
+    for start in range(0, len(feature_cols), step):
+        cols = feature_cols[start : start + step]
+        block = df_features[cols].to_numpy(dtype=np.float64, na_value=np.nan)[positions]
+        _fill_non_finite(block)
+        features[:, start : start + len(cols)] = block
+        del block
+
+    return TrainingMatrix(features, labels, timestamps, feature_cols)
+
+
+def _fill_non_finite(block: np.ndarray) -> None:
+    """In place: inf -> NaN, forward fill, back fill, then 0 (column-wise)."""
+    np.copyto(block, np.nan, where=~np.isfinite(block))
+    missing = np.isnan(block)
+    if not missing.any():
+        return
+
+    rows = np.arange(block.shape[0])[:, None]
+    last_valid = np.where(missing, 0, rows)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    block[:] = np.take_along_axis(block, last_valid, axis=0)
+
+    # Anything still missing precedes the column's first value
+    missing = np.isnan(block)
+    if missing.any():
+        has_value = ~missing.all(axis=0)
+        first_valid = np.argmax(~missing, axis=0)
+        first_values = np.where(has_value, block[first_valid, np.arange(block.shape[1])], 0.0)
+        np.copyto(block, np.broadcast_to(first_values, block.shape), where=missing)
@@ -1,10 +1,11 @@
 from typing import Optional
 
-from celery import Celery
+from celery import Celery, chord, group
 from apps.api.config import settings
 from apps.api.db.session import SessionLocal
 from apps.api.db.models import (
     OHLCV,
+    BackfillJob,
     Signal,
     SignalStatus,
     RiskProfile,
@@ -12,22 +13,29 @@ from apps.api.db.models import (
     SignalRejection,
     ModelRegistry as ModelRecord,
 )
+from apps.ml.archive import get_archive
 from apps.ml.backfill import BackfillService
-from apps.ml.training import train_model_pipeline
+from apps.ml.checkpoint import read_manifest
+from apps.ml.fold_executor import train_published_fold
+from apps.ml.gap_scanner import scan_gaps
+from apps.ml.resampling import update_derived_bars
+from apps.ml.training import finalize_training_folds, publish_training_folds, train_model_pipeline
 from apps.ml.model_registry import ModelRegistry
 from apps.ml.signal_engine import SignalEngine
 from apps.ml.summaries import generate_signal_summary
 from apps.ml.drift import DriftDetector
 from apps.ml.auto_trainer import AutoTrainer, create_auto_training_config_table
 from apps.ml.cleanup import PerformanceTrackingCleanup
-from sqlalchemy import and_, text
-from datetime import datetime, timezone
+from sqlalchemy import and_, func, text
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from sqlalchemy.exc import ProgrammingError
 import pandas as pd
 import numpy as np
 import asyncio
 import logging
 import math
+import shutil
 
 _HISTORICAL_TABLE_INITIALIZED = False
 
@@ -96,17 +104,26 @@ celery_app.conf.update(
     task_routes={
         'backfill.execute': {'queue': 'backfill', 'priority': 10},
         'backfill.update_latest': {'queue': 'backfill', 'priority': 9},
+        'backfill.repair_gaps': {'queue': 'backfill', 'priority': 8},
         'training.train_model': {'queue': 'training', 'priority': 5},
+        'training.train_model_distributed': {'queue': 'training', 'priority': 5},
+        'training.train_fold': {'queue': 'training', 'priority': 5},
+        'training.finalize_folds': {'queue': 'training', 'priority': 6},
+        'training.fail_distributed': {'queue': 'training', 'priority': 6},
         'training.auto_train': {'queue': 'training', 'priority': 4},
         'signals.generate_historical': {'queue': 'historical', 'priority': 1},
-        'signals.generate': {'queue': 'default', 'priority': 7},
+        # Own queue: its worker keeps child processes (and their model cache) alive
+        'signals.generate': {'queue': 'signals', 'priority': 7},
         'signals.expire': {'queue': 'default', 'priority': 8},
         'drift.monitor': {'queue': 'default', 'priority': 3},
         'maintenance.cleanup': {'queue': 'default', 'priority': 2},
+        'maintenance.build_archive': {'queue': 'default', 'priority': 2},
     },
     task_default_queue='default',
     task_default_priority=5,
     worker_prefetch_multiplier=1,
+    # Recycle children after every task to release training/backfill memory.
+    # The signals worker overrides this on its command line (see docker-compose.yml)
     worker_max_tasks_per_child=1,
 )
 
@@ -126,6 +143,267 @@ def execute_backfill_task(job_id: str):
         db.close()
 
 
+def _ensure_model_registry_record(db, symbol: str, timeframe: str, results_dict: dict):
+    """Create or update relational model registry entry so FKs stay valid."""
+    from apps.api.db.models import TimeFrame
+
+    model_id = results_dict.get("model_id")
+    if not model_id:
+        return None
+
+    try:
+        timeframe_enum = TimeFrame(timeframe)
+    except ValueError:
+        logger.error("Invalid timeframe %s for model registry entry", timeframe)
+        return None
+
+    avg_metrics = results_dict.get("avg_metrics") or {}
+    split_results = results_dict.get("split_results") or []
+    validation_period = results_dict.get("validation_period") or {}
+
+    train_starts = [split.get("train_start") for split in split_results if split.get("train_start")]
+    train_ends = [split.get("train_end") for split in split_results if split.get("train_end")]
+    test_starts = [split.get("test_start") for split in split_results if split.get("test_start")]
+    test_ends = [split.get("test_end") for split in split_results if split.get("test_end")]
+
+    def _parse_iso(value):
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except (ValueError, TypeError):
+            return None
+
+    train_start = min(train_starts) if train_starts else _parse_iso(validation_period.get("start"))
+    train_end = max(train_ends) if train_ends else _parse_iso(validation_period.get("end"))
+    oos_start = min(test_starts) if test_starts else train_start
+    oos_end = max(test_ends) if test_ends else train_end
+
+    registry = ModelRegistry()
+    registry_version = results_dict.get("registry_version")
+    registry_entry = registry.get_model(symbol, timeframe, registry_version)
+    artifact_path = registry_entry.get("path") if registry_entry else None
+
+    def _to_serializable(value):
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, dict):
+            return {k: _to_serializable(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [_to_serializable(v) for v in value]
+        return value
+
+    feature_importance = results_dict.get("feature_importance")
+    if feature_importance:
+        feature_importance = _to_serializable(feature_importance)
+
+    db_model = db.query(ModelRecord).filter_by(model_id=model_id).first()
+
+    if not db_model:
+        if not (train_start and train_end and oos_start and oos_end):
+            logger.warning(
+                "Skipping model registry insert for %s due to missing timeline metadata", model_id
+            )
+            return None
+
+        db_model = ModelRecord(
+            model_id=model_id,
+            symbol=symbol,
+            timeframe=timeframe_enum,
+            model_type="ensemble",
+            version=registry_version or "v1",
+            train_start=train_start,
+            train_end=train_end,
+            oos_start=oos_start,
+            oos_end=oos_end,
+            hyperparameters=None,
+            accuracy=avg_metrics.get("avg_accuracy"),
+            precision=avg_metrics.get("avg_precision"),
+            recall=avg_metrics.get("avg_recall"),
+            f1_score=avg_metrics.get("avg_f1_score"),
+            roc_auc=avg_metrics.get("avg_roc_auc"),
+            hit_rate_tp1=avg_metrics.get("avg_hit_rate_tp1"),
+            artifact_path=artifact_path,
+            feature_importance=feature_importance,
+        )
+        db.add(db_model)
+    else:
+        db_model.symbol = symbol
+        db_model.timeframe = timeframe_enum
+        if registry_version:
+            db_model.version = registry_version
+        if train_start:
+            db_model.train_start = train_start
+        if train_end:
+            db_model.train_end = train_end
+        if oos_start:
+            db_model.oos_start = oos_start
+        if oos_end:
+            db_model.oos_end = oos_end
+        db_model.accuracy = avg_metrics.get("avg_accuracy")
+        db_model.precision = avg_metrics.get("avg_precision")
+        db_model.recall = avg_metrics.get("avg_recall")
+        db_model.f1_score = avg_metrics.get("avg_f1_score")
+        db_model.roc_auc = avg_metrics.get("avg_roc_auc")
+        db_model.hit_rate_tp1 = avg_metrics.get("avg_hit_rate_tp1")
+        if artifact_path:
+            db_model.artifact_path = artifact_path
+        if feature_importance:
+            db_model.feature_importance = feature_importance
+
+    if db_model:
+        # Promote the latest model to production and retire older ones for this pair
+        siblings = (
+            db.query(ModelRecord)
+            .filter(
+                ModelRecord.symbol == symbol,
+                ModelRecord.timeframe == timeframe_enum,
+                ModelRecord.model_id != db_model.model_id,
+            )
+            .all()
+        )
+        for sibling in siblings:
+            sibling.is_active = False
+            sibling.is_production = False
+
+        db_model.is_active = True
+        db_model.is_production = True
+        db_model.deployed_at = datetime.utcnow()
+
+        if registry_version:
+            try:
+                registry.deploy_model(symbol, timeframe, registry_version)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.error(
+                    "Failed to auto-deploy model %s %s %s: %s",
+                    symbol,
+                    timeframe,
+                    registry_version,
+                    exc,
+                )
+
+    return db_model
+
+
+def _complete_training_job(db, training_job, symbol: str, timeframe: str, results: dict):
+    """Mark a training job completed with its registered model and average metrics."""
+    model_record = _ensure_model_registry_record(db, symbol, timeframe, results)
+
+    training_job.status = "completed"
+    # The pipeline removed the checkpoint once the model was registered
+    training_job.checkpoint_path = None
+    training_job.completed_at = datetime.utcnow()
+    if model_record:
+        training_job.model_id = model_record.model_id
+        training_job.version = model_record.version
+    else:
+        logger.warning(
+            "No relational registry entry for model %s; leaving training job detached",
+            results.get("model_id"),
+        )
+        training_job.model_id = None
+        training_job.version = results.get("registry_version")
+
+    avg_metrics = results.get("avg_metrics", {})
+    training_job.accuracy = avg_metrics.get("avg_accuracy")
+    training_job.avg_roc_auc = avg_metrics.get("avg_roc_auc")
+    training_job.hit_rate_tp1 = avg_metrics.get("avg_hit_rate_tp1")
+    training_job.progress_pct = 100.0
+
+    training_job.avg_fold_seconds = results.get("avg_fold_seconds")
+    time_budget = results.get("time_budget")
+    if time_budget:
+        training_job.budget_exhausted = time_budget["exhausted"]
+        training_job.budget_skipped_folds = len(time_budget["skipped_folds"])
+
+    if training_job.started_at:
+        elapsed = (datetime.utcnow() - training_job.started_at).total_seconds()
+        training_job.elapsed_seconds = elapsed
+
+    db.commit()
+
+
+def _fail_training_job(db, job_id: str, error_message: str):
+    """Persist a training failure (after the caller rolled back its session)."""
+    from apps.api.db.models import TrainingJob
+
+    try:
+        training_job = db.query(TrainingJob).filter_by(job_id=job_id).first()
+        if training_job:
+            training_job.status = "failed"
+            training_job.completed_at = datetime.utcnow()
+            training_job.error_message = error_message
+            training_job.model_id = None
+            training_job.version = None
+
+            if training_job.started_at:
+                elapsed = (datetime.utcnow() - training_job.started_at).total_seconds()
+                training_job.elapsed_seconds = elapsed
+
+            db.commit()
+    except Exception as update_error:
+        logger.error(f"Failed to persist training failure status: {update_error}")
+        db.rollback()
+
+
+def _training_job_failed(job_id: str) -> bool:
+    """Whether the job already failed, e.g. because the user cancelled it."""
+    from apps.api.db.models import TrainingJob
+
+    db = SessionLocal()
+    try:
+        status = db.query(TrainingJob.status).filter_by(job_id=job_id).scalar()
+        return status == "failed"
+    finally:
+        db.close()
+
+
+def _find_interrupted_training_job(db, training_job, training_mode: str):
+    """
+    Latest interrupted job for the same symbol/timeframe/windows with a checkpoint to resume.
+
+    A job is interrupted when it failed, or when it still claims to be training
+    but has not reported progress for settings.TRAINING_RESUME_STALE_MINUTES
+    (its worker was killed before it could mark the failure).
+    """
+    from sqlalchemy import or_
+
+    from apps.api.db.models import TrainingJob
+
+    stale_before = datetime.utcnow() - timedelta(minutes=settings.TRAINING_RESUME_STALE_MINUTES)
+    candidates = (
+        db.query(TrainingJob)
+        .filter(
+            TrainingJob.job_id != training_job.job_id,
+            TrainingJob.symbol == training_job.symbol,
+            TrainingJob.timeframe == training_job.timeframe,
+            TrainingJob.test_period_days == training_job.test_period_days,
+            TrainingJob.min_train_days == training_job.min_train_days,
+            TrainingJob.use_expanding_window == training_job.use_expanding_window,
+            TrainingJob.checkpoint_path.isnot(None),
+            or_(
+                TrainingJob.status == "failed",
+                and_(
+                    TrainingJob.status.in_(["training", "pending"]),
+                    TrainingJob.updated_at < stale_before,
+                ),
+            ),
+        )
+        .order_by(TrainingJob.created_at.desc())
+        .all()
+    )
+
+    for candidate in candidates:
+        manifest = read_manifest(candidate.checkpoint_path)
+        if (
+            manifest
+            and manifest.get("completed_folds")
+            and manifest.get("training_mode") == training_mode
+        ):
+            return candidate
+    return None
+
+
 @celery_app.task(name="training.train_model", bind=True)
 def train_model_task(
     self,
@@ -134,7 +412,9 @@ def train_model_task(
     test_period_days: int = 30,
     min_train_days: int = 180,
     use_expanding_window: bool = True,
-    training_mode: str = 'full'
+    training_mode: str = "full",
+    time_budget_hours: Optional[float] = None,
+    budget_clock: Optional[str] = None,
 ):
     """
     Train ML model with walk-forward validation.
@@ -142,8 +422,12 @@ def train_model_task(
     Args:
         training_mode: 'quick' for fast validation (3-4h, ~5 folds)
                       'full' for complete training (35-45h, ~45 folds)
+        time_budget_hours: Hours split across the folds; training stops with the
+                           best model so far when they run out
+                           (default: settings.TRAINING_TIME_BUDGET_HOURS; 0 = unlimited)
+        budget_clock: 'wall' or 'cpu' (default: settings.TRAINING_BUDGET_CLOCK)
     """
-    from apps.api.db.models import TrainingJob, TimeFrame, ModelRegistry as ModelRecord
+    from apps.api.db.models import TrainingJob, TimeFrame
     from datetime import datetime
 
     db = SessionLocal()
@@ -174,6 +458,44 @@ def train_model_task(
             training_job.status = 'training'
             training_job.started_at = datetime.utcnow()
 
+        # Fold checkpoints: pick up an interrupted run of the same job, or of an
+        # earlier job for the same pair and windows
+        checkpoint_dir = None
+        start_date = end_date = None
+        if settings.TRAINING_CHECKPOINTS:
+            if not training_job.checkpoint_path:
+                interrupted = _find_interrupted_training_job(db, training_job, training_mode)
+                if interrupted is not None:
+                    logger.info("Resuming interrupted training job %s", interrupted.job_id)
+                    training_job.checkpoint_path = interrupted.checkpoint_path
+                    training_job.resumed_from_job_id = interrupted.job_id
+                    interrupted.checkpoint_path = None
+                    if interrupted.status != "failed":
+                        interrupted.status = "failed"
+                        interrupted.completed_at = datetime.utcnow()
+                        interrupted.error_message = (
+                            f"Interrupted; resumed by job {training_job.job_id}"
+                        )
+                else:
+                    training_job.checkpoint_path = str(
+                        Path(settings.TRAINING_CHECKPOINT_DIR) / training_job.job_id
+                    )
+
+            manifest = read_manifest(training_job.checkpoint_path)
+            if manifest:
+                # The interrupted run's date range, so the prepared data can match
+                start_date = datetime.fromisoformat(manifest["start_date"])
+                end_date = datetime.fromisoformat(manifest["end_date"])
+            checkpoint_dir = training_job.checkpoint_path
+
+        training_job.resumed_folds = 0
+
+        if time_budget_hours is None:
+            time_budget_hours = settings.TRAINING_TIME_BUDGET_HOURS
+        training_job.time_budget_seconds = time_budget_hours * 3600 if time_budget_hours else None
+        training_job.budget_clock = (
+            (budget_clock or settings.TRAINING_BUDGET_CLOCK) if time_budget_hours else None
+        )
         db.commit()
 
         logger.info(
@@ -217,141 +539,115 @@ def train_model_task(
                 logger.error(f"Failed to update labeling progress: {e}")
                 db.rollback()
 
-        def ensure_model_registry_record(results_dict: dict):
-            """Create or update relational model registry entry so FKs stay valid."""
+        def update_resumed_folds(resumed_folds):
+            """Record how many folds were restored from the checkpoint"""
+            try:
+                db.refresh(training_job)
+                training_job.resumed_folds = resumed_folds
+                db.commit()
+                if resumed_folds:
+                    logger.info(f"Resumed {resumed_folds} folds from checkpoint")
+            except Exception as e:
+                logger.error(f"Failed to update resumed folds: {e}")
+                db.rollback()
 
-            model_id = results_dict.get('model_id')
-            if not model_id:
-                return None
+        results = train_model_pipeline(
+            db=db,
+            symbol=symbol,
+            timeframe=timeframe,
+            test_period_days=test_period_days,
+            min_train_days=min_train_days,
+            use_expanding_window=use_expanding_window,
+            training_mode=training_mode,
+            start_date=start_date,
+            end_date=end_date,
+            progress_callback={
+                'training': update_training_progress,
+                'labeling': update_labeling_progress,
+                'resume': update_resumed_folds
+            },
+            checkpoint_dir=checkpoint_dir,
+            time_budget_seconds=training_job.time_budget_seconds or 0,
+            budget_clock=training_job.budget_clock,
+        )
 
-            try:
-                timeframe_enum = TimeFrame(timeframe)
-            except ValueError:
-                logger.error("Invalid timeframe %s for model registry entry", timeframe)
-                return None
+        # Update job as completed
+        _complete_training_job(db, training_job, symbol, timeframe, results)
 
-            avg_metrics = results_dict.get('avg_metrics') or {}
-            split_results = results_dict.get('split_results') or []
-            validation_period = results_dict.get('validation_period') or {}
+        return {
+            "status": "completed",
+            "model_id": results['model_id'],
+            "version": results.get('registry_version'),
+            "avg_metrics": results.get('avg_metrics', {}),
+            "resumed_folds": len(results.get('resumed_folds', [])),
+            "avg_fold_seconds": results.get('avg_fold_seconds'),
+            "time_budget": results.get('time_budget')
+        }
+    except Exception as e:
+        logger.error(f"Training task failed: {e}", exc_info=True)
 
-            train_starts = [split.get('train_start') for split in split_results if split.get('train_start')]
-            train_ends = [split.get('train_end') for split in split_results if split.get('train_end')]
-            test_starts = [split.get('test_start') for split in split_results if split.get('test_start')]
-            test_ends = [split.get('test_end') for split in split_results if split.get('test_end')]
+        # Update job as failed
+        db.rollback()
 
-            def _parse_iso(value):
-                if not value:
-                    return None
-                try:
-                    return datetime.fromisoformat(value)
-                except (ValueError, TypeError):
-                    return None
-
-            train_start = min(train_starts) if train_starts else _parse_iso(validation_period.get('start'))
-            train_end = max(train_ends) if train_ends else _parse_iso(validation_period.get('end'))
-            oos_start = min(test_starts) if test_starts else train_start
-            oos_end = max(test_ends) if test_ends else train_end
-
-            registry = ModelRegistry()
-            registry_version = results_dict.get('registry_version')
-            registry_entry = registry.get_model(symbol, timeframe, registry_version)
-            artifact_path = registry_entry.get('path') if registry_entry else None
-
-            def _to_serializable(value):
-                if isinstance(value, np.generic):
-                    return value.item()
-                if isinstance(value, dict):
-                    return {k: _to_serializable(v) for k, v in value.items()}
-                if isinstance(value, list):
-                    return [_to_serializable(v) for v in value]
-                return value
-
-            feature_importance = results_dict.get('feature_importance')
-            if feature_importance:
-                feature_importance = _to_serializable(feature_importance)
-
-            db_model = db.query(ModelRecord).filter_by(model_id=model_id).first()
+        if training_job:
+            _fail_training_job(db, self.request.id, str(e))
 
-            if not db_model:
-                if not (train_start and train_end and oos_start and oos_end):
-                    logger.warning("Skipping model registry insert for %s due to missing timeline metadata", model_id)
-                    return None
+        # Re-raise exception so Celery marks task as FAILURE
+        raise
+    finally:
+        db.close()
 
-                db_model = ModelRecord(
-                    model_id=model_id,
-                    symbol=symbol,
-                    timeframe=timeframe_enum,
-                    model_type='ensemble',
-                    version=registry_version or 'v1',
-                    train_start=train_start,
-                    train_end=train_end,
-                    oos_start=oos_start,
-                    oos_end=oos_end,
-                    hyperparameters=None,
-                    accuracy=avg_metrics.get('avg_accuracy'),
-                    precision=avg_metrics.get('avg_precision'),
-                    recall=avg_metrics.get('avg_recall'),
-                    f1_score=avg_metrics.get('avg_f1_score'),
-                    roc_auc=avg_metrics.get('avg_roc_auc'),
-                    hit_rate_tp1=avg_metrics.get('avg_hit_rate_tp1'),
-                    artifact_path=artifact_path,
-                    feature_importance=feature_importance
-                )
-                db.add(db_model)
-            else:
-                db_model.symbol = symbol
-                db_model.timeframe = timeframe_enum
-                if registry_version:
-                    db_model.version = registry_version
-                if train_start:
-                    db_model.train_start = train_start
-                if train_end:
-                    db_model.train_end = train_end
-                if oos_start:
-                    db_model.oos_start = oos_start
-                if oos_end:
-                    db_model.oos_end = oos_end
-                db_model.accuracy = avg_metrics.get('avg_accuracy')
-                db_model.precision = avg_metrics.get('avg_precision')
-                db_model.recall = avg_metrics.get('avg_recall')
-                db_model.f1_score = avg_metrics.get('avg_f1_score')
-                db_model.roc_auc = avg_metrics.get('avg_roc_auc')
-                db_model.hit_rate_tp1 = avg_metrics.get('avg_hit_rate_tp1')
-                if artifact_path:
-                    db_model.artifact_path = artifact_path
-                if feature_importance:
-                    db_model.feature_importance = feature_importance
-
-            if db_model:
-                # Promote the latest model to production and retire older ones for this pair
-                siblings = db.query(ModelRecord).filter(
-                    ModelRecord.symbol == symbol,
-                    ModelRecord.timeframe == timeframe_enum,
-                    ModelRecord.model_id != db_model.model_id,
-                ).all()
-                for sibling in siblings:
-                    sibling.is_active = False
-                    sibling.is_production = False
 
-                db_model.is_active = True
-                db_model.is_production = True
-                db_model.deployed_at = datetime.utcnow()
+@celery_app.task(name="training.train_model_distributed", bind=True)
+def train_model_distributed_task(
+    self,
+    symbol: str,
+    timeframe: str,
+    test_period_days: int = 30,
+    min_train_days: int = 180,
+    use_expanding_window: bool = True,
+    training_mode: str = "full",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+):
+    """
+    Walk-forward training with every fold as its own task on the training queue.
 
-                if registry_version:
-                    try:
-                        registry.deploy_model(symbol, timeframe, registry_version)
-                    except Exception as exc:  # pragma: no cover - defensive logging
-                        logger.error(
-                            "Failed to auto-deploy model %s %s %s: %s",
-                            symbol,
-                            timeframe,
-                            registry_version,
-                            exc,
-                        )
+    Features and labels are prepared once here and published to
+    settings.TRAINING_DISTRIBUTED_DIR, which all training workers mount. A
+    chord of training.train_fold tasks trains the folds on whichever workers
+    are free; training.finalize_folds aggregates them, saves and registers
+    the best model and completes the job.
 
-            return db_model
+    Args:
+        start_date: ISO start date (default: earliest available data)
+        end_date: ISO end date (default: latest available data)
+    """
+    from apps.api.db.models import TimeFrame, TrainingJob
 
-        results = train_model_pipeline(
+    db = SessionLocal()
+    training_job = None
+
+    try:
+        training_job = db.query(TrainingJob).filter_by(job_id=self.request.id).first()
+        if training_job is None:
+            training_job = TrainingJob(
+                job_id=self.request.id,
+                symbol=symbol,
+                timeframe=TimeFrame(timeframe),
+                test_period_days=test_period_days,
+                min_train_days=min_train_days,
+                use_expanding_window=use_expanding_window,
+                status="training",
+                started_at=datetime.utcnow(),
+            )
+            db.add(training_job)
+        else:
+            training_job.status = "training"
+            training_job.started_at = datetime.utcnow()
+        db.commit()
+
+        plan = publish_training_folds(
             db=db,
             symbol=symbol,
             timeframe=timeframe,
@@ -359,75 +655,123 @@ def train_model_task(
             min_train_days=min_train_days,
             use_expanding_window=use_expanding_window,
             training_mode=training_mode,
-            progress_callback={
-                'training': update_training_progress,
-                'labeling': update_labeling_progress
-            }
+            start_date=datetime.fromisoformat(start_date) if start_date else None,
+            end_date=datetime.fromisoformat(end_date) if end_date else None,
         )
+        folds = plan.pop("folds")
+        plan["job_id"] = self.request.id
 
-        # Update job as completed
-        model_record = ensure_model_registry_record(results)
+        training_job.total_folds = plan["total_splits"]
+        training_job.current_fold = 0
+        training_job.labeling_progress_pct = 100.0
+        db.commit()
 
-        training_job.status = 'completed'
-        training_job.completed_at = datetime.utcnow()
-        if model_record:
-            training_job.model_id = model_record.model_id
-            training_job.version = model_record.version
-        else:
-            logger.warning(
-                "No relational registry entry for model %s; leaving training job detached",
-                results.get('model_id')
-            )
-            training_job.model_id = None
-            training_job.version = results.get('registry_version')
+        logger.info(
+            f"Dispatching {len(folds)} fold tasks for {symbol} {timeframe} (job {self.request.id})"
+        )
+        callback = finalize_training_task.s(plan).on_error(
+            fail_distributed_training_task.si(self.request.id, plan["run_dir"])
+        )
+        result = chord(group([train_fold_task.s(plan, fold) for fold in folds]))(callback)
+        if result.parent is not None:
+            # Saved so cancel_training can restore the group and revoke every fold
+            result.parent.save()
+            training_job.fold_group_id = result.parent.id
+            db.commit()
 
-        avg_metrics = results.get('avg_metrics', {})
-        training_job.accuracy = avg_metrics.get('avg_accuracy')
-        training_job.avg_roc_auc = avg_metrics.get('avg_roc_auc')
-        training_job.hit_rate_tp1 = avg_metrics.get('avg_hit_rate_tp1')
-        training_job.progress_pct = 100.0
+        return {"status": "dispatched", "job_id": self.request.id, "folds": len(folds)}
+    except Exception as e:
+        logger.error(f"Distributed training task failed: {e}", exc_info=True)
+        db.rollback()
 
-        if training_job.started_at:
-            elapsed = (datetime.utcnow() - training_job.started_at).total_seconds()
-            training_job.elapsed_seconds = elapsed
+        if training_job:
+            _fail_training_job(db, self.request.id, str(e))
 
-        db.commit()
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(name="training.train_fold")
+def train_fold_task(plan: dict, fold: dict):
+    """Train one fold of a distributed run and report the job's progress"""
+    if _training_job_failed(plan["job_id"]):
+        logger.info(f"Training job {plan['job_id']} failed or was cancelled; skipping fold")
+        return None
+
+    from apps.api.db.models import TrainingJob
+
+    split_index = train_published_fold(plan, fold)
+
+    db = SessionLocal()
+    try:
+        training_job = db.query(TrainingJob).filter_by(job_id=plan["job_id"]).first()
+        if training_job:
+            # Fold results on the shared volume: every finished fold, on any worker
+            done = len(list((Path(plan["run_dir"]) / "folds").glob("fold_*.json")))
+            training_job.current_fold = done
+            training_job.progress_pct = min(100.0, (done / max(plan["total_splits"], 1)) * 100.0)
+            if training_job.started_at:
+                training_job.elapsed_seconds = (
+                    datetime.utcnow() - training_job.started_at
+                ).total_seconds()
+            db.commit()
+    except Exception as e:
+        logger.error(f"Failed to update distributed training progress: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+    return split_index
+
+
+@celery_app.task(name="training.finalize_folds")
+def finalize_training_task(split_indices: list, plan: dict):
+    """Chord callback: aggregate the folds, register the best model, complete the job"""
+    from apps.api.db.models import TrainingJob
+
+    if _training_job_failed(plan["job_id"]):
+        logger.info(f"Training job {plan['job_id']} failed or was cancelled; not finalizing")
+        shutil.rmtree(plan["run_dir"], ignore_errors=True)
+        return {"status": "failed", "job_id": plan["job_id"]}
+
+    db = SessionLocal()
+    try:
+        results = finalize_training_folds(plan, split_indices)
+
+        training_job = db.query(TrainingJob).filter_by(job_id=plan["job_id"]).first()
+        if training_job:
+            _complete_training_job(db, training_job, plan["symbol"], plan["timeframe"], results)
+        else:
+            _ensure_model_registry_record(db, plan["symbol"], plan["timeframe"], results)
+            db.commit()
 
         return {
             "status": "completed",
-            "model_id": results['model_id'],
-            "version": results.get('registry_version'),
-            "avg_metrics": avg_metrics
+            "model_id": results["model_id"],
+            "version": results.get("registry_version"),
+            "avg_metrics": results.get("avg_metrics", {}),
         }
     except Exception as e:
-        logger.error(f"Training task failed: {e}", exc_info=True)
-
-        # Update job as failed
+        logger.error(f"Finalizing distributed training failed: {e}", exc_info=True)
         db.rollback()
+        _fail_training_job(db, plan["job_id"], str(e))
+        raise
+    finally:
+        db.close()
 
-        if training_job:
-            try:
-                training_job = db.query(TrainingJob).filter_by(job_id=self.request.id).first()
-                if training_job:
-                    training_job.status = 'failed'
-                    training_job.completed_at = datetime.utcnow()
-                    training_job.error_message = str(e)
-                    training_job.model_id = None
-                    training_job.version = None
-
-                    if training_job.started_at:
-                        elapsed = (datetime.utcnow() - training_job.started_at).total_seconds()
-                        training_job.elapsed_seconds = elapsed
-
-                    db.commit()
-            except Exception as update_error:
-                logger.error(f"Failed to persist training failure status: {update_error}")
-                db.rollback()
 
-        # Re-raise exception so Celery marks task as FAILURE
-        raise
+@celery_app.task(name="training.fail_distributed")
+def fail_distributed_training_task(job_id: str, run_dir: str):
+    """Chord error handler: a fold task failed, so the job fails and its published data goes"""
+    db = SessionLocal()
+    try:
+        # A cancelled job keeps its own error message
+        if not _training_job_failed(job_id):
+            _fail_training_job(db, job_id, "A distributed fold task failed")
     finally:
         db.close()
+    shutil.rmtree(run_dir, ignore_errors=True)
 
 
 @celery_app.task(name="signals.generate")
@@ -455,6 +799,8 @@ def generate_signals_task():
     skipped_filters = 0
     skipped_low_performance = 0
     performance_cache: dict[tuple[str, str], Optional[dict]] = {}
+    model_cache = getattr(engine, "model_cache", None)
+    model_cache_snapshot = model_cache.stats() if model_cache is not None else None
     min_performance_samples = max(30, settings.HISTORICAL_PERFORMANCE_SAMPLE // 5)
 
     try:
@@ -527,6 +873,7 @@ def generate_signals_task():
                 summary["details"].append({"reason": "no_deployments_available"})
                 return summary
 
+        pending: list[tuple[str, str, str]] = []
         for _, deployment in deployments.items():
             symbol = deployment.get('symbol')
             timeframe = deployment.get('timeframe')
@@ -604,19 +951,19 @@ def generate_signals_task():
                 continue
 
             processed_deployments += 1
+            pending.append((symbol, timeframe, environment))
 
-            selected_risk_profile = RiskProfile.MEDIUM
+        selected_risk_profile = RiskProfile.MEDIUM
 
-            try:
-                result = engine.generate_for_deployment(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    environment=environment,
-                    risk_profile=selected_risk_profile,
-                    capital_usd=1000.0
-                )
-            except Exception as exc:
-                logger.error("Failed to generate signal for %s %s: %s", symbol, timeframe, exc)
+        # Bars, features and model scores for every deployment are computed in one batch;
+        # results arrive in deployment order and are persisted one at a time below
+        outcomes = engine.generate_for_deployments(
+            pending, risk_profile=selected_risk_profile, capital_usd=1000.0
+        )
+
+        for (symbol, timeframe, environment), result in outcomes:
+            if isinstance(result, Exception):
+                logger.error("Failed to generate signal for %s %s: %s", symbol, timeframe, result)
                 summary['errors'] += 1
                 db.rollback()
                 continue
@@ -767,6 +1114,19 @@ def generate_signals_task():
         summary['metrics']['skipped_due_to_filters'] = skipped_filters
         summary['metrics']['skipped_low_performance'] = skipped_low_performance
 
+        if model_cache is not None:
+            cache_metrics = model_cache.stats_since(model_cache_snapshot)
+            summary["metrics"]["model_cache"] = cache_metrics
+            logger.info(
+                "Model cache this cycle: %d hits, %d loads, hit rate %s, load time %.1f ms",
+                cache_metrics["hits"],
+                cache_metrics["misses"],
+                f"{cache_metrics['hit_rate']:.0%}"
+                if cache_metrics["hit_rate"] is not None
+                else "n/a",
+                cache_metrics["load_ms_total"],
+            )
+
         return summary
     except Exception as exc:
         logger.error("Signal generation task failed: %s", exc, exc_info=True)
@@ -869,95 +1229,148 @@ def _build_signal_broadcast_payload(signal_record, signal_data, model_info, infe
     }
 
 
+# List of trading pairs to track (Bitget USDT-margined swaps)
+TRACKED_PAIRS = [
+    "BTC/USDT",
+    "ETH/USDT",
+    "BNB/USDT",
+    "XRP/USDT",
+    "ADA/USDT",
+    "SOL/USDT",
+    "DOGE/USDT",
+    "POL/USDT",  # Previously MATIC
+    "DOT/USDT",
+    "AVAX/USDT",
+    "LINK/USDT",
+    "UNI/USDT",
+]
+
+
 @celery_app.task(name="backfill.update_latest")
 def update_latest_candles_task():
     """Update latest candles for all active symbols (runs every 5 minutes)"""
     db = SessionLocal()
     try:
         from apps.ml.backfill import BackfillService
+        from apps.ml.streaming_features import StreamingFeatureStore, advance_streaming_features
         from apps.api.db.models import TimeFrame
         from datetime import datetime, timedelta
 
-        # List of trading pairs to track (Bitget USDT-margined swaps)
-        TRACKED_PAIRS = [
-            'BTC/USDT',
-            'ETH/USDT',
-            'BNB/USDT',
-            'XRP/USDT',
-            'ADA/USDT',
-            'SOL/USDT',
-            'DOGE/USDT',
-            'POL/USDT',  # Previously MATIC
-            'DOT/USDT',
-            'AVAX/USDT',
-            'LINK/USDT',
-            'UNI/USDT'
-        ]
-
         service = BackfillService(db)
+        feature_store = None
+        if settings.STREAMING_FEATURES_ENABLED:
+            feature_store = StreamingFeatureStore(
+                ttl_seconds=settings.STREAMING_FEATURES_TTL_SECONDS
+            )
         total_updated = 0
         backfills_triggered = 0
 
-        for symbol in TRACKED_PAIRS:
-            try:
-                # Get latest timestamp from database for this symbol
-                latest_candle = db.query(OHLCV).filter(
-                    and_(
-                        OHLCV.symbol == symbol,
-                        OHLCV.timeframe == TimeFrame.M15
-                    )
-                ).order_by(OHLCV.timestamp.desc()).first()
+        # Latest stored candle of every tracked pair in one query
+        latest_by_symbol = dict(
+            db.query(OHLCV.symbol, func.max(OHLCV.timestamp))
+            .filter(and_(OHLCV.symbol.in_(TRACKED_PAIRS), OHLCV.timeframe == TimeFrame.M15))
+            .group_by(OHLCV.symbol)
+            .all()
+        )
 
-                if latest_candle:
-                    # Fetch candles from latest timestamp to now
-                    start_date = latest_candle.timestamp
-                    end_date = datetime.utcnow()
+        # Fetch candles and market metrics for all pairs concurrently
+        end_date = datetime.utcnow()
+        start_dates = {
+            symbol: latest_by_symbol[symbol]
+            for symbol in TRACKED_PAIRS
+            if symbol in latest_by_symbol
+        }
+        for symbol, start_date in start_dates.items():
+            logger.info(f"Updating {symbol} candles from {start_date} to {end_date}")
+        fetched = service.fetch_latest_many(start_dates, "15m", end_date, limit=100)
+
+        frames = {}
+        metrics_entries = []
+        for symbol in start_dates:
+            outcome = fetched.get(symbol)
+            if isinstance(outcome, Exception):
+                logger.error(f"Error updating {symbol}: {outcome}")
+                continue
+            df = outcome["candles"]
+            if df.empty:
+                continue
 
-                    logger.info(f"Updating {symbol} candles from {start_date} to {end_date}")
+            metrics_timestamp = df["timestamp"].max()
+            if hasattr(metrics_timestamp, "to_pydatetime"):
+                metrics_timestamp = metrics_timestamp.to_pydatetime()
 
-                    df = service.client.fetch_ohlcv_range(
-                        symbol=symbol,
-                        timeframe='15m',
-                        start_date=start_date,
-                        end_date=end_date,
-                        limit=100
-                    )
+            frames[symbol] = df
+            metrics_entries.append((symbol, metrics_timestamp, outcome["metrics"]))
+
+        # One bulk upsert per table for the whole cycle. Each commits on its own:
+        # stored candles still advance features and derived bars if the metrics fail
+        try:
+            service.upsert_ohlcv_many(TimeFrame.M15, frames)
+        except Exception as e:
+            logger.error(f"Error writing latest candles for {len(frames)} symbols: {e}")
+            frames = {}
+        try:
+            service.upsert_market_metrics_many(metrics_entries)
+        except Exception as e:
+            logger.error(f"Error writing market metrics for {len(metrics_entries)} symbols: {e}")
 
-                    if not df.empty:
-                        service._upsert_ohlcv(symbol, TimeFrame.M15, df)
+        for symbol, metrics_timestamp, market_metrics in metrics_entries:
+            if symbol not in frames:
+                continue
+            df = frames[symbol]
+            try:
+                if feature_store is not None and feature_store.is_available():
+                    # Only candles whose 15m bucket has finished are final
+                    current_bucket = pd.Timestamp(end_date).floor("15min")
+                    advance_streaming_features(
+                        feature_store,
+                        symbol,
+                        TimeFrame.M15.value,
+                        df,
+                        market_metrics=dict(market_metrics, timestamp=metrics_timestamp),
+                        closed_before=current_bucket,
+                    )
+            except Exception as e:
+                logger.error(f"Error advancing streaming features for {symbol}: {e}")
 
-                        metrics_timestamp = df['timestamp'].max()
-                        if hasattr(metrics_timestamp, 'to_pydatetime'):
-                            metrics_timestamp = metrics_timestamp.to_pydatetime()
+            logger.info(f"Updated {len(df)} latest candles for {symbol} 15m")
+            total_updated += len(df)
 
-                        market_metrics = service.collect_market_metrics(symbol)
-                        service.upsert_market_metrics(symbol, metrics_timestamp, market_metrics)
+        derived_updated = {}
+        if settings.RESAMPLING_ENABLED and frames:
+            try:
+                # 1h/4h/1d follow the 15m series locally instead of being downloaded
+                derived_updated = update_derived_bars(db, symbols=list(frames), as_of=end_date)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Error deriving higher timeframes: {e}")
 
-                        logger.info(f"Updated {len(df)} latest candles for {symbol} 15m")
-                        total_updated += len(df)
-                else:
-                    # No candles exist - trigger initial backfill
-                    logger.info(f"No candles for {symbol}, triggering initial backfill")
+        for symbol in TRACKED_PAIRS:
+            if symbol in latest_by_symbol:
+                continue
+            try:
+                # No candles exist - trigger initial backfill
+                logger.info(f"No candles for {symbol}, triggering initial backfill")
 
-                    # Get earliest available date from exchange
-                    earliest_dt = service.client.get_earliest_timestamp(symbol, '15m')
-                    if not earliest_dt:
-                        earliest_dt = datetime(2020, 1, 1)  # Fallback to 2020
+                # Get earliest available date from exchange
+                earliest_dt = service.client.get_earliest_timestamp(symbol, "15m")
+                if not earliest_dt:
+                    earliest_dt = datetime(2020, 1, 1)  # Fallback to 2020
 
-                    end_date = datetime.utcnow()
+                end_date = datetime.utcnow()
 
-                    # Create and execute backfill job
-                    job = service.create_backfill_job(
-                        symbol=symbol,
-                        timeframe=TimeFrame.M15,
-                        start_date=earliest_dt,
-                        end_date=end_date
-                    )
+                # Create and execute backfill job
+                job = service.create_backfill_job(
+                    symbol=symbol,
+                    timeframe=TimeFrame.M15,
+                    start_date=earliest_dt,
+                    end_date=end_date,
+                )
 
-                    # Trigger async backfill
-                    execute_backfill_task.delay(job.job_id)
-                    backfills_triggered += 1
-                    logger.info(f"Triggered backfill job {job.job_id} for {symbol}")
+                # Trigger async backfill
+                execute_backfill_task.delay(job.job_id)
+                backfills_triggered += 1
+                logger.info(f"Triggered backfill job {job.job_id} for {symbol}")
 
             except Exception as e:
                 logger.error(f"Error updating {symbol}: {e}")
@@ -966,6 +1379,7 @@ def update_latest_candles_task():
         return {
             "status": "completed",
             "candles_updated": total_updated,
+            "derived_bars_updated": derived_updated,
             "backfills_triggered": backfills_triggered,
             "pairs_tracked": len(TRACKED_PAIRS)
         }
@@ -977,6 +1391,53 @@ def update_latest_candles_task():
         db.close()
 
 
+@celery_app.task(name="backfill.repair_gaps")
+def repair_gaps_task():
+    """
+    Scan new candles for gaps and queue repair jobs that refetch only the holes.
+
+    Pairs with a backfill still pending or running are skipped (and stay
+    unscanned) so the segments it has not written yet are not mistaken for
+    gaps.
+    """
+    db = SessionLocal()
+    try:
+        active = (
+            db.query(BackfillJob.symbol, BackfillJob.timeframe)
+            .filter(BackfillJob.status.in_(["pending", "running"]))
+            .distinct()
+            .all()
+        )
+
+        # The high-water marks and the repair jobs commit together: if job
+        # creation fails the marks stay put and the next scan finds the gaps again
+        gaps = scan_gaps(
+            db, exclude=[(symbol, timeframe) for symbol, timeframe in active], commit=False
+        )
+        jobs = BackfillService(db).create_repair_jobs(gaps, commit=False) if gaps else []
+        db.commit()
+        if not gaps:
+            return {"status": "completed", "gaps_found": 0, "repair_jobs": []}
+
+        for job in jobs:
+            execute_backfill_task.delay(job.job_id)
+
+        logger.info(f"Queued {len(jobs)} repair jobs for {len(gaps)} gaps")
+        return {
+            "status": "completed",
+            "gaps_found": len(gaps),
+            "missing_candles": sum(gap.missing_bars for gap in gaps),
+            "repair_jobs": [job.job_id for job in jobs],
+        }
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Gap repair task failed: {e}")
+        return {"status": "failed", "error": str(e)}
+    finally:
+        db.close()
+
+
 @celery_app.task(name="drift.monitor")
 def monitor_drift_task():
     """Monitor model drift (runs daily)"""
@@ -1597,7 +2058,10 @@ def auto_train_task():
             result = trainer.run_training_cycle(
                 symbol=symbol,
                 timeframe=timeframe,
-                quick_mode=quick_mode
+                quick_mode=quick_mode,
+                warm_start=settings.AUTO_TRAINING_WARM_START,
+                time_budget_hours=config.time_budget_hours if config else None,
+                budget_clock=config.budget_clock if config else None,
             )
 
             results.append(result)
@@ -1661,12 +2125,98 @@ def cleanup_performance_tracking_task():
     }
 
 
+@celery_app.task(name="maintenance.cleanup_checkpoints")
+def cleanup_training_checkpoints_task():
+    """
+    Delete fold checkpoints that no training job will resume.
+
+    A failed, cancelled or interrupted job keeps its checkpoint for
+    settings.TRAINING_CHECKPOINT_RETENTION_DAYS so a retry can resume it.
+    Directories no job points at (a run died between registering its model
+    and clearing its checkpoint) are removed after the same age.
+    """
+    from apps.api.db.models import TrainingJob
+
+    cutoff = datetime.utcnow() - timedelta(days=settings.TRAINING_CHECKPOINT_RETENTION_DAYS)
+    db = SessionLocal()
+    try:
+        deleted = []
+        expired = (
+            db.query(TrainingJob)
+            .filter(TrainingJob.checkpoint_path.isnot(None), TrainingJob.updated_at < cutoff)
+            .all()
+        )
+        for training_job in expired:
+            shutil.rmtree(training_job.checkpoint_path, ignore_errors=True)
+            deleted.append(training_job.checkpoint_path)
+            training_job.checkpoint_path = None
+        db.commit()
+
+        in_use = {
+            Path(path).resolve()
+            for (path,) in db.query(TrainingJob.checkpoint_path).filter(
+                TrainingJob.checkpoint_path.isnot(None)
+            )
+        }
+        root = Path(settings.TRAINING_CHECKPOINT_DIR)
+        if root.is_dir():
+            for directory in root.iterdir():
+                if (
+                    directory.is_dir()
+                    and directory.resolve() not in in_use
+                    and datetime.utcfromtimestamp(directory.stat().st_mtime) < cutoff
+                ):
+                    shutil.rmtree(directory, ignore_errors=True)
+                    deleted.append(str(directory))
+
+        logger.info(f"Deleted {len(deleted)} stale training checkpoints")
+        return {"status": "completed", "deleted": deleted}
+
+    except Exception as e:
+        logger.error(f"Checkpoint cleanup failed: {e}")
+        db.rollback()
+        return {"status": "failed", "error": str(e)}
+    finally:
+        db.close()
+
+
+@celery_app.task(name="maintenance.build_archive")
+def build_archive_task(verify: bool = True, repair: bool = True):
+    """
+    Export finalized months of market data to the Parquet archive.
+
+    Runs daily; only months that are new or whose row count changed are
+    written. With ``verify`` every archived month is then checked against its
+    file and the database, and mismatches are re-exported when ``repair`` is set.
+    """
+    if not settings.ARCHIVE_ENABLED:
+        return {"status": "skipped", "reason": "archive disabled"}
+
+    db = SessionLocal()
+    try:
+        archive = get_archive()
+        result = {"status": "completed", "build": archive.build(db)}
+        if verify:
+            result["verify"] = archive.verify(db, repair=repair)
+        return result
+
+    except Exception as e:
+        logger.error(f"Archive build failed: {e}")
+        return {"status": "failed", "error": str(e)}
+    finally:
+        db.close()
+
+
 # Celery beat schedule (for periodic tasks)
 celery_app.conf.beat_schedule = {
     'update-latest-candles-every-5-minutes': {
         'task': 'backfill.update_latest',
         'schedule': 300.0,  # 5 minutes
     },
+    "repair-gaps-every-15-minutes": {
+        "task": "backfill.repair_gaps",
+        "schedule": 900.0,  # 15 minutes
+    },
     'generate-signals-every-15-minutes': {
         'task': 'signals.generate',
         'schedule': 900.0,  # 15 minutes
@@ -1687,4 +2237,12 @@ celery_app.conf.beat_schedule = {
         'task': 'maintenance.cleanup',
         'schedule': 86400.0,  # 1 day
     },
+    "cleanup-training-checkpoints-daily": {
+        "task": "maintenance.cleanup_checkpoints",
+        "schedule": 86400.0,  # 1 day
+    },
+    "build-market-archive-daily": {
+        "task": "maintenance.build_archive",
+        "schedule": 86400.0,  # 1 day
+    },
 }
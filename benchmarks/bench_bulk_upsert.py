@@ -0,0 +1,95 @@
+"""
+Benchmark the OHLCV bulk write paths (COPY staging merge vs multi-row INSERT).
+
+Usage:
+    python -m benchmarks.bench_bulk_upsert [--rows 100000] [--database-url URL]
+
+The COPY path needs PostgreSQL with psycopg2; on other databases (the
+default is an in-memory SQLite) only the statement path is measured.
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from apps.api.db.base import Base
+from apps.api.db.models import OHLCV, TimeFrame
+from apps.ml.market_data import PRICE_COLUMNS, bulk_upsert
+
+SYMBOL = "BENCH/USDT"
+
+
+def _batch(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, rows)))
+    return pd.DataFrame(
+        {
+            "symbol": SYMBOL,
+            "timeframe": TimeFrame.M15,
+            "timestamp": pd.date_range(datetime(2020, 1, 1), periods=rows, freq="15min"),
+            "open": close,
+            "high": close * 1.001,
+            "low": close * 0.999,
+            "close": close,
+            "volume": rng.random(rows) * 100,
+            "created_at": datetime.utcnow(),
+        }
+    )
+
+
+def _timed_upsert(session, batch: pd.DataFrame, method: str) -> float:
+    start = time.perf_counter()
+    bulk_upsert(
+        session,
+        OHLCV.__table__,
+        batch,
+        conflict_columns=["symbol", "timeframe", "timestamp"],
+        update_columns=PRICE_COLUMNS,
+        method=method,
+    )
+    session.commit()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--database-url", default="sqlite:///:memory:")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine, tables=[OHLCV.__table__])
+    session = sessionmaker(bind=engine)()
+
+    methods = ["statement"]
+    if engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2":
+        methods.insert(0, "copy")
+
+    print(f"rows={args.rows} backend={engine.dialect.name}/{engine.dialect.driver}")
+    for method in methods:
+        session.execute(delete(OHLCV).where(OHLCV.symbol == SYMBOL))
+        session.commit()
+
+        insert_s = _timed_upsert(session, _batch(args.rows, seed=1), method)
+        # Same keys again: every row takes the ON CONFLICT DO UPDATE branch
+        update_s = _timed_upsert(session, _batch(args.rows, seed=2), method)
+        print(
+            f"{method:>9}: insert {args.rows / insert_s:,.0f} rows/s ({insert_s:.2f}s), "
+            f"update {args.rows / update_s:,.0f} rows/s ({update_s:.2f}s)"
+        )
+
+    if "copy" not in methods:
+        print("     copy: skipped (requires PostgreSQL with psycopg2)")
+
+    session.execute(delete(OHLCV).where(OHLCV.symbol == SYMBOL))
+    session.commit()
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
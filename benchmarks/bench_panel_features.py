@@ -0,0 +1,69 @@
+"""
+Benchmark panel feature computation against one compute_all_features call per symbol.
+
+Usage:
+    python -m benchmarks.bench_panel_features [--symbols 12] [--bars 250]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from apps.ml.features import FeatureEngineering
+from apps.ml.panel_features import FeaturePanel
+
+
+def _candles(bars: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, bars)))
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-01-01", periods=bars, freq="15min"),
+            "open": close * (1 + rng.normal(0, 0.001, bars)),
+            "high": close * (1 + rng.random(bars) * 0.004),
+            "low": close * (1 - rng.random(bars) * 0.004),
+            "close": close,
+            "volume": rng.random(bars) * 50 + 1,
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=12)
+    parser.add_argument("--bars", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = {f"SYM{i}/USDT": _candles(args.bars, i) for i in range(args.symbols)}
+    engineering = FeatureEngineering()
+
+    # Warm up JIT compilation so it is not counted in the timings
+    engineering.compute_panel_features(FeaturePanel.from_frames(frames)).frames()
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        expected = {
+            symbol: engineering.compute_all_features(frame) for symbol, frame in frames.items()
+        }
+    per_symbol_s = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        result = engineering.compute_panel_features(FeaturePanel.from_frames(frames)).frames()
+    panel_s = (time.perf_counter() - start) / args.repeat
+
+    for symbol, frame in expected.items():
+        pd.testing.assert_frame_equal(result[symbol], frame)
+
+    print(f"symbols={args.symbols} bars={args.bars}")
+    print(
+        f"per symbol {per_symbol_s * 1000:.0f} ms, panel {panel_s * 1000:.0f} ms "
+        f"({per_symbol_s / panel_s:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
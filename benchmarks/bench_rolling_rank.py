@@ -0,0 +1,59 @@
+"""
+Benchmark the rolling percentile-rank/quantile primitives against pandas.
+
+Usage:
+    python -m benchmarks.bench_rolling_rank [--bars 100000] [--window 100]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from apps.ml.features import NUMBA_AVAILABLE, rolling_percentile_rank, rolling_quantile
+
+
+def _legacy_rank(series: pd.Series, window: int) -> pd.Series:
+    return series.rolling(window).apply(
+        lambda x: pd.Series(x).rank(pct=True).iloc[-1] if len(x) > 0 else 0.5
+    )
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, default=100_000)
+    parser.add_argument("--window", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    series = pd.Series(rng.lognormal(mean=3.0, sigma=0.8, size=args.bars))
+
+    # Warm up JIT compilation so it is not counted in the timings
+    rolling_percentile_rank(series.iloc[: args.window * 2], args.window)
+    rolling_quantile(series.iloc[: args.window * 2], args.window, 0.3)
+
+    print(f"bars={args.bars} window={args.window} numba={NUMBA_AVAILABLE}")
+
+    fast_rank, fast_rank_s = _timed(rolling_percentile_rank, series, args.window)
+    legacy_rank, legacy_rank_s = _timed(_legacy_rank, series, args.window)
+    assert np.array_equal(fast_rank.to_numpy(), legacy_rank.to_numpy(), equal_nan=True)
+    print(
+        f"percentile rank: rolling.apply {legacy_rank_s:.2f}s, "
+        f"kernel {fast_rank_s:.3f}s ({legacy_rank_s / fast_rank_s:.0f}x)"
+    )
+
+    fast_q, fast_q_s = _timed(rolling_quantile, series, args.window, 0.3)
+    legacy_q, legacy_q_s = _timed(lambda s: s.rolling(args.window).quantile(0.3), series)
+    assert np.array_equal(fast_q.to_numpy(), legacy_q.to_numpy(), equal_nan=True)
+    print(f"quantile(0.30): rolling.quantile {legacy_q_s:.3f}s, kernel {fast_q_s:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark expanding-window fold training with shared bins against per-fold binning.
+
+Each mode runs in a fresh process so its peak RSS is reported separately.
+
+Usage:
+    python -m benchmarks.bench_shared_bins [--rows 200000] [--features 80] [--folds 12]
+"""
+
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from apps.ml.fold_executor import build_shared_bins, train_fold_xy
+from apps.ml.training_data import peak_rss_bytes
+
+_MODEL_PARAMS = {
+    "lgbm_params": {
+        "objective": "binary",
+        "metric": "auc",
+        "num_leaves": 31,
+        "learning_rate": 0.1,
+        "verbose": -1,
+    },
+    "xgb_params": {
+        "objective": "binary:logistic",
+        "eval_metric": "auc",
+        "max_depth": 6,
+        "learning_rate": 0.1,
+        "tree_method": "hist",
+        "verbosity": 0,
+    },
+}
+
+
+def _data(rows: int, features: int, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        rng.normal(size=(rows, features)).astype(np.float32),
+        columns=[f"f{i}" for i in range(features)],
+    )
+    y = pd.Series((X["f0"] + rng.normal(scale=1.0, size=rows) > 0.5).astype(np.int8))
+    return X, y
+
+
+def _run(rows: int, features: int, folds: int, shared: bool):
+    X, y = _data(rows, features)
+    test_rows = rows // (folds + 2)
+    first_train = rows - folds * test_rows
+
+    start = time.perf_counter()
+    bins = None
+    if shared:
+        last_train = first_train + (folds - 1) * test_rows
+        bins = build_shared_bins(
+            X.iloc[:last_train], y.iloc[:last_train], model_params=_MODEL_PARAMS
+        )
+
+    aucs = []
+    for fold in range(folds):
+        train_stop = first_train + fold * test_rows
+        test_stop = train_stop + test_rows
+        split_result, _ = train_fold_xy(
+            X.iloc[:train_stop],
+            y.iloc[:train_stop],
+            X.iloc[train_stop:test_stop],
+            y.iloc[train_stop:test_stop],
+            0.55,
+            split_index=fold + 1,
+            total_splits=folds,
+            train_bounds=(0, train_stop),
+            test_bounds=(train_stop, test_stop),
+            model_params=_MODEL_PARAMS,
+            shared_bins=bins,
+            train_rows=(0, train_stop) if bins is not None else None,
+        )
+        aucs.append(split_result["oos_metrics"]["roc_auc"])
+
+    return time.perf_counter() - start, peak_rss_bytes(), float(np.mean(aucs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--features", type=int, default=80)
+    parser.add_argument("--folds", type=int, default=12)
+    args = parser.parse_args()
+
+    results = {}
+    for shared in (False, True):
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            results[shared] = pool.submit(
+                _run, args.rows, args.features, args.folds, shared
+            ).result()
+
+    print(f"rows={args.rows} features={args.features} folds={args.folds}")
+    for shared, label in ((False, "per-fold bins"), (True, "shared bins")):
+        elapsed, peak, auc = results[shared]
+        peak_mb = f"{peak / 1024 ** 2:.0f} MB" if peak else "n/a"
+        print(f"{label:14s} {elapsed:7.1f} s  peak RSS {peak_mb}  mean OOS AUC {auc:.4f}")
+    print(f"speedup {results[False][0] / results[True][0]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark the SuperTrend kernel against the per-row ``.iloc`` loop it replaced.
+
+Usage:
+    python -m benchmarks.bench_supertrend [--bars 3000] [--repeat 10]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from apps.ml.indicators import NUMBA_AVAILABLE, supertrend, true_range
+
+
+def _legacy_supertrend(df: pd.DataFrame, atr: pd.Series, multiplier: float = 3.0):
+    hl_avg = (df["high"] + df["low"]) / 2
+    upper_band = hl_avg + multiplier * atr
+    lower_band = hl_avg - multiplier * atr
+
+    line = pd.Series(index=df.index, dtype=float)
+    direction = pd.Series(index=df.index, dtype=int)
+    for i in range(1, len(df)):
+        if df["close"].iloc[i] > upper_band.iloc[i - 1]:
+            direction.iloc[i] = 1
+        elif df["close"].iloc[i] < lower_band.iloc[i - 1]:
+            direction.iloc[i] = -1
+        else:
+            direction.iloc[i] = direction.iloc[i - 1] if i > 0 else 0
+
+        if direction.iloc[i] == 1:
+            line.iloc[i] = lower_band.iloc[i]
+        else:
+            line.iloc[i] = upper_band.iloc[i]
+    return line, direction
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(4)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, args.bars)))
+    df = pd.DataFrame(
+        {
+            "high": close * (1 + rng.random(args.bars) * 0.004),
+            "low": close * (1 - rng.random(args.bars) * 0.004),
+            "close": close,
+        }
+    )
+    atr = true_range(df["high"], df["low"], df["close"]).rolling(14).mean()
+
+    # Warm up JIT compilation so it is not counted in the timings
+    supertrend(df["high"], df["low"], df["close"], atr)
+
+    print(f"bars={args.bars} numba={NUMBA_AVAILABLE}")
+
+    start = time.perf_counter()
+    legacy_line, _ = _legacy_supertrend(df, atr)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        line, _ = supertrend(df["high"], df["low"], df["close"], atr)
+    kernel_s = (time.perf_counter() - start) / args.repeat
+
+    assert np.array_equal(line.to_numpy(), legacy_line.to_numpy(), equal_nan=True)
+    print(
+        f"supertrend: .iloc loop {legacy_s * 1000:.1f} ms, "
+        f"kernel {kernel_s * 1000:.3f} ms ({legacy_s / kernel_s:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
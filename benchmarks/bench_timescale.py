@@ -0,0 +1,159 @@
+"""
+Benchmark OHLCV range reads on a plain table vs a compressed hypertable.
+
+Usage:
+    python -m benchmarks.bench_timescale --database-url postgresql://... [--symbols 10] [--years 4]
+
+Both layouts are built side by side in scratch schemas (``bench_plain`` and
+``bench_timescale``) with the same synthetic 15m history, then timed with the
+two read patterns that dominate the workload:
+
+* training: ``WalkForwardPipeline.fetch_ohlcv_data`` - one symbol, the last year
+* backtest: ``backtest._load_market_data`` - random few-day windows padded by 2 days
+
+The scratch schemas are dropped afterwards. The hypertable run is skipped
+when the database does not have the timescaledb extension.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from apps.api.db.base import Base
+from apps.api.db.models import OHLCV
+from apps.api.db.timescale import setup_hypertable, timescale_available
+from apps.ml.market_data import load_ohlcv
+
+LAYOUTS = ("bench_plain", "bench_timescale")
+
+
+def _engine(url: str, schema: str):
+    return create_engine(url, connect_args={"options": f"-csearch_path={schema},public"})
+
+
+def _seed(connection, symbols: int, start: datetime, end: datetime) -> int:
+    connection.execute(
+        text(
+            """
+        INSERT INTO ohlcv (symbol, timeframe, timestamp, open, high, low, close, volume, created_at)
+        SELECT 'SYM' || s || '/USDT', 'M15', ts,
+               100 + random(), 101 + random(), 99 + random(), 100 + random(), random() * 1000, now()
+        FROM generate_series(1, :symbols) AS s,
+             generate_series(CAST(:start AS timestamp), CAST(:end AS timestamp), INTERVAL '15 minutes') AS ts
+        """
+        ),
+        {"symbols": symbols, "start": start, "end": end},
+    )
+    return connection.execute(text("SELECT count(*) FROM ohlcv")).scalar()
+
+
+def _timed(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def _run_layout(url: str, schema: str, args, start: datetime, end: datetime):
+    admin = create_engine(url)
+    with admin.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+
+    engine = _engine(url, schema)
+    Base.metadata.create_all(engine, tables=[OHLCV.__table__])
+
+    with engine.begin() as connection:
+        if schema == "bench_timescale":
+            if not timescale_available(connection):
+                return None
+            setup_hypertable(connection, "ohlcv")
+        rows = _seed(connection, args.symbols, start, end)
+
+    with engine.begin() as connection:
+        if schema == "bench_timescale":
+            connection.execute(
+                text(
+                    "SELECT compress_chunk(c, if_not_compressed => TRUE) "
+                    "FROM show_chunks('ohlcv', older_than => CAST(:age AS interval)) c"
+                ),
+                {"age": f"{args.compress_after_days} days"},
+            )
+            size = connection.execute(text("SELECT hypertable_size('ohlcv')")).scalar()
+        else:
+            size = connection.execute(text("SELECT pg_total_relation_size('ohlcv')")).scalar()
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("VACUUM ANALYZE ohlcv"))
+
+    session = sessionmaker(bind=engine)()
+    rng = random.Random(7)
+
+    def _training():
+        load_ohlcv(session, "SYM1/USDT", "15m", start=end - timedelta(days=365), end=end)
+        session.rollback()
+
+    def _backtest():
+        window_start = start + timedelta(days=rng.uniform(0, (end - start).days - 5))
+        buffer = timedelta(days=2)
+        load_ohlcv(
+            session,
+            "SYM1/USDT",
+            "15m",
+            start=window_start - buffer,
+            end=window_start + timedelta(days=3) + buffer,
+        )
+        session.rollback()
+
+    result = {
+        "rows": rows,
+        "bytes": size,
+        "training_s": _timed(_training, args.repeats),
+        "backtest_s": _timed(_backtest, args.repeats * 10),
+    }
+    session.close()
+    engine.dispose()
+
+    with admin.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+    admin.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--years", type=float, default=4)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--compress-after-days", type=int, default=30)
+    args = parser.parse_args()
+
+    if not args.database_url.startswith("postgresql"):
+        parser.error("a PostgreSQL database is required")
+
+    end = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=365 * args.years)
+
+    print(f"symbols={args.symbols} years={args.years} repeats={args.repeats}")
+    for schema in LAYOUTS:
+        result = _run_layout(args.database_url, schema, args, start, end)
+        if result is None:
+            print(f"{schema:>16}: skipped (timescaledb extension not available)")
+            continue
+        print(
+            f"{schema:>16}: rows={result['rows']:,} size={result['bytes'] / 1024 ** 2:,.0f} MiB "
+            f"fetch_ohlcv_data(1y)={result['training_s'] * 1000:,.1f} ms "
+            f"_load_market_data(7d)={result['backtest_s'] * 1000:,.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
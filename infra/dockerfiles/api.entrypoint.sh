@@ -45,6 +45,12 @@ except Exception as exc:
     raise
 PY
 
+log "Converting market data tables to TimescaleDB hypertables (no-op on plain PostgreSQL)"
+
+DATABASE_URL="${DATABASE_URL:-postgresql://traderai:traderai@db:5432/traderai}" \
+ASYNC_DATABASE_URL="${ASYNC_DATABASE_URL:-postgresql+asyncpg://traderai:traderai@db:5432/traderai}" \
+python -m apps.api.db.timescale
+
 log "Stamping Alembic revision to head"
 
 DATABASE_URL="${DATABASE_URL:-postgresql://traderai:traderai@db:5432/traderai}" \
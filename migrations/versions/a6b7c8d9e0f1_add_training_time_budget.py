@@ -0,0 +1,47 @@
+"""add training time budget columns
+
+Revision ID: a6b7c8d9e0f1
+Revises: f5a6b7c8d9e0
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a6b7c8d9e0f1"
+down_revision: Union[str, None] = "f5a6b7c8d9e0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Budget a job ran under and the per-fold training time it achieved
+    op.add_column("training_jobs", sa.Column("time_budget_seconds", sa.Float(), nullable=True))
+    op.add_column("training_jobs", sa.Column("budget_clock", sa.String(length=10), nullable=True))
+    op.add_column("training_jobs", sa.Column("avg_fold_seconds", sa.Float(), nullable=True))
+    op.add_column(
+        "training_jobs",
+        sa.Column("budget_exhausted", sa.Boolean(), nullable=True, server_default=sa.text("false")),
+    )
+    op.add_column(
+        "training_jobs",
+        sa.Column("budget_skipped_folds", sa.Integer(), nullable=True, server_default="0"),
+    )
+    # Budget given to every auto-training job
+    op.add_column("auto_training_config", sa.Column("time_budget_hours", sa.Float(), nullable=True))
+    op.add_column(
+        "auto_training_config", sa.Column("budget_clock", sa.String(length=10), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("auto_training_config", "budget_clock")
+    op.drop_column("auto_training_config", "time_budget_hours")
+    op.drop_column("training_jobs", "budget_skipped_folds")
+    op.drop_column("training_jobs", "budget_exhausted")
+    op.drop_column("training_jobs", "avg_fold_seconds")
+    op.drop_column("training_jobs", "budget_clock")
+    op.drop_column("training_jobs", "time_budget_seconds")
@@ -0,0 +1,26 @@
+"""add the fold task group id to training jobs
+
+Revision ID: b7c8d9e0f1a2
+Revises: a6b7c8d9e0f1
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7c8d9e0f1a2"
+down_revision: Union[str, None] = "a6b7c8d9e0f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Celery group of a distributed job's fold tasks, revoked when the job is cancelled
+    op.add_column("training_jobs", sa.Column("fold_group_id", sa.String(length=50), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("training_jobs", "fold_group_id")
@@ -0,0 +1,48 @@
+"""add gap repair jobs and gap scan state
+
+Revision ID: d3e4f5a6b7c8
+Revises: c2d3e4f5a6b7
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d3e4f5a6b7c8"
+down_revision: Union[str, None] = "c2d3e4f5a6b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 'backfill' jobs fetch a date range, 'repair' jobs only the gaps found by the scanner
+    op.add_column(
+        "backfill_jobs",
+        sa.Column("job_type", sa.String(length=20), nullable=False, server_default="backfill"),
+    )
+
+    # High-water mark of the incremental gap scan
+    op.create_table(
+        "gap_scan_state",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(length=20), nullable=False),
+        sa.Column(
+            "timeframe",
+            sa.Enum("M1", "M5", "M15", "H1", "H4", "D1", name="timeframe", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("scanned_until", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("symbol", "timeframe", name="uq_gap_scan_state_symbol_tf"),
+    )
+    op.create_index(op.f("ix_gap_scan_state_id"), "gap_scan_state", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_gap_scan_state_id"), table_name="gap_scan_state")
+    op.drop_table("gap_scan_state")
+    op.drop_column("backfill_jobs", "job_type")
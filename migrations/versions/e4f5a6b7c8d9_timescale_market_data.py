@@ -0,0 +1,81 @@
+"""timescale hypertables and compression for market data
+
+Revision ID: e4f5a6b7c8d9
+Revises: d3e4f5a6b7c8
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4f5a6b7c8d9"
+down_revision: Union[str, None] = "d3e4f5a6b7c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> compress_segmentby; both are chunked by timestamp
+HYPERTABLES = {
+    "ohlcv": "symbol, timeframe",
+    "market_metrics": "symbol",
+}
+CHUNK_INTERVAL = "7 days"
+COMPRESS_AFTER = "30 days"
+
+
+def _timescale_installed(bind) -> bool:
+    return bool(
+        bind.execute(sa.text("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")).scalar()
+    )
+
+
+def upgrade() -> None:
+    # No-op on plain PostgreSQL: the tables keep their B-tree indexes
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    available = bind.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'")
+    ).scalar()
+    if not available:
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+
+    for table, segment_by in HYPERTABLES.items():
+        compression = bind.execute(
+            sa.text(
+                "SELECT compression_enabled FROM timescaledb_information.hypertables "
+                "WHERE hypertable_name = :table AND hypertable_schema = current_schema()"
+            ),
+            {"table": table},
+        ).first()
+        if compression is None:
+            # Hypertables need the time column in every unique constraint, the primary key included
+            op.execute(
+                f"ALTER TABLE {table} DROP CONSTRAINT {table}_pkey, ADD PRIMARY KEY (id, timestamp)"
+            )
+            op.execute(
+                f"SELECT create_hypertable('{table}', 'timestamp', "
+                f"chunk_time_interval => INTERVAL '{CHUNK_INTERVAL}', migrate_data => TRUE)"
+            )
+        if compression is None or not compression[0]:
+            op.execute(
+                f"ALTER TABLE {table} SET (timescaledb.compress, "
+                f"timescaledb.compress_segmentby = '{segment_by}', "
+                f"timescaledb.compress_orderby = 'timestamp DESC')"
+            )
+        op.execute(
+            f"SELECT add_compression_policy('{table}', INTERVAL '{COMPRESS_AFTER}', "
+            f"if_not_exists => TRUE)"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql" or not _timescale_installed(bind):
+        return
+    # Hypertables cannot be turned back into plain tables in place; only the policies are removed
+    for table in HYPERTABLES:
+        op.execute(f"SELECT remove_compression_policy('{table}', if_exists => TRUE)")
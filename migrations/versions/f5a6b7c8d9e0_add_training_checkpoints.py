@@ -0,0 +1,37 @@
+"""add fold checkpoint and resume columns to training jobs
+
+Revision ID: f5a6b7c8d9e0
+Revises: e4f5a6b7c8d9
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f5a6b7c8d9e0"
+down_revision: Union[str, None] = "e4f5a6b7c8d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Directory of the job's per-fold checkpoint (cleared once the model is registered)
+    op.add_column(
+        "training_jobs", sa.Column("checkpoint_path", sa.String(length=255), nullable=True)
+    )
+    # Interrupted job whose checkpoint this job picked up, and the folds it restored
+    op.add_column(
+        "training_jobs", sa.Column("resumed_from_job_id", sa.String(length=50), nullable=True)
+    )
+    op.add_column(
+        "training_jobs", sa.Column("resumed_folds", sa.Integer(), nullable=True, server_default="0")
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("training_jobs", "resumed_folds")
+    op.drop_column("training_jobs", "resumed_from_job_id")
+    op.drop_column("training_jobs", "checkpoint_path")
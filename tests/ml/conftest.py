@@ -0,0 +1,291 @@
+import copy
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+import ccxt
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import apps.ml.training as training
+from apps.api.db.base import Base
+from apps.ml.training import WalkForwardPipeline
+
+# Small, conflict-free booster settings so each fold trains in well under a second
+MODEL_PARAMS = {
+    "lgbm_params": {
+        "objective": "binary",
+        "metric": "auc",
+        "num_leaves": 15,
+        "learning_rate": 0.1,
+        "min_child_samples": 20,
+        "deterministic": True,
+        "verbose": -1,
+    },
+    "xgb_params": {
+        "objective": "binary:logistic",
+        "eval_metric": "auc",
+        "max_depth": 4,
+        "learning_rate": 0.1,
+        "tree_method": "hist",
+        "verbosity": 0,
+    },
+}
+
+
+def make_prepared_frame(
+    days: int = 75, seed: int = 7, flag: bool = False, prices: bool = False
+) -> pd.DataFrame:
+    """
+    Hourly features and labels, ready for fold training.
+
+    ``feat_signal`` predicts ``label``; ``feat_noise`` (and ``feat_flag`` with
+    ``flag``) carry nothing. ``prices`` adds constant OHLCV columns.
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2024-01-01", periods=days * 24, freq="1h")
+    n = len(timestamps)
+    signal = rng.normal(size=n)
+    df = pd.DataFrame({"timestamp": timestamps})
+    if prices:
+        df = df.assign(open=100.0, high=101.0, low=99.0, close=100.0, volume=1.0)
+    df["feat_signal"] = signal
+    df["feat_noise"] = rng.normal(size=n)
+    if flag:
+        df["feat_flag"] = (rng.random(n) > 0.5).astype(int)
+    df["label"] = ((signal + rng.normal(scale=0.8, size=n)) > 0.3).astype(int)
+    return df
+
+
+def make_candles(
+    n: int, start: str = "2024-01-01", freq: str = "15min", seed: int = 0
+) -> pd.DataFrame:
+    """
+    Random-walk OHLCV candles.
+
+    Each bar opens at the previous close; high and low enclose open and close.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    open_ = np.r_[close[:1], close[:-1]]
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range(start, periods=n, freq=freq),
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + rng.random(n) * 0.004),
+            "low": np.minimum(open_, close) * (1 - rng.random(n) * 0.004),
+            "close": close,
+            "volume": rng.uniform(1, 50, n),
+        }
+    )
+
+
+STEP_MS = 15 * 60 * 1000
+
+
+def to_ms(dt: datetime) -> int:
+    """Exchange timestamp (milliseconds) of a naive datetime."""
+    return int(dt.timestamp() * 1000)
+
+
+class FakeExchange:
+    """
+    In-process stand-in for a CCXT exchange serving a synthetic 15m series.
+
+    Bars run from ``start`` (default: wherever ``since`` asks) to ``end``
+    (default: the last bar closed before now). Bars listed in ``missing`` are
+    left out of every page, and a page requested at a ``since`` listed in
+    ``failing`` raises a network error. Each call sleeps ``latency`` seconds
+    and counts towards ``max_in_flight``; ``requests`` records the
+    (since, limit) of every fetch_ohlcv call.
+    """
+
+    rateLimit = 0
+
+    def __init__(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        latency: float = 0.0,
+        missing: Iterable[datetime] = (),
+        failing: Iterable[datetime] = (),
+    ):
+        self.start = start
+        self.end = end
+        self.latency = latency
+        self.missing = {to_ms(ts) for ts in missing}
+        self.failing = {to_ms(ts) for ts in failing}
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=1000):
+        with self._lock:
+            self.requests.append((since, limit))
+        self._enter()
+        if since in self.failing:
+            raise ccxt.NetworkError(f"fetch_ohlcv {symbol} since {since} failed")
+
+        first = since if self.start is None else max(since or 0, to_ms(self.start))
+        if first is None:
+            return []
+        first += (-first) % STEP_MS
+        if self.end is not None:
+            end = to_ms(self.end)
+        else:
+            # Only bars that have closed
+            end = to_ms(datetime.utcnow()) - STEP_MS
+        last = min(first + (limit - 1) * STEP_MS, end)
+        return [
+            [ts, 100.0, 101.0, 99.0, 100.5, 10.0]
+            for ts in range(first, last + 1, STEP_MS)
+            if ts not in self.missing
+        ]
+
+    def fetch_funding_rate(self, symbol):
+        self._enter()
+        return {"fundingRate": 0.0001}
+
+    def fetch_open_interest(self, symbol):
+        self._enter()
+        return {"openInterest": 1000.0}
+
+    def fetch_order_book(self, symbol, limit=20):
+        self._enter()
+        return {"bids": [[100.0, 1.0]], "asks": [[100.1, 1.0]]}
+
+
+class FakeRegistry:
+    """Model registry that accepts every model without writing anything."""
+
+    def register_model(self, **kwargs):
+        return "v-test"
+
+    def get_model(self, *args, **kwargs):
+        return None
+
+    def deploy_model(self, *args, **kwargs):
+        return True
+
+
+class CountingModel:
+    """
+    Stand-in for EnsembleModel that counts loads and records predictions.
+
+    ``predict_proba`` appends (path, rows) to ``calls`` and scores each row from
+    its ``volume``, so stacked and single-row inference can be compared.
+    """
+
+    loads = 0
+    calls = []
+
+    def __init__(self):
+        self.feature_names = ["ema_21", "rsi_14", "atr_14", "volume"]
+
+    def load(self, path):
+        type(self).loads += 1
+        self.path = path
+        artifact = Path(path) / "lgbm_model.txt"
+        self.payload = artifact.read_text() if artifact.exists() else None
+
+    def predict_proba(self, X):
+        type(self).calls.append((self.path, len(X)))
+        return (0.5 + (X["volume"] % 40) / 100).to_numpy()
+
+
+@pytest.fixture()
+def engine():
+    """Fresh in-memory SQLite database with every table created."""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture()
+def session(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture()
+def model_params():
+    return copy.deepcopy(MODEL_PARAMS)
+
+
+@pytest.fixture()
+def counting_model():
+    """CountingModel with its load and prediction counters reset."""
+    CountingModel.loads = 0
+    CountingModel.calls = []
+    return CountingModel
+
+
+@pytest.fixture()
+def prepared_frame():
+    """Factory of synthetic prepared frames (see ``make_prepared_frame``)."""
+    return make_prepared_frame
+
+
+@pytest.fixture()
+def fake_registry(monkeypatch):
+    """Keep trained models out of the real registry."""
+    monkeypatch.setattr(training, "ModelRegistry", FakeRegistry)
+    return FakeRegistry
+
+
+@pytest.fixture()
+def synthetic_pipeline(fake_registry, model_params):
+    """
+    WalkForwardPipeline class that trains small boosters on a synthetic frame.
+
+    Instances serve ``prepared`` (the default prepared frame if omitted) as
+    already-prepared features, so every run skips data loading, feature
+    computation and the feature cache. Keyword arguments the caller leaves out
+    get one single-threaded fold worker, 10-day test periods and 30 days of
+    minimum training data. The class can also stand in for
+    ``training.WalkForwardPipeline`` where a task builds the pipeline itself.
+    """
+    default_frame = make_prepared_frame()
+
+    class SyntheticPipeline(WalkForwardPipeline):
+        def __init__(self, prepared: Optional[pd.DataFrame] = None, **kwargs):
+            kwargs.setdefault("model_params", model_params)
+            kwargs.setdefault("threads_per_worker", 1)
+            kwargs.setdefault("fold_workers", 1)
+            kwargs.setdefault("test_period_days", 10)
+            kwargs.setdefault("min_train_days", 30)
+            super().__init__(**kwargs)
+            self.feature_cache = None
+            self.prepared = default_frame if prepared is None else prepared
+
+        def fetch_ohlcv_data(self, *args, **kwargs):
+            return self.prepared
+
+        def fetch_market_metrics(self, *args, **kwargs):
+            return pd.DataFrame()
+
+        def prepare_features_and_labels(self, df, **kwargs):
+            return df
+
+    return SyntheticPipeline
@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import insert, update
+
+from apps.api.config import settings
+from apps.api.db.models import OHLCV, MarketMetrics, TimeFrame
+from apps.ml import archive as archive_module
+from apps.ml.archive import MarketDataArchive, load_market_metrics, load_ohlcv_history
+from apps.ml.backfill import BackfillService
+from apps.ml.market_data import load_ohlcv
+
+START = datetime(2024, 1, 1)
+BARS = 60 * 96  # January and February
+NOW = datetime(2024, 3, 5)  # January is finalized, February is not (7 day settling period)
+
+
+@pytest.fixture()
+def session(session):
+    rng = np.random.default_rng(3)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, BARS)))
+
+    session.execute(
+        insert(OHLCV),
+        [
+            {
+                "symbol": "BTC/USDT",
+                "timeframe": TimeFrame.M15,
+                "timestamp": START + timedelta(minutes=15 * i),
+                "open": close[i],
+                "high": close[i] * 1.002,
+                "low": close[i] * 0.998,
+                "close": close[i],
+                "volume": 1.0 + i,
+            }
+            for i in range(BARS)
+            if i != 100
+        ],
+    )
+    session.execute(
+        insert(MarketMetrics),
+        [
+            {
+                "symbol": "BTC/USDT",
+                "timestamp": START + timedelta(hours=8 * i),
+                "funding_rate": 0.0001 * i,
+                "open_interest": None if i % 5 == 0 else 1e6 + i,
+                "spread_bps": 1.5,
+            }
+            for i in range(180)
+        ],
+    )
+    session.commit()
+    return session
+
+
+def test_reads_go_to_the_database_when_disabled(session, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_ENABLED", False)
+    assert archive_module.get_archive() is None
+
+    df = load_ohlcv_history(session, "BTC/USDT", "15m", start=START, end=START + timedelta(days=3))
+    pd.testing.assert_frame_equal(
+        df, load_ohlcv(session, "BTC/USDT", "15m", start=START, end=START + timedelta(days=3))
+    )
+
+
+def test_enabled_archive_without_pyarrow_fails_loudly(session, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_ENABLED", True)
+    monkeypatch.setattr(archive_module, "PYARROW_AVAILABLE", False)
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        load_ohlcv_history(session, "BTC/USDT", "15m", start=START, end=START + timedelta(days=3))
+
+
+def test_build_archives_finalized_months_and_stitches_the_tail(session, tmp_path):
+    pytest.importorskip("pyarrow")
+    archive = MarketDataArchive(str(tmp_path), min_age_days=7)
+
+    report = archive.build(session, now=NOW)
+    assert report == {"exported": 2, "rows": 96 * 31 - 1 + 93, "up_to_date": 0}
+    assert (tmp_path / "ohlcv" / "BTC_USDT" / "15m" / "2024-01.parquet").exists()
+    assert (tmp_path / "market_metrics" / "BTC_USDT" / "2024-01.parquet").exists()
+    assert list(archive.archived_months("ohlcv", "BTC/USDT", TimeFrame.M15)) == ["2024-01"]
+
+    # A range spanning the archived month and the live tail matches a database read exactly
+    for start, end in [
+        (START + timedelta(days=10), datetime(2024, 2, 10)),
+        (None, None),
+        (START, START + timedelta(days=2)),
+    ]:
+        pd.testing.assert_frame_equal(
+            archive.load_ohlcv(session, "BTC/USDT", "15m", start=start, end=end),
+            load_ohlcv(session, "BTC/USDT", "15m", start=start, end=end),
+        )
+    pd.testing.assert_frame_equal(
+        archive.load_market_metrics(
+            session, "BTC/USDT", start=datetime(2024, 1, 20), end=datetime(2024, 2, 20)
+        ),
+        load_market_metrics(
+            session, "BTC/USDT", start=datetime(2024, 1, 20), end=datetime(2024, 2, 20)
+        ),
+    )
+
+    # Archived rows come from disk: the database is only asked for the tail
+    session.execute(update(OHLCV).where(OHLCV.timestamp < datetime(2024, 1, 2)).values(close=0.0))
+    archived = archive.load_ohlcv(session, "BTC/USDT", "15m", start=START, end=datetime(2024, 2, 1))
+    assert (archived["close"] > 0).all()
+    session.rollback()
+
+    assert archive.build(session, now=NOW) == {"exported": 0, "rows": 0, "up_to_date": 2}
+
+
+def test_changed_months_are_reexported_and_verified(session, tmp_path):
+    pytest.importorskip("pyarrow")
+    archive = MarketDataArchive(str(tmp_path), min_age_days=7)
+    archive.build(session, now=NOW)
+
+    # A gap repair fills the missing January bar
+    session.execute(
+        insert(OHLCV),
+        [
+            {
+                "symbol": "BTC/USDT",
+                "timeframe": TimeFrame.M15,
+                "timestamp": START + timedelta(minutes=15 * 100),
+                "open": 100.0,
+                "high": 101.0,
+                "low": 99.0,
+                "close": 100.0,
+                "volume": 1.0,
+            }
+        ],
+    )
+    session.commit()
+    assert archive.build(session, now=NOW)["exported"] == 1
+    assert archive.archived_months("ohlcv", "BTC/USDT", TimeFrame.M15)["2024-01"]["rows"] == 96 * 31
+
+    assert archive.verify(session) == {"checked": 2, "mismatched": [], "repaired": 0}
+
+    # Values rewritten without changing the row count are caught by the checksum
+    session.execute(update(OHLCV).where(OHLCV.timestamp == START).values(close=1.0))
+    session.commit()
+    report = archive.verify(session, repair=True)
+    assert report["mismatched"] == ["ohlcv/BTC/USDT/15m/2024-01"] and report["repaired"] == 1
+    assert archive.verify(session)["mismatched"] == []
+    assert archive.load_ohlcv(session, "BTC/USDT", "15m", end=START)["close"].tolist() == [1.0]
+
+    # Backfills drop the months they rewrote until the next build
+    assert archive.invalidate("ohlcv", "BTC/USDT", TimeFrame.M15, START, START) == ["2024-01"]
+    assert not (tmp_path / "ohlcv" / "BTC_USDT" / "15m" / "2024-01.parquet").exists()
+    assert len(archive.load_ohlcv(session, "BTC/USDT", "15m")) == BARS
+
+
+def test_market_metrics_writes_invalidate_archived_months(session, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(settings, "ARCHIVE_ENABLED", True)
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    archive = archive_module.get_archive()
+    archive.build(session, now=NOW)
+    assert list(archive.archived_months("market_metrics", "BTC/USDT")) == ["2024-01"]
+
+    BackfillService(session, client=MagicMock()).upsert_market_metrics(
+        "BTC/USDT", datetime(2024, 1, 10), {"funding_rate": 0.5, "spread_bps": 2.0}
+    )
+
+    assert archive.archived_months("market_metrics", "BTC/USDT") == {}
+    metrics = archive.load_market_metrics(
+        session, "BTC/USDT", start=datetime(2024, 1, 10), end=datetime(2024, 1, 10)
+    )
+    assert metrics["funding_rate"].tolist() == [0.5]
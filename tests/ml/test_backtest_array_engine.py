@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.api.db.models import Side
+from apps.ml import backtest
+from apps.ml.backtest import ArrayBacktester, Backtester, backtest_signals
+from tests.ml.conftest import make_candles
+
+
+def _signals(market_data, count=60, seed=9):
+    rng = np.random.default_rng(seed)
+    signals = []
+    for idx in range(count):
+        bar = int(rng.integers(0, len(market_data) + 20))
+        if bar < len(market_data):
+            ts = market_data["timestamp"].iloc[bar].to_pydatetime() - timedelta(minutes=5)
+            price = float(market_data["close"].iloc[bar])
+        else:
+            # Past the end of the data: no entry bar
+            ts = market_data["timestamp"].iloc[-1].to_pydatetime() + timedelta(hours=bar)
+            price = float(market_data["close"].iloc[-1])
+        side = Side.LONG if rng.random() < 0.5 else Side.SHORT
+        direction = 1 if side == Side.LONG else -1
+        move = price * float(rng.uniform(0.002, 0.01))
+        signal = {
+            "signal_id": f"sig-{idx}",
+            "symbol": "BTC/USDT",
+            "timestamp": ts,
+            "side": side,
+            "entry_price": price,
+            "sl_price": price - direction * move,
+            "tp1_price": price + direction * move * 0.8,
+            "tp2_price": price + direction * move * 1.6,
+            "tp3_price": price + direction * move * 2.5,
+            "tp1_pct": 30.0,
+            "tp2_pct": 40.0,
+            "tp3_pct": 30.0,
+            "quantity": 0.01,
+            "position_size_usd": price * 0.01,
+            "leverage": 5,
+        }
+        if idx % 3 == 0:
+            signal["atr"] = move * 0.5
+        signals.append(signal)
+    return signals
+
+
+def _normalize_trades(trades):
+    normalized = []
+    for trade in trades:
+        trade = dict(trade)
+        trade["exits"] = [
+            {**exit, "timestamp": pd.Timestamp(exit["timestamp"])} for exit in trade["exits"]
+        ]
+        trade["entry_timestamp"] = pd.Timestamp(trade["entry_timestamp"])
+        normalized.append(trade)
+    return normalized
+
+
+def test_array_engine_matches_row_backtester():
+    market_data = make_candles(1500, seed=5)
+    signals = _signals(market_data)
+
+    expected = Backtester(initial_capital=1000.0).run([dict(s) for s in signals], market_data)
+    actual = ArrayBacktester(initial_capital=1000.0).run([dict(s) for s in signals], market_data)
+
+    assert actual["total_trades"] == expected["total_trades"] > 0
+    assert _normalize_trades(actual["trades"]) == _normalize_trades(expected["trades"])
+    for key in [
+        "final_equity",
+        "win_rate",
+        "profit_factor",
+        "max_drawdown_pct",
+        "sharpe_ratio",
+        "hit_rate_tp1",
+    ]:
+        assert actual[key] == expected[key], key
+    assert actual["equity_curve"] == expected["equity_curve"]
+    exit_types = {e["type"] for t in actual["trades"] for e in t["exits"]}
+    assert {"SL", "TP1", "TIME"} <= exit_types
+
+
+def test_python_kernel_used_without_numba(monkeypatch):
+    monkeypatch.setattr(backtest, "NUMBA_AVAILABLE", False)
+    market_data = make_candles(300)
+    signals = _signals(market_data, count=10)
+
+    tester = ArrayBacktester()
+    result = tester.run(signals, market_data)
+
+    assert tester._kernel is backtest._lifecycle_kernel
+    assert result["total_trades"] == Backtester().run(signals, market_data)["total_trades"]
+
+
+@pytest.mark.parametrize("use_array_engine", [False, True])
+def test_backtest_signals_engines_agree(monkeypatch, use_array_engine):
+    market_data = make_candles(600)
+    monkeypatch.setattr(backtest, "_load_market_data", lambda *args, **kwargs: market_data)
+
+    signals = _signals(market_data, count=20)
+    for signal in signals:
+        signal["side"] = signal["side"].value
+        signal["timestamp"] = signal["timestamp"].isoformat()
+
+    baseline = backtest_signals(None, [dict(s) for s in signals])
+    result = backtest_signals(None, [dict(s) for s in signals], use_array_engine=use_array_engine)
+
+    for key in ["win_rate", "avg_profit_pct", "total_pnl_usd", "total_trades"]:
+        assert result[key] == baseline[key]
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from apps.api.db.models import OHLCV, RiskProfile, TimeFrame
+from apps.ml.model_cache import ModelCache
+from apps.ml.signal_engine import SignalEngine
+
+
+class PathRegistry:
+    def __init__(self, paths):
+        self.paths = paths
+        self.index = {"deployments": {}}
+
+    def get_deployed_model(self, symbol, timeframe, environment="production"):
+        if symbol not in self.paths:
+            return None
+        return {
+            "model_id": f"model_{symbol}",
+            "version": "v1",
+            "path": self.paths[symbol],
+            "symbol": symbol,
+            "timeframe": timeframe,
+        }
+
+
+@pytest.fixture()
+def session(session):
+    base_ts = datetime.utcnow() - timedelta(minutes=120 * 15)
+    for offset, symbol in enumerate(["BTC/USDT", "ETH/USDT", "SOL/USDT"]):
+        for idx in range(120):
+            price = 50000 + idx + offset * 1000
+            session.add(
+                OHLCV(
+                    symbol=symbol,
+                    timeframe=TimeFrame.M15,
+                    timestamp=base_ts + timedelta(minutes=15 * idx),
+                    open=price,
+                    high=price + 800,
+                    low=price - 800,
+                    close=price + 120,
+                    volume=150 + idx + offset * 7,
+                )
+            )
+    session.commit()
+    return session
+
+
+def _engine(session, registry, model_factory):
+    return SignalEngine(
+        db=session,
+        registry=registry,
+        model_factory=model_factory,
+        performance_tracker=MagicMock(),
+        feature_store=MagicMock(**{"is_available.return_value": False}),
+        feature_cache=MagicMock(),
+        model_cache=ModelCache(max_bytes=0),
+        lookback_bars=90,
+    )
+
+
+def test_shared_artifacts_are_scored_in_one_call(session, counting_model):
+    registry = PathRegistry({"BTC/USDT": "shared", "ETH/USDT": "shared", "SOL/USDT": "solo"})
+    requests = [
+        ("BTC/USDT", "15m", "production"),
+        ("ETH/USDT", "15m", "production"),
+        ("SOL/USDT", "15m", "production"),
+        ("DOGE/USDT", "15m", "production"),
+    ]
+
+    batched = list(
+        _engine(session, registry, counting_model).generate_for_deployments(
+            requests, risk_profile=RiskProfile.MEDIUM
+        )
+    )
+
+    assert [request for request, _ in batched] == requests
+    assert sorted(counting_model.calls) == [("shared", 2), ("solo", 1)]
+    assert batched[3][1] is None
+
+    for request, outcome in batched[:3]:
+        single = _engine(session, registry, counting_model).generate_for_deployment(*request)
+        assert outcome.inference_metadata["probability"] == pytest.approx(
+            single.inference_metadata["probability"]
+        )
+        assert outcome.accepted == single.accepted
+        assert outcome.risk_filters == single.risk_filters
+
+
+def test_missing_market_data_does_not_abort_batch(session, counting_model):
+    registry = PathRegistry({"BTC/USDT": "shared", "XRP/USDT": "shared"})
+    requests = [("XRP/USDT", "15m", "production"), ("BTC/USDT", "15m", "production")]
+
+    outcomes = dict(_engine(session, registry, counting_model).generate_for_deployments(requests))
+
+    assert outcomes[requests[0]] is None
+    assert outcomes[requests[1]] is not None
+    assert counting_model.calls == [("shared", 1)]
+
+
+def test_panel_snapshots_match_per_symbol(session, monkeypatch, counting_model):
+    engine = _engine(session, PathRegistry({}), counting_model)
+    pairs = [("BTC/USDT", "15m"), ("ETH/USDT", "15m"), ("SOL/USDT", "15m")]
+    compute_panel = MagicMock(wraps=engine.feature_engineering.compute_panel_features)
+    monkeypatch.setattr(engine.feature_engineering, "compute_panel_features", compute_panel)
+
+    panel = engine._prepare_latest_snapshots(pairs)
+    assert compute_panel.call_count == 1
+
+    monkeypatch.setattr("apps.ml.signal_engine.settings.PANEL_FEATURES_ENABLED", False)
+    per_symbol = engine._prepare_latest_snapshots(pairs)
+    assert compute_panel.call_count == 1
+
+    for pair in pairs:
+        pd.testing.assert_series_equal(panel[pair]["features"], per_symbol[pair]["features"])
+        assert panel[pair]["atr"] == per_symbol[pair]["atr"]
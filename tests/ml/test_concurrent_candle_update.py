@@ -0,0 +1,127 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from apps.api.db.models import OHLCV, MarketMetrics, TimeFrame
+from apps.ml import backfill, worker
+from apps.ml.ccxt_client import CCXTClient, RateLimiter
+from tests.ml.conftest import FakeExchange
+
+
+def test_rate_limiter_spaces_concurrent_requests():
+    limiter = RateLimiter(0.02)
+    started = []
+
+    def _acquire():
+        limiter.acquire()
+        started.append(time.monotonic())
+
+    threads = [threading.Thread(target=_acquire) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    started.sort()
+    gaps = [b - a for a, b in zip(started, started[1:])]
+    assert min(gaps) >= 0.015
+
+
+@pytest.fixture()
+def session_factory(session_factory):
+    session = session_factory()
+    base = datetime.utcnow().replace(second=0, microsecond=0) - timedelta(hours=2)
+    # On the exchange's 15m grid, so the first fetched bar replaces it
+    base -= timedelta(minutes=base.minute % 15)
+    for symbol in worker.TRACKED_PAIRS:
+        session.add(
+            OHLCV(
+                symbol=symbol,
+                timeframe=TimeFrame.M15,
+                timestamp=base,
+                open=1,
+                high=1,
+                low=1,
+                close=1,
+                volume=1,
+            )
+        )
+    session.commit()
+    session.close()
+    return session_factory
+
+
+def test_update_latest_candles_fetches_pairs_concurrently(engine, session_factory, monkeypatch):
+    exchange = FakeExchange(latency=0.02)
+    client = CCXTClient(exchange_id="bitget", exchange=exchange)
+
+    class FakeBackfillService(backfill.BackfillService):
+        def __init__(self, db, exchange_id=None):
+            super().__init__(db, client=client)
+
+    monkeypatch.setattr(worker, "SessionLocal", session_factory)
+    monkeypatch.setattr(backfill, "BackfillService", FakeBackfillService)
+    monkeypatch.setattr(
+        "apps.ml.streaming_features.StreamingFeatureStore.is_available", lambda self: False
+    )
+
+    inserts = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO"):
+            inserts.append(statement.split()[2])
+
+    result = worker.update_latest_candles_task()
+
+    assert result["status"] == "completed"
+    assert result["backfills_triggered"] == 0
+    assert exchange.max_in_flight > 1
+
+    pairs = len(worker.TRACKED_PAIRS)
+    session = session_factory()
+    assert session.query(MarketMetrics).count() == pairs
+    # Each fetch starts at the stored candle, which is updated in place
+    assert (
+        session.query(OHLCV).filter(OHLCV.timeframe == TimeFrame.M15).count()
+        == result["candles_updated"]
+    )
+    assert session.query(OHLCV).filter(OHLCV.open == 1).count() == 0
+    # Higher timeframes are derived locally, not fetched
+    assert session.query(OHLCV).filter(OHLCV.timeframe == TimeFrame.D1).count() >= pairs
+    session.close()
+
+    # One bulk statement per table (and derived timeframe) for the whole cycle
+    assert inserts.count("ohlcv") == 1 + len(result["derived_bars_updated"])
+    assert inserts.count("market_metrics") == 1
+
+
+def test_candles_stay_stored_when_metrics_write_fails(session_factory, monkeypatch):
+    client = CCXTClient(exchange_id="bitget", exchange=FakeExchange())
+
+    class FakeBackfillService(backfill.BackfillService):
+        def __init__(self, db, exchange_id=None):
+            super().__init__(db, client=client)
+
+        def upsert_market_metrics_many(self, entries):
+            raise RuntimeError("market_metrics is locked")
+
+    monkeypatch.setattr(worker, "SessionLocal", session_factory)
+    monkeypatch.setattr(backfill, "BackfillService", FakeBackfillService)
+    monkeypatch.setattr(
+        "apps.ml.streaming_features.StreamingFeatureStore.is_available", lambda self: False
+    )
+
+    result = worker.update_latest_candles_task()
+
+    assert result["status"] == "completed"
+    assert result["candles_updated"] > 0
+    session = session_factory()
+    assert session.query(MarketMetrics).count() == 0
+    assert session.query(OHLCV).filter(OHLCV.open == 1).count() == 0
+    # The candles were stored, so the derived bars still follow them
+    assert session.query(OHLCV).filter(OHLCV.timeframe == TimeFrame.D1).count() > 0
+    session.close()
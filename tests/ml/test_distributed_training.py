@@ -0,0 +1,152 @@
+import asyncio
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import apps.ml.training as training
+from apps.api.config import settings
+from apps.api.db.models import ModelRegistry as ModelRecord
+from apps.api.db.models import TimeFrame, TrainingJob
+from apps.api.routers import train as train_router
+from apps.ml import worker
+from apps.ml.checkpoint import load_split_result
+from apps.ml.fold_executor import train_published_fold
+
+
+def test_published_plan_survives_json(tmp_path, synthetic_pipeline):
+    pipeline = synthetic_pipeline(model_dir=str(tmp_path / "models"))
+    plan = pipeline.publish_folds(
+        db=None,
+        symbol="BTC/USDT",
+        timeframe="1h",
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 3, 15),
+        shared_dir=str(tmp_path / "shared"),
+    )
+
+    # Celery's JSON serializer sits between the parent and the fold tasks
+    plan = json.loads(json.dumps(plan))
+    fold = plan["folds"][0]
+    assert train_published_fold(plan, fold) == fold["split_index"]
+
+    split_result = load_split_result(f"{plan['run_dir']}/folds/fold_{fold['split_index']:03d}.json")
+    assert split_result["train_start"] == pd.Timestamp(fold["train_bounds"][0])
+    assert split_result["train_samples"] == fold["train_rows"][1] - fold["train_rows"][0]
+
+    results = pipeline.finalize_published_folds(plan, [fold["split_index"], None])
+    assert results["num_splits"] == 1
+    assert results["distributed"] is True
+    assert not Path(plan["run_dir"]).exists()
+
+
+def test_distributed_task_runs_folds_as_a_chord(
+    tmp_path, monkeypatch, session_factory, fake_registry, synthetic_pipeline
+):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(worker, "SessionLocal", session_factory)
+    monkeypatch.setattr(worker, "ModelRegistry", fake_registry)
+    monkeypatch.setattr(training, "WalkForwardPipeline", synthetic_pipeline)
+    monkeypatch.setattr(settings, "TRAINING_DISTRIBUTED_DIR", str(tmp_path / "shared"))
+    monkeypatch.setattr(worker.celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(worker.celery_app.conf, "task_eager_propagates", True)
+
+    dispatched = worker.train_model_distributed_task.apply(
+        kwargs=dict(
+            symbol="BTC/USDT",
+            timeframe="1h",
+            test_period_days=10,
+            min_train_days=30,
+            start_date="2024-01-01T00:00:00",
+            end_date="2024-03-15T00:00:00",
+        )
+    ).get()
+
+    serial = synthetic_pipeline(model_dir=str(tmp_path / "serial")).run_walk_forward_validation(
+        db=None,
+        symbol="BTC/USDT",
+        timeframe="1h",
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 3, 15),
+    )
+
+    assert dispatched["status"] == "dispatched"
+    assert dispatched["folds"] == serial["num_splits"] > 1
+
+    session = session_factory()
+    job = session.query(TrainingJob).filter_by(job_id=dispatched["job_id"]).one()
+    assert job.status == "completed"
+    assert job.current_fold == job.total_folds == serial["num_splits"]
+    assert job.avg_roc_auc == pytest.approx(serial["avg_metrics"]["avg_roc_auc"])
+    assert session.query(ModelRecord).filter_by(model_id=job.model_id).one().is_production
+    session.close()
+
+    # The published data is removed once the model is registered
+    assert not any((tmp_path / "shared").iterdir())
+
+
+def test_cancelled_distributed_job_stops_folds_and_is_not_finalized(
+    tmp_path, monkeypatch, session_factory, fake_registry, synthetic_pipeline
+):
+    monkeypatch.setattr(worker, "SessionLocal", session_factory)
+    monkeypatch.setattr(worker, "ModelRegistry", fake_registry)
+
+    plan = synthetic_pipeline(model_dir=str(tmp_path / "models")).publish_folds(
+        db=None,
+        symbol="BTC/USDT",
+        timeframe="1h",
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 3, 15),
+        shared_dir=str(tmp_path / "shared"),
+    )
+    folds = plan.pop("folds")
+    plan = json.loads(json.dumps({**plan, "job_id": "job-1"}))
+
+    session = session_factory()
+    session.add(
+        TrainingJob(
+            job_id="job-1",
+            symbol="BTC/USDT",
+            timeframe=TimeFrame.H1,
+            status="training",
+            fold_group_id="group-1",
+        )
+    )
+    session.commit()
+
+    revoked = []
+
+    class FakeGroup:
+        def revoke(self, **kwargs):
+            revoked.append("group-1")
+
+    monkeypatch.setattr(
+        worker.celery_app.control, "revoke", lambda task_id, **kwargs: revoked.append(task_id)
+    )
+    monkeypatch.setattr(
+        train_router.GroupResult,
+        "restore",
+        classmethod(lambda cls, group_id, app=None: FakeGroup() if group_id == "group-1" else None),
+    )
+
+    response = asyncio.run(train_router.cancel_training("job-1", db=session))
+    assert response["status"] == "cancelled"
+    assert revoked == ["job-1", "group-1"]
+
+    # Folds already queued when the cancel landed do not train
+    assert worker.train_fold_task(plan, json.loads(json.dumps(folds[0]))) is None
+    assert not list((Path(plan["run_dir"]) / "folds").glob("fold_*.json"))
+
+    assert worker.finalize_training_task([None], plan)["status"] == "failed"
+    worker.fail_distributed_training_task("job-1", plan["run_dir"])
+
+    session.expire_all()
+    job = session.query(TrainingJob).filter_by(job_id="job-1").one()
+    assert job.status == "failed"
+    assert job.error_message == "Cancelled by user"
+    assert job.model_id is None
+    assert session.query(ModelRecord).count() == 0
+    assert not Path(plan["run_dir"]).exists()
+    session.close()
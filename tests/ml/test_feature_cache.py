@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.ml.feature_store import FeatureCache
+from apps.ml.features import FeatureEngineering
+from apps.ml.labeling import TripleBarrierLabeling
+from tests.ml.conftest import make_candles
+
+
+def _labeler(**overrides) -> TripleBarrierLabeling:
+    params = dict(time_bars=24, use_atr=True, tp_atr_multiplier=3.5, sl_atr_multiplier=1.0)
+    params.update(overrides)
+    return TripleBarrierLabeling(**params)
+
+
+def _assert_features_close(expected: pd.DataFrame, actual: pd.DataFrame):
+    assert list(actual.columns) == list(expected.columns)
+    assert len(actual) == len(expected)
+    for col in expected.columns:
+        if pd.api.types.is_numeric_dtype(expected[col]):
+            np.testing.assert_allclose(
+                actual[col].to_numpy(dtype=np.float64),
+                expected[col].to_numpy(dtype=np.float64),
+                rtol=1e-7,
+                atol=1e-9,
+                err_msg=col,
+            )
+        else:
+            assert actual[col].tolist() == expected[col].tolist(), col
+
+
+@pytest.fixture()
+def feature_eng():
+    return FeatureEngineering()
+
+
+def test_exact_hit_serves_stored_frames(tmp_path, feature_eng):
+    df = make_candles(800, seed=3)
+    cache = FeatureCache(str(tmp_path), warmup_bars=500)
+    labeler = _labeler()
+
+    features, labels = cache.get_or_compute("BTC/USDT", "15m", df, feature_eng, labeler=labeler)
+
+    progress = []
+    cached_features, cached_labels = cache.get_or_compute(
+        "BTC/USDT",
+        "15m",
+        df,
+        feature_eng,
+        labeler=labeler,
+        labeling_progress_callback=progress.append,
+    )
+
+    pd.testing.assert_frame_equal(cached_features, features)
+    pd.testing.assert_frame_equal(cached_labels, labels)
+    assert progress == [100.0]
+
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["bytes_served"] > 0
+    assert stats["entries"] == 1
+    assert stats["hit_rate"] == pytest.approx(0.5)
+
+
+def test_extended_history_only_recomputes_tail(tmp_path, feature_eng, monkeypatch):
+    df = make_candles(3300, seed=3)
+    labeler = _labeler()
+    cache = FeatureCache(str(tmp_path), warmup_bars=2000)
+
+    cache.get_or_compute("BTC/USDT", "15m", df.iloc[:3000], feature_eng, labeler=labeler)
+
+    computed_rows = []
+    original = feature_eng.compute_all_features
+
+    def _tracking(frame, market_metrics=None):
+        computed_rows.append(len(frame))
+        return original(frame, market_metrics=market_metrics)
+
+    monkeypatch.setattr(feature_eng, "compute_all_features", _tracking)
+    features, labels = cache.get_or_compute("BTC/USDT", "15m", df, feature_eng, labeler=labeler)
+    monkeypatch.undo()
+
+    # Warm-up window before the cached end plus the 300 new bars
+    assert computed_rows == [2000 + 300]
+
+    expected_features = feature_eng.compute_all_features(df)
+    expected_labels = labeler.label_data(expected_features)
+
+    _assert_features_close(expected_features, features)
+    pd.testing.assert_frame_equal(
+        labels[["timestamp", "hit_barrier", "bars_to_hit"]],
+        expected_labels[["timestamp", "hit_barrier", "bars_to_hit"]],
+    )
+    np.testing.assert_allclose(labels["return_pct"], expected_labels["return_pct"], rtol=1e-9)
+
+    stats = cache.stats()
+    assert stats["partial_hits"] == 1
+    # The extended entry supersedes its prefix
+    assert stats["entries"] == 1
+
+
+def test_changed_history_or_params_miss(tmp_path, feature_eng):
+    df = make_candles(600, seed=3)
+    cache = FeatureCache(str(tmp_path), warmup_bars=500)
+    cache.get_or_compute("BTC/USDT", "15m", df, feature_eng, labeler=_labeler())
+
+    revised = df.copy()
+    revised.loc[10, "close"] *= 1.01
+    cache.get_or_compute("BTC/USDT", "15m", revised, feature_eng, labeler=_labeler())
+    cache.get_or_compute("BTC/USDT", "15m", df, feature_eng, labeler=_labeler(time_bars=12))
+    cache.get_or_compute("ETH/USDT", "15m", df, feature_eng, labeler=_labeler())
+
+    stats = cache.stats()
+    assert stats["misses"] == 4
+    assert stats["hits"] == 0
+
+
+def test_lru_eviction_respects_size_budget(tmp_path, feature_eng):
+    frames = {
+        symbol: make_candles(400, seed=i) for i, symbol in enumerate(["A/USDT", "B/USDT", "C/USDT"])
+    }
+
+    probe = FeatureCache(str(tmp_path / "probe"))
+    probe.get_or_compute("A/USDT", "15m", frames["A/USDT"], feature_eng)
+    entry_bytes = probe.stats()["bytes_on_disk"]
+
+    cache = FeatureCache(str(tmp_path / "cache"), max_bytes=int(entry_bytes * 2.5))
+    cache.get_or_compute("A/USDT", "15m", frames["A/USDT"], feature_eng)
+    cache.get_or_compute("B/USDT", "15m", frames["B/USDT"], feature_eng)
+    # Touch A so B becomes least recently used
+    cache.get_or_compute("A/USDT", "15m", frames["A/USDT"], feature_eng)
+    cache.get_or_compute("C/USDT", "15m", frames["C/USDT"], feature_eng)
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["bytes_on_disk"] <= cache.max_bytes
+
+    symbols = {meta["symbol"] for meta in cache._read_index()["entries"].values()}
+    assert symbols == {"A/USDT", "C/USDT"}
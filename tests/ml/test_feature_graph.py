@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from apps.ml.features import (
+    BASE_COLUMNS,
+    FEATURE_REGISTRY,
+    TALIB_AVAILABLE,
+    FeatureEngineering,
+    feature_lookback,
+    resolve_features,
+)
+from apps.ml.signal_engine import SignalEngine
+from tests.ml.conftest import make_candles
+
+
+@pytest.fixture(scope="module")
+def full_features():
+    return FeatureEngineering().compute_all_features(make_candles(600))
+
+
+def test_registry_is_a_dag_in_computation_order(full_features):
+    produced = set(BASE_COLUMNS)
+    for spec in FEATURE_REGISTRY:
+        assert set(spec.inputs) <= produced, spec.name
+        produced.update(spec.outputs)
+
+    assert set(full_features.columns) == produced
+
+
+@pytest.mark.parametrize("spec", FEATURE_REGISTRY, ids=lambda spec: spec.name)
+def test_subgraph_matches_full_computation(spec, full_features):
+    subset = FeatureEngineering().compute_all_features(
+        make_candles(600), columns=list(spec.outputs)
+    )
+
+    needed = {column for node in resolve_features(spec.outputs) for column in node.outputs}
+    assert set(subset.columns) == set(BASE_COLUMNS) | needed
+    pd.testing.assert_frame_equal(subset[list(spec.outputs)], full_features[list(spec.outputs)])
+
+
+def test_lookback_follows_the_longest_dependency_chain():
+    assert [spec.name for spec in resolve_features(["stochrsi_k", "close", "retired_feature"])] == [
+        "rsi",
+        "stochrsi",
+    ]
+    assert feature_lookback(["stochrsi_k"], backend="pandas") == 15 + 18 + 1
+    # Wilder's RSI needs 8 periods to settle
+    assert feature_lookback(["stochrsi_k"], backend="talib") == 113 + 18 + 1
+    # ema_50 (4 spans) outweighs keltner's ATR + EMA(20) chain
+    assert feature_lookback(["ema_50_slope"]) == 200 + 6 + 1
+    assert feature_lookback(["close"]) == 1
+    # Whole-history features cannot be shortened
+    assert feature_lookback(["obv", "rsi_14"]) is None
+    assert feature_lookback() is None
+
+
+@pytest.mark.skipif(not TALIB_AVAILABLE, reason="TA-Lib not installed")
+@pytest.mark.parametrize("columns", [["rsi_14"], ["atr_14"], ["adx"], ["stochrsi_k"]])
+def test_shortened_window_matches_full_history_on_talib(columns):
+    candles = make_candles(2000)
+    bars = feature_lookback(columns)
+    assert bars > feature_lookback(columns, backend="pandas")
+
+    full = FeatureEngineering().compute_all_features(candles, columns=columns).iloc[-1]
+    window = (
+        FeatureEngineering()
+        .compute_all_features(candles.iloc[-bars:].reset_index(drop=True), columns=columns)
+        .iloc[-1]
+    )
+    for column in columns:
+        assert window[column] == pytest.approx(full[column], rel=1e-3), column
+
+
+def test_signal_engine_computes_only_what_the_model_reads():
+    engine = SignalEngine(
+        db=MagicMock(),
+        registry=MagicMock(),
+        performance_tracker=MagicMock(),
+        feature_store=MagicMock(**{"is_available.return_value": False}),
+        feature_cache=MagicMock(),
+        model_cache=MagicMock(),
+        lookback_bars=250,
+    )
+
+    columns, bars = engine._feature_plan([SimpleNamespace(feature_names=["rsi_14", "macd_hist"])])
+    assert {"rsi_14", "macd_hist", "atr_14", "regime_volatility"} <= set(columns)
+    assert bars == feature_lookback(columns) < 250
+
+    assert engine._feature_plan([SimpleNamespace(feature_names=None)]) == (None, 250)
+    assert engine._feature_plan([SimpleNamespace(feature_names=["ema_200"])])[1] == 250
+
+    snapshot = engine._snapshot_from_bars(
+        "BTC/USDT", "15m", make_candles(bars), None, False, columns
+    )
+    assert "fib_618" not in snapshot["features"].index
+    assert not pd.isna(snapshot["features"]["macd_hist"])
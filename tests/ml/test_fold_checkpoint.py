@@ -0,0 +1,200 @@
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import apps.ml.training as training
+import apps.ml.worker as worker
+from apps.api.db.models import TrainingJob
+from apps.ml.checkpoint import FoldCheckpoint, read_manifest
+
+
+class _WorkerKilled(Exception):
+    pass
+
+
+# The unpatched function: each phase of a test wraps this, never a previous phase's wrapper
+_TRAIN_FOLD_XY = training.train_fold_xy
+
+_RUN = dict(
+    db=None,
+    symbol="BTC/USDT",
+    timeframe="1h",
+    start_date=datetime(2024, 1, 1),
+    end_date=datetime(2024, 3, 15),
+)
+
+
+def _count_folds(monkeypatch, crash_at=None):
+    """Count trained folds; raise like a killed worker when reaching ``crash_at``."""
+    trained = []
+
+    def _train_fold_xy(*args, **kwargs):
+        if kwargs["split_index"] == crash_at:
+            raise _WorkerKilled()
+        trained.append(kwargs["split_index"])
+        return _TRAIN_FOLD_XY(*args, **kwargs)
+
+    monkeypatch.setattr(training, "train_fold_xy", _train_fold_xy)
+    return trained
+
+
+@pytest.mark.parametrize("fold_workers,warm_start", [(1, False), (1, True), (2, False)])
+def test_interrupted_run_resumes_after_completed_folds(
+    tmp_path, monkeypatch, synthetic_pipeline, fold_workers, warm_start
+):
+    checkpoint_dir = tmp_path / "checkpoint"
+    settings = dict(model_dir=str(tmp_path / "models"), warm_start=warm_start, warm_start_rounds=50)
+
+    _count_folds(monkeypatch)
+    reference = synthetic_pipeline(
+        fold_workers=fold_workers, **settings
+    ).run_walk_forward_validation(**_RUN)
+    total = reference["num_splits"]
+    assert total > 3
+
+    # Crash serially: train_fold_xy is only patched in this process
+    _count_folds(monkeypatch, crash_at=3)
+    with pytest.raises(_WorkerKilled):
+        synthetic_pipeline(
+            checkpoint_dir=str(checkpoint_dir), **settings
+        ).run_walk_forward_validation(**_RUN)
+    assert read_manifest(checkpoint_dir)["completed_folds"] == [1, 2]
+
+    trained = _count_folds(monkeypatch)
+    resumed_counts = []
+    resumed = synthetic_pipeline(
+        checkpoint_dir=str(checkpoint_dir), fold_workers=fold_workers, **settings
+    ).run_walk_forward_validation(
+        **_RUN, progress_callback=lambda **kw: None, resume_callback=resumed_counts.append
+    )
+
+    if fold_workers == 1:
+        assert trained == list(range(3, total + 1))
+    assert resumed_counts == [2]
+    assert resumed["resumed_folds"] == [1, 2]
+    assert resumed["num_splits"] == total
+    for expected, actual in zip(reference["split_results"], resumed["split_results"]):
+        assert actual["train_start"] == expected["train_start"]
+        assert actual["train_samples"] == expected["train_samples"]
+        assert actual["oos_metrics"] == pytest.approx(expected["oos_metrics"])
+    assert resumed["best_oos_auc"] == pytest.approx(reference["best_oos_auc"])
+    assert not checkpoint_dir.exists()
+
+
+def test_changed_data_starts_over(tmp_path, monkeypatch, synthetic_pipeline, prepared_frame):
+    checkpoint_dir = tmp_path / "checkpoint"
+    settings = dict(model_dir=str(tmp_path / "models"), checkpoint_dir=str(checkpoint_dir))
+
+    _count_folds(monkeypatch, crash_at=2)
+    with pytest.raises(_WorkerKilled):
+        synthetic_pipeline(**settings).run_walk_forward_validation(**_RUN)
+    assert read_manifest(checkpoint_dir)["completed_folds"] == [1]
+
+    trained = _count_folds(monkeypatch)
+    results = synthetic_pipeline(
+        prepared=prepared_frame(seed=8), **settings
+    ).run_walk_forward_validation(**_RUN)
+
+    assert trained[0] == 1
+    assert results["resumed_folds"] == []
+
+
+def test_checkpoint_round_trips_split_results(tmp_path):
+    checkpoint = FoldCheckpoint(tmp_path / "checkpoint")
+    assert checkpoint.open("abc", run_info={"start_date": "2024-01-01T00:00:00"}) == {}
+
+    split_result = {
+        "split_id": 0,
+        "train_start": pd.Timestamp("2024-01-01"),
+        "oos_metrics": {"roc_auc": np.float64(0.61)},
+        "train_samples": np.int64(720),
+    }
+    checkpoint.record_fold(1, split_result)
+
+    reopened = FoldCheckpoint(tmp_path / "checkpoint")
+    restored = reopened.open("abc")
+    assert restored[1]["train_start"] == pd.Timestamp("2024-01-01")
+    assert restored[1]["oos_metrics"]["roc_auc"] == pytest.approx(0.61)
+    assert reopened.manifest["start_date"] == "2024-01-01T00:00:00"
+    assert reopened.load_best_model() is None
+
+    assert FoldCheckpoint(tmp_path / "checkpoint").open("other") == {}
+    assert read_manifest(tmp_path / "checkpoint")["completed_folds"] == []
+
+
+class _SavedModel:
+    def save(self, path):
+        Path(path).mkdir(parents=True)
+
+
+def test_unreadable_fold_drops_the_models_of_lost_folds(tmp_path):
+    checkpoint = FoldCheckpoint(tmp_path / "checkpoint")
+    checkpoint.open("abc")
+    best_auc = 0.0
+    for split_index, auc in [(1, 0.6), (2, 0.55), (3, 0.7), (4, 0.5)]:
+        new_best = auc > best_auc
+        best_auc = max(best_auc, auc)
+        checkpoint.record_fold(
+            split_index,
+            {"oos_metrics": {"roc_auc": auc}},
+            best_model=_SavedModel() if new_best else None,
+            best_oos_auc=best_auc,
+            last_model=_SavedModel(),
+        )
+    (tmp_path / "checkpoint" / "fold_003.json").write_text("{")
+
+    reopened = FoldCheckpoint(tmp_path / "checkpoint")
+    restored = reopened.open("abc")
+
+    # Fold 3's best model is gone, and with it the best model of folds 1-2 (fold 1)
+    assert sorted(restored) == [2]
+    assert reopened.best_split_index is None
+    assert reopened.best_oos_auc == 0.0
+    assert reopened.load_best_model() is None
+    assert reopened.load_last_model() is None
+    manifest = read_manifest(tmp_path / "checkpoint")
+    assert manifest["completed_folds"] == [2]
+    assert not (tmp_path / "checkpoint" / "best_003").exists()
+    assert not (tmp_path / "checkpoint" / "last_004").exists()
+
+
+def test_stale_checkpoints_are_deleted(tmp_path, monkeypatch, session_factory, session):
+    root = tmp_path / "checkpoints"
+    monkeypatch.setattr(worker, "SessionLocal", session_factory)
+    monkeypatch.setattr(worker.settings, "TRAINING_CHECKPOINT_DIR", str(root))
+    monkeypatch.setattr(worker.settings, "TRAINING_CHECKPOINT_RETENTION_DAYS", 7)
+
+    long_ago = datetime.utcnow() - timedelta(days=8)
+    for job_id, status, updated_at in [
+        ("cancelled", "failed", long_ago),
+        ("retryable", "failed", datetime.utcnow()),
+        ("killed", "training", long_ago),
+    ]:
+        (root / job_id).mkdir(parents=True)
+        session.add(
+            TrainingJob(
+                job_id=job_id,
+                symbol="BTC/USDT",
+                timeframe="1h",
+                status=status,
+                checkpoint_path=str(root / job_id),
+                updated_at=updated_at,
+            )
+        )
+    session.commit()
+    (root / "orphan").mkdir()
+    (root / "fresh_orphan").mkdir()
+    old = long_ago.replace(tzinfo=timezone.utc).timestamp()
+    os.utime(root / "orphan", (old, old))
+
+    result = worker.cleanup_training_checkpoints_task()
+
+    assert result["status"] == "completed"
+    assert sorted(p.name for p in root.iterdir()) == ["fresh_orphan", "retryable"]
+    session.expire_all()
+    paths = dict(session.query(TrainingJob.job_id, TrainingJob.checkpoint_path))
+    assert paths == {"cancelled": None, "retryable": str(root / "retryable"), "killed": None}
@@ -0,0 +1,116 @@
+import multiprocessing
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+from celery import Celery
+from celery.contrib.testing.worker import start_worker
+
+from apps.ml import training
+from apps.ml.fold_executor import SharedFoldData, resolve_threads_per_worker
+
+# Set by the test before the prefork pool forks, so the task can reach its fixtures
+_PREFORK_RUN = {}
+
+
+def _run(tmp_path, synthetic_pipeline, prepared_frame, fold_workers: int):
+    pipeline = synthetic_pipeline(
+        prepared=prepared_frame(flag=True, prices=True),
+        model_dir=str(tmp_path / f"models_{fold_workers}"),
+        training_mode="full",
+        fold_workers=fold_workers,
+    )
+
+    progress = []
+    results = pipeline.run_walk_forward_validation(
+        db=None,
+        symbol="BTC/USDT",
+        timeframe="15m",
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 3, 15),
+        progress_callback=lambda **kwargs: progress.append(kwargs),
+    )
+    return results, progress
+
+
+def test_parallel_folds_match_serial(tmp_path, synthetic_pipeline, prepared_frame):
+    serial, serial_progress = _run(tmp_path, synthetic_pipeline, prepared_frame, fold_workers=1)
+    parallel, parallel_progress = _run(tmp_path, synthetic_pipeline, prepared_frame, fold_workers=2)
+
+    assert serial["num_splits"] == parallel["num_splits"] > 1
+    for expected, actual in zip(serial["split_results"], parallel["split_results"]):
+        assert actual["split_id"] == expected["split_id"]
+        assert actual["train_samples"] == expected["train_samples"]
+        assert actual["test_samples"] == expected["test_samples"]
+        assert actual["oos_metrics"] == pytest.approx(expected["oos_metrics"])
+
+    assert parallel["best_oos_auc"] == pytest.approx(serial["best_oos_auc"])
+    assert parallel["avg_metrics"] == pytest.approx(serial["avg_metrics"])
+
+    total = serial["num_splits"]
+    assert [p["current_fold"] for p in parallel_progress] == [1] + list(range(1, total + 1)) + [
+        total
+    ]
+    assert parallel_progress[-1]["progress_pct"] == 100.0
+    assert all(p["total_folds"] == total for p in parallel_progress)
+    assert len(parallel_progress) == len(serial_progress)
+
+
+def _walk_forward_in_task():
+    calls = []
+    run_folds_parallel = training.run_folds_parallel
+
+    def _counting_run_folds_parallel(*args, **kwargs):
+        calls.append(multiprocessing.current_process().daemon)
+        return run_folds_parallel(*args, **kwargs)
+
+    training.run_folds_parallel = _counting_run_folds_parallel
+    results, _ = _run(fold_workers=2, **_PREFORK_RUN)
+    return {"parallel_calls": calls, "num_splits": results["num_splits"]}
+
+
+def test_parallel_folds_run_inside_a_prefork_celery_task(
+    tmp_path, monkeypatch, synthetic_pipeline, prepared_frame
+):
+    # Prefork children are daemonic: multiprocessing alone cannot start the fold pool there
+    monkeypatch.delenv("CELERY_BROKER_URL", raising=False)
+    monkeypatch.delenv("CELERY_RESULT_BACKEND", raising=False)
+    app = Celery("fold_parallel_test", broker="memory://", backend=f"file://{tmp_path}")
+    app.conf.update(task_serializer="json", result_serializer="json")
+    task = app.task(name="tests.walk_forward_in_task")(_walk_forward_in_task)
+    _PREFORK_RUN.update(
+        tmp_path=tmp_path, synthetic_pipeline=synthetic_pipeline, prepared_frame=prepared_frame
+    )
+    try:
+        with start_worker(app, pool="prefork", concurrency=1, perform_ping_check=False):
+            outcome = task.delay().get(timeout=600)
+    finally:
+        _PREFORK_RUN.clear()
+
+    assert outcome["parallel_calls"] == [True]
+    assert outcome["num_splits"] > 1
+
+
+def test_shared_fold_data_round_trip(prepared_frame):
+    df = prepared_frame(days=3, flag=True)
+    cols = ["feat_signal", "feat_noise", "feat_flag"]
+
+    with SharedFoldData(df, cols) as shared:
+        features = np.load(shared.paths["features"], mmap_mode="r")
+        labels = np.load(shared.paths["labels"], mmap_mode="r")
+        timestamps = np.load(shared.paths["timestamps"], mmap_mode="r")
+
+        np.testing.assert_array_equal(features, df[cols].to_numpy(dtype=np.float64))
+        np.testing.assert_array_equal(labels, df["label"].to_numpy())
+        np.testing.assert_array_equal(timestamps, df["timestamp"].to_numpy())
+        path = shared.paths["features"]
+
+    assert not os.path.exists(path)
+
+
+def test_threads_per_worker_defaults_to_core_share(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+    assert resolve_threads_per_worker(4, 0) == 2
+    assert resolve_threads_per_worker(16, None) == 1
+    assert resolve_threads_per_worker(4, 3) == 3
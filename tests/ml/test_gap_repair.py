@@ -0,0 +1,225 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import event
+
+from apps.api.db.models import OHLCV, BackfillJob, GapScanState, TimeFrame
+from apps.ml import gap_scanner, worker
+from apps.ml.backfill import BackfillService
+from apps.ml.ccxt_client import CCXTClient
+from apps.ml.gap_scanner import find_gaps, scan_gaps
+from apps.ml.market_data import bulk_upsert
+from tests.ml.conftest import FakeExchange, to_ms
+
+START = datetime(2024, 1, 1)
+STEP = timedelta(minutes=15)
+
+
+def _seed(session, symbol, bars, missing=(), timeframe=TimeFrame.M15):
+    session.add_all(
+        [
+            OHLCV(
+                symbol=symbol,
+                timeframe=timeframe,
+                timestamp=START + STEP * i,
+                open=1.0,
+                high=2.0,
+                low=0.5,
+                close=1.0,
+                volume=1.0,
+            )
+            for i in range(bars)
+            if i not in missing
+        ]
+    )
+    session.commit()
+
+
+def _seed_range(session, indices, symbol="BTC/USDT"):
+    session.add_all(
+        [
+            OHLCV(
+                symbol=symbol,
+                timeframe=TimeFrame.M15,
+                timestamp=START + STEP * i,
+                open=1.0,
+                high=2.0,
+                low=0.5,
+                close=1.0,
+                volume=1.0,
+            )
+            for i in indices
+        ]
+    )
+    session.commit()
+
+
+def _count_ohlcv_reads(session):
+    reads = []
+
+    def _track(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM ohlcv" in statement:
+            reads.append(statement)
+
+    event.listen(session.get_bind(), "before_cursor_execute", _track)
+    return reads
+
+
+def test_window_scan_finds_gaps_across_pairs(session):
+    _seed(session, "BTC/USDT", 200, missing={10, 11, 12, 150})
+    _seed(session, "ETH/USDT", 200, missing={50})
+    _seed(session, "SOL/USDT", 200)
+
+    reads = _count_ohlcv_reads(session)
+    gaps = find_gaps(session)
+
+    assert len(reads) == 1
+    assert [(gap.symbol, gap.start, gap.end, gap.missing_bars) for gap in gaps] == [
+        ("BTC/USDT", START + STEP * 9, START + STEP * 13, 3),
+        ("BTC/USDT", START + STEP * 149, START + STEP * 151, 1),
+        ("ETH/USDT", START + STEP * 49, START + STEP * 51, 1),
+    ]
+
+    ranged = find_gaps(
+        session, symbol="BTC/USDT", timeframe=TimeFrame.M15, start=START + STEP * 100
+    )
+    assert [gap.start for gap in ranged] == [START + STEP * 149]
+
+
+def test_scan_is_incremental_from_high_water_mark(session):
+    _seed(session, "BTC/USDT", 100, missing={20})
+
+    assert len(scan_gaps(session)) == 1
+    state = session.query(GapScanState).one()
+    assert state.scanned_until == START + STEP * 99
+
+    # Nothing new: the old gap is not reported again
+    assert scan_gaps(session) == []
+
+    # A worker outage leaves a hole right after the mark
+    session.add_all(
+        [
+            OHLCV(
+                symbol="BTC/USDT",
+                timeframe=TimeFrame.M15,
+                timestamp=START + STEP * i,
+                open=1.0,
+                high=2.0,
+                low=0.5,
+                close=1.0,
+                volume=1.0,
+            )
+            for i in range(104, 110)
+        ]
+    )
+    session.commit()
+
+    gaps = scan_gaps(session)
+    assert [(gap.start, gap.end) for gap in gaps] == [(START + STEP * 99, START + STEP * 104)]
+    session.refresh(state)
+    assert state.scanned_until == START + STEP * 109
+
+
+def test_scan_marks_only_the_bars_it_checked(session, monkeypatch):
+    _seed(session, "BTC/USDT", 100, missing={20})
+    reads = _count_ohlcv_reads(session)
+
+    # The 5-minute updater lands bars after a hole while the scan is running
+    def _late_bars_then_upsert(*args, **kwargs):
+        _seed_range(session, range(104, 110))
+        return bulk_upsert(*args, **kwargs)
+
+    monkeypatch.setattr(gap_scanner, "bulk_upsert", _late_bars_then_upsert)
+    assert len(scan_gaps(session)) == 1
+    monkeypatch.undo()
+
+    # Gaps and marks come from one statement, so the late bars are above the mark
+    assert len(reads) == 1
+    assert session.query(GapScanState).one().scanned_until == START + STEP * 99
+    gaps = scan_gaps(session)
+    assert [(gap.start, gap.end) for gap in gaps] == [(START + STEP * 99, START + STEP * 104)]
+
+
+def test_repair_job_refetches_only_missing_intervals(session):
+    _seed(session, "BTC/USDT", 3000, missing={10, 11, 12, 40, 2500, 2501})
+    exchange = FakeExchange()
+    service = BackfillService(session, client=CCXTClient(exchange_id="bitget", exchange=exchange))
+
+    jobs = service.create_repair_jobs(scan_gaps(session))
+    assert len(jobs) == 1
+    job = jobs[0]
+    assert job.job_type == "repair"
+    # The two nearby holes share one request; the distant one gets its own
+    assert [(segment["start"], segment["end"]) for segment in job.segments] == [
+        ((START + STEP * 10).isoformat(), (START + STEP * 41).isoformat()),
+        ((START + STEP * 2500).isoformat(), (START + STEP * 2502).isoformat()),
+    ]
+
+    service.execute_backfill(job)
+    session.refresh(job)
+
+    assert job.status == "completed"
+    assert not job.detected_gaps
+    assert sorted(exchange.requests) == [
+        (to_ms(START + STEP * 10), 31),
+        (to_ms(START + STEP * 2500), 2),
+    ]
+    assert session.query(OHLCV).filter(OHLCV.timeframe == TimeFrame.M15).count() == 3000
+    assert find_gaps(session, timeframe=TimeFrame.M15) == []
+
+
+def test_repair_reports_bars_the_exchange_never_had(session):
+    _seed(session, "BTC/USDT", 200, missing={10, 11, 12})
+    exchange = FakeExchange(missing=[START + STEP * 11])
+    service = BackfillService(session, client=CCXTClient(exchange_id="bitget", exchange=exchange))
+
+    (job,) = service.create_repair_jobs(scan_gaps(session))
+    service.execute_backfill(job)
+    session.refresh(job)
+
+    assert job.status == "completed"
+    assert job.detected_gaps == [
+        {"start": (START + STEP * 10).isoformat(), "end": (START + STEP * 12).isoformat()}
+    ]
+
+
+def test_ccxt_detect_gaps_matches_window_scan(session):
+    _seed(session, "BTC/USDT", 300, missing={5, 6, 100, 299 - 1})
+    timestamps = pd.DataFrame(
+        {"timestamp": [row.timestamp for row in session.query(OHLCV).order_by(OHLCV.timestamp)]}
+    )
+
+    client = CCXTClient(exchange_id="bitget", exchange=FakeExchange())
+    expected = [(gap.start, gap.end) for gap in find_gaps(session)]
+    assert client.detect_gaps(timestamps, "15m") == expected
+    assert client.detect_gaps(timestamps.iloc[:0], "15m") == []
+
+
+def test_marks_only_advance_with_the_repair_jobs(session, session_factory, monkeypatch):
+    _seed(session, "BTC/USDT", 100, missing={20})
+    queued = []
+
+    class FailingBackfillService(BackfillService):
+        def __init__(self, db, exchange_id=None):
+            super().__init__(db, client=CCXTClient(exchange_id="bitget", exchange=FakeExchange()))
+
+        def create_repair_job(self, *args, **kwargs):
+            raise RuntimeError("database went away")
+
+    monkeypatch.setattr(worker, "SessionLocal", session_factory)
+    monkeypatch.setattr(worker, "BackfillService", FailingBackfillService)
+    monkeypatch.setattr(worker.execute_backfill_task, "delay", queued.append)
+
+    assert worker.repair_gaps_task()["status"] == "failed"
+    assert session.query(GapScanState).count() == 0
+
+    # The next pass finds the same gap and records the job and the mark together
+    monkeypatch.setattr(
+        FailingBackfillService, "create_repair_job", BackfillService.create_repair_job
+    )
+    result = worker.repair_gaps_task()
+
+    assert result["gaps_found"] == 1
+    assert queued == result["repair_jobs"]
+    assert session.query(BackfillJob).filter_by(job_id=queued[0]).one().job_type == "repair"
+    assert session.query(GapScanState).one().scanned_until == START + STEP * 99
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.ml import indicators
+from apps.ml.features import FeatureEngineering
+from apps.ml.indicators import true_range
+from tests.ml.conftest import make_candles
+
+
+def _legacy_true_range(df):
+    high_low = df["high"] - df["low"]
+    high_close = np.abs(df["high"] - df["close"].shift())
+    low_close = np.abs(df["low"] - df["close"].shift())
+    return pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+
+
+def _legacy_supertrend(df, atr, multiplier=3.0):
+    """The per-row ``.iloc`` loop FeatureEngineering used before the kernels."""
+    hl_avg = (df["high"] + df["low"]) / 2
+    upper_band = hl_avg + multiplier * atr
+    lower_band = hl_avg - multiplier * atr
+
+    line = pd.Series(index=df.index, dtype=float)
+    direction = pd.Series(index=df.index, dtype=int)
+    for i in range(1, len(df)):
+        if df["close"].iloc[i] > upper_band.iloc[i - 1]:
+            direction.iloc[i] = 1
+        elif df["close"].iloc[i] < lower_band.iloc[i - 1]:
+            direction.iloc[i] = -1
+        else:
+            direction.iloc[i] = direction.iloc[i - 1] if i > 0 else 0
+
+        if direction.iloc[i] == 1:
+            line.iloc[i] = lower_band.iloc[i]
+        else:
+            line.iloc[i] = upper_band.iloc[i]
+    return line, direction
+
+
+def _candles(bars):
+    """Shared candles on an offset index, with a few missing highs."""
+    df = make_candles(bars, seed=4)[["high", "low", "close"]]
+    df.index = pd.RangeIndex(1000, 1000 + bars)
+    df.iloc[300:304, 0] = np.nan
+    return df
+
+
+KERNELS = [indicators._supertrend_kernel, indicators._supertrend_numpy]
+
+
+def test_true_range_matches_concat_max():
+    df = _candles(800)
+    pd.testing.assert_series_equal(
+        true_range(df["high"], df["low"], df["close"]), _legacy_true_range(df)
+    )
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+@pytest.mark.parametrize("bars", [0, 1, 2, 50, 1500])
+def test_supertrend_kernels_match_legacy_loop(kernel, bars):
+    df = _candles(bars)
+    atr = _legacy_true_range(df).rolling(14).mean()
+    expected_line, expected_direction = _legacy_supertrend(df, atr)
+
+    hl_avg = ((df["high"] + df["low"]) / 2).to_numpy()
+    line, direction = kernel(
+        df["close"].to_numpy(), hl_avg + 3.0 * atr.to_numpy(), hl_avg - 3.0 * atr.to_numpy()
+    )
+
+    np.testing.assert_array_equal(line, expected_line.to_numpy())
+    np.testing.assert_array_equal(direction, expected_direction.to_numpy())
+
+
+def test_feature_columns_match_legacy_loop():
+    df = _candles(600)
+    df["open"] = df["close"]
+    features = FeatureEngineering()._add_supertrend(df.copy())
+
+    expected_line, expected_direction = _legacy_supertrend(
+        df, _legacy_true_range(df).rolling(14).mean()
+    )
+    pd.testing.assert_series_equal(features["supertrend"], expected_line, check_names=False)
+    pd.testing.assert_series_equal(
+        features["supertrend_direction"], expected_direction, check_names=False
+    )
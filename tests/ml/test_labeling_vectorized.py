@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.ml.labeling import TripleBarrierLabeling
+from tests.ml.conftest import make_candles
+
+
+def _reference_labels(labeler, df, side):
+    """Row-by-row triple barrier labeling used as the parity reference."""
+    df = df.sort_values("timestamp").reset_index(drop=True)
+    close = df["close"].to_numpy()
+    high = df["high"].to_numpy()
+    low = df["low"].to_numpy()
+    atr = df[labeler.atr_column].to_numpy() if labeler.use_atr else None
+    time_bars = labeler.time_bars
+
+    rows = []
+    for i in range(len(df) - time_bars):
+        entry_price = close[i]
+        atr_value = atr[i] if atr is not None else None
+        if atr_value is not None and (pd.isna(atr_value) or atr_value <= 0):
+            atr_value = None
+
+        if atr_value is not None:
+            if side == "long":
+                tp_price = entry_price + (atr_value * labeler.tp_atr_multiplier)
+                sl_price = entry_price - (atr_value * labeler.sl_atr_multiplier)
+            else:
+                tp_price = entry_price - (atr_value * labeler.tp_atr_multiplier)
+                sl_price = entry_price + (atr_value * labeler.sl_atr_multiplier)
+        elif side == "long":
+            tp_price = entry_price * (1 + labeler.tp_pct)
+            sl_price = entry_price * (1 - labeler.sl_pct)
+        else:
+            tp_price = entry_price * (1 - labeler.tp_pct)
+            sl_price = entry_price * (1 + labeler.sl_pct)
+
+        future_high = high[i + 1 : i + 1 + time_bars]
+        future_low = low[i + 1 : i + 1 + time_bars]
+        if side == "long":
+            tp_hits = np.where(future_high >= tp_price)[0]
+            sl_hits = np.where(future_low <= sl_price)[0]
+        else:
+            tp_hits = np.where(future_low <= tp_price)[0]
+            sl_hits = np.where(future_high >= sl_price)[0]
+
+        first_tp = tp_hits[0] + 1 if tp_hits.size else None
+        first_sl = sl_hits[0] + 1 if sl_hits.size else None
+
+        hit_barrier, bars_to_hit, exit_price = "time", time_bars, close[i + time_bars]
+        if first_tp is not None and (first_sl is None or first_tp <= first_sl):
+            hit_barrier, bars_to_hit, exit_price = "tp", first_tp, tp_price
+        elif first_sl is not None:
+            hit_barrier, bars_to_hit, exit_price = "sl", first_sl, sl_price
+
+        if side == "long":
+            return_pct = (exit_price - entry_price) / entry_price
+        else:
+            return_pct = (entry_price - exit_price) / entry_price
+
+        rows.append(
+            {
+                "timestamp": df["timestamp"].iloc[i],
+                "side": side,
+                "tp_barrier": tp_price,
+                "sl_barrier": sl_price,
+                "time_barrier": time_bars,
+                "hit_barrier": hit_barrier,
+                "bars_to_hit": bars_to_hit,
+                "return_pct": return_pct,
+            }
+        )
+
+    return pd.DataFrame(rows)
+
+
+def _make_ohlcv(rows=600, seed=7):
+    """Candles with an ``atr_14`` column that is zero for a few bars."""
+    df = make_candles(rows, seed=seed)
+    atr = (df["high"] - df["low"]).rolling(14).mean().to_numpy()
+    atr[50:60] = 0.0
+    return df.assign(atr_14=atr)
+
+
+@pytest.mark.parametrize("side", ["long", "short"])
+@pytest.mark.parametrize("use_atr", [False, True])
+def test_vectorized_labels_match_reference(side, use_atr):
+    df = _make_ohlcv()
+    # Tiny chunk budget forces many chunks, including a ragged final one
+    labeler = TripleBarrierLabeling(
+        tp_pct=0.01,
+        sl_pct=0.005,
+        time_bars=16,
+        use_atr=use_atr,
+        tp_atr_multiplier=2.0,
+        sl_atr_multiplier=1.0,
+        max_chunk_bytes=1000,
+    )
+
+    result = labeler.label_data(df, side=side)
+    expected = _reference_labels(labeler, df, side)
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+    assert set(result["hit_barrier"]) <= {"tp", "sl", "time"}
+
+
+def test_progress_callback_fires_per_chunk():
+    df = _make_ohlcv(rows=200)
+    labeler = TripleBarrierLabeling(time_bars=10, max_chunk_bytes=2 * 10 * 50)
+    progress = []
+
+    labels = labeler.label_data(df, progress_callback=progress.append)
+
+    assert len(labels) == 190
+    assert progress == [50 / 190 * 100, 100 / 190 * 100, 150 / 190 * 100, 100.0]
+
+
+def test_too_few_rows_returns_empty_frame():
+    df = _make_ohlcv(rows=10)
+    labels = TripleBarrierLabeling(time_bars=24).label_data(df)
+    assert labels.empty
+    assert "hit_barrier" in labels.columns
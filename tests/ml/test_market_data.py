@@ -0,0 +1,233 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.dialects import postgresql
+
+from apps.api.db.models import OHLCV, TimeFrame
+from apps.ml import market_data
+from apps.ml.market_data import bulk_upsert, load_latest_ohlcv_many, load_ohlcv
+
+BASE_TS = datetime(2024, 1, 1)
+
+
+def _add_candles(session, rows=25):
+    for idx in range(rows):
+        session.add(
+            OHLCV(
+                symbol="BTC/USDT",
+                timeframe=TimeFrame.M15,
+                timestamp=BASE_TS + timedelta(minutes=15 * idx),
+                open=100.0 + idx,
+                high=101.0 + idx,
+                low=99.0 + idx,
+                close=100.5 + idx,
+                volume=10.0 + idx,
+            )
+        )
+    # Different timeframe and symbol must be filtered out
+    session.add(
+        OHLCV(
+            symbol="BTC/USDT",
+            timeframe=TimeFrame.H1,
+            timestamp=BASE_TS,
+            open=1,
+            high=1,
+            low=1,
+            close=1,
+            volume=1,
+        )
+    )
+    session.add(
+        OHLCV(
+            symbol="ETH/USDT",
+            timeframe=TimeFrame.M15,
+            timestamp=BASE_TS,
+            open=1,
+            high=1,
+            low=1,
+            close=1,
+            volume=1,
+        )
+    )
+    session.commit()
+
+
+def test_load_ohlcv_returns_typed_columns_in_range(session):
+    _add_candles(session)
+
+    df = load_ohlcv(
+        session,
+        "BTC/USDT",
+        "15m",
+        start=BASE_TS + timedelta(minutes=30),
+        end=BASE_TS + timedelta(minutes=150),
+        chunk_size=3,
+    )
+
+    assert list(df.columns) == ["timestamp", "open", "high", "low", "close", "volume"]
+    assert df["timestamp"].dtype == "datetime64[ns]"
+    assert all(df[col].dtype == np.float64 for col in ["open", "high", "low", "close", "volume"])
+    assert len(df) == 9
+    assert df["timestamp"].iloc[0] == pd.Timestamp(BASE_TS + timedelta(minutes=30))
+    assert df["close"].tolist() == [100.5 + idx for idx in range(2, 11)]
+    # Streaming is requested per statement, not left on the session's connection
+    assert "stream_results" not in session.connection().get_execution_options()
+
+
+def test_load_ohlcv_latest_returns_most_recent_ascending(session):
+    _add_candles(session)
+
+    df = load_ohlcv(session, "BTC/USDT", TimeFrame.M15, limit=5, latest=True)
+
+    assert df["timestamp"].is_monotonic_increasing
+    assert df["open"].tolist() == [120.0, 121.0, 122.0, 123.0, 124.0]
+
+
+def test_load_ohlcv_empty_result_is_typed(session):
+    _add_candles(session)
+
+    df = load_ohlcv(session, "SOL/USDT", "15m")
+
+    assert df.empty
+    assert df["timestamp"].dtype == "datetime64[ns]"
+    assert df["close"].dtype == np.float64
+
+
+def test_load_latest_ohlcv_many_windows_each_symbol(session):
+    _add_candles(session)
+
+    frames = load_latest_ohlcv_many(session, ["BTC/USDT", "ETH/USDT", "SOL/USDT"], "15m", limit=4)
+
+    pd.testing.assert_frame_equal(
+        frames["BTC/USDT"], load_ohlcv(session, "BTC/USDT", "15m", limit=4, latest=True)
+    )
+    assert len(frames["ETH/USDT"]) == 1
+    assert frames["SOL/USDT"].empty
+    assert frames["SOL/USDT"]["close"].dtype == np.float64
+
+
+class _FakeCursor:
+    def __init__(self, payload):
+        self.payload = payload
+        self.sql = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def copy_expert(self, sql, buffer):
+        self.sql = sql
+        buffer.write(self.payload.encode())
+
+
+def test_copy_path_builds_literal_query_and_parses_csv():
+    cursor = _FakeCursor(
+        "2024-01-01 00:00:00,1,2,0.5,1.5,10\n" "2024-01-01 00:15:00,1.5,2.5,1,2,12.5\n"
+    )
+    connection = SimpleNamespace(
+        dialect=postgresql.psycopg2.dialect(),
+        connection=SimpleNamespace(dbapi_connection=SimpleNamespace(cursor=lambda: cursor)),
+    )
+    query = market_data._build_query("O'Coin/USDT", TimeFrame.M15, BASE_TS, None, 100, latest=False)
+
+    assert market_data._supports_copy(connection)
+    df = market_data._load_with_copy(connection, query)
+
+    assert cursor.sql.startswith("COPY (SELECT")
+    assert "TO STDOUT WITH (FORMAT csv)" in cursor.sql
+    assert "'M15'" in cursor.sql
+    assert "'O''Coin/USDT'" in cursor.sql
+    assert df["timestamp"].dtype == "datetime64[ns]"
+    assert df["volume"].tolist() == [10.0, 12.5]
+
+
+def _ohlcv_batch(rows):
+    return pd.DataFrame(
+        {
+            "symbol": ["BTC/USDT"] * rows,
+            "timeframe": [TimeFrame.M15] * rows,
+            "timestamp": [BASE_TS + timedelta(minutes=15 * idx) for idx in range(rows)],
+            "open": [200.0 + idx for idx in range(rows)],
+            "high": [201.0 + idx for idx in range(rows)],
+            "low": [199.0 + idx for idx in range(rows)],
+            "close": [200.5 + idx for idx in range(rows)],
+            "volume": [20.0 + idx for idx in range(rows)],
+        }
+    )
+
+
+def test_bulk_upsert_statement_path_inserts_and_updates(session):
+    _add_candles(session, rows=5)
+    batch = _ohlcv_batch(8)
+    # Duplicate key: the last occurrence wins
+    batch = pd.concat([batch, batch.iloc[[7]].assign(close=999.0)], ignore_index=True)
+
+    written = bulk_upsert(
+        session,
+        OHLCV.__table__,
+        batch,
+        conflict_columns=["symbol", "timeframe", "timestamp"],
+        update_columns=["open", "high", "low", "close", "volume"],
+    )
+    session.commit()
+
+    assert written == 8
+    df = load_ohlcv(session, "BTC/USDT", "15m", end=BASE_TS + timedelta(minutes=15 * 7))
+    assert df["open"].tolist() == [200.0 + idx for idx in range(8)]
+    assert df["close"].iloc[-1] == 999.0
+
+
+class _RecordingCursor:
+    def __init__(self):
+        self.statements = []
+        self.copied = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        self.statements.append(sql)
+
+    def copy_expert(self, sql, buffer):
+        self.statements.append(sql)
+        self.copied = buffer.read()
+
+
+def test_bulk_upsert_copy_path_stages_and_merges():
+    cursor = _RecordingCursor()
+    connection = SimpleNamespace(
+        dialect=postgresql.psycopg2.dialect(),
+        connection=SimpleNamespace(dbapi_connection=SimpleNamespace(cursor=lambda: cursor)),
+    )
+    session = SimpleNamespace(connection=lambda: connection)
+
+    written = bulk_upsert(
+        session,
+        OHLCV.__table__,
+        _ohlcv_batch(3),
+        conflict_columns=["symbol", "timeframe", "timestamp"],
+        update_columns=["open", "close"],
+    )
+
+    assert written == 3
+    create, truncate, copy, merge = cursor.statements
+    assert create.startswith("CREATE TEMP TABLE IF NOT EXISTS staging_ohlcv ON COMMIT DROP")
+    assert truncate == "TRUNCATE staging_ohlcv"
+    assert copy.startswith("COPY staging_ohlcv (symbol, timeframe, timestamp, open")
+    assert "FROM STDIN WITH (FORMAT csv)" in copy
+    assert merge.startswith("INSERT INTO ohlcv (symbol, timeframe, timestamp, open")
+    assert merge.endswith(
+        "ON CONFLICT (symbol, timeframe, timestamp) DO UPDATE SET open = EXCLUDED.open, close = EXCLUDED.close"
+    )
+    # Enum members are sent by name, as the column stores them
+    assert (
+        cursor.copied.splitlines()[0]
+        == "BTC/USDT,M15,2024-01-01 00:00:00.000000,200.0,201.0,199.0,200.5,20.0"
+    )
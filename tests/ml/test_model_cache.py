@@ -0,0 +1,154 @@
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from apps.ml.model_cache import ModelCache
+from apps.ml.model_registry import ModelRegistry
+from apps.ml.signal_engine import SignalEngine
+
+
+def _write_artifact(directory: Path, payload: str = "booster", size: int = 100) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "lgbm_model.txt").write_text(payload.ljust(size, "#"))
+    return directory
+
+
+def test_repeated_loads_are_served_from_memory(tmp_path, counting_model):
+    path = _write_artifact(tmp_path / "v1")
+    cache = ModelCache(max_bytes=10_000)
+
+    first = cache.get(str(path), counting_model)
+    second = cache.get(str(path), counting_model)
+
+    assert first is second
+    assert counting_model.loads == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bytes"] == 100
+
+
+def test_rewritten_artifact_is_reloaded(tmp_path, counting_model):
+    path = _write_artifact(tmp_path / "v1", payload="old")
+    cache = ModelCache(max_bytes=10_000)
+    assert cache.get(str(path), counting_model).payload.startswith("old")
+
+    _write_artifact(path, payload="new", size=120)
+    stat = (path / "lgbm_model.txt").stat()
+    os.utime(path / "lgbm_model.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert cache.get(str(path), counting_model).payload.startswith("new")
+    assert counting_model.loads == 2
+    assert cache.stats()["entries"] == 1
+
+
+def test_lru_eviction_keeps_memory_budget(tmp_path, counting_model):
+    paths = [_write_artifact(tmp_path / f"v{i}") for i in range(3)]
+    cache = ModelCache(max_bytes=250)
+
+    cache.get(str(paths[0]), counting_model)
+    cache.get(str(paths[1]), counting_model)
+    cache.get(str(paths[0]), counting_model)  # paths[1] is now least recently used
+    cache.get(str(paths[2]), counting_model)
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 250
+
+    cache.get(str(paths[0]), counting_model)
+    assert counting_model.loads == 3
+    cache.get(str(paths[1]), counting_model)
+    assert counting_model.loads == 4
+
+
+def test_missing_artifact_bypasses_cache(tmp_path):
+    class PathlessModel:
+        def load(self, path):
+            self.path = path
+
+    cache = ModelCache(max_bytes=10_000)
+    cache.get(str(tmp_path / "missing"), PathlessModel)
+    cache.get(str(tmp_path / "missing"), PathlessModel)
+
+    snapshot = {}
+    cycle = cache.stats_since(snapshot)
+    assert cycle["hits"] == 0
+    assert cycle["misses"] == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_deploy_and_rollback_invalidate_cached_models(tmp_path, monkeypatch, counting_model):
+    cache = ModelCache(max_bytes=10_000)
+    monkeypatch.setattr("apps.ml.model_registry.get_model_cache", lambda: cache)
+
+    registry = ModelRegistry(registry_dir=str(tmp_path / "registry"))
+    for name in ("a", "b"):
+        registry.register_model(
+            model_id=f"model_{name}",
+            symbol="BTC/USDT",
+            timeframe="15m",
+            model_path=_write_artifact(tmp_path / f"src_{name}", payload=name),
+            metrics={"avg_roc_auc": 0.6},
+        )
+
+    registry.deploy_model("BTC/USDT", "15m", "v2")
+    deployed = registry.get_deployed_model("BTC/USDT", "15m")
+    cache.get(deployed["path"], counting_model, tag=("BTC/USDT", "15m", "v2"))
+    assert cache.stats()["entries"] == 1
+
+    assert registry.rollback_deployment("BTC/USDT", "15m")
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_sync_registry_drops_models_replaced_by_another_process(tmp_path, counting_model):
+    cache = ModelCache(max_bytes=10_000)
+    registry = ModelRegistry(registry_dir=str(tmp_path / "registry"))
+    for name in ("a", "b"):
+        registry.register_model(
+            model_id=f"model_{name}",
+            symbol="ETH/USDT",
+            timeframe="15m",
+            model_path=_write_artifact(tmp_path / f"src_{name}", payload=name),
+            metrics={},
+        )
+    registry.deploy_model("ETH/USDT", "15m", "v1")
+
+    cache.sync_registry(registry)
+    v1 = registry.get_model("ETH/USDT", "15m", "v1")
+    cache.get(v1["path"], counting_model, tag=("ETH/USDT", "15m", "v1"))
+
+    # Another process deploys v2; this process only sees the index file change
+    other = ModelRegistry(registry_dir=str(tmp_path / "registry"))
+    other.index["deployments"]["ETH/USDT_15m_production"]["version"] = "v2"
+    other._save_index()
+    stat = other.index_file.stat()
+    os.utime(other.index_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    cache.sync_registry(ModelRegistry(registry_dir=str(tmp_path / "registry")))
+    assert cache.stats()["entries"] == 0
+
+
+def test_signal_engine_reuses_models_across_engines(tmp_path, counting_model):
+    path = _write_artifact(tmp_path / "v1")
+    cache = ModelCache(max_bytes=10_000)
+    deployment = {"path": str(path), "symbol": "BTC/USDT", "timeframe": "15m", "version": "v1"}
+
+    for _ in range(3):
+        engine = SignalEngine(
+            db=MagicMock(),
+            registry=MagicMock(index={"deployments": {}}),
+            model_factory=counting_model,
+            performance_tracker=MagicMock(),
+            feature_store=MagicMock(),
+            feature_cache=MagicMock(),
+            model_cache=cache,
+        )
+        engine._load_model(deployment)
+
+    assert counting_model.loads == 1
+    cycle = cache.stats_since({})
+    assert cycle["hit_rate"] == pytest.approx(2 / 3)
+    assert cycle["avg_load_ms"] is not None
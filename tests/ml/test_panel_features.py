@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.ml import panel_features
+from apps.ml.features import FeatureEngineering
+from apps.ml.indicators import supertrend, true_range
+from apps.ml.panel_features import FeaturePanel
+from tests.ml.conftest import make_candles
+
+# Listed late, ending early and spanning the whole panel
+FRAMES = {
+    "BTC/USDT": make_candles(600, seed=1),
+    "ETH/USDT": make_candles(500, start="2024-01-02 01:00", seed=2),
+    "SOL/USDT": make_candles(550, seed=3).iloc[:530],
+}
+
+METRICS = {
+    "ETH/USDT": pd.DataFrame(
+        {
+            "timestamp": [pd.Timestamp("2024-01-03")],
+            "funding_rate": [0.001],
+            "spread_bps": [2.0],
+            "open_interest": [5e6],
+            "depth_imbalance": [0.1],
+            "realized_volatility": [0.3],
+        }
+    )
+}
+
+
+def _assert_matches_per_symbol(result, columns=None):
+    engineering = FeatureEngineering()
+    for symbol, frame in FRAMES.items():
+        expected = engineering.compute_all_features(
+            frame, market_metrics=METRICS.get(symbol), columns=columns
+        )
+        pd.testing.assert_frame_equal(result.frame(symbol), expected, check_exact=True)
+
+
+def test_panel_matches_per_symbol_computation():
+    panel = FeaturePanel.from_frames(FRAMES)
+    assert panel.symbols == list(FRAMES)
+    assert panel.gapped_symbols() == []
+
+    result = FeatureEngineering().compute_panel_features(panel, market_metrics=METRICS)
+    _assert_matches_per_symbol(result)
+
+
+def test_per_symbol_fallback_matches(monkeypatch):
+    # The path taken for TA-Lib/pandas_ta backed indicators
+    monkeypatch.setattr(panel_features, "_uses_ta_library", lambda method: True)
+    result = FeatureEngineering().compute_panel_features(
+        FeaturePanel.from_frames(FRAMES), market_metrics=METRICS
+    )
+    _assert_matches_per_symbol(result)
+
+
+def test_subgraph_and_long_format():
+    columns = ["stochrsi_k", "consolidation_duration", "regime_volatility"]
+    result = FeatureEngineering().compute_panel_features(
+        FeaturePanel.from_frames(FRAMES), columns=columns
+    )
+    _assert_matches_per_symbol(result, columns)
+
+    long_df = result.long()
+    assert len(long_df) == sum(len(frame) for frame in FRAMES.values())
+    assert list(long_df.columns[:2]) == ["symbol", "timestamp"]
+    eth = long_df[long_df["symbol"] == "ETH/USDT"].drop(columns="symbol").reset_index(drop=True)
+    pd.testing.assert_frame_equal(eth, result.frame("ETH/USDT"))
+
+
+def test_from_arrays_and_gaps():
+    timestamps = pd.date_range("2024-01-01", periods=6, freq="15min")
+    close = np.arange(12, dtype=float).reshape(6, 2) + 100
+    close[2, 1] = np.nan
+    close[0, 0] = np.nan
+    panel = FeaturePanel.from_arrays(
+        timestamps, ["A", "B"], close, close + 1, close - 1, close, np.ones((6, 2))
+    )
+
+    assert panel.gapped_symbols() == ["B"]
+    assert panel.present.sum().tolist() == [5, 5]
+
+
+def test_indicator_kernels_accept_wide_frames():
+    panel = FeaturePanel.from_frames(FRAMES)
+    high, low, close = (panel.fields[column] for column in ("high", "low", "close"))
+    atr = true_range(high, low, close).rolling(14).mean()
+    line, direction = supertrend(high, low, close, atr)
+
+    for symbol, frame in FRAMES.items():
+        rows = panel.present[symbol].to_numpy()
+        expected_atr = true_range(frame["high"], frame["low"], frame["close"]).rolling(14).mean()
+        expected_line, expected_direction = supertrend(
+            frame["high"], frame["low"], frame["close"], expected_atr
+        )
+        np.testing.assert_array_equal(line[symbol].to_numpy()[rows], expected_line.to_numpy())
+        np.testing.assert_array_equal(
+            direction[symbol].to_numpy()[rows], expected_direction.to_numpy()
+        )
+
+
+def test_panel_requires_price_fields():
+    with pytest.raises(ValueError):
+        FeaturePanel({"close": pd.DataFrame({"A": [1.0]})})
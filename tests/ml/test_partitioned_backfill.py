@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from apps.api.db.models import OHLCV, BackfillJob, TimeFrame
+from apps.ml.backfill import BackfillService
+from apps.ml.ccxt_client import CCXTClient
+from apps.ml.gap_scanner import find_gaps, scan_gaps
+from tests.ml.conftest import FakeExchange, to_ms
+
+START = datetime(2024, 1, 1)
+END = START + timedelta(days=12)
+
+
+@pytest.fixture(autouse=True)
+def _small_segments(monkeypatch):
+    monkeypatch.setattr("apps.ml.backfill.MIN_SEGMENT_BARS", 100)
+
+
+def _service(session, exchange):
+    return BackfillService(session, client=CCXTClient(exchange_id="bitget", exchange=exchange))
+
+
+EXPECTED_BARS = int((END - START) / timedelta(minutes=15)) + 1
+
+
+def test_segments_are_fetched_concurrently_and_aggregated(session):
+    exchange = FakeExchange(start=START, end=END, latency=0.005)
+    service = _service(session, exchange)
+
+    job = service.create_backfill_job("BTC/USDT", TimeFrame.M15, START, END, segments=4)
+    assert [segment["status"] for segment in job.segments] == ["pending"] * 4
+
+    service.execute_backfill(job)
+    session.refresh(job)
+
+    assert job.status == "completed"
+    assert exchange.max_in_flight > 1
+    assert session.query(OHLCV).filter(OHLCV.timeframe == TimeFrame.M15).count() == EXPECTED_BARS
+    # Segments are disjoint, so nothing is counted twice
+    assert job.candles_fetched == EXPECTED_BARS
+    assert sum(segment["candles_fetched"] for segment in job.segments) == EXPECTED_BARS
+    assert all(segment["status"] == "completed" for segment in job.segments)
+    assert job.last_completed_ts == END
+    assert job.candles_per_minute > 0
+
+
+def test_resume_refetches_only_unfinished_segments(session):
+    exchange = FakeExchange(start=START, end=END, latency=0.005)
+    service = _service(session, exchange)
+    job = service.create_backfill_job("BTC/USDT", TimeFrame.M15, START, END, segments=4)
+    crash_from = datetime.fromisoformat(job.segments[2]["start"])
+
+    original_upsert = service._upsert_ohlcv
+
+    def crashing_upsert(symbol, timeframe, df):
+        if df["timestamp"].min() >= crash_from:
+            raise RuntimeError("database went away")
+        original_upsert(symbol, timeframe, df)
+
+    service._upsert_ohlcv = crashing_upsert
+    with pytest.raises(RuntimeError):
+        service.execute_backfill(job)
+
+    session.refresh(job)
+    assert job.status == "failed"
+    assert job.segments[2]["status"] != "completed"
+    completed = [segment for segment in job.segments if segment["status"] == "completed"]
+
+    exchange.requests.clear()
+    resumed = _service(session, exchange).resume_backfill_job(job.job_id)
+
+    assert resumed.status == "completed"
+    assert session.query(OHLCV).filter(OHLCV.timeframe == TimeFrame.M15).count() == EXPECTED_BARS
+    for segment in completed:
+        lo = to_ms(datetime.fromisoformat(segment["start"]))
+        hi = to_ms(datetime.fromisoformat(segment["end"]))
+        assert not [since for since, _ in exchange.requests if lo <= since < hi]
+
+
+def test_short_ranges_stay_serial(session):
+    service = _service(session, FakeExchange(start=START, end=END, latency=0.005))
+    job = service.create_backfill_job(
+        "BTC/USDT", TimeFrame.M15, START, START + timedelta(hours=30), segments=4
+    )
+    assert job.segments is None
+    assert session.query(BackfillJob).count() == 1
+
+
+def test_failed_page_is_reported_and_repaired(session):
+    # The first page of the third segment never arrives
+    lost_from = START + timedelta(days=6)
+    exchange = FakeExchange(start=START, end=END, failing=[lost_from])
+    service = _service(session, exchange)
+    job = service.create_backfill_job("BTC/USDT", TimeFrame.M15, START, END, segments=4)
+    assert job.segments[2]["start"] == lost_from.isoformat()
+
+    service.execute_backfill(job)
+    session.refresh(job)
+
+    assert job.status == "completed"
+    assert job.detected_gaps
+    assert session.query(OHLCV).filter(OHLCV.timeframe == TimeFrame.M15).count() < EXPECTED_BARS
+
+    exchange.failing.clear()
+    for repair in service.create_repair_jobs(scan_gaps(session)):
+        service.execute_backfill(repair)
+
+    assert session.query(OHLCV).filter(OHLCV.timeframe == TimeFrame.M15).count() == EXPECTED_BARS
+    assert find_gaps(session, timeframe=TimeFrame.M15) == []
@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.api.db.models import OHLCV, TimeFrame
+from apps.ml.backfill import BackfillService
+from apps.ml.ccxt_client import CCXTClient
+from apps.ml.gap_scanner import find_gaps
+from apps.ml.market_data import load_ohlcv
+from apps.ml.resampling import resample_ohlcv, update_derived_bars
+from tests.ml.conftest import make_candles
+
+START = datetime(2024, 1, 1)
+
+
+def _store(session, symbol, df, timeframe=TimeFrame.M15):
+    session.add_all(
+        [
+            OHLCV(
+                symbol=symbol,
+                timeframe=timeframe,
+                timestamp=row.timestamp.to_pydatetime(),
+                open=row.open,
+                high=row.high,
+                low=row.low,
+                close=row.close,
+                volume=row.volume,
+            )
+            for row in df.itertuples()
+        ]
+    )
+    session.commit()
+
+
+@pytest.mark.parametrize(
+    "target, rule", [(TimeFrame.H1, "1h"), (TimeFrame.H4, "4h"), (TimeFrame.D1, "1D")]
+)
+def test_resample_matches_pandas_aggregation(target, rule):
+    candles = make_candles(1000)
+    df = candles.drop(index=[7, 300, 301]).sample(frac=1, random_state=1)
+
+    bars = resample_ohlcv(df, target)
+
+    expected = (
+        df.set_index("timestamp")
+        .sort_index()
+        .resample(rule)
+        .agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+        .dropna()
+        .reset_index()
+    )
+    pd.testing.assert_frame_equal(bars.drop(columns="complete"), expected, check_freq=False)
+    # 1000 bars end at 09:45 on day 11: only the last bucket is still forming, and
+    # the buckets that lost bars are not complete
+    holed = set(candles["timestamp"].iloc[[7, 300, 301]].dt.floor(rule))
+    closed = [ts not in holed for ts in bars["timestamp"].iloc[:-1]]
+    assert bars["complete"].tolist() == closed + [target == TimeFrame.H1]
+
+
+def test_forming_bucket_follows_clock():
+    df = make_candles(6)  # 00:00 .. 01:15
+
+    bars = resample_ohlcv(df, TimeFrame.H1, as_of=START + timedelta(hours=1, minutes=20))
+    assert bars["complete"].tolist() == [True, False]
+
+    with pytest.raises(ValueError):
+        resample_ohlcv(df, TimeFrame.M5)
+
+
+def test_buckets_with_missing_bars_do_not_replace_fetched_bars(session):
+    history = make_candles(96)
+    fetched = resample_ohlcv(history, TimeFrame.H1)
+    _store(session, "BTC/USDT", fetched, timeframe=TimeFrame.H1)
+    # 01:15 and 05:00 .. 05:30 never arrived
+    _store(session, "BTC/USDT", history.drop(index=[5, 20, 21, 22]))
+
+    update_derived_bars(session, symbols=["BTC/USDT"], since=START)
+
+    stored = load_ohlcv(session, "BTC/USDT", "1h")
+    np.testing.assert_allclose(
+        stored[["open", "high", "low", "close", "volume"]].to_numpy(),
+        fetched[["open", "high", "low", "close", "volume"]].to_numpy(),
+    )
+
+    class NoDownloads:
+        rateLimit = 0
+
+    service = BackfillService(
+        session, client=CCXTClient(exchange_id="bitget", exchange=NoDownloads())
+    )
+    job = service.create_backfill_job(
+        "BTC/USDT", TimeFrame.H1, START, START + timedelta(days=1) - timedelta(minutes=15)
+    )
+    assert job.job_type == "backfill"
+
+
+def test_bounded_rebuild_does_not_replace_fetched_bar_with_short_bucket(session):
+    history = make_candles(96)
+    fetched = resample_ohlcv(history, TimeFrame.H1)
+    _store(session, "BTC/USDT", fetched, timeframe=TimeFrame.H1)
+    # 05:15 never arrived; the rebuild ends inside the 05:00 bucket
+    _store(session, "BTC/USDT", history.drop(index=[21]))
+
+    written = update_derived_bars(
+        session,
+        symbols=["BTC/USDT"],
+        timeframes=[TimeFrame.H1],
+        since=START,
+        until=START + timedelta(hours=5, minutes=30),
+    )
+
+    assert written["1h"] == 5
+    stored = load_ohlcv(session, "BTC/USDT", "1h")
+    np.testing.assert_allclose(
+        stored[["open", "high", "low", "close", "volume"]].to_numpy(),
+        fetched[["open", "high", "low", "close", "volume"]].to_numpy(),
+    )
+
+
+def test_incremental_update_rewrites_only_the_open_bucket(session):
+    history = make_candles(200)
+    _store(session, "BTC/USDT", history.iloc[:150])
+
+    update_derived_bars(session, symbols=["BTC/USDT"])
+    first_pass = load_ohlcv(session, "BTC/USDT", "1h")
+    assert len(first_pass) == 38  # 37 full hours plus the forming one
+
+    _store(session, "BTC/USDT", history.iloc[150:])
+    written = update_derived_bars(session, symbols=["BTC/USDT"])
+
+    # Restarts at the newest stored bucket, not at the beginning of history
+    assert written["1h"] == 13
+    assert written["1d"] == 2  # the open day and the one started since
+
+    expected = resample_ohlcv(history, TimeFrame.H1)
+    stored = load_ohlcv(session, "BTC/USDT", "1h")
+    np.testing.assert_allclose(
+        stored[["open", "high", "low", "close", "volume"]].to_numpy(),
+        expected[["open", "high", "low", "close", "volume"]].to_numpy(),
+    )
+
+
+def test_derived_backfill_is_built_locally(session):
+    _store(session, "ETH/USDT", make_candles(4 * 96))
+
+    class NoDownloads:
+        rateLimit = 0
+
+        def fetch_ohlcv(self, *args, **kwargs):
+            raise AssertionError("derived timeframes must not be downloaded")
+
+    service = BackfillService(
+        session, client=CCXTClient(exchange_id="bitget", exchange=NoDownloads())
+    )
+    job = service.create_backfill_job(
+        "ETH/USDT", TimeFrame.H4, START, START + timedelta(days=4) - timedelta(minutes=15)
+    )
+    assert job.job_type == "resample"
+
+    service.execute_backfill(job)
+    session.refresh(job)
+
+    assert job.status == "completed"
+    assert job.candles_fetched == 24
+    assert len(load_ohlcv(session, "ETH/USDT", "4h")) == 24
+
+    # Ranges the 15m history does not cover still go to the exchange
+    uncovered = service.create_backfill_job(
+        "ETH/USDT", TimeFrame.H4, START - timedelta(days=30), START
+    )
+    assert uncovered.job_type == "backfill"
+
+
+def test_holes_in_derived_series_are_rebuilt_not_downloaded(session):
+    history = make_candles(96)
+    _store(session, "SOL/USDT", history)
+    hourly = resample_ohlcv(history, TimeFrame.H1).drop(index=[5, 6, 12])
+    _store(session, "SOL/USDT", hourly, timeframe=TimeFrame.H1)
+
+    service = BackfillService(session, client=CCXTClient(exchange_id="bitget", exchange=object()))
+    jobs = service.create_repair_jobs(find_gaps(session, timeframe=TimeFrame.H1))
+    assert [job.job_type for job in jobs] == ["resample"]
+
+    service.execute_backfill(jobs[0])
+    assert len(load_ohlcv(session, "SOL/USDT", "1h")) == 24
+    assert find_gaps(session) == []
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.ml import features
+from apps.ml.features import rolling_percentile_rank, rolling_quantile
+
+
+def _legacy_rank(series, window):
+    return series.rolling(window).apply(
+        lambda x: pd.Series(x).rank(pct=True).iloc[-1] if len(x) > 0 else 0.5
+    )
+
+
+def _sample_series(kind):
+    rng = np.random.default_rng(11)
+    if kind == "continuous":
+        values = rng.lognormal(mean=2.0, sigma=0.5, size=1500)
+    else:
+        # Heavy ties exercise the average-rank path
+        values = rng.integers(0, 15, size=1500).astype(float)
+    values[400:405] = np.nan
+    return pd.Series(values)
+
+
+KERNELS = [features._numpy_window_kernel, features._sorted_window_kernel]
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+@pytest.mark.parametrize("kind", ["continuous", "ties"])
+def test_percentile_rank_matches_rolling_apply(kernel, kind):
+    series = _sample_series(kind)
+    expected = _legacy_rank(series, 100).to_numpy()
+
+    result = kernel(series.to_numpy(), 100, 0.0, 0)
+
+    np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+@pytest.mark.parametrize("window,q", [(50, 0.8), (100, 0.30), (9, 0.5), (9, 1.0)])
+def test_quantile_matches_rolling_quantile(kernel, window, q):
+    series = _sample_series("continuous")
+    expected = series.rolling(window).quantile(q).to_numpy()
+
+    result = kernel(series.to_numpy(), window, q, 1)
+
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_public_helpers_preserve_index_and_short_input():
+    series = pd.Series([3.0, 1.0, 2.0], index=[10, 11, 12])
+
+    assert rolling_percentile_rank(series, 5).isna().all()
+    assert list(rolling_quantile(series, 2, 0.5).index) == [10, 11, 12]
+    assert rolling_percentile_rank(series, 3).iloc[-1] == pytest.approx(2 / 3)
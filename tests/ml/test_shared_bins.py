@@ -0,0 +1,98 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from apps.ml.fold_executor import build_shared_bins
+from apps.ml.models import BIN_CUTS_FILE, EnsembleModel
+
+_COLS = ["feat_signal", "feat_noise", "feat_flag"]
+
+
+def test_folds_reuse_the_shared_cuts(prepared_frame, model_params):
+    df = prepared_frame(flag=True)
+    bins = build_shared_bins(df[_COLS], df["label"], n_threads=1, model_params=model_params)
+
+    fold = df.iloc[100:600]
+    weights = np.linspace(0.5, 1.0, len(fold))
+
+    indptr, values = bins.xgb_reference.get_quantile_cut()
+    fold_indptr, fold_values = bins.xgb_matrix(
+        fold[_COLS], fold["label"], weights
+    ).get_quantile_cut()
+    np.testing.assert_array_equal(fold_indptr, indptr)
+    np.testing.assert_array_equal(fold_values, values)
+
+    subset = bins.lgb_train_set((100, 600), weights)
+    assert subset.num_data() == len(fold)
+    np.testing.assert_array_equal(subset.get_label(), fold["label"].to_numpy())
+    np.testing.assert_allclose(subset.get_weight(), weights)
+    assert [subset.feature_num_bin(i) for i in range(len(_COLS))] == list(
+        bins.cut_points()["lgbm_num_bins"]
+    )
+
+    with pytest.raises(ValueError):
+        bins.lgb_train_set((0, len(df) + 1), weights)
+
+
+def test_bin_cuts_are_saved_with_the_model(tmp_path, prepared_frame, model_params):
+    df = prepared_frame(days=20, flag=True)
+    bins = build_shared_bins(df[_COLS], df["label"], n_threads=1, model_params=model_params)
+
+    model = EnsembleModel(n_threads=1, **model_params)
+    model.train(
+        df[_COLS].iloc[:300],
+        df["label"].iloc[:300],
+        df[_COLS].iloc[300:400],
+        df["label"].iloc[300:400],
+        shared_bins=bins,
+        train_rows=(0, 300),
+    )
+    model.save(str(tmp_path / "model"))
+    assert (tmp_path / "model" / BIN_CUTS_FILE).exists()
+
+    loaded = EnsembleModel()
+    loaded.load(str(tmp_path / "model"))
+    for name, values in bins.cut_points().items():
+        np.testing.assert_array_equal(loaded.bin_cuts[name], values)
+    np.testing.assert_allclose(loaded.predict_proba(df[_COLS]), model.predict_proba(df[_COLS]))
+
+    with pytest.raises(ValueError):
+        model.train(
+            df[_COLS].iloc[:300], df["label"].iloc[:300], df[_COLS], df["label"], shared_bins=bins
+        )
+
+
+def _run(tmp_path, synthetic_pipeline, prepared_frame, fold_workers: int, shared_bins: bool):
+    pipeline = synthetic_pipeline(
+        prepared=prepared_frame(flag=True),
+        model_dir=str(tmp_path / f"models_{fold_workers}_{shared_bins}"),
+        fold_workers=fold_workers,
+        shared_bins=shared_bins,
+    )
+    return pipeline.run_walk_forward_validation(
+        db=None,
+        symbol="BTC/USDT",
+        timeframe="1h",
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 3, 15),
+    )
+
+
+def test_shared_bins_walk_forward(tmp_path, synthetic_pipeline, prepared_frame):
+    baseline = _run(tmp_path, synthetic_pipeline, prepared_frame, fold_workers=1, shared_bins=False)
+    serial = _run(tmp_path, synthetic_pipeline, prepared_frame, fold_workers=1, shared_bins=True)
+    parallel = _run(tmp_path, synthetic_pipeline, prepared_frame, fold_workers=2, shared_bins=True)
+
+    assert serial["num_splits"] == parallel["num_splits"] == baseline["num_splits"] > 1
+    for expected, actual in zip(baseline["split_results"], serial["split_results"]):
+        assert actual["train_samples"] == expected["train_samples"]
+        assert actual["test_samples"] == expected["test_samples"]
+
+    # Both paths bin the same rows, so the fold models are identical
+    for expected, actual in zip(serial["split_results"], parallel["split_results"]):
+        assert actual["oos_metrics"] == pytest.approx(expected["oos_metrics"])
+
+    assert serial["avg_metrics"]["avg_roc_auc"] == pytest.approx(
+        baseline["avg_metrics"]["avg_roc_auc"], abs=0.05
+    )
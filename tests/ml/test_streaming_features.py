@@ -0,0 +1,207 @@
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import apps.ml.features as features
+from apps.api.db.models import OHLCV, TimeFrame
+from apps.ml.features import TALIB_AVAILABLE, FeatureEngineering
+from apps.ml.signal_engine import SignalEngine
+from apps.ml.streaming_features import (
+    StreamingFeatureEngine,
+    StreamingFeatureStore,
+    advance_streaming_features,
+)
+from tests.ml.conftest import make_candles
+
+
+def _assert_row_matches(stream_row, batch_row):
+    assert list(stream_row.keys()) == list(batch_row.index)
+    for column in batch_row.index:
+        if column == "timestamp":
+            assert stream_row[column] == batch_row[column]
+            continue
+        expected = float(batch_row[column])
+        actual = float(stream_row[column])
+        if np.isnan(expected):
+            assert np.isnan(actual), column
+        else:
+            assert actual == pytest.approx(expected, rel=1e-8, abs=1e-10), column
+
+
+@pytest.fixture(
+    params=[
+        "pandas",
+        pytest.param(
+            "talib", marks=pytest.mark.skipif(not TALIB_AVAILABLE, reason="TA-Lib not installed")
+        ),
+    ]
+)
+def backend(request, monkeypatch):
+    """Indicator backend used by both the batch pipeline and the streaming engine."""
+    monkeypatch.setattr(features, "TALIB_AVAILABLE", request.param == "talib")
+    monkeypatch.setattr(features, "PANDAS_TA_AVAILABLE", False)
+    return request.param
+
+
+@pytest.mark.parametrize("with_metrics", [False, True])
+def test_streaming_rows_match_batch_features(with_metrics, backend):
+    df = make_candles(360, seed=3)
+    metrics = None
+    metrics_df = None
+    if with_metrics:
+        metrics = {
+            "timestamp": df["timestamp"].iloc[100],
+            "funding_rate": 0.0001,
+            "open_interest": 1500.0,
+            "spread_bps": 2.5,
+            "depth_imbalance": 0.1,
+            "realized_volatility": None,
+        }
+        metrics_df = pd.DataFrame([metrics])
+
+    engine = StreamingFeatureEngine("BTC/USDT", "15m")
+    feature_engineering = FeatureEngineering()
+
+    stream_rows = [engine.update(candle, metrics) for candle in df.to_dict("records")]
+
+    # Around the TA-Lib seeding bars (RSI/ATR 14, STOCH 17, ADX 27, MACD 33) and later
+    for index in [13, 14, 17, 27, 30, 33, 120, 219, 250, 300, len(df) - 1]:
+        batch_row = feature_engineering.compute_all_features(
+            df.iloc[: index + 1], market_metrics=metrics_df
+        ).iloc[-1]
+        _assert_row_matches(stream_rows[index], batch_row)
+
+
+def test_state_round_trip_resumes_identically(backend):
+    df = make_candles(240)
+    candles = df.to_dict("records")
+
+    uninterrupted = StreamingFeatureEngine("ETH/USDT", "15m")
+    expected = [uninterrupted.update(candle) for candle in candles]
+
+    engine = StreamingFeatureEngine("ETH/USDT", "15m")
+    for candle in candles[:150]:
+        engine.update(candle)
+
+    restored = StreamingFeatureEngine.from_state(json.loads(json.dumps(engine.to_state())))
+    resumed = [restored.update(candle) for candle in candles[150:]]
+
+    for actual, wanted in zip(resumed, expected[150:]):
+        assert actual.keys() == wanted.keys()
+        for key in wanted:
+            if isinstance(wanted[key], float) and np.isnan(wanted[key]):
+                assert np.isnan(actual[key])
+            else:
+                assert actual[key] == wanted[key]
+
+
+def test_update_rejects_stale_candles():
+    df = make_candles(5)
+    engine = StreamingFeatureEngine("BTC/USDT", "15m")
+    engine.warm_up(df)
+
+    with pytest.raises(ValueError):
+        engine.update(df.iloc[-1].to_dict())
+
+
+class _MemoryStore(StreamingFeatureStore):
+    def __init__(self):
+        super().__init__()
+        self.states = {}
+
+    def is_available(self):
+        return True
+
+    def load(self, symbol, timeframe):
+        state = self.states.get((symbol, timeframe))
+        return StreamingFeatureEngine.from_state(state) if state else None
+
+    def save(self, engine):
+        self.states[(engine.symbol, engine.timeframe)] = json.loads(json.dumps(engine.to_state()))
+
+
+def test_advance_skips_known_and_forming_candles():
+    df = make_candles(60)
+    store = _MemoryStore()
+
+    engine = StreamingFeatureEngine("BTC/USDT", "15m")
+    engine.warm_up(df.iloc[:50])
+    store.save(engine)
+
+    # Overlapping fetch window: rows 45..59, with row 59 still forming
+    row = advance_streaming_features(
+        store, "BTC/USDT", "15m", df.iloc[45:], closed_before=df["timestamp"].iloc[59]
+    )
+
+    reference = StreamingFeatureEngine("BTC/USDT", "15m")
+    expected = reference.warm_up(df.iloc[:59])
+
+    assert row["timestamp"] == df["timestamp"].iloc[58]
+    assert row["ema_21"] == expected["ema_21"]
+    assert store.load("BTC/USDT", "15m").last_timestamp == df["timestamp"].iloc[58]
+
+
+def test_advance_without_state_is_noop():
+    store = _MemoryStore()
+    assert advance_streaming_features(store, "BTC/USDT", "15m", make_candles(10)) is None
+    assert store.states == {}
+
+
+def test_store_discards_state_of_another_backend(monkeypatch):
+    engine = StreamingFeatureEngine("BTC/USDT", "15m", backend="pandas")
+    engine.warm_up(make_candles(20))
+    state = json.loads(json.dumps(engine.to_state()))
+    monkeypatch.setattr("apps.ml.streaming_features.get_cached_json", lambda key: state)
+
+    store = StreamingFeatureStore()
+    monkeypatch.setattr(features, "TALIB_AVAILABLE", False)
+    monkeypatch.setattr(features, "PANDAS_TA_AVAILABLE", False)
+    assert store.load("BTC/USDT", "15m").last_timestamp == engine.last_timestamp
+
+    monkeypatch.setattr(features, "TALIB_AVAILABLE", True)
+    assert store.load("BTC/USDT", "15m") is None
+
+    monkeypatch.setattr(features, "TALIB_AVAILABLE", False)
+    monkeypatch.setattr(features, "PANDAS_TA_AVAILABLE", True)
+    assert not store.is_supported()
+    with pytest.raises(ValueError):
+        StreamingFeatureEngine("BTC/USDT", "15m")
+
+
+def test_signal_engine_snapshot_uses_streaming_state(backend, session):
+    df = make_candles(130)
+    for candle in df.iloc[:120].to_dict("records"):
+        session.add(OHLCV(symbol="BTC/USDT", timeframe=TimeFrame.M15, **candle))
+    session.commit()
+
+    store = _MemoryStore()
+    signal_engine = SignalEngine(
+        db=session,
+        registry=MagicMock(),
+        performance_tracker=MagicMock(),
+        lookback_bars=100,
+        feature_store=store,
+    )
+
+    # Cold start: batch pipeline runs and seeds state up to the last closed bar
+    first = signal_engine._prepare_latest_snapshot("BTC/USDT", "15m")
+    assert store.load("BTC/USDT", "15m").last_timestamp == df["timestamp"].iloc[118]
+
+    for candle in df.iloc[120:].to_dict("records"):
+        session.add(OHLCV(symbol="BTC/USDT", timeframe=TimeFrame.M15, **candle))
+    session.commit()
+
+    # State was seeded from the 100-bar window starting at row 20; the recursive
+    # smoothers remember that start
+    batch_features = FeatureEngineering().compute_all_features(df.iloc[20:]).iloc[-1]
+    second = signal_engine._prepare_latest_snapshot("BTC/USDT", "15m")
+
+    assert first["timestamp"] == df["timestamp"].iloc[119]
+    assert second["timestamp"] == df["timestamp"].iloc[129]
+    assert store.load("BTC/USDT", "15m").last_timestamp == df["timestamp"].iloc[128]
+    for column in ["atr_14", "rsi_14", "bb_middle", "vwap_rolling"]:
+        assert second["features"][column] == pytest.approx(batch_features[column], rel=1e-9)
+    assert second["atr"] == pytest.approx(batch_features["atr_14"], rel=1e-9)
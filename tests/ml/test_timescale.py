@@ -0,0 +1,100 @@
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+
+from apps.api.db import timescale
+
+
+class _Result:
+    def __init__(self, value=None, row=None):
+        self._value = value
+        self._row = row
+
+    def scalar(self):
+        return self._value
+
+    def first(self):
+        return self._row
+
+
+class FakeTimescaleConnection:
+    """Answers the catalog queries of a fresh TimescaleDB database and records DDL."""
+
+    def __init__(self):
+        self.dialect = SimpleNamespace(
+            name="postgresql", identifier_preparer=postgresql.dialect().identifier_preparer
+        )
+        self.hypertables = set()
+        self.statements = []
+
+    def begin_nested(self):
+        return nullcontext()
+
+    def execute(self, clause, params=None):
+        sql = " ".join(str(clause).split())
+        params = params or {}
+        self.statements.append((sql, params))
+
+        if "FROM pg_extension" in sql:
+            return _Result(1)
+        if sql.startswith("SELECT to_regclass"):
+            return _Result(params["table"])
+        if "FROM pg_constraint" in sql:
+            return _Result(row=(f"{params['table']}_pkey", ["id"]))
+        if "create_hypertable" in sql:
+            self.hypertables.add(params["table"])
+        if "compression_enabled" in sql:
+            return _Result(False)
+        if "FROM timescaledb_information.hypertables" in sql:
+            return _Result(1 if params["table"] in self.hypertables else None)
+        return _Result()
+
+
+def test_plain_databases_keep_their_tables():
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as connection:
+        report = timescale.setup_timescale(connection)
+    assert report == {"timescale": False, "hypertables": []}
+
+
+def test_setup_converts_and_compresses_tables():
+    connection = FakeTimescaleConnection()
+
+    report = timescale.setup_timescale(connection)
+
+    assert report["timescale"] is True
+    assert report["hypertables"] == list(timescale.HYPERTABLES)
+
+    sql = [statement for statement, _ in connection.statements]
+    # The primary key is widened before the conversion, which requires it to cover the time column
+    assert sql.index(
+        "ALTER TABLE ohlcv DROP CONSTRAINT ohlcv_pkey, ADD PRIMARY KEY (id, timestamp)"
+    ) < next(
+        i
+        for i, (statement, params) in enumerate(connection.statements)
+        if "create_hypertable" in statement and params["table"] == "ohlcv"
+    )
+    # Snapshots dedup on signal_id alone, so that table keeps its primary key
+    assert "historical_signal_snapshots" not in report["hypertables"]
+    assert any("compress_segmentby = 'symbol, timeframe'" in statement for statement in sql)
+
+    # Higher timeframes come from the resampler, not from continuous aggregates
+    assert not any("MATERIALIZED VIEW" in statement for statement in sql)
+
+    policies = [
+        params
+        for statement, params in connection.statements
+        if "add_compression_policy" in statement
+    ]
+    assert {params["after"] for params in policies} == {"30 days"}
+
+
+def test_disabled_setting_skips_conversion(monkeypatch):
+    monkeypatch.setattr(timescale.settings, "TIMESCALE_ENABLED", False)
+    connection = FakeTimescaleConnection()
+
+    assert timescale.setup_timescale(connection)["timescale"] is False
+    assert timescale.setup_hypertable(connection, "ohlcv") is False
+    assert not connection.hypertables
@@ -0,0 +1,145 @@
+import time
+from datetime import datetime
+
+import pytest
+
+import apps.ml.training as training
+from apps.api.config import settings
+from apps.api.db.models import TrainingJob
+from apps.ml import worker
+from apps.ml.models import EnsembleModel
+from apps.ml.training_budget import TrainingBudget
+
+_COLS = ["feat_signal", "feat_noise"]
+
+_RUN = dict(
+    db=None,
+    symbol="BTC/USDT",
+    timeframe="1h",
+    start_date=datetime(2024, 1, 1),
+    end_date=datetime(2024, 3, 15),
+)
+
+
+def _measured_budget(seconds: float, **kwargs) -> TrainingBudget:
+    """Budget that has seen one fold: 1e-5 s per row and round, 1000 rounds at the base rate."""
+    budget = TrainingBudget(seconds, base_learning_rate=0.02, min_fold_seconds=1, **kwargs)
+    budget.start()
+    budget.record_fold(
+        1,
+        {"train_seconds": 10.0, "boost_rounds": 1000, "train_samples": 1000, "learning_rate": 0.02},
+    )
+    return budget
+
+
+def test_tight_share_raises_learning_rate_and_caps_rounds():
+    budget = _measured_budget(100)
+
+    # 2000 of 20000 pending rows: a 10 s share affords 500 of the 1000 rounds needed
+    squeezed = budget.fold_settings(2000, [2000] * 9)
+    assert squeezed["learning_rate"] == pytest.approx(0.04, rel=0.01)
+    assert 490 <= squeezed["num_boost_round"] <= 500
+    assert 395 <= squeezed["early_stopping_rounds"] <= 400
+    assert squeezed["deadline"] <= budget.deadline
+
+    # A 50 s share affords every round: boosting settings are left alone
+    relaxed = budget.fold_settings(2000, [2000])
+    assert relaxed["learning_rate"] is None
+    assert relaxed["num_boost_round"] is None
+
+
+def test_oldest_folds_are_dropped_when_the_rest_cannot_fit():
+    # Cheapest fold of 2000 rows: 100 rounds at the highest learning rate = 2 s
+    assert _measured_budget(101).folds_to_skip([2000] * 60) == 10
+
+    # Before any fold is measured every fold costs min_fold_seconds
+    budget = TrainingBudget(330, min_fold_seconds=60)
+    budget.start()
+    assert budget.folds_to_skip([100] * 8) == 3
+
+    budget.start(spent_seconds=400)
+    assert budget.exhausted
+    assert budget.folds_to_skip([100] * 8) == 7
+
+
+def test_cpu_budget_is_spread_over_cores():
+    assert TrainingBudget(3600, clock="cpu", cores=4).wall_seconds == 900
+    with pytest.raises(ValueError):
+        TrainingBudget(3600, clock="gpu")
+
+
+def test_deadline_keeps_the_trees_built_so_far(prepared_frame, model_params):
+    df = prepared_frame(days=30)
+    model = EnsembleModel(n_threads=1, **model_params)
+    model.train(
+        df[_COLS].iloc[:500],
+        df["label"].iloc[:500],
+        df[_COLS].iloc[500:600],
+        df["label"].iloc[500:600],
+        learning_rate=0.3,
+        deadline=time.time(),
+    )
+
+    assert model.deadline_reached
+    assert model.lgbm_model.current_iteration() == 1
+    assert model.xgb_model.num_boosted_rounds() == 1
+    assert model.lgbm_params["learning_rate"] == 0.1
+    assert model.predict_proba(df[_COLS]).shape == (len(df),)
+
+
+def test_budgeted_run_trains_the_newest_folds(tmp_path, monkeypatch, synthetic_pipeline):
+    monkeypatch.setattr(settings, "TRAINING_BUDGET_MIN_FOLD_SECONDS", 20)
+
+    reference = synthetic_pipeline(
+        model_dir=str(tmp_path / "reference")
+    ).run_walk_forward_validation(**_RUN)
+    total = reference["num_splits"]
+    assert total > 3
+
+    # Room for two minimum-length folds
+    budgeted = synthetic_pipeline(
+        model_dir=str(tmp_path / "budgeted"), time_budget_seconds=45
+    ).run_walk_forward_validation(**_RUN)
+
+    assert budgeted["num_splits"] == 2
+    assert budgeted["time_budget"]["skipped_folds"] == list(range(1, total - 1))
+    assert budgeted["time_budget"]["exhausted"] is False
+    assert [s["train_start"] for s in budgeted["split_results"]] == [
+        s["train_start"] for s in reference["split_results"][-2:]
+    ]
+    assert budgeted["avg_fold_seconds"] == pytest.approx(budgeted["total_train_seconds"] / 2)
+    assert reference["time_budget"] is None
+
+
+def test_training_job_records_the_budget_and_fold_time(
+    tmp_path, monkeypatch, session_factory, fake_registry, synthetic_pipeline
+):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(worker, "SessionLocal", session_factory)
+    monkeypatch.setattr(worker, "ModelRegistry", fake_registry)
+    monkeypatch.setattr(training, "WalkForwardPipeline", synthetic_pipeline)
+    monkeypatch.setattr(
+        training, "_resolve_date_range", lambda *args: (_RUN["start_date"], _RUN["end_date"])
+    )
+    monkeypatch.setattr(settings, "TRAINING_CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+
+    result = worker.train_model_task.apply(
+        kwargs=dict(
+            symbol="BTC/USDT",
+            timeframe="1h",
+            test_period_days=10,
+            min_train_days=30,
+            time_budget_hours=1,
+        )
+    ).get()
+
+    session = session_factory()
+    job = session.query(TrainingJob).one()
+    assert job.status == "completed"
+    assert job.time_budget_seconds == 3600
+    assert job.budget_clock == settings.TRAINING_BUDGET_CLOCK
+    assert job.avg_fold_seconds > 0
+    assert job.avg_fold_seconds == pytest.approx(result["avg_fold_seconds"])
+    assert job.budget_exhausted is False
+    assert job.budget_skipped_folds == 0
+    session.close()
@@ -0,0 +1,158 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.ml.fold_executor import SharedFoldData
+from apps.ml.training import WalkForwardPipeline
+from apps.ml.training_data import build_training_matrix, columns_per_chunk, log_memory
+
+
+def _features(rows: int = 400, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-01-01", periods=rows, freq="15min"),
+            "open": 100.0,
+            "high": 101.0,
+            "low": 99.0,
+            "close": 100.0,
+            "volume": 1.0,
+            "feat_a": rng.normal(size=rows),
+            "feat_b": rng.normal(size=rows),
+            "feat_flag": rng.random(rows) > 0.5,
+            "feat_int": rng.integers(0, 5, size=rows),
+            "feat_empty": np.nan,
+        }
+    )
+    # Leading gap (bfill), interior gaps (ffill) and infinities
+    df.loc[:9, "feat_a"] = np.nan
+    df.loc[50:60, "feat_b"] = np.nan
+    df.loc[[5, 120], "feat_b"] = np.inf
+    df.loc[200, "feat_a"] = -np.inf
+    return df
+
+
+def _labels(df_features: pd.DataFrame, seed: int = 5) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # Labeling stops short of the end (time barrier) and leaves a few gaps
+    labels = df_features[["timestamp"]].iloc[:-24].copy()
+    labels["hit_barrier"] = rng.choice(["tp", "sl", "time"], size=len(labels))
+    labels["return_pct"] = rng.normal(size=len(labels))
+    labels["bars_to_hit"] = rng.integers(1, 24, size=len(labels)).astype(float)
+    labels.loc[labels.index[30:35], "return_pct"] = np.nan
+    labels["label"] = (labels["hit_barrier"] == "tp").astype(int)
+    return labels.reset_index(drop=True)
+
+
+def _pipeline(tmp_path, monkeypatch, df_features, labels_df, **kwargs) -> WalkForwardPipeline:
+    pipeline = WalkForwardPipeline(model_dir=str(tmp_path / "models"), **kwargs)
+    pipeline.feature_cache = None
+    monkeypatch.setattr(
+        pipeline.feature_eng, "compute_all_features", lambda df, **kw: df_features.copy()
+    )
+    monkeypatch.setattr(
+        pipeline.labeler, "label_data", lambda df, **kw: labels_df.drop(columns="label")
+    )
+    return pipeline
+
+
+@pytest.mark.parametrize("budget_mb", [None, 1])
+def test_matrix_matches_prepared_frame(tmp_path, monkeypatch, budget_mb):
+    df_features = _features()
+    labels_df = _labels(df_features)
+    pipeline = _pipeline(tmp_path, monkeypatch, df_features, labels_df, memory_budget_mb=budget_mb)
+
+    expected = pipeline.prepare_features_and_labels(df_features)
+    matrix = pipeline.prepare_training_matrix(df_features)
+
+    feature_cols = pipeline.feature_eng.get_feature_columns(expected)
+    assert matrix.feature_cols == feature_cols
+    assert matrix.features.dtype == np.float32
+    assert matrix.features.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(
+        matrix.features, expected[feature_cols].to_numpy(dtype=np.float32)
+    )
+    np.testing.assert_array_equal(matrix.labels, expected["label"].to_numpy())
+    np.testing.assert_array_equal(matrix.timestamps, pd.DatetimeIndex(expected["timestamp"]))
+
+
+def test_small_budget_builds_in_column_groups():
+    df_features = _features(rows=1000)
+    labels_df = _labels(df_features)
+    cols = ["feat_a", "feat_b", "feat_flag", "feat_int", "feat_empty"]
+
+    budget = 1000 * 32 * 2
+    assert columns_per_chunk(1000, len(cols), budget) == 2
+    assert columns_per_chunk(1000, len(cols), None) == len(cols)
+
+    whole = build_training_matrix(df_features, labels_df, cols)
+    chunked = build_training_matrix(df_features, labels_df, cols, budget_bytes=budget)
+    np.testing.assert_array_equal(chunked.features, whole.features)
+    assert not np.isnan(whole.features).any()
+    assert (whole.features[:, cols.index("feat_empty")] == 0).all()
+
+
+def test_fold_views_share_the_matrix():
+    df_features = _features()
+    matrix = build_training_matrix(df_features, _labels(df_features), ["feat_a", "feat_b"])
+
+    start, stop = matrix.rows((datetime(2024, 1, 1, 6), datetime(2024, 1, 2)))
+    assert matrix.timestamps[start] == pd.Timestamp("2024-01-01 06:00")
+    assert matrix.timestamps[stop - 1] < pd.Timestamp("2024-01-02")
+    assert np.shares_memory(matrix.features_frame(start, stop).to_numpy(), matrix.features)
+
+    with SharedFoldData.from_matrix(matrix) as shared:
+        features = np.load(shared.paths["features"], mmap_mode="r")
+        assert features.dtype == np.float32
+        np.testing.assert_array_equal(features, matrix.features)
+
+
+def test_log_memory_reports_rss(caplog):
+    with caplog.at_level("INFO", logger="apps.ml.training_data"):
+        rss = log_memory("unit test", budget_bytes=1)
+    assert rss is None or rss > 0
+    assert "Memory after unit test" in caplog.text
+
+
+@pytest.mark.parametrize("fold_workers", [1, 2])
+def test_compact_walk_forward_matches_frame_path(
+    tmp_path, monkeypatch, synthetic_pipeline, fold_workers
+):
+    def _run(compact: bool):
+        pipeline = synthetic_pipeline(
+            model_dir=str(tmp_path / f"models_{compact}"),
+            fold_workers=fold_workers,
+            compact_features=compact,
+        )
+        labels_df = pipeline.prepared[["timestamp", "label"]].assign(
+            hit_barrier="tp", return_pct=0.0, bars_to_hit=1.0
+        )
+        monkeypatch.setattr(
+            pipeline,
+            "prepare_training_matrix",
+            lambda df, **kwargs: build_training_matrix(
+                df, labels_df, ["feat_signal", "feat_noise"]
+            ),
+        )
+        return pipeline.run_walk_forward_validation(
+            db=None,
+            symbol="BTC/USDT",
+            timeframe="1h",
+            start_date=datetime(2024, 1, 1),
+            end_date=datetime(2024, 3, 15),
+        )
+
+    frame_results = _run(compact=False)
+    compact_results = _run(compact=True)
+
+    assert compact_results["num_splits"] == frame_results["num_splits"] > 1
+    for expected, actual in zip(frame_results["split_results"], compact_results["split_results"]):
+        assert actual["split_id"] == expected["split_id"]
+        assert actual["train_samples"] == expected["train_samples"]
+        assert actual["test_samples"] == expected["test_samples"]
+        assert actual["hit_rate_tp1"] == pytest.approx(expected["hit_rate_tp1"])
+    assert compact_results["avg_metrics"]["avg_roc_auc"] == pytest.approx(
+        frame_results["avg_metrics"]["avg_roc_auc"], abs=0.05
+    )
@@ -0,0 +1,167 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import apps.ml.auto_trainer as auto_trainer
+from apps.ml.models import EnsembleModel
+from apps.ml.training import WalkForwardPipeline
+
+_COLS = ["feat_signal", "feat_noise"]
+
+
+def test_continued_boosting_keeps_the_base_model(prepared_frame, model_params):
+    df = prepared_frame(days=30)
+    base = EnsembleModel(n_threads=1, **model_params)
+    base.train(
+        df[_COLS].iloc[:300],
+        df["label"].iloc[:300],
+        df[_COLS].iloc[300:400],
+        df["label"].iloc[300:400],
+    )
+    base_trees = base.lgbm_model.num_trees()
+    base_proba = base.predict_proba(df[_COLS])
+
+    model = EnsembleModel(n_threads=1, **model_params)
+    model.train(
+        df[_COLS].iloc[:500],
+        df["label"].iloc[:500],
+        df[_COLS].iloc[500:600],
+        df["label"].iloc[500:600],
+        init_model=base,
+        num_boost_round=25,
+        early_stopping_rounds=5,
+    )
+
+    assert base_trees <= model.lgbm_model.num_trees() <= base_trees + 25
+    assert base.lgbm_model.num_trees() == base_trees
+    np.testing.assert_allclose(base.predict_proba(df[_COLS]), base_proba)
+
+    other = EnsembleModel(n_threads=1, **model_params)
+    with pytest.raises(ValueError):
+        other.train(
+            df[["feat_noise"]], df["label"], df[["feat_noise"]], df["label"], init_model=base
+        )
+
+
+def test_warm_start_folds_report_the_same_metrics(tmp_path, synthetic_pipeline):
+    run = dict(
+        db=None,
+        symbol="BTC/USDT",
+        timeframe="1h",
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 3, 15),
+    )
+
+    cold = synthetic_pipeline(
+        model_dir=str(tmp_path / "cold"), warm_start=False
+    ).run_walk_forward_validation(**run)
+    warm_pipeline = synthetic_pipeline(
+        model_dir=str(tmp_path / "warm"),
+        warm_start=True,
+        warm_start_rounds=50,
+        warm_start_patience=10,
+    )
+    warm = warm_pipeline.run_walk_forward_validation(**run)
+
+    assert warm["num_splits"] == cold["num_splits"] > 1
+    assert [s["warm_started"] for s in warm["split_results"]] == [False] + [True] * (
+        warm["num_splits"] - 1
+    )
+    assert not any(s["warm_started"] for s in cold["split_results"])
+    for expected, actual in zip(cold["split_results"], warm["split_results"]):
+        assert set(actual) == set(expected)
+        assert set(actual["oos_metrics"]) == set(expected["oos_metrics"])
+        assert actual["train_samples"] == expected["train_samples"]
+        assert actual["train_seconds"] > 0
+    assert warm["total_train_seconds"] == pytest.approx(
+        sum(s["train_seconds"] for s in warm["split_results"])
+    )
+    assert warm["warm_start"] is True
+
+
+def test_warm_start_requires_expanding_windows(tmp_path):
+    pipeline = WalkForwardPipeline(
+        model_dir=str(tmp_path), warm_start=True, use_expanding_window=False
+    )
+    assert pipeline.warm_start is False
+
+
+def test_incremental_update_trains_on_new_rows_only(
+    tmp_path, monkeypatch, synthetic_pipeline, prepared_frame, model_params
+):
+    df_prepared = prepared_frame(days=40)
+    since = datetime(2024, 1, 31)
+
+    base = EnsembleModel(n_threads=1, **model_params)
+    old = df_prepared[df_prepared["timestamp"] <= since]
+    base.train(
+        old[_COLS].iloc[:500],
+        old["label"].iloc[:500],
+        old[_COLS].iloc[500:],
+        old["label"].iloc[500:],
+    )
+
+    pipeline = synthetic_pipeline(
+        prepared=df_prepared,
+        model_dir=str(tmp_path / "update"),
+        warm_start=True,
+        warm_start_rounds=30,
+    )
+    monkeypatch.setattr(pipeline.feature_eng, "get_feature_columns", lambda df: list(_COLS))
+
+    results = pipeline.run_incremental_update(
+        db=None,
+        symbol="BTC/USDT",
+        timeframe="1h",
+        base_model=base,
+        since=since,
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 2, 10),
+        base_model_id="BTC_USDT_1h_base",
+    )
+
+    new_rows = int((df_prepared["timestamp"] > since).sum())
+    split = results["split_results"][0]
+    assert results["num_splits"] == 1
+    assert split["warm_started"] is True
+    assert split["train_samples"] + split["test_samples"] == new_rows
+    assert split["train_start"] > pd.Timestamp(since)
+    assert results["warm_start_from"] == "BTC_USDT_1h_base"
+    assert "avg_roc_auc" in results["avg_metrics"]
+
+    monkeypatch.setattr(pipeline.feature_eng, "get_feature_columns", lambda df: ["feat_signal"])
+    with pytest.raises(ValueError):
+        pipeline.run_incremental_update(
+            db=None,
+            symbol="BTC/USDT",
+            timeframe="1h",
+            base_model=base,
+            since=since,
+            start_date=datetime(2024, 1, 1),
+            end_date=datetime(2024, 2, 10),
+        )
+
+
+def test_auto_trainer_falls_back_to_full_training(monkeypatch):
+    class _Registry:
+        def get_deployed_model(self, symbol, timeframe, environment="production"):
+            return None
+
+    calls = []
+    monkeypatch.setattr(auto_trainer, "ModelRegistry", _Registry)
+    monkeypatch.setattr(auto_trainer, "update_model_pipeline", lambda **kw: calls.append("update"))
+    monkeypatch.setattr(
+        auto_trainer,
+        "train_model_pipeline",
+        lambda **kw: calls.append("full") or {"model_id": "m-full", "avg_metrics": {}},
+    )
+
+    result = auto_trainer.AutoTrainer(db=None).run_training_cycle(
+        "BTC/USDT", "15m", warm_start=True
+    )
+
+    assert calls == ["full"]
+    assert result["status"] == "completed"
+    assert result["warm_start"] is False
@@ -373,6 +373,10 @@ def test_generate_signals_task_returns_statistics(monkeypatch):
             self.db = db
             self.registry = registry
 
+        def generate_for_deployments(self, requests, **kwargs):
+            for request in requests:
+                yield request, self.generate_for_deployment(*request, **kwargs)
+
         def generate_for_deployment(self, symbol, timeframe, environment='production', **kwargs):
             timestamp = datetime.utcnow()
             signal = generator.generate_signal(
@@ -497,6 +501,10 @@ def test_generate_signals_task_includes_ai_summary(monkeypatch):
             self.db = db
             self.registry = registry
 
+        def generate_for_deployments(self, requests, **kwargs):
+            for request in requests:
+                yield request, self.generate_for_deployment(*request, **kwargs)
+
         def generate_for_deployment(self, symbol, timeframe, environment='production', **kwargs):
             timestamp = datetime.utcnow()
             signal = generator.generate_signal(